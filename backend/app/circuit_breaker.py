@@ -0,0 +1,204 @@
+"""
+Circuit Breaker
+Per-dependency latency budget and failure isolation for Redis and outbound HTTP
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+
+logger = logging.getLogger("mediconnect")
+
+T = TypeVar("T")
+
+CLOSED = "closed"
+HALF_OPEN = "half_open"
+OPEN = "open"
+
+# Gauge values for mediconnect_circuit_state
+STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a dependency whose circuit is open."""
+
+    def __init__(self, name: str):
+        super().__init__(f"Circuit '{name}' is open")
+        self.name = name
+
+
+_metrics_module: Any = None
+
+
+def _metrics():
+    # Imported lazily: metrics pulls in app.config, which the Redis client avoids
+    global _metrics_module
+    if _metrics_module is None:
+        try:
+            from .services import metrics as module
+        except Exception:
+            module = False
+        _metrics_module = module
+    return _metrics_module or None
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker with a per-call timeout and error/latency thresholds.
+
+    Every call runs under `timeout` seconds. The last `window` outcomes are
+    kept; once at least `min_calls` are recorded, the circuit opens when
+    the share of failures (exceptions, timeouts, results matching
+    `failure_result`) reaches `failure_rate`, or the share of calls slower
+    than `slow_call` reaches `slow_rate`. An open circuit rejects calls
+    with CircuitOpenError for `open_seconds`, then lets `half_open_calls`
+    probes through: if all of them succeed quickly the circuit closes,
+    any failed or slow probe opens it again.
+
+    Usage:
+        breaker = CircuitBreaker("redis", timeout=0.1, slow_call=0.025)
+        value = await breaker.call(lambda: client.get(key))
+    """
+
+    def __init__(
+        self,
+        name: str,
+        timeout: float,
+        slow_call: Optional[float] = None,
+        window: int = 20,
+        min_calls: int = 10,
+        failure_rate: float = 0.5,
+        slow_rate: float = 0.8,
+        open_seconds: float = 30.0,
+        half_open_calls: int = 3,
+        failure_result: Optional[Callable[[Any], bool]] = None
+    ):
+        self.name = name
+        self.timeout = timeout
+        self.slow_call = slow_call
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.slow_rate = slow_rate
+        self.open_seconds = open_seconds
+        self.half_open_calls = half_open_calls
+        self.failure_result = failure_result
+
+        self.state = CLOSED
+        self._outcomes: deque = deque(maxlen=window)  # (failed, slow)
+        self._opened_at = 0.0
+        self._probes = 0
+        self._probe_successes = 0
+
+    @property
+    def is_open(self) -> bool:
+        """Whether calls are currently being rejected (without reserving a probe)."""
+        return self.state == OPEN and time.monotonic() - self._opened_at < self.open_seconds
+
+    def allow(self) -> bool:
+        """Whether a call may go through now (reserves a probe when half-open)."""
+        if self.state == OPEN:
+            if time.monotonic() - self._opened_at < self.open_seconds:
+                return False
+            self._transition(HALF_OPEN)
+
+        if self.state == HALF_OPEN:
+            if self._probes >= self.half_open_calls:
+                return False
+            self._probes += 1
+
+        return True
+
+    async def call(self, operation: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run `operation()` under the breaker.
+
+        Raises:
+            CircuitOpenError: If the circuit is open (the operation is not started)
+            asyncio.TimeoutError: If the call exceeded the timeout
+        """
+        if not self.allow():
+            self._count("rejected")
+            raise CircuitOpenError(self.name)
+
+        start = time.monotonic()
+        try:
+            result = await asyncio.wait_for(operation(), self.timeout)
+        except asyncio.TimeoutError:
+            self.record(failed=True, slow=True, outcome="timeout")
+            raise
+        except Exception:
+            self.record(failed=True, slow=False, outcome="failure")
+            raise
+        except BaseException:
+            # Cancelled by the caller: neither outcome, but free the probe slot
+            if self.state == HALF_OPEN:
+                self._probes -= 1
+            raise
+
+        if self.failure_result is not None and self.failure_result(result):
+            self.record(failed=True, slow=False, outcome="failure")
+            return result
+
+        slow = self.slow_call is not None and time.monotonic() - start >= self.slow_call
+        self.record(failed=False, slow=slow, outcome="slow" if slow else "success")
+        return result
+
+    def record(self, failed: bool, slow: bool, outcome: str):
+        """Account for one finished call."""
+        self._count(outcome)
+
+        if self.state == HALF_OPEN:
+            if failed or slow:
+                self._transition(OPEN)
+                return
+            self._probe_successes += 1
+            if self._probe_successes >= self.half_open_calls:
+                self._transition(CLOSED)
+            return
+
+        if self.state != CLOSED:
+            return
+
+        self._outcomes.append((failed, slow))
+        calls = len(self._outcomes)
+        if calls < self.min_calls:
+            return
+
+        failures = sum(1 for was_failed, _ in self._outcomes if was_failed)
+        slow_calls = sum(1 for _, was_slow in self._outcomes if was_slow)
+        if failures / calls >= self.failure_rate or slow_calls / calls >= self.slow_rate:
+            self._transition(OPEN)
+
+    def _transition(self, state: str):
+        previous, self.state = self.state, state
+        if state == OPEN:
+            self._opened_at = time.monotonic()
+            logger.warning(f"Circuit '{self.name}' opened (was {previous}), retrying in {self.open_seconds:g}s")
+        elif state == HALF_OPEN:
+            self._probes = 0
+            self._probe_successes = 0
+        else:
+            self._outcomes.clear()
+            logger.info(f"Circuit '{self.name}' closed")
+
+        metrics = _metrics()
+        if metrics:
+            metrics.set_circuit_state(self.name, STATE_VALUES[state])
+
+    def _count(self, outcome: str):
+        metrics = _metrics()
+        if metrics:
+            metrics.record_circuit_call(self.name, outcome)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current state and window statistics (for health checks)."""
+        calls = len(self._outcomes)
+        return {
+            "state": self.state,
+            "calls": calls,
+            "failures": sum(1 for failed, _ in self._outcomes if failed),
+            "slow_calls": sum(1 for _, slow in self._outcomes if slow),
+            "timeout_seconds": self.timeout,
+        }
@@ -37,6 +37,81 @@ REDIS_URL = os.environ.get("REDIS_URL", "redis://localhost:6379/0")
 REDIS_ENABLED = parse_bool(os.environ.get("REDIS_ENABLED", "true"), True)
 REDIS_CACHE_TTL = int(os.environ.get("REDIS_CACHE_TTL", "300"))  # 5 minutes default
 REDIS_MAX_CONNECTIONS = int(os.environ.get("REDIS_MAX_CONNECTIONS", "50"))
+# Cached value encoding: serializer "orjson" | "json" | "msgpack", compression
+# "zlib" | "lz4" | "none" for values of at least REDIS_CACHE_COMPRESS_MIN_BYTES
+REDIS_CACHE_SERIALIZER = os.environ.get("REDIS_CACHE_SERIALIZER", "orjson").lower()
+REDIS_CACHE_COMPRESSION = os.environ.get("REDIS_CACHE_COMPRESSION", "zlib").lower()
+REDIS_CACHE_COMPRESS_MIN_BYTES = int(os.environ.get("REDIS_CACHE_COMPRESS_MIN_BYTES", "1024"))
+# Prefix version of every @cache key; bump it to orphan all cached results at
+# once (per-function schema changes use @cache(version=...) instead)
+CACHE_KEY_VERSION = os.environ.get("CACHE_KEY_VERSION", "1")
+
+# Latency budgets and circuit breakers (app/circuit_breaker.py).
+# A call over its timeout counts as a failure, one over the slow threshold as
+# slow; a dependency whose recent calls mostly fail (or are slow) is skipped
+# for CIRCUIT_OPEN_SECONDS before a few probe calls are let through.
+REDIS_CALL_TIMEOUT_MS = float(os.environ.get("REDIS_CALL_TIMEOUT_MS", "100"))
+REDIS_SLOW_CALL_MS = float(os.environ.get("REDIS_SLOW_CALL_MS", "20"))
+HTTP_CALL_TIMEOUT_SECONDS = float(os.environ.get("HTTP_CALL_TIMEOUT_SECONDS", "5"))
+HTTP_SLOW_CALL_SECONDS = float(os.environ.get("HTTP_SLOW_CALL_SECONDS", "2"))
+HTTP_MAX_CONNECTIONS = int(os.environ.get("HTTP_MAX_CONNECTIONS", "100"))
+CIRCUIT_OPEN_SECONDS = float(os.environ.get("CIRCUIT_OPEN_SECONDS", "30"))
+
+# Notification push channel (Server-Sent Events)
+# "redis" fans out through Redis pub/sub (in-process when Redis is unavailable),
+# "change_stream" tails MongoDB change streams (requires a replica set)
+NOTIFICATION_STREAM_BACKEND = os.environ.get("NOTIFICATION_STREAM_BACKEND", "redis").lower()
+NOTIFICATION_STREAM_HEARTBEAT = int(os.environ.get("NOTIFICATION_STREAM_HEARTBEAT", "15"))  # seconds
+NOTIFICATION_STREAM_REPLAY_LIMIT = int(os.environ.get("NOTIFICATION_STREAM_REPLAY_LIMIT", "100"))
+
+# Create missing indexes from the index registry on startup
+INDEX_BOOTSTRAP_ON_STARTUP = parse_bool(os.environ.get("INDEX_BOOTSTRAP_ON_STARTUP", "true"), True)
+
+# Query profiling (pymongo command monitoring)
+QUERY_PROFILER_ENABLED = parse_bool(os.environ.get("QUERY_PROFILER_ENABLED", "true"), True)
+SLOW_QUERY_MS = float(os.environ.get("SLOW_QUERY_MS", "100"))
+QUERY_PROFILER_HISTORY = int(os.environ.get("QUERY_PROFILER_HISTORY", "500"))  # recent requests kept
+QUERY_COUNT_WARNING = int(os.environ.get("QUERY_COUNT_WARNING", "25"))  # per request, flags N+1 patterns
+
+# Keep a per-user health_summaries document for /health/stats
+# (otherwise the summary is aggregated on every request)
+HEALTH_SUMMARY_CACHE_ENABLED = parse_bool(os.environ.get("HEALTH_SUMMARY_CACHE_ENABLED", "true"), True)
+
+# Organization topology cache (location IDs and names per organization).
+# Entries live in-process for ORG_TOPOLOGY_LOCAL_TTL seconds in front of Redis;
+# writes invalidate both, other workers catch up within the local TTL.
+ORG_TOPOLOGY_CACHE_TTL = int(os.environ.get("ORG_TOPOLOGY_CACHE_TTL", "600"))  # seconds
+ORG_TOPOLOGY_LOCAL_TTL = int(os.environ.get("ORG_TOPOLOGY_LOCAL_TTL", "30"))  # seconds
+
+# Conditional GET for catalog endpoints (clinics, centers, doctors, services,
+# reviews). ETags come from per-scope version counters bumped on writes;
+# anonymous responses are public for CATALOG_MAX_AGE seconds and may be served
+# stale by a CDN for CATALOG_STALE_WHILE_REVALIDATE more while it revalidates.
+CATALOG_MAX_AGE = int(os.environ.get("CATALOG_MAX_AGE", "60"))  # seconds
+CATALOG_STALE_WHILE_REVALIDATE = int(os.environ.get("CATALOG_STALE_WHILE_REVALIDATE", "300"))  # seconds
+
+# Batch endpoint (POST /api/batch): GET sub-requests per batch and the time
+# each one may take before it is answered with 504
+BATCH_MAX_REQUESTS = int(os.environ.get("BATCH_MAX_REQUESTS", "10"))
+BATCH_SUB_REQUEST_TIMEOUT = float(os.environ.get("BATCH_SUB_REQUEST_TIMEOUT", "10"))  # seconds
+
+# Bulk vital sign uploads (POST /health/vitals/bulk)
+VITALS_BULK_MAX_ITEMS = int(os.environ.get("VITALS_BULK_MAX_ITEMS", "5000"))  # per request
+VITALS_BULK_CHUNK_SIZE = int(os.environ.get("VITALS_BULK_CHUNK_SIZE", "500"))  # documents per insert_many
+
+# Prometheus metrics (GET /metrics). Set PROMETHEUS_MULTIPROC_DIR when running
+# several workers; METRICS_TOKEN, if set, is required as a bearer token.
+METRICS_ENABLED = parse_bool(os.environ.get("METRICS_ENABLED", "true"), True)
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN")
+
+# Data lifecycle / retention (days, 0 keeps documents forever)
+# Sessions and password reset tokens expire at their own expires_at.
+NOTIFICATION_RETENTION_DAYS = int(os.environ.get("NOTIFICATION_RETENTION_DAYS", "90"))
+NOTIFICATION_LOG_RETENTION_DAYS = int(os.environ.get("NOTIFICATION_LOG_RETENTION_DAYS", "30"))
+AUDIT_LOG_RETENTION_DAYS = int(os.environ.get("AUDIT_LOG_RETENTION_DAYS", "180"))  # before archival
+AUDIT_LOG_ARCHIVE_TARGET = os.environ.get("AUDIT_LOG_ARCHIVE_TARGET", "collection").lower()  # "collection" or "file"
+AUDIT_LOG_ARCHIVE_DIR = os.environ.get("AUDIT_LOG_ARCHIVE_DIR", str(ROOT_DIR / "archive"))
+DATA_LIFECYCLE_BATCH_SIZE = int(os.environ.get("DATA_LIFECYCLE_BATCH_SIZE", "1000"))
 
 DB_NAME = os.environ.get("DB_NAME")
 if not DB_NAME:
@@ -93,6 +168,43 @@ if CORS_ALLOW_CREDENTIALS and "*" in CORS_ORIGINS:
         "CORS_ORIGINS cannot contain '*' when credentials are enabled"
     )
 
+# Logging (records are formatted and written on a background thread)
+LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO").upper()
+LOG_JSON = parse_bool(os.environ.get("LOG_JSON", "false"), False)
+LOG_FILE = os.environ.get("LOG_FILE")
+LOG_ASYNC = parse_bool(os.environ.get("LOG_ASYNC", "true"), True)
+LOG_QUEUE_SIZE = int(os.environ.get("LOG_QUEUE_SIZE", "10000"))
+
+# Access log sampling: fraction of successful, fast requests logged.
+# ACCESS_LOG_SAMPLE_ROUTES overrides per route template, e.g.
+# "/api/notifications/me/stats=0.05,/health/=0"
+ACCESS_LOG_SAMPLE_RATE = float(os.environ.get("ACCESS_LOG_SAMPLE_RATE", "1.0"))
+ACCESS_LOG_SAMPLE_ROUTES = {
+    route.strip(): float(rate)
+    for route, _, rate in (
+        item.partition("=") for item in parse_list(os.environ.get("ACCESS_LOG_SAMPLE_ROUTES"))
+    )
+    if rate
+}
+ACCESS_LOG_SLOW_MS = float(os.environ.get("ACCESS_LOG_SLOW_MS", "1000"))
+
+# Response compression (gzip, plus brotli when the brotli package is installed).
+# Bodies under COMPRESSION_MIN_SIZE bytes are sent as is; streamed responses are
+# compressed chunk by chunk and Server-Sent Events are never compressed.
+# COMPRESSION_LEVELS overrides "gzip level:brotli quality" per content type,
+# e.g. "application/json=5:4,text/csv=9:6" (0 disables a type).
+COMPRESSION_ENABLED = parse_bool(os.environ.get("COMPRESSION_ENABLED", "true"), True)
+COMPRESSION_MIN_SIZE = int(os.environ.get("COMPRESSION_MIN_SIZE", "1024"))  # bytes
+COMPRESSION_GZIP_LEVEL = int(os.environ.get("COMPRESSION_GZIP_LEVEL", "6"))
+COMPRESSION_BROTLI_QUALITY = int(os.environ.get("COMPRESSION_BROTLI_QUALITY", "4"))
+COMPRESSION_LEVELS = {
+    content_type.strip().lower(): tuple(int(level) for level in levels.split(":"))
+    for content_type, _, levels in (
+        item.partition("=") for item in parse_list(os.environ.get("COMPRESSION_LEVELS"))
+    )
+    if levels
+}
+
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
@@ -1,5 +1,7 @@
 from motor.motor_asyncio import AsyncIOMotorClient
-from .config import MONGO_URL, DB_NAME
+from .config import MONGO_URL, DB_NAME, QUERY_PROFILER_ENABLED
+from .services.query_profiler import query_profiler
+from .services.metrics import mongo_pool_metrics
 
 client = AsyncIOMotorClient(
     MONGO_URL,
@@ -10,7 +12,14 @@ client = AsyncIOMotorClient(
     minPoolSize=5,
     maxIdleTimeMS=45000,
     retryWrites=True,
-    retryReads=True
+    retryReads=True,
+    event_listeners=[
+        listener for listener in (
+            query_profiler if QUERY_PROFILER_ENABLED else None,
+            mongo_pool_metrics
+        )
+        if listener is not None
+    ]
 )
 
 db = client[DB_NAME]
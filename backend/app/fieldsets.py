@@ -0,0 +1,92 @@
+"""
+Sparse Fieldsets
+`?fields=` selection for list endpoints, validated per resource and pushed down to Mongo projections
+"""
+
+from typing import Any, Dict, FrozenSet, List, Mapping, Optional, Tuple
+
+from fastapi import HTTPException
+
+
+class FieldSelector:
+    """
+    Allow-list of the fields a list endpoint can return.
+
+    `computed` maps fields added by enrichment (e.g. `doctor_name`) to the
+    stored fields they are derived from, so those are loaded when the
+    computed field is requested. `key` is always returned.
+
+    Usage:
+        DOCTOR_FIELDS = FieldSelector(DoctorListItem, key="doctor_id",
+                                      computed={"location_name": ("location_id",)})
+
+        fieldset = DOCTOR_FIELDS.parse(fields)
+        doctors = await db.doctors.find(query, fieldset.projection()).to_list(100)
+        if fieldset.wants("location_name"):
+            ...  # enrichment
+        return FastJSONResponse(fieldset.trim(doctors))
+    """
+
+    def __init__(
+        self,
+        item_type: Any,
+        key: str,
+        computed: Optional[Mapping[str, Tuple[str, ...]]] = None
+    ):
+        # TypedDicts describing list items (e.g. AppointmentListItem) or a field iterable
+        self.allowed: FrozenSet[str] = frozenset(getattr(item_type, "__annotations__", item_type))
+        self.key = key
+        self.computed = dict(computed or {})
+
+    def parse(self, fields: Optional[str]) -> "FieldSet":
+        """
+        Parse a comma-separated `fields` query parameter.
+
+        Raises:
+            HTTPException: 400 if a field is not in the allow-list
+        """
+        requested = [field.strip() for field in (fields or "").split(",") if field.strip()]
+        if not requested:
+            return FieldSet(self, None)
+
+        unknown = sorted(set(requested) - self.allowed)
+        if unknown:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown fields: {', '.join(unknown)}. Allowed: {', '.join(sorted(self.allowed))}"
+            )
+        return FieldSet(self, frozenset(requested) | {self.key})
+
+
+class FieldSet:
+    """The fields one request asked for (`fields` is None when it asked for all)."""
+
+    def __init__(self, selector: FieldSelector, fields: Optional[FrozenSet[str]]):
+        self.selector = selector
+        self.fields = fields
+
+    @property
+    def sparse(self) -> bool:
+        return self.fields is not None
+
+    def wants(self, *fields: str) -> bool:
+        """Whether any of `fields` will be returned (enrichment for the others can be skipped)."""
+        return self.fields is None or any(field in self.fields for field in fields)
+
+    def projection(self) -> Dict[str, int]:
+        """Mongo projection loading the requested fields and what computed ones need."""
+        if self.fields is None:
+            return {"_id": 0}
+
+        loaded = set(self.fields)
+        for field in self.fields:
+            loaded.update(self.selector.computed.get(field, ()))
+        return {"_id": 0, **{field: 1 for field in sorted(loaded)}}
+
+    def trim(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Drop fields that were only loaded (or computed) for enrichment."""
+        if self.fields is None:
+            return items
+        fields = self.fields
+        return [{name: value for name, value in item.items() if name in fields} for item in items]
+
@@ -0,0 +1,95 @@
+"""
+Outbound HTTP Client
+Shared pooled httpx client with a circuit breaker per external dependency
+"""
+
+import logging
+from typing import Dict, Optional
+
+import httpx
+
+from .circuit_breaker import CircuitBreaker
+from .config import (
+    HTTP_CALL_TIMEOUT_SECONDS,
+    HTTP_SLOW_CALL_SECONDS,
+    HTTP_MAX_CONNECTIONS,
+    CIRCUIT_OPEN_SECONDS
+)
+
+logger = logging.getLogger("mediconnect")
+
+
+def _server_error(response: httpx.Response) -> bool:
+    return response.status_code >= 500
+
+
+class HTTPClient:
+    """
+    One connection-pooled httpx.AsyncClient for all outbound calls.
+
+    Each external dependency (e.g. "oauth") gets its own circuit breaker,
+    so a slow or failing provider is cut off without affecting the others.
+    5xx responses count as failures; other responses are returned as is.
+
+    Usage:
+        response = await http_client.get("oauth", url, headers={...})
+
+    Raises (from request/get/post):
+        CircuitOpenError: If the dependency's circuit is open
+        asyncio.TimeoutError: If the call exceeded HTTP_CALL_TIMEOUT_SECONDS
+        httpx.HTTPError: On connection or protocol errors
+    """
+
+    _client: Optional[httpx.AsyncClient] = None
+    breakers: Dict[str, CircuitBreaker] = {}
+
+    async def start(self):
+        """Create the shared client (called from the app lifespan)."""
+        if self._client is None:
+            HTTPClient._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(HTTP_CALL_TIMEOUT_SECONDS),
+                limits=httpx.Limits(
+                    max_connections=HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=HTTP_MAX_CONNECTIONS // 5 or 1
+                )
+            )
+            logger.info("✅ Outbound HTTP client started")
+
+    async def close(self):
+        """Close the shared client and its pooled connections."""
+        if self._client is not None:
+            await self._client.aclose()
+            HTTPClient._client = None
+            logger.info("Outbound HTTP client closed")
+
+    def breaker(self, dependency: str) -> CircuitBreaker:
+        """The circuit breaker for an external dependency."""
+        breaker = self.breakers.get(dependency)
+        if breaker is None:
+            breaker = CircuitBreaker(
+                dependency,
+                timeout=HTTP_CALL_TIMEOUT_SECONDS,
+                slow_call=HTTP_SLOW_CALL_SECONDS,
+                open_seconds=CIRCUIT_OPEN_SECONDS,
+                failure_result=_server_error
+            )
+            self.breakers[dependency] = breaker
+        return breaker
+
+    async def request(self, dependency: str, method: str, url: str, **kwargs) -> httpx.Response:
+        """Send a request to `dependency` through its circuit breaker."""
+        if self._client is None:
+            # Used outside the app lifespan (scripts, tests)
+            await self.start()
+        client = self._client
+        return await self.breaker(dependency).call(lambda: client.request(method, url, **kwargs))
+
+    async def get(self, dependency: str, url: str, **kwargs) -> httpx.Response:
+        return await self.request(dependency, "GET", url, **kwargs)
+
+    async def post(self, dependency: str, url: str, **kwargs) -> httpx.Response:
+        return await self.request(dependency, "POST", url, **kwargs)
+
+
+# Global HTTP client instance
+http_client = HTTPClient()
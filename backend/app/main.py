@@ -1,12 +1,46 @@
-from fastapi import FastAPI, Request
+from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
-from .config import CORS_ORIGINS, CORS_ALLOW_CREDENTIALS, CORS_ALLOW_METHODS, CORS_ALLOW_HEADERS
+from .config import (
+    CORS_ORIGINS,
+    CORS_ALLOW_CREDENTIALS,
+    CORS_ALLOW_METHODS,
+    CORS_ALLOW_HEADERS,
+    INDEX_BOOTSTRAP_ON_STARTUP,
+    QUERY_PROFILER_ENABLED,
+    LOG_LEVEL,
+    LOG_JSON,
+    LOG_FILE,
+    LOG_ASYNC,
+    LOG_QUEUE_SIZE,
+    ACCESS_LOG_SAMPLE_RATE,
+    ACCESS_LOG_SAMPLE_ROUTES,
+    ACCESS_LOG_SLOW_MS,
+    COMPRESSION_ENABLED,
+    COMPRESSION_MIN_SIZE,
+    COMPRESSION_GZIP_LEVEL,
+    COMPRESSION_BROTLI_QUALITY,
+    COMPRESSION_LEVELS
+)
+from .db import db
 from .middleware import setup_error_handlers, RequestValidationMiddleware, setup_rate_limiting
 from .middleware.rate_limiter import rate_limiter
 from .redis_client import redis_client
+from .http_client import http_client
+from .services.notification_stream import notification_stream
+from .services.database import DatabaseService
+from .services.metrics import mark_process_dead
+from .services.logging_config import setup_logging, stop_logging
+from .responses import FastJSONResponse
 import logging
 
+setup_logging(
+    level=LOG_LEVEL,
+    json_logs=LOG_JSON,
+    log_file=LOG_FILE,
+    async_logging=LOG_ASYNC,
+    queue_size=LOG_QUEUE_SIZE
+)
 logger = logging.getLogger("mediconnect")
 
 
@@ -25,14 +59,28 @@ async def lifespan(app: FastAPI):
     # Connect rate limiter to Redis
     rate_limiter.redis_client = redis_client
     
+    # Shared pooled client for outbound HTTP calls
+    await http_client.start()
+    
+    # Create missing indexes (including TTL indexes) from the index registry
+    if INDEX_BOOTSTRAP_ON_STARTUP:
+        await DatabaseService(db).create_indexes()
+    
+    # Start notification push channel listener
+    await notification_stream.start()
+    
     logger.info("✅ MediConnect API started successfully")
     
     yield
     
     # Shutdown
     logger.info("🛑 Shutting down MediConnect API...")
+    await notification_stream.stop()
+    await http_client.close()
     await redis_client.close()
+    mark_process_dead()
     logger.info("✅ MediConnect API shutdown complete")
+    stop_logging()
 from .routers import auth as auth_router
 from .routers import clinics as clinics_router
 from .routers import centers as centers_router
@@ -53,16 +101,24 @@ from .routers import health as health_router
 from .routers import notifications as notifications_router
 from .routers import favorites as favorites_router
 from .routers import health_stats as health_stats_router
+from .routers import profiler as profiler_router
+from .routers import metrics as metrics_router
+from .routers import batch as batch_router
 from .middleware import (
     RequestIDMiddleware,
     SecurityHeadersMiddleware,
-    APIVersionMiddleware
+    APIVersionMiddleware,
+    QueryProfilerMiddleware,
+    MetricsMiddleware,
+    AccessLogMiddleware,
+    CompressionMiddleware
 )
 
 app = FastAPI(
     title="MediConnect API",
     version="2.0.0",
     lifespan=lifespan,
+    default_response_class=FastJSONResponse,
     description="Modern healthcare appointment scheduling platform with best practices",
     docs_url="/docs",
     redoc_url="/redoc"
@@ -79,19 +135,6 @@ app.add_middleware(
     max_age=3600,
 )
 
-# Add request logging middleware AFTER CORS
-@app.middleware("http")
-async def log_requests(request: Request, call_next):
-    logger.info(f"Request: {request.method} {request.url.path}")
-    logger.info(f"Headers: {dict(request.headers)}")
-    try:
-        response = await call_next(request)
-        logger.info(f"Response status: {response.status_code}")
-        return response
-    except Exception as e:
-        logger.error(f"Error processing request: {e}", exc_info=True)
-        raise
-
 # Health check endpoint
 @app.get("/")
 async def root():
@@ -107,12 +150,14 @@ async def health():
 
 # Add best practices middleware
 app.add_middleware(SecurityHeadersMiddleware)
-app.add_middleware(RequestIDMiddleware)
+if QUERY_PROFILER_ENABLED:
+    app.add_middleware(QueryProfilerMiddleware)  # inside RequestID so summaries carry the request ID
 app.add_middleware(APIVersionMiddleware)
 
 # Include routers
 api_prefix = "/api"
 app.include_router(health_router.router)  # Health checks at root level
+app.include_router(metrics_router.router)  # Prometheus scrape endpoint at root level
 app.include_router(auth_router.router, prefix=api_prefix)
 app.include_router(clinics_router.router, prefix=api_prefix)
 app.include_router(centers_router.router, prefix=api_prefix)
@@ -132,10 +177,31 @@ app.include_router(analytics_router.router, prefix=api_prefix)
 app.include_router(notifications_router.router, prefix=api_prefix)
 app.include_router(favorites_router.router, prefix=api_prefix)
 app.include_router(health_stats_router.router, prefix=api_prefix)
+app.include_router(profiler_router.router, prefix=api_prefix)
+app.include_router(batch_router.router, prefix=api_prefix)
 
 # Setup error handling and rate limiting middleware (after routers)
 setup_error_handlers(app)
 app.add_middleware(RequestValidationMiddleware)
 setup_rate_limiting(app)
 
+# Access logging outside the rate limiter, so rejected (429) requests get their line too,
+# and request IDs outside both, so that line (and the 429) carries the request ID
+app.add_middleware(
+    AccessLogMiddleware,
+    sample_rate=ACCESS_LOG_SAMPLE_RATE,
+    route_sample_rates=ACCESS_LOG_SAMPLE_ROUTES,
+    slow_request_ms=ACCESS_LOG_SLOW_MS
+)
+app.add_middleware(RequestIDMiddleware)
+if COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=COMPRESSION_MIN_SIZE,
+        gzip_level=COMPRESSION_GZIP_LEVEL,
+        brotli_quality=COMPRESSION_BROTLI_QUALITY,
+        levels=COMPRESSION_LEVELS
+    )
+app.add_middleware(MetricsMiddleware)  # outermost, so every request is timed
+
 logger.info("✅ MediConnect API initialized successfully")
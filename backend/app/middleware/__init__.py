@@ -39,6 +39,14 @@ from .request_id import (
 
 from .security_headers import SecurityHeadersMiddleware
 
+from .query_profiler import QueryProfilerMiddleware
+
+from .metrics import MetricsMiddleware
+
+from .access_log import AccessLogMiddleware
+
+from .compression import CompressionMiddleware
+
 from .api_versioning import (
     APIVersionMiddleware,
     get_api_version
@@ -75,6 +83,14 @@ __all__ = [
     'get_request_id',
     # Security Headers
     'SecurityHeadersMiddleware',
+    # Query Profiling
+    'QueryProfilerMiddleware',
+    # Metrics
+    'MetricsMiddleware',
+    # Access Logging
+    'AccessLogMiddleware',
+    # Response Compression
+    'CompressionMiddleware',
     # API Versioning
     'APIVersionMiddleware',
     'get_api_version'
@@ -0,0 +1,96 @@
+"""
+Access Log Middleware
+One structured log line per request, with timing and sampling
+"""
+
+from fastapi import Request
+from starlette.middleware.base import BaseHTTPMiddleware
+from typing import Dict, Optional
+import logging
+import random
+import time
+
+from ..services.logging_config import redact_headers
+
+logger = logging.getLogger("mediconnect")
+
+
+class AccessLogMiddleware(BaseHTTPMiddleware):
+    """
+    Middleware writing a single access log line per request.
+    
+    - Replaces separate "incoming request" / "response" lines
+    - Headers are only logged at DEBUG, with credentials redacted
+    - Successful, fast requests can be sampled per route template;
+      errors and slow requests are always logged
+    """
+    
+    def __init__(
+        self,
+        app,
+        sample_rate: float = 1.0,
+        route_sample_rates: Optional[Dict[str, float]] = None,
+        slow_request_ms: float = 1000.0
+    ):
+        super().__init__(app)
+        self.sample_rate = sample_rate
+        self.route_sample_rates = route_sample_rates or {}
+        self.slow_request_ms = slow_request_ms
+    
+    async def dispatch(self, request: Request, call_next):
+        start = time.perf_counter()
+        
+        try:
+            response = await call_next(request)
+        except Exception:
+            duration_ms = (time.perf_counter() - start) * 1000
+            logger.error(
+                f"{request.method} {request.url.path} failed after {duration_ms:.1f}ms",
+                exc_info=True,
+                extra={"http": self._http_fields(request, 500, duration_ms)}
+            )
+            raise
+        
+        duration_ms = (time.perf_counter() - start) * 1000
+        status_code = response.status_code
+        
+        if status_code >= 500:
+            level = logging.ERROR
+        elif duration_ms >= self.slow_request_ms:
+            level = logging.WARNING
+        else:
+            level = logging.INFO
+            if not self._sampled(request):
+                return response
+        
+        if logger.isEnabledFor(level):
+            logger.log(
+                level,
+                f"{request.method} {request.url.path} {status_code} {duration_ms:.1f}ms",
+                extra={"http": self._http_fields(request, status_code, duration_ms)}
+            )
+        
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                f"Request headers for {request.method} {request.url.path}",
+                extra={"headers": redact_headers(request.headers)}
+            )
+        
+        return response
+    
+    def _sampled(self, request: Request) -> bool:
+        route = getattr(request.scope.get("route"), "path", None)
+        rate = self.route_sample_rates.get(route, self.sample_rate)
+        return rate >= 1.0 or random.random() < rate
+    
+    @staticmethod
+    def _http_fields(request: Request, status_code: int, duration_ms: float) -> dict:
+        return {
+            "method": request.method,
+            "path": request.url.path,
+            "route": getattr(request.scope.get("route"), "path", None),
+            "status_code": status_code,
+            "duration_ms": round(duration_ms, 2),
+            "client_ip": request.client.host if request.client else "unknown",
+            "user_agent": request.headers.get("user-agent", "unknown"),
+        }
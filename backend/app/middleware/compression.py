@@ -0,0 +1,265 @@
+"""
+Compression Middleware
+gzip / brotli response compression with a size threshold and per-content-type levels
+"""
+
+import logging
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Try to import brotli (or its CFFI build), but don't fail if not available
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    try:
+        import brotlicffi as brotli
+        BROTLI_AVAILABLE = True
+    except ImportError:
+        brotli = None
+        BROTLI_AVAILABLE = False
+
+logger = logging.getLogger("mediconnect")
+
+# Compressed by default (plus any text/*, +json and +xml type)
+COMPRESSIBLE_CONTENT_TYPES = {
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "application/x-ndjson",
+    "image/svg+xml",
+}
+
+# Events must reach the client as soon as they are written
+EXCLUDED_CONTENT_TYPES = ("text/event-stream",)
+
+
+class GzipEncoder:
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        """Compress a chunk and flush it, so streamed chunks are never held back."""
+        return self._compressor.compress(data) + self._compressor.flush(
+            zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH
+        )
+
+
+class BrotliEncoder:
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+        # brotli exposes process(), brotlicffi compress()
+        self._process = getattr(self._compressor, "process", None) or self._compressor.compress
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        output = self._process(data) if data else b""
+        return output + (self._compressor.finish() if final else self._compressor.flush())
+
+
+ENCODERS = {"gzip": GzipEncoder}
+if BROTLI_AVAILABLE:
+    ENCODERS["br"] = BrotliEncoder
+
+# Preferred first when the client accepts several with the same weight
+ENCODING_PREFERENCE = ("br", "gzip")
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """
+    Pick the response encoding for an Accept-Encoding header.
+
+    Returns:
+        "br", "gzip" or None (send uncompressed)
+    """
+    weights: Dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        weight = 1.0
+        params = params.strip().replace(" ", "")
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[coding] = weight
+
+    best, best_weight = None, 0.0
+    for encoding in ENCODING_PREFERENCE:
+        if encoding not in ENCODERS:
+            continue
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+def is_compressible(content_type: str) -> bool:
+    return (
+        content_type.startswith("text/")
+        or content_type in COMPRESSIBLE_CONTENT_TYPES
+        or content_type.endswith(("+json", "+xml"))
+    )
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware compressing responses with gzip or brotli.
+
+    A pure ASGI middleware (not BaseHTTPMiddleware) so bodies are never
+    collected: single-message responses of at least `minimum_size` bytes
+    are compressed in one go (with an exact Content-Length), streamed
+    responses chunk by chunk, each chunk flushed as it is written.
+    Server-Sent Events, already-encoded responses and responses marked
+    Cache-Control: no-transform are passed through untouched.
+
+    `levels` maps a content type to (gzip level, brotli quality); a level
+    of 0 disables compression for that type.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+        levels: Optional[Dict[str, Tuple[int, ...]]] = None
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.levels = levels or {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = CompressionResponder(self, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+    def level_for(self, encoding: str, headers: Headers) -> int:
+        """Compression level for a response (0: send it uncompressed)."""
+        if "content-encoding" in headers or "no-transform" in headers.get("cache-control", ""):
+            return 0
+
+        content_type = headers.get("content-type", "").split(";", 1)[0].strip().lower()
+        if content_type.startswith(EXCLUDED_CONTENT_TYPES):
+            return 0
+
+        levels = self.levels.get(content_type)
+        if levels is None:
+            if not is_compressible(content_type):
+                return 0
+            levels = (self.gzip_level, self.brotli_quality)
+
+        if encoding == "gzip":
+            return levels[0]
+        return levels[1] if len(levels) > 1 else self.brotli_quality
+
+
+class CompressionResponder:
+    """
+    Per-response state: holds the start message (and up to `minimum_size`
+    bytes of body) until it is known whether the response is worth
+    compressing. BaseHTTPMiddleware layers re-stream every body, so even a
+    tiny response can arrive as a first chunk with more_body=True.
+    """
+
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send: Send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self._send = send
+        self.start_message: Optional[Message] = None
+        self.level: Optional[int] = None
+        self.buffer: List[bytes] = []
+        self.buffered = 0
+        self.encoder = None
+
+    async def send(self, message: Message):
+        message_type = message["type"]
+
+        if message_type == "http.response.start":
+            self.start_message = message
+            return
+
+        if message_type != "http.response.body":
+            # e.g. http.response.pathsend: nothing to compress
+            await self._flush_start()
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.start_message is not None:
+            if self.level is None:
+                headers = MutableHeaders(raw=list(self.start_message["headers"]))
+                self.level = self.middleware.level_for(self.encoding, headers)
+            if not self.level:
+                await self._flush_start()
+                await self._send(message)
+                return
+
+            self.buffer.append(body)
+            self.buffered += len(body)
+            if more_body and self.buffered < self.middleware.minimum_size:
+                return
+
+            body = b"".join(self.buffer)
+            self.buffer = []
+            start, self.start_message = self.start_message, None
+            if not more_body and len(body) < self.middleware.minimum_size:
+                await self._send(start)
+                await self._send({"type": "http.response.body", "body": body})
+                return
+
+            headers = MutableHeaders(raw=list(start["headers"]))
+            self.encoder = ENCODERS[self.encoding](self.level)
+            headers["Content-Encoding"] = self.encoding
+            headers.add_vary_header("Accept-Encoding")
+            etag = headers.get("etag")
+            if etag and not etag.startswith("W/"):
+                # The compressed bytes differ, so a strong validator becomes weak
+                headers["ETag"] = f"W/{etag}"
+            if "content-length" in headers:
+                del headers["content-length"]
+
+            if not more_body:
+                body = self.encoder.compress(body, final=True)
+                headers["Content-Length"] = str(len(body))
+                await self._send({**start, "headers": headers.raw})
+                await self._send({"type": "http.response.body", "body": body})
+                return
+
+            await self._send({**start, "headers": headers.raw})
+
+        if self.encoder is None:
+            await self._send(message)
+            return
+
+        await self._send({
+            "type": "http.response.body",
+            "body": self.encoder.compress(body, final=not more_body),
+            "more_body": more_body
+        })
+
+    async def _flush_start(self):
+        """Send the held start message and any buffered body uncompressed."""
+        if self.start_message is not None:
+            start, self.start_message = self.start_message, None
+            await self._send(start)
+            if self.buffer:
+                body, self.buffer = b"".join(self.buffer), []
+                await self._send({"type": "http.response.body", "body": body, "more_body": True})
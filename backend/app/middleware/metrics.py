@@ -0,0 +1,47 @@
+"""
+Metrics Middleware
+Records per-route latency histograms and in-flight requests for Prometheus
+"""
+
+from fastapi import Request
+from starlette.middleware.base import BaseHTTPMiddleware
+import time
+import logging
+
+from ..services.metrics import observe_request, route_label, track_in_progress
+
+logger = logging.getLogger("mediconnect")
+
+
+class MetricsMiddleware(BaseHTTPMiddleware):
+    """
+    Middleware to time every request.
+    
+    Registered outermost so rate-limited and rejected requests are counted
+    too. Requests are labelled by route template, never by raw path.
+    """
+    
+    def __init__(self, app, excluded_paths: tuple = ("/metrics",)):
+        super().__init__(app)
+        self.excluded_paths = excluded_paths
+    
+    async def dispatch(self, request: Request, call_next):
+        if request.url.path in self.excluded_paths:
+            return await call_next(request)
+        
+        method = request.method
+        start = time.perf_counter()
+        status_code = 500
+        
+        with track_in_progress(method):
+            try:
+                response = await call_next(request)
+                status_code = response.status_code
+                return response
+            finally:
+                observe_request(
+                    method,
+                    route_label(request.scope),
+                    status_code,
+                    time.perf_counter() - start
+                )
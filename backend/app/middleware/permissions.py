@@ -16,6 +16,7 @@ from ..schemas.user import User, UserRole
 from ..schemas.permission import PermissionConstants
 from ..schemas.audit_log import AuditActions
 from ..services.permissions import PermissionService
+from ..services.permission_evaluator import get_permission_context
 from ..security import require_auth
 
 
@@ -57,7 +58,8 @@ def require_permission(permission: str, resource_id_param: Optional[str] = None)
                 user=user,
                 permission=permission,
                 resource_id=resource_id,
-                context={"location_id": location_id}
+                context={"location_id": location_id},
+                request=request
             )
             
             if not result.allowed:
@@ -153,7 +155,7 @@ def require_location_access(location_id_param: str = "location_id"):
                 raise HTTPException(status_code=400, detail="Location ID is required")
             
             # Check location access
-            accessible_locations = await PermissionService.get_accessible_locations(user)
+            accessible_locations = await PermissionService.get_accessible_locations(user, request)
             
             if location_id not in accessible_locations:
                 await PermissionService.log_action(
@@ -221,7 +223,11 @@ def block_admin_appointment_modification():
     return decorator
 
 
-async def check_appointment_access(user: User, appointment_id: str) -> bool:
+async def check_appointment_access(
+    user: User,
+    appointment_id: str,
+    request: Optional[Request] = None
+) -> bool:
     """
     Check if user has access to a specific appointment.
     
@@ -232,13 +238,12 @@ async def check_appointment_access(user: User, appointment_id: str) -> bool:
     - DOCTOR: Can view/modify only own appointments
     - ASSISTANT: Can view appointments in assigned locations
     - USER: Can view only own appointments
-    """
-    from ..db import db
     
-    appointment = await db.appointments.find_one(
-        {"appointment_id": appointment_id},
-        {"_id": 0}
-    )
+    With `request`, the appointment and doctor lookups are shared with the
+    permission checks of the same request.
+    """
+    facts = get_permission_context(user, request)
+    appointment = await facts.appointment(appointment_id)
     
     if not appointment:
         return False
@@ -250,13 +255,8 @@ async def check_appointment_access(user: User, appointment_id: str) -> bool:
     
     elif user.role == UserRole.DOCTOR:
         # Doctors can only access their own appointments
-        doctor = await db.doctors.find_one(
-            {"email": user.email.lower()},
-            {"_id": 0}
-        )
-        if doctor:
-            return appointment.get("doctor_id") == doctor.get("doctor_id")
-        return False
+        doctor_id = await facts.doctor_id()
+        return doctor_id is not None and appointment.get("doctor_id") == doctor_id
     
     elif user.role in [UserRole.SUPER_ADMIN, UserRole.LOCATION_ADMIN, UserRole.RECEPTIONIST, UserRole.ASSISTANT]:
         # Staff can access appointments in their locations
@@ -265,17 +265,17 @@ async def check_appointment_access(user: User, appointment_id: str) -> bool:
             # Legacy: check clinic_id
             appointment_location = appointment.get("clinic_id")
         
-        accessible_locations = await PermissionService.get_accessible_locations(user)
+        accessible_locations = await facts.accessible_locations()
         return appointment_location in accessible_locations
     
     return False
 
 
-async def check_location_access(user: User, location_id: str) -> bool:
+async def check_location_access(user: User, location_id: str, request: Optional[Request] = None) -> bool:
     """
     Check if user has access to a specific location.
     """
-    accessible_locations = await PermissionService.get_accessible_locations(user)
+    accessible_locations = await PermissionService.get_accessible_locations(user, request)
     return location_id in accessible_locations
 
 
@@ -0,0 +1,55 @@
+"""
+Query Profiler Middleware
+Attributes MongoDB commands to requests and reports them via Server-Timing
+"""
+
+from fastapi import Request
+from starlette.middleware.base import BaseHTTPMiddleware
+import logging
+
+from ..config import QUERY_COUNT_WARNING
+from ..services.query_profiler import query_profiler, request_query_stats
+
+logger = logging.getLogger("mediconnect")
+
+
+class QueryProfilerMiddleware(BaseHTTPMiddleware):
+    """
+    Middleware to collect per-request database statistics.
+    
+    Must run inside RequestIDMiddleware so the summary carries the request ID.
+    
+    Adds:
+    - Server-Timing: db;dur=<ms>;desc="<n> queries"
+    - A warning log when a request exceeds QUERY_COUNT_WARNING queries
+      (usually an N+1 loop in a router)
+    """
+    
+    async def dispatch(self, request: Request, call_next):
+        stats = query_profiler.begin_request()
+        
+        try:
+            response = await call_next(request)
+        finally:
+            request_query_stats.set(None)
+        
+        route = getattr(request.scope.get("route"), "path", request.url.path)
+        summary = query_profiler.end_request(
+            stats,
+            request_id=getattr(request.state, "request_id", "unknown"),
+            method=request.method,
+            route=route,
+            status_code=response.status_code
+        )
+        
+        if summary["query_count"] >= QUERY_COUNT_WARNING:
+            logger.warning(
+                f"{request.method} {route} issued {summary['query_count']} queries "
+                f"({summary['db_time_ms']}ms): {summary['commands']}"
+            )
+        
+        timing = f'db;dur={summary["db_time_ms"]};desc="{summary["query_count"]} queries"'
+        existing = response.headers.get("Server-Timing")
+        response.headers["Server-Timing"] = f"{existing}, {timing}" if existing else timing
+        
+        return response
@@ -13,11 +13,24 @@ import logging
 import asyncio
 import os
 
+from ..services.metrics import record_rate_limit_rejection
+from .error_handler import ErrorHandler
+
 logger = logging.getLogger("mediconnect")
 
 # Check if rate limiting is enabled
 RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
 
+# Endpoints to exclude from rate limiting (direct and batched requests alike)
+RATE_LIMIT_EXCLUDED_PATHS = [
+    "/",
+    "/health",
+    "/metrics",
+    "/docs",
+    "/redoc",
+    "/openapi.json"
+]
+
 
 class RateLimiter:
     """
@@ -80,29 +93,26 @@ class RateLimiter:
             now = datetime.now().timestamp()
             window_start = now - window
             
-            # Get Redis client
-            client = await self.redis_client.get_client()
-            if not client:
-                return await self._is_rate_limited_memory(client_ip, endpoint)
-            
-            # Use Redis pipeline for atomic operations
-            pipe = client.pipeline()
-            
-            # Remove old entries outside the window
-            pipe.zremrangebyscore(key, 0, window_start)
-            
-            # Count requests in current window
-            pipe.zcard(key)
-            
-            # Add current request
-            pipe.zadd(key, {str(now): now})
-            
-            # Set expiration
-            pipe.expire(key, window + 10)
+            # Atomic window update, sent in one round trip under the Redis
+            # latency budget when the block exits
+            async with self.redis_client.pipeline(transaction=True) as pipe:
+                if pipe is not None:
+                    # Remove old entries outside the window
+                    pipe.zremrangebyscore(key, 0, window_start)
+                    
+                    # Count requests in current window
+                    pipe.zcard(key)
+                    
+                    # Add current request
+                    pipe.zadd(key, {str(now): now})
+                    
+                    # Set expiration
+                    pipe.expire(key, window + 10)
             
-            # Execute pipeline
-            results = await pipe.execute()
-            current_count = results[1]  # Result of zcard
+            if pipe is None or pipe.results is None:
+                # Slow or unavailable Redis: limit locally rather than delay the request
+                return await self._is_rate_limited_memory(client_ip, endpoint)
+            current_count = pipe.results[1]  # Result of zcard
             
             # Check if limit exceeded
             if current_count >= limit:
@@ -170,16 +180,22 @@ class RateLimiter:
             
             return False, current_count + 1, limit
     
-    def _get_limit_for_endpoint(self, endpoint: str) -> int:
+    def _get_limit_name(self, endpoint: str) -> str:
         """
-        Determine rate limit based on endpoint pattern.
+        Determine which rate limit applies based on endpoint pattern.
         """
         if "/auth/" in endpoint or "/login" in endpoint or "/register" in endpoint:
-            return self.limits["auth"]
+            return "auth"
         elif "/upload" in endpoint or "/file" in endpoint:
-            return self.limits["upload"]
+            return "upload"
         else:
-            return self.limits["default"]
+            return "default"
+    
+    def _get_limit_for_endpoint(self, endpoint: str) -> int:
+        """
+        Determine rate limit based on endpoint pattern.
+        """
+        return self.limits[self._get_limit_name(endpoint)]
     
     async def _cleanup_old_entries(self):
         """
@@ -211,13 +227,7 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         self.rate_limiter = rate_limiter
         
         # Endpoints to exclude from rate limiting
-        self.excluded_paths = [
-            "/",
-            "/health",
-            "/docs",
-            "/redoc",
-            "/openapi.json"
-        ]
+        self.excluded_paths = RATE_LIMIT_EXCLUDED_PATHS
     
     async def dispatch(self, request: Request, call_next):
         """
@@ -241,8 +251,11 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         )
         
         if is_limited:
-            # Return 429 Too Many Requests
-            raise HTTPException(
+            record_rate_limit_rejection(self.rate_limiter._get_limit_name(endpoint))
+            
+            # Return 429 Too Many Requests. The exception handlers sit inside this
+            # middleware, so the response is built here rather than raised.
+            exc = HTTPException(
                 status_code=status.HTTP_429_TOO_MANY_REQUESTS,
                 detail=f"Rate limit exceeded. Maximum {limit} requests per minute allowed.",
                 headers={
@@ -251,6 +264,9 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
                     "X-RateLimit-Reset": str(60)  # Seconds until reset
                 }
             )
+            response = await ErrorHandler.http_exception_handler(request, exc)
+            response.headers.update(exc.headers)
+            return response
         
         # Add rate limit headers to response
         response = await call_next(request)
@@ -261,22 +277,26 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         return response
     
     def _get_client_ip(self, request: Request) -> str:
-        """
-        Extract client IP from request, considering proxies.
-        """
-        # Check X-Forwarded-For header (for proxies/load balancers)
-        forwarded_for = request.headers.get("X-Forwarded-For")
-        if forwarded_for:
-            # Take the first IP in the chain
-            return forwarded_for.split(",")[0].strip()
-        
-        # Check X-Real-IP header
-        real_ip = request.headers.get("X-Real-IP")
-        if real_ip:
-            return real_ip
-        
-        # Fall back to direct client IP
-        return request.client.host if request.client else "unknown"
+        return get_client_ip(request)
+
+
+def get_client_ip(request: Request) -> str:
+    """
+    Extract client IP from request, considering proxies.
+    """
+    # Check X-Forwarded-For header (for proxies/load balancers)
+    forwarded_for = request.headers.get("X-Forwarded-For")
+    if forwarded_for:
+        # Take the first IP in the chain
+        return forwarded_for.split(",")[0].strip()
+    
+    # Check X-Real-IP header
+    real_ip = request.headers.get("X-Real-IP")
+    if real_ip:
+        return real_ip
+    
+    # Fall back to direct client IP
+    return request.client.host if request.client else "unknown"
 
 
 # Global rate limiter instance
@@ -8,7 +8,7 @@ from starlette.middleware.base import BaseHTTPMiddleware
 import re
 import logging
 from typing import Optional
-from datetime import datetime, timezone
+from datetime import datetime
 
 logger = logging.getLogger("mediconnect")
 
@@ -52,33 +52,8 @@ class RequestValidationMiddleware(BaseHTTPMiddleware):
                 detail="Request body too large. Maximum size is 10MB."
             )
         
-        # Log request details
-        logger.info(
-            f"Incoming request: {request.method} {request.url.path}",
-            extra={
-                "method": request.method,
-                "path": request.url.path,
-                "client_ip": request.client.host if request.client else "unknown",
-                "user_agent": request.headers.get("user-agent", "unknown"),
-                "timestamp": datetime.now(timezone.utc).isoformat()
-            }
-        )
-        
-        # Process the request
-        response = await call_next(request)
-        
-        # Log response
-        logger.info(
-            f"Response: {response.status_code} for {request.method} {request.url.path}",
-            extra={
-                "method": request.method,
-                "path": request.url.path,
-                "status_code": response.status_code,
-                "client_ip": request.client.host if request.client else "unknown"
-            }
-        )
-        
-        return response
+        # Process the request (access logging is done once by AccessLogMiddleware)
+        return await call_next(request)
 
 
 class InputValidator:
@@ -79,7 +79,8 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
             )
         
         # Remove server header for security
-        response.headers.pop("Server", None)
+        if "server" in response.headers:
+            del response.headers["server"]
         
         return response
 
@@ -3,11 +3,14 @@ Redis Client Configuration and Connection Pool
 Provides centralized Redis connection management with best practices
 """
 
-from typing import Optional
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional
 import logging
-import json
 import os
 
+from .circuit_breaker import CircuitBreaker, CircuitOpenError
+from .redis_codecs import ValueCodec
+
 # Try to import redis, but don't fail if not available (for testing)
 try:
     import redis.asyncio as redis
@@ -22,10 +25,31 @@ except ImportError:
 REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
 REDIS_ENABLED = os.getenv("REDIS_ENABLED", "true").lower() == "true" and REDIS_AVAILABLE
 REDIS_MAX_CONNECTIONS = int(os.getenv("REDIS_MAX_CONNECTIONS", "50"))
+REDIS_CACHE_SERIALIZER = os.getenv("REDIS_CACHE_SERIALIZER", "orjson").lower()
+REDIS_CACHE_COMPRESSION = os.getenv("REDIS_CACHE_COMPRESSION", "zlib").lower()
+REDIS_CACHE_COMPRESS_MIN_BYTES = int(os.getenv("REDIS_CACHE_COMPRESS_MIN_BYTES", "1024"))
+REDIS_CALL_TIMEOUT_MS = float(os.getenv("REDIS_CALL_TIMEOUT_MS", "100"))
+REDIS_SLOW_CALL_MS = float(os.getenv("REDIS_SLOW_CALL_MS", "20"))
+CIRCUIT_OPEN_SECONDS = float(os.getenv("CIRCUIT_OPEN_SECONDS", "30"))
 
 logger = logging.getLogger("mediconnect")
 
 
+class RedisPipeline:
+    """
+    Commands queued inside `RedisClient.pipeline()`; any redis-py pipeline
+    command can be called on it. `results` holds the replies, in queueing
+    order, once the block has exited and the pipeline ran.
+    """
+    
+    def __init__(self, pipe: Any):
+        self._pipe = pipe
+        self.results: Optional[List[Any]] = None
+    
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._pipe, name)
+
+
 class RedisClient:
     """
     Singleton Redis client with connection pooling and error handling.
@@ -35,12 +59,32 @@ class RedisClient:
     - Async/await support for non-blocking operations
     - Automatic reconnection on connection failures
     - Graceful degradation when Redis is unavailable
-    - JSON serialization for complex data types
+    - Pluggable value codecs (see redis_codecs) for complex data types
+    - Batched reads and writes (MGET, pipelined SETEX)
+    - Circuit breaker with a per-command latency budget: a slow or failing
+      Redis is skipped (cache miss / no-op) instead of delaying requests
+    
+    Cached values go through a second, non-decoding connection pool so
+    binary codecs and compressed payloads round-trip unchanged; plain
+    string commands keep using the decoding client.
     """
     
     _instance: Optional['RedisClient'] = None
     _pool: Optional[ConnectionPool] = None
     _client: Optional[redis.Redis] = None
+    _binary_pool: Optional[ConnectionPool] = None
+    _binary_client: Optional[redis.Redis] = None
+    codec = ValueCodec(
+        REDIS_CACHE_SERIALIZER,
+        compression=None if REDIS_CACHE_COMPRESSION == "none" else REDIS_CACHE_COMPRESSION,
+        compress_min_bytes=REDIS_CACHE_COMPRESS_MIN_BYTES
+    )
+    breaker = CircuitBreaker(
+        "redis",
+        timeout=REDIS_CALL_TIMEOUT_MS / 1000,
+        slow_call=REDIS_SLOW_CALL_MS / 1000,
+        open_seconds=CIRCUIT_OPEN_SECONDS
+    )
     
     def __new__(cls):
         if cls._instance is None:
@@ -68,30 +112,49 @@ class RedisClient:
                 health_check_interval=30
             )
             
-            # Create Redis client
+            self._binary_pool = ConnectionPool.from_url(
+                REDIS_URL,
+                max_connections=REDIS_MAX_CONNECTIONS,
+                decode_responses=False,
+                socket_connect_timeout=5,
+                socket_keepalive=True,
+                health_check_interval=30
+            )
+            
+            # Create Redis clients
             self._client = redis.Redis(connection_pool=self._pool)
+            self._binary_client = redis.Redis(connection_pool=self._binary_pool)
             
             # Test connection
             await self._client.ping()
-            logger.info(f"✅ Redis connected successfully at {REDIS_URL}")
+            logger.info(
+                f"✅ Redis connected successfully at {REDIS_URL} "
+                f"(codec: {self.codec.serializer_name}, compression: {self.codec.compression_name or 'none'})"
+            )
             
         except Exception as e:
             logger.error(f"❌ Failed to connect to Redis: {e}")
             logger.warning("⚠️ Application will continue without caching")
             self._client = None
             self._pool = None
+            self._binary_client = None
+            self._binary_pool = None
     
     async def close(self):
         """
         Close Redis connection pool.
         Should be called during application shutdown.
         """
+        for client in (self._client, self._binary_client):
+            if client:
+                await client.close()
         if self._client:
-            await self._client.close()
             logger.info("✅ Redis connection closed")
         
+        for pool in (self._pool, self._binary_pool):
+            if pool:
+                await pool.disconnect()
         if self._pool:
-            await self._pool.disconnect()
             logger.info("✅ Redis connection pool closed")
     
     def is_available(self) -> bool:
@@ -112,12 +175,9 @@ class RedisClient:
             return None
         
         try:
-            value = await self._client.get(key)
-            if value:
-                logger.debug(f"Cache HIT: {key}")
-            else:
-                logger.debug(f"Cache MISS: {key}")
-            return value
+            return await self.breaker.call(lambda: self._client.get(key))
+        except CircuitOpenError:
+            return None
         except Exception as e:
             logger.error(f"Redis GET error for key '{key}': {e}")
             return None
@@ -144,11 +204,12 @@ class RedisClient:
         
         try:
             if ttl:
-                await self._client.setex(key, ttl, value)
+                await self.breaker.call(lambda: self._client.setex(key, ttl, value))
             else:
-                await self._client.set(key, value)
-            logger.debug(f"Cache SET: {key} (TTL: {ttl}s)")
+                await self.breaker.call(lambda: self._client.set(key, value))
             return True
+        except CircuitOpenError:
+            return False
         except Exception as e:
             logger.error(f"Redis SET error for key '{key}': {e}")
             return False
@@ -167,9 +228,9 @@ class RedisClient:
             return 0
         
         try:
-            deleted = await self._client.delete(*keys)
-            logger.debug(f"Cache DELETE: {keys} ({deleted} deleted)")
-            return deleted
+            return await self.breaker.call(lambda: self._client.delete(*keys))
+        except CircuitOpenError:
+            return 0
         except Exception as e:
             logger.error(f"Redis DELETE error for keys {keys}: {e}")
             return 0
@@ -188,7 +249,9 @@ class RedisClient:
             return 0
         
         try:
-            return await self._client.exists(*keys)
+            return await self.breaker.call(lambda: self._client.exists(*keys))
+        except CircuitOpenError:
+            return 0
         except Exception as e:
             logger.error(f"Redis EXISTS error for keys {keys}: {e}")
             return 0
@@ -208,7 +271,9 @@ class RedisClient:
             return False
         
         try:
-            return await self._client.expire(key, ttl)
+            return await self.breaker.call(lambda: self._client.expire(key, ttl))
+        except CircuitOpenError:
+            return False
         except Exception as e:
             logger.error(f"Redis EXPIRE error for key '{key}': {e}")
             return False
@@ -228,53 +293,182 @@ class RedisClient:
             return None
         
         try:
-            return await self._client.incrby(key, amount)
+            return await self.breaker.call(lambda: self._client.incrby(key, amount))
+        except CircuitOpenError:
+            return None
         except Exception as e:
             logger.error(f"Redis INCR error for key '{key}': {e}")
             return None
     
-    async def get_json(self, key: str) -> Optional[dict]:
+    def _decode(self, key: str, data: Optional[bytes]) -> Any:
+        if data is None:
+            return None
+        try:
+            return self.codec.decode(data)
+        except Exception as e:
+            logger.error(f"Cache decode error for key '{key}': {e}")
+            return None
+    
+    async def get_json(self, key: str) -> Optional[Any]:
         """
-        Get JSON value from Redis.
+        Get a cached value (decoded with the value codec).
         
         Args:
             key: Cache key
             
         Returns:
-            Deserialized JSON or None
+            Decoded value or None
         """
-        value = await self.get(key)
-        if value:
-            try:
-                return json.loads(value)
-            except json.JSONDecodeError as e:
-                logger.error(f"JSON decode error for key '{key}': {e}")
-        return None
+        if not self.is_available():
+            return None
+        
+        try:
+            data = await self.breaker.call(lambda: self._binary_client.get(key))
+        except CircuitOpenError:
+            return None
+        except Exception as e:
+            logger.error(f"Redis GET error for key '{key}': {e}")
+            return None
+        return self._decode(key, data)
     
     async def set_json(
         self,
         key: str,
-        value: dict,
+        value: Any,
         ttl: Optional[int] = None
     ) -> bool:
         """
-        Set JSON value in Redis.
+        Cache a value (encoded with the value codec).
         
         Args:
             key: Cache key
-            value: Dictionary to cache
+            value: JSON-compatible value to cache
             ttl: Time to live in seconds
             
         Returns:
             True if successful, False otherwise
         """
+        if not self.is_available():
+            return False
+        
         try:
-            json_str = json.dumps(value)
-            return await self.set(key, json_str, ttl)
+            data = self.codec.encode(value)
         except (TypeError, ValueError) as e:
-            logger.error(f"JSON encode error for key '{key}': {e}")
+            logger.error(f"Cache encode error for key '{key}': {e}")
+            return False
+        
+        try:
+            if ttl:
+                await self.breaker.call(lambda: self._binary_client.setex(key, ttl, data))
+            else:
+                await self.breaker.call(lambda: self._binary_client.set(key, data))
+            return True
+        except CircuitOpenError:
+            return False
+        except Exception as e:
+            logger.error(f"Redis SET error for key '{key}': {e}")
+            return False
+    
+    async def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """
+        Get several cached values in one MGET round trip.
+        
+        Args:
+            keys: Cache keys
+            
+        Returns:
+            Dict of key → decoded value for the keys that were found
+        """
+        keys = list(dict.fromkeys(keys))
+        if not self.is_available() or not keys:
+            return {}
+        
+        try:
+            values = await self.breaker.call(lambda: self._binary_client.mget(keys))
+        except CircuitOpenError:
+            return {}
+        except Exception as e:
+            logger.error(f"Redis MGET error for {len(keys)} keys: {e}")
+            return {}
+        
+        found = {}
+        for key, data in zip(keys, values):
+            value = self._decode(key, data)
+            if value is not None:
+                found[key] = value
+        return found
+    
+    async def set_many(self, items: Dict[str, Any], ttl: Optional[int] = None) -> bool:
+        """
+        Cache several values in one round trip (pipelined SETEX, or MSET
+        without a TTL).
+        
+        Args:
+            items: Dict of key → JSON-compatible value
+            ttl: Time to live in seconds, applied to every key
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        if not self.is_available() or not items:
+            return False
+        
+        encoded = {}
+        for key, value in items.items():
+            try:
+                encoded[key] = self.codec.encode(value)
+            except (TypeError, ValueError) as e:
+                logger.error(f"Cache encode error for key '{key}': {e}")
+        if not encoded:
+            return False
+        
+        try:
+            if not ttl:
+                await self.breaker.call(lambda: self._binary_client.mset(encoded))
+                return True
+            async with self._binary_client.pipeline(transaction=False) as pipe:
+                for key, data in encoded.items():
+                    pipe.setex(key, ttl, data)
+                await self.breaker.call(pipe.execute)
+            return True
+        except CircuitOpenError:
+            return False
+        except Exception as e:
+            logger.error(f"Redis SET error for {len(encoded)} keys: {e}")
             return False
     
+    @asynccontextmanager
+    async def pipeline(self, transaction: bool = False) -> AsyncIterator[Optional["RedisPipeline"]]:
+        """
+        Queue several commands and send them in one round trip on exit.
+        
+        Yields None when Redis is unavailable. The replies are on
+        `pipe.results` after the block; it stays None if the pipeline could
+        not run (circuit open, timeout or error), which is logged, not
+        raised, like every other method here.
+        
+        Usage:
+            async with redis_client.pipeline() as pipe:
+                if pipe is not None:
+                    pipe.incr("counter")
+                    pipe.expire("counter", 60)
+            if pipe is not None and pipe.results is not None:
+                count = pipe.results[0]
+        """
+        if not self.is_available():
+            yield None
+            return
+        
+        async with self._client.pipeline(transaction=transaction) as raw:
+            pipe = RedisPipeline(raw)
+            yield pipe
+            try:
+                pipe.results = await self.breaker.call(raw.execute)
+            except CircuitOpenError:
+                pass
+            except Exception as e:
+                logger.error(f"Redis pipeline error: {e}")
+    
     async def delete_pattern(self, pattern: str) -> int:
         """
         Delete all keys matching a pattern.
@@ -285,7 +479,7 @@ class RedisClient:
         Returns:
             Number of keys deleted
         """
-        if not self.is_available():
+        if not self.is_available() or self.breaker.is_open:
             return 0
         
         try:
@@ -302,14 +496,39 @@ class RedisClient:
             logger.error(f"Redis PATTERN DELETE error for pattern '{pattern}': {e}")
             return 0
     
+    async def publish(self, channel: str, message: str) -> int:
+        """
+        Publish a message to a pub/sub channel.
+
+        Args:
+            channel: Channel name
+            message: Message payload
+
+        Returns:
+            Number of subscribers that received the message
+        """
+        if not self.is_available():
+            return 0
+
+        try:
+            return await self.breaker.call(lambda: self._client.publish(channel, message))
+        except CircuitOpenError:
+            return 0
+        except Exception as e:
+            logger.error(f"Redis PUBLISH error for channel '{channel}': {e}")
+            return 0
+
     async def get_client(self) -> Optional[redis.Redis]:
         """
         Get raw Redis client for advanced operations.
         
+        Calls made on the raw client bypass the circuit breaker, but it is
+        withheld while the circuit is open so callers use their fallbacks.
+        
         Returns:
             Redis client or None if unavailable
         """
-        return self._client if self.is_available() else None
+        return self._client if self.is_available() and not self.breaker.is_open else None
 
 
 # Global Redis client instance
@@ -0,0 +1,158 @@
+"""
+Redis Value Codecs
+Pluggable serialization (JSON/orjson, msgpack) and compression (zlib, LZ4) for cached values
+"""
+
+import json
+import logging
+import zlib
+from typing import Any, Callable, Dict, NamedTuple, Optional, Union
+
+from .responses import ORJSON_AVAILABLE, _default, _json_default, orjson
+
+# Try to import the optional codecs, but don't fail if not available
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    msgpack = None
+    MSGPACK_AVAILABLE = False
+
+try:
+    import lz4.frame as lz4_frame
+    LZ4_AVAILABLE = True
+except ImportError:
+    lz4_frame = None
+    LZ4_AVAILABLE = False
+
+logger = logging.getLogger("mediconnect")
+
+# Framed values start with a NUL byte, which never begins a JSON document, so
+# plain JSON written before framing existed (or by a JSON codec without
+# compression) still decodes: b"\x00" + serializer id + compressor id + payload
+FRAME_MARKER = 0
+
+
+class Serializer(NamedTuple):
+    frame_id: int
+    dumps: Callable[[Any], bytes]
+    loads: Callable[[bytes], Any]
+
+
+class Compressor(NamedTuple):
+    frame_id: int
+    compress: Callable[[bytes], bytes]
+    decompress: Callable[[bytes], bytes]
+
+
+def _json_dumps(value: Any) -> bytes:
+    return json.dumps(value, default=_json_default, separators=(",", ":")).encode()
+
+
+def _json_loads(data: bytes) -> Any:
+    return orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data)
+
+
+def _orjson_dumps(value: Any) -> bytes:
+    return orjson.dumps(value, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+def _msgpack_dumps(value: Any) -> bytes:
+    return msgpack.packb(value, default=_json_default, use_bin_type=True)
+
+
+def _msgpack_loads(data: bytes) -> Any:
+    return msgpack.unpackb(data, raw=False)
+
+
+SERIALIZERS: Dict[str, Serializer] = {"json": Serializer(1, _json_dumps, _json_loads)}
+if ORJSON_AVAILABLE:
+    # Same wire format as "json", only faster
+    SERIALIZERS["orjson"] = Serializer(1, _orjson_dumps, _json_loads)
+if MSGPACK_AVAILABLE:
+    SERIALIZERS["msgpack"] = Serializer(2, _msgpack_dumps, _msgpack_loads)
+
+COMPRESSORS: Dict[str, Compressor] = {
+    "zlib": Compressor(1, lambda data: zlib.compress(data, 6), zlib.decompress),
+}
+if LZ4_AVAILABLE:
+    COMPRESSORS["lz4"] = Compressor(2, lz4_frame.compress, lz4_frame.decompress)
+
+_SERIALIZERS_BY_ID = {serializer.frame_id: serializer for serializer in SERIALIZERS.values()}
+_COMPRESSORS_BY_ID = {compressor.frame_id: compressor for compressor in COMPRESSORS.values()}
+
+
+class ValueCodec:
+    """
+    Encodes cache values to bytes and back.
+
+    Values are serialized with `serializer`; payloads of at least
+    `compress_min_bytes` are compressed with `compression` when that makes
+    them smaller. Decoding reads the frame header, so values written with a
+    different codec configuration (e.g. by a worker not yet redeployed)
+    still decode.
+
+    Usage:
+        codec = ValueCodec("msgpack", compression="lz4", compress_min_bytes=512)
+        data = codec.encode({"doctor_id": "doctor_1"})
+        codec.decode(data)
+    """
+
+    def __init__(
+        self,
+        serializer: str = "orjson",
+        compression: Optional[str] = "zlib",
+        compress_min_bytes: int = 1024
+    ):
+        if serializer not in SERIALIZERS:
+            logger.warning(f"Cache serializer '{serializer}' is not available, using json")
+            serializer = "orjson" if ORJSON_AVAILABLE else "json"
+        if compression and compression not in COMPRESSORS:
+            logger.warning(f"Cache compression '{compression}' is not available, using zlib")
+            compression = "zlib"
+
+        self.serializer_name = serializer
+        self.compression_name = compression or None
+        self.serializer = SERIALIZERS[serializer]
+        self.compressor = COMPRESSORS[compression] if compression else None
+        self.compress_min_bytes = compress_min_bytes
+
+    def encode(self, value: Any) -> bytes:
+        """Serialize (and possibly compress) a value."""
+        payload = self.serializer.dumps(value)
+
+        compressor_id = 0
+        if self.compressor and len(payload) >= self.compress_min_bytes:
+            compressed = self.compressor.compress(payload)
+            if len(compressed) < len(payload):
+                payload, compressor_id = compressed, self.compressor.frame_id
+
+        if compressor_id == 0 and self.serializer.frame_id == SERIALIZERS["json"].frame_id:
+            # Plain JSON stays unframed: readable in redis-cli and by older workers
+            return payload
+        return bytes((FRAME_MARKER, self.serializer.frame_id, compressor_id)) + payload
+
+    def decode(self, data: Union[bytes, str]) -> Any:
+        """
+        Decode a value produced by any ValueCodec (or plain JSON).
+
+        Raises:
+            ValueError: If the frame names a codec that is not installed
+        """
+        if isinstance(data, str):
+            data = data.encode()
+        if not data or data[0] != FRAME_MARKER:
+            return _json_loads(data)
+
+        serializer_id, compressor_id, payload = data[1], data[2], data[3:]
+        if compressor_id:
+            compressor = _COMPRESSORS_BY_ID.get(compressor_id)
+            if compressor is None:
+                raise ValueError(f"Unknown cache compression id {compressor_id}")
+            payload = compressor.decompress(payload)
+
+        serializer = _SERIALIZERS_BY_ID.get(serializer_id)
+        if serializer is None:
+            raise ValueError(f"Unknown cache serializer id {serializer_id}")
+        return serializer.loads(payload)
+
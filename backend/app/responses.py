@@ -0,0 +1,69 @@
+"""
+JSON Response Classes
+orjson-backed default response class for the whole API
+"""
+
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any
+from uuid import UUID
+
+from starlette.responses import JSONResponse
+
+# Try to import orjson, but don't fail if not available (falls back to json)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+
+def _default(obj: Any) -> Any:
+    """Serialize types orjson does not handle natively."""
+    if hasattr(obj, "model_dump"):
+        # Pydantic models returned directly from a handler
+        return obj.model_dump(mode="json")
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if isinstance(obj, Decimal):
+        return float(obj)
+    # ObjectId, Enum values and anything else with a sensible str()
+    return str(getattr(obj, "value", obj))
+
+
+def _json_default(obj: Any) -> Any:
+    """Stdlib json fallback mirroring orjson's native types."""
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, UUID):
+        return str(obj)
+    return _default(obj)
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize content to JSON bytes."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(
+        content,
+        default=_json_default,
+        ensure_ascii=False,
+        separators=(",", ":")
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response rendered with orjson.
+
+    Set as the app's default_response_class. Handlers serving large lists
+    return it directly (`return FastJSONResponse(items)`), which skips
+    FastAPI's response_model validation and jsonable_encoder pass entirely;
+    the raw Mongo documents (datetimes, nested dicts) are encoded in one
+    native call. Declared response models still document the shape.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
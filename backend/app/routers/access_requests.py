@@ -12,6 +12,8 @@ from ..schemas.user import User
 from ..schemas.location import Location
 from ..security import require_auth, create_session
 from ..services.email import send_password_reset_email
+from ..services.org_topology import org_topology
+from ..services.catalog_versions import catalog_versions, LOCATIONS
 
 router = APIRouter(prefix="/access-requests", tags=["access-requests"])
 
@@ -133,6 +135,8 @@ async def approve_access_request(
         location_doc = location.model_dump()
         location_doc['created_at'] = location_doc['created_at'].isoformat()
         await db.locations.insert_one(location_doc)
+        await org_topology.invalidate(user.organization_id)
+        await catalog_versions.bump(LOCATIONS)
         
         new_location_id = location_id
     
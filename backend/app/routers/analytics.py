@@ -5,6 +5,7 @@ from collections import defaultdict
 
 from ..db import db
 from ..security import require_auth
+from ..services.org_topology import org_topology
 
 router = APIRouter(prefix="/analytics", tags=["analytics"])
 
@@ -31,6 +32,7 @@ async def get_analytics_overview(request: Request, days: int = 30):
     
     # Determine query filter based on role
     query_filter = {}
+    topology = await org_topology.get(user.organization_id) if user.organization_id else None
     
     if user.role == "SUPER_ADMIN":
         # Super Admin sees all locations in their organization
@@ -38,12 +40,7 @@ async def get_analytics_overview(request: Request, days: int = 30):
             raise HTTPException(status_code=404, detail="User is not associated with an organization")
         
         # Get all locations in organization
-        locations = await db.locations.find(
-            {"organization_id": user.organization_id, "is_active": True},
-            {"_id": 0, "location_id": 1}
-        ).to_list(100)
-        
-        location_ids = [loc["location_id"] for loc in locations]
+        location_ids = topology.active_location_ids()
         
         if location_ids:
             query_filter["location_id"] = {"$in": location_ids}
@@ -88,12 +85,20 @@ async def get_analytics_overview(request: Request, days: int = 30):
         if location_id:
             appointments_by_location[location_id] += 1
     
-    # Get location names
+    # Get location names (organization topology first, one query for any others)
+    location_names = topology.names() if topology else {}
+    missing = [location_id for location_id in appointments_by_location if location_id not in location_names]
+    if missing:
+        async for location in db.locations.find(
+            {"location_id": {"$in": missing}},
+            {"_id": 0, "location_id": 1, "name": 1}
+        ):
+            location_names[location["location_id"]] = location.get("name", "Unknown")
+    
     location_data = []
     for location_id, count in appointments_by_location.items():
-        location = await db.locations.find_one({"location_id": location_id}, {"_id": 0, "name": 1})
         location_data.append({
-            "location": location.get("name", "Unknown") if location else "Unknown",
+            "location": location_names.get(location_id) or "Unknown",
             "count": count
         })
     
@@ -215,12 +220,11 @@ async def get_analytics_overview(request: Request, days: int = 30):
     # ========================================
     # 4. LOCATIONS ANALYTICS
     # ========================================
-    locations_query = {"is_active": True}
     if user.role == "SUPER_ADMIN" and user.organization_id:
-        locations_query["organization_id"] = user.organization_id
-    
-    locations_list = await db.locations.find(locations_query, {"_id": 0}).to_list(100)
-    total_locations = len(locations_list)
+        total_locations = len(topology.active_location_ids())
+    else:
+        locations_list = await db.locations.find({"is_active": True}, {"_id": 0, "location_id": 1}).to_list(100)
+        total_locations = len(locations_list)
     
     # ========================================
     # 5. SERVICES ANALYTICS
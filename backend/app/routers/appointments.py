@@ -1,9 +1,17 @@
-from fastapi import APIRouter, HTTPException, Request
-from typing import Optional
+from fastapi import APIRouter, HTTPException, Query, Request
+from typing import List, Optional
 from datetime import datetime, timezone, timedelta
 
 from ..db import db
-from ..schemas.appointment import Appointment, AppointmentCreate, AppointmentUpdate, AppointmentCancel
+from ..responses import FastJSONResponse
+from ..fieldsets import FieldSelector
+from ..schemas.appointment import (
+    Appointment,
+    AppointmentCreate,
+    AppointmentUpdate,
+    AppointmentCancel,
+    AppointmentListItem
+)
 from ..schemas.user import UserRole
 from ..schemas.permission import PermissionConstants
 from ..schemas.audit_log import AuditActions
@@ -15,6 +23,8 @@ from ..services.email import (
     send_appointment_reminder_email
 )
 from ..services.permissions import PermissionService
+from ..services.dashboard_stats import dashboard_stats
+from ..services.doctor_identity import doctor_identity
 from ..middleware.permissions import (
     require_permission,
     block_admin_appointment_modification,
@@ -23,6 +33,19 @@ from ..middleware.permissions import (
 
 router = APIRouter(prefix="/appointments", tags=["appointments"])
 
+# ?fields= for the appointment list (computed fields → stored fields they need)
+APPOINTMENT_FIELDS = FieldSelector(
+    AppointmentListItem,
+    key="appointment_id",
+    computed={
+        "doctor_name": ("doctor_id",),
+        "doctor_specialty": ("doctor_id",),
+        "patient_name": ("patient_id",),
+        "patient_email": ("patient_id",),
+        "is_own_patient": ("patient_id",),
+    }
+)
+
 
 async def create_recurring_appointments(base_appointment, recurrence, user, doctor, clinic):
     """
@@ -104,7 +127,7 @@ async def create_recurring_appointments(base_appointment, recurrence, user, doct
     return recurring_appointments
 
 
-@router.get("")
+@router.get("", response_model=List[AppointmentListItem])
 async def get_appointments(
     request: Request,
     clinic_id: Optional[str] = None,
@@ -112,7 +135,8 @@ async def get_appointments(
     doctor_id: Optional[str] = None,
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
-    status: Optional[str] = None
+    status: Optional[str] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return (default: all)")
 ):
     """
     Get appointments with permission-based filtering.
@@ -123,18 +147,21 @@ async def get_appointments(
     - DOCTOR: Can view only own appointments
     - ASSISTANT: Can view appointments in assigned locations
     - USER: Can view only own appointments
+    
+    `fields` limits the response (and the query) to the listed fields.
     """
     user = await require_auth(request)
+    fieldset = APPOINTMENT_FIELDS.parse(fields)
 
     # Check view permission
-    can_view = await PermissionService.can_view_appointments(user, location_id)
+    can_view = await PermissionService.can_view_appointments(user, location_id, request)
     if not can_view:
         raise HTTPException(status_code=403, detail="You do not have permission to view appointments")
 
     query = {}
 
     # Get accessible locations for the user
-    accessible_locations = await PermissionService.get_accessible_locations(user)
+    accessible_locations = await PermissionService.get_accessible_locations(user, request)
 
     # Role-based filtering
     if user.role == UserRole.USER:
@@ -143,9 +170,9 @@ async def get_appointments(
     
     elif user.role == UserRole.DOCTOR:
         # Doctors can only see their own appointments
-        user_doctor = await db.doctors.find_one({"email": user.email.lower()}, {"_id": 0})
-        if user_doctor:
-            query["doctor_id"] = user_doctor.get("doctor_id")
+        own_doctor_id = await doctor_identity.resolve(user)
+        if own_doctor_id:
+            query["doctor_id"] = own_doctor_id
         else:
             # No doctor profile, return empty
             return []
@@ -187,15 +214,20 @@ async def get_appointments(
         query["date_time"] = query.get("date_time", {})
         query["date_time"]["$lte"] = end_date
 
-    appointments = await db.appointments.find(query, {"_id": 0}).to_list(500)
+    appointments = await db.appointments.find(query, fieldset.projection()).to_list(500)
 
-    # Enrich appointment data
+    # Enrich appointment data (only what was requested)
+    wants_doctor = fieldset.wants("doctor_name", "doctor_specialty")
+    wants_patient = fieldset.wants("patient_name", "patient_email", "is_own_patient")
     for apt in appointments:
-        doctor = await db.doctors.find_one({"doctor_id": apt["doctor_id"]}, {"_id": 0})
-        apt["doctor_name"] = doctor.get("name") if doctor else "Unknown"
-        apt["doctor_specialty"] = doctor.get("specialty") if doctor else "Unknown"
+        if wants_doctor:
+            doctor = await db.doctors.find_one({"doctor_id": apt["doctor_id"]}, {"_id": 0})
+            apt["doctor_name"] = doctor.get("name") if doctor else "Unknown"
+            apt["doctor_specialty"] = doctor.get("specialty") if doctor else "Unknown"
 
         # Patient information visibility based on role
+        if not wants_patient:
+            continue
         if user.role in [UserRole.SUPER_ADMIN, UserRole.LOCATION_ADMIN, UserRole.RECEPTIONIST]:
             patient = await db.users.find_one({"user_id": apt["patient_id"]}, {"_id": 0})
             apt["patient_name"] = apt.get("patient_name") or (patient.get("name") if patient else "Unknown")
@@ -225,7 +257,7 @@ async def get_appointments(
         status="success"
     )
 
-    return appointments
+    return FastJSONResponse(fieldset.trim(appointments))
 
 
 @router.post("")
@@ -272,7 +304,8 @@ async def create_appointment(data: AppointmentCreate, request: Request):
     if doc.get('recurrence') and doc['recurrence'].get('end_date'):
         doc['recurrence']['end_date'] = doc['recurrence']['end_date'].isoformat()
 
-    await db.appointments.insert_one(doc)
+    # Insert a copy: insert_one adds `_id`, and `doc` is also the response body
+    await db.appointments.insert_one({**doc})
     
     # Handle recurring appointments
     recurring_appointments = []
@@ -285,6 +318,8 @@ async def create_appointment(data: AppointmentCreate, request: Request):
             clinic=clinic
         )
 
+    await dashboard_stats.invalidate_for_appointment(doc)
+
     # Send confirmation email to patient
     send_appointment_confirmation_email(
         patient_email=user.email,
@@ -306,7 +341,7 @@ async def create_appointment(data: AppointmentCreate, request: Request):
     )
 
     return {
-        **appointment.model_dump(),
+        **doc,
         "recurring_count": len(recurring_appointments) if recurring_appointments else 0
     }
 
@@ -343,6 +378,7 @@ async def update_appointment(appointment_id: str, data: AppointmentUpdate, reque
         update_data["date_time"] = new_datetime.isoformat()
 
     await db.appointments.update_one({"appointment_id": appointment_id}, {"$set": update_data})
+    await dashboard_stats.invalidate_for_appointment(appointment)
 
     updated = await db.appointments.find_one({"appointment_id": appointment_id}, {"_id": 0})
     return updated
@@ -365,6 +401,7 @@ async def cancel_appointment(appointment_id: str, request: Request):
         {"appointment_id": appointment_id},
         {"$set": {"status": "CANCELLED"}}
     )
+    await dashboard_stats.invalidate_for_appointment(appointment)
 
     await send_notification_email(
         user_id=appointment["patient_id"],
@@ -390,8 +427,7 @@ async def cancel_appointment_with_reason(appointment_id: str, data: AppointmentC
     if user.role == "CLINIC_ADMIN" and appointment["clinic_id"] != user.clinic_id:
         raise HTTPException(status_code=403, detail="Access denied")
     if user.role == "DOCTOR":
-        doctor = await db.doctors.find_one({"email": user.email.lower(), "clinic_id": user.clinic_id}, {"_id": 0})
-        if not doctor or doctor["doctor_id"] != appointment["doctor_id"]:
+        if await doctor_identity.resolve(user) != appointment["doctor_id"]:
             raise HTTPException(status_code=403, detail="You can only cancel your own appointments")
 
     if not data.reason or len(data.reason.strip()) < 3:
@@ -406,6 +442,7 @@ async def cancel_appointment_with_reason(appointment_id: str, data: AppointmentC
             "cancelled_at": datetime.now(timezone.utc).isoformat()
         }}
     )
+    await dashboard_stats.invalidate_for_appointment(appointment)
     
     # Get doctor and clinic info for email
     doctor = await db.doctors.find_one({"doctor_id": appointment["doctor_id"]}, {"_id": 0})
@@ -436,7 +473,7 @@ async def accept_appointment(appointment_id: str, request: Request):
     user = await require_auth(request)
     
     # Check permission
-    can_accept = await PermissionService.can_accept_appointments(user)
+    can_accept = await PermissionService.can_accept_appointments(user, request)
     if not can_accept:
         await PermissionService.log_action(
             user=user,
@@ -453,7 +490,7 @@ async def accept_appointment(appointment_id: str, request: Request):
         )
     
     # Check appointment access
-    has_access = await check_appointment_access(user, appointment_id)
+    has_access = await check_appointment_access(user, appointment_id, request)
     if not has_access:
         raise HTTPException(status_code=403, detail="You do not have access to this appointment")
     
@@ -511,7 +548,8 @@ async def reject_appointment(appointment_id: str, request: Request, reason: Opti
     result = await PermissionService.check_permission(
         user=user,
         permission=PermissionConstants.APPOINTMENTS_REJECT,
-        resource_id=appointment_id
+        resource_id=appointment_id,
+        request=request
     )
     
     if not result.allowed:
@@ -527,7 +565,7 @@ async def reject_appointment(appointment_id: str, request: Request, reason: Opti
         raise HTTPException(status_code=403, detail=result.reason)
     
     # Check appointment access
-    has_access = await check_appointment_access(user, appointment_id)
+    has_access = await check_appointment_access(user, appointment_id, request)
     if not has_access:
         raise HTTPException(status_code=403, detail="You do not have access to this appointment")
     
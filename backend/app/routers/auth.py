@@ -1,5 +1,6 @@
 from fastapi import APIRouter, HTTPException, Request, Response, BackgroundTasks
 from datetime import datetime, timezone, timedelta
+import asyncio
 import uuid
 import httpx
 import re
@@ -8,10 +9,16 @@ from ..schemas.user import User, UserRegister, UserLogin, UserUpdate, ForgotPass
 from ..schemas.clinic import Clinic, ClinicRegistration
 from ..security import hash_password, verify_password, create_session, get_current_user, require_auth
 from ..config import FRONTEND_URL
+from ..http_client import http_client
+from ..circuit_breaker import CircuitOpenError
 from ..services.email import send_password_reset_email
 from ..services.password_policy import password_policy
 from ..services.audit_log import audit_logger, AuditAction
 from ..services.sanitization import sanitizer
+from ..services.data_lifecycle import purge_at
+from ..services.doctor_identity import doctor_identity
+from ..services.org_topology import org_topology
+from ..services.catalog_versions import catalog_versions, CLINICS
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
@@ -70,6 +77,11 @@ async def login_user(data: UserLogin, response: Response):
     )
     
     session_token = await create_session(user_doc['user_id'], response)
+    
+    # Link the doctor profile once so doctor-scoped requests skip the lookup
+    if user_doc.get('role') == 'DOCTOR' and not user_doc.get('doctor_id'):
+        user_doc['doctor_id'] = await doctor_identity.resolve(User(**user_doc))
+    
     user_data = {k: v for k, v in user_doc.items() if k != 'password_hash'}
     
     # Determine redirect based on role and location count
@@ -78,10 +90,8 @@ async def login_user(data: UserLogin, response: Response):
     
     if role == 'SUPER_ADMIN' and organization_id:
         # Check number of locations in organization
-        location_count = await db.locations.count_documents({
-            "organization_id": organization_id,
-            "is_active": True
-        })
+        active_locations = (await org_topology.get(organization_id)).active_locations()
+        location_count = len(active_locations)
         
         # For now, always redirect SUPER_ADMIN to /dashboard
         # TODO: Implement location-specific dashboard routes in frontend
@@ -90,12 +100,7 @@ async def login_user(data: UserLogin, response: Response):
         
         # Store primary location for single-location orgs
         if location_count == 1:
-            location = await db.locations.find_one({
-                "organization_id": organization_id,
-                "is_active": True
-            }, {"_id": 0})
-            if location:
-                user_data['primary_location_id'] = location['location_id']
+            user_data['primary_location_id'] = active_locations[0]['location_id']
         
         user_data['location_count'] = location_count
     
@@ -170,6 +175,7 @@ async def register_clinic(data: ClinicRegistration, response: Response):
     clinic_doc = clinic.model_dump()
     clinic_doc['created_at'] = clinic_doc['created_at'].isoformat()
     await db.clinics.insert_one(clinic_doc)
+    await catalog_versions.bump(CLINICS)
     user_id = f"user_{uuid.uuid4().hex[:12]}"
     admin_user = User(
         user_id=user_id,
@@ -194,14 +200,21 @@ async def create_oauth_session(request: Request, response: Response):
     session_id = request.headers.get("X-Session-ID")
     if not session_id:
         raise HTTPException(status_code=400, detail="Missing X-Session-ID header")
-    async with httpx.AsyncClient() as client_http:
-        auth_response = await client_http.get(
+    try:
+        auth_response = await http_client.get(
+            "oauth",
             "https://demobackend.emergentagent.com/auth/v1/env/oauth/session-data",
             headers={"X-Session-ID": session_id}
         )
-        if auth_response.status_code != 200:
-            raise HTTPException(status_code=401, detail="Invalid session ID")
-        user_data = auth_response.json()
+    except CircuitOpenError:
+        raise HTTPException(status_code=503, detail="Sign-in provider is unavailable, please try again shortly")
+    except (asyncio.TimeoutError, httpx.HTTPError):
+        raise HTTPException(status_code=502, detail="Sign-in provider did not respond")
+    if auth_response.status_code >= 500:
+        raise HTTPException(status_code=502, detail="Sign-in provider did not respond")
+    if auth_response.status_code != 200:
+        raise HTTPException(status_code=401, detail="Invalid session ID")
+    user_data = auth_response.json()
     existing_user = await db.users.find_one({"email": user_data["email"].lower()}, {"_id": 0})
     if existing_user:
         user_id = existing_user["user_id"]
@@ -309,6 +322,7 @@ async def forgot_password(data: ForgotPasswordRequest, background_tasks: Backgro
     token_doc = reset_token.model_dump()
     token_doc['expires_at'] = token_doc['expires_at'].isoformat()
     token_doc['created_at'] = token_doc['created_at'].isoformat()
+    token_doc['purge_at'] = purge_at("password_reset_tokens", expires_at)
     await db.password_reset_tokens.insert_one(token_doc)
     medical_center = None
     if user_doc.get('clinic_id'):
@@ -0,0 +1,25 @@
+from fastapi import APIRouter, Request
+
+from ..responses import FastJSONResponse
+from ..schemas.batch import BatchRequest
+from ..security import require_auth
+from ..services.batch import batch_service
+
+router = APIRouter(prefix="/batch", tags=["batch"])
+
+
+@router.post("")
+async def run_batch(data: BatchRequest, request: Request):
+    """
+    Run several GET requests in one round trip (e.g. the staff dashboard's
+    stats, appointments, notification counters, locations and doctors).
+    
+    Authentication is resolved once and shared by every sub-request, which
+    run concurrently; each still counts against its own endpoint's rate
+    limit. Responses come back in request order:
+    
+        {"responses": [{"id": "stats", "status": 200, "headers": {...}, "body": {...}}, ...]}
+    """
+    await require_auth(request)
+    responses = await batch_service.execute(request, data.requests)
+    return FastJSONResponse({"responses": responses})
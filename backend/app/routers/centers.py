@@ -1,17 +1,34 @@
-from fastapi import APIRouter, HTTPException, Query
-from typing import Optional
+from fastapi import APIRouter, HTTPException, Query, Request
+from typing import Literal, Optional
 from ..db import db
-from ..schemas.center import MedicalCenterCreate, MedicalCenterUpdate, MedicalCenterResponse
+from ..services.catalog_versions import catalog_versions, CLINICS, CENTERS
+from ..schemas.center import (
+    MedicalCenterCreate,
+    MedicalCenterUpdate,
+    MedicalCenterResponse,
+    CenterListResponse,
+    CENTER_LIST_PROJECTION
+)
 import re
 
 router = APIRouter(prefix="/centers", tags=["centers"])
 
+# Sort orders for center search (clinic rating fields are maintained by ClinicRatingService)
+CENTER_SORTS = {
+    "rating": [("average_rating", -1), ("review_count", -1)],
+    "reviews": [("review_count", -1), ("average_rating", -1)],
+    "name": [("name", 1)],
+}
 
-@router.get("")
+
+@router.get("", response_model=CenterListResponse)
 async def get_centers(
+    request: Request,
     search_term: Optional[str] = Query(None, description="Search by name or description"),
     county_filter: Optional[str] = Query(None, description="Filter by county (use 'all' for national search)"),
-    city_filter: Optional[str] = Query(None, description="Filter by city within county")
+    city_filter: Optional[str] = Query(None, description="Filter by city within county"),
+    min_rating: Optional[float] = Query(None, ge=0, le=5, description="Only centers rated at least this"),
+    sort: Optional[Literal["rating", "reviews", "name"]] = Query(None, description="Sort order")
 ):
     """
     Get medical centers (clinics) with optional filtering by search term, county, and city.
@@ -20,7 +37,12 @@ async def get_centers(
     - If county_filter is specified: filter by that county
     - If city_filter is also specified: filter by both county and city
     - search_term matches against name or description (case-insensitive)
+    - min_rating / sort=rating|reviews use the rating aggregates stored on each clinic
     """
+    validators = await catalog_versions.validators(request, [CLINICS])
+    if validators.not_modified:
+        return validators.not_modified_response()
+    
     # Build the query filter
     query_filter = {}
     
@@ -42,25 +64,34 @@ async def get_centers(
         # Exact match for city (case-insensitive)
         query_filter["city"] = {"$regex": f"^{re.escape(city_filter.strip())}$", "$options": "i"}
     
-    # Execute query on clinics collection
-    centers = await db.clinics.find(query_filter, {"_id": 0}).to_list(length=1000)
+    if min_rating is not None:
+        query_filter["average_rating"] = {"$gte": min_rating}
+    
+    # Execute query on clinics collection, loading only the card fields
+    cursor = db.clinics.find(query_filter, CENTER_LIST_PROJECTION)
+    if sort:
+        cursor = cursor.sort(CENTER_SORTS[sort])
+    centers = await cursor.to_list(length=1000)
     
-    return {
+    return validators.response({
         "count": len(centers),
         "county_filter": county_filter if county_filter and county_filter.lower() != "all" else "all",
         "city_filter": city_filter if city_filter and city_filter.lower() != "all" else "all",
         "search_term": search_term,
         "results": centers
-    }
+    })
 
 
 @router.get("/{center_id}")
-async def get_center(center_id: str):
+async def get_center(center_id: str, request: Request):
     """Get a specific medical center by ID"""
+    validators = await catalog_versions.validators(request, [CENTERS])
+    if validators.not_modified:
+        return validators.not_modified_response()
     center = await db.medical_centers.find_one({"center_id": center_id}, {"_id": 0})
     if not center:
         raise HTTPException(status_code=404, detail="Medical center not found")
-    return center
+    return validators.response(center)
 
 
 @router.post("")
@@ -73,6 +104,7 @@ async def create_center(center: MedicalCenterCreate):
     
     # Insert into database
     await db.medical_centers.insert_one(center_data.model_dump())
+    await catalog_versions.bump(CENTERS)
     
     # Return created center
     created = await db.medical_centers.find_one({"center_id": center_data.center_id}, {"_id": 0})
@@ -95,6 +127,7 @@ async def update_center(center_id: str, data: MedicalCenterUpdate):
     
     # Update the center
     await db.medical_centers.update_one({"center_id": center_id}, {"$set": update_data})
+    await catalog_versions.bump(CENTERS)
     
     # Return updated center
     updated = await db.medical_centers.find_one({"center_id": center_id}, {"_id": 0})
@@ -108,6 +141,7 @@ async def delete_center(center_id: str):
     
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Medical center not found")
+    await catalog_versions.bump(CENTERS)
     
     return {"message": "Medical center deleted successfully"}
 
@@ -2,22 +2,30 @@ from fastapi import APIRouter, HTTPException, Request
 from ..db import db
 from ..schemas.clinic import ClinicUpdate
 from ..security import require_clinic_admin
+from ..services.clinic_ratings import clinic_ratings
+from ..services.catalog_versions import catalog_versions, CLINICS
 
 router = APIRouter(prefix="/clinics", tags=["clinics"])
 
 
 @router.get("")
-async def get_clinics():
+async def get_clinics(request: Request):
+    validators = await catalog_versions.validators(request, [CLINICS])
+    if validators.not_modified:
+        return validators.not_modified_response()
     clinics = await db.clinics.find({}, {"_id": 0}).to_list(length=100)
-    return clinics
+    return validators.response(clinics)
 
 
 @router.get("/{clinic_id}")
-async def get_clinic(clinic_id: str):
+async def get_clinic(clinic_id: str, request: Request):
+    validators = await catalog_versions.validators(request, [CLINICS])
+    if validators.not_modified:
+        return validators.not_modified_response()
     clinic = await db.clinics.find_one({"clinic_id": clinic_id}, {"_id": 0})
     if not clinic:
         raise HTTPException(status_code=404, detail="Clinic not found")
-    return clinic
+    return validators.response(clinic)
 
 
 @router.put("/{clinic_id}")
@@ -34,26 +42,26 @@ async def update_clinic(clinic_id: str, data: ClinicUpdate, request: Request):
     if new_name and new_address:
         update_data['is_profile_complete'] = True
     await db.clinics.update_one({"clinic_id": clinic_id}, {"$set": update_data})
+    await catalog_versions.bump(CLINICS)
     updated = await db.clinics.find_one({"clinic_id": clinic_id}, {"_id": 0})
     return updated
 
 
 @router.get("/{clinic_id}/stats")
 async def get_clinic_stats(clinic_id: str):
-    clinic = await db.clinics.find_one({"clinic_id": clinic_id}, {"_id": 0})
+    clinic = await db.clinics.find_one(
+        {"clinic_id": clinic_id},
+        {"_id": 0, "average_rating": 1, "review_count": 1, "rating_histogram": 1}
+    )
     if not clinic:
         raise HTTPException(status_code=404, detail="Clinic not found")
 
-    pipeline = [
-        {"$match": {"clinic_id": clinic_id}},
-        {"$group": {"_id": "$clinic_id", "average_rating": {"$avg": "$rating"}, "review_count": {"$sum": 1}}}
-    ]
-    agg = await db.reviews.aggregate(pipeline).to_list(length=1)
-    if agg:
-        average = float(agg[0].get("average_rating", 0))
-        count = int(agg[0].get("review_count", 0))
-    else:
-        average = 0.0
-        count = 0
-
-    return {"average_rating": round(average, 1), "review_count": count}
+    # Rating aggregates live on the clinic document (see ClinicRatingService)
+    if "review_count" not in clinic:
+        clinic = await clinic_ratings.rebuild(clinic_id)
+
+    return {
+        "average_rating": round(float(clinic.get("average_rating", 0)), 1),
+        "review_count": int(clinic.get("review_count", 0)),
+        "rating_histogram": clinic.get("rating_histogram", {})
+    }
@@ -1,19 +1,51 @@
-from fastapi import APIRouter, HTTPException, Request
+from fastapi import APIRouter, HTTPException, Query, Request
 from datetime import datetime, timezone, timedelta
-from typing import Optional
+from typing import List, Optional
 
 from ..db import db
-from ..schemas.doctor import Doctor, DoctorCreate, DoctorUpdate
+from ..fieldsets import FieldSelector
+from ..schemas.doctor import Doctor, DoctorCreate, DoctorUpdate, DoctorListItem
 from ..security import require_clinic_admin, get_current_user, require_auth
 from ..services.cache import doctors_cache, cache_invalidate
+from ..services.doctor_identity import doctor_identity
+from ..services.org_topology import org_topology
+from ..services.catalog_versions import catalog_versions, CLINICS, DOCTORS, LOCATIONS
 
 router = APIRouter(prefix="/doctors", tags=["doctors"])
 
+# ?fields= for the doctor list (a doctor gets location_name, or clinic_name without a location)
+DOCTOR_FIELDS = FieldSelector(
+    DoctorListItem,
+    key="doctor_id",
+    computed={
+        "location_name": ("location_id", "clinic_id"),
+        "clinic_name": ("location_id", "clinic_id"),
+    }
+)
 
-@router.get("")
-async def get_doctors(request: Request, clinic_id: Optional[str] = None, location_id: Optional[str] = None):
+
+@router.get("", response_model=List[DoctorListItem])
+async def get_doctors(
+    request: Request,
+    clinic_id: Optional[str] = None,
+    location_id: Optional[str] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return (default: all)")
+):
     user = await get_current_user(request)
+    fieldset = DOCTOR_FIELDS.parse(fields)
+    
+    # The admin branches below ignore the query params and list the admin's own scope
+    variant = None
+    if user and user.role == "SUPER_ADMIN" and user.organization_id:
+        variant = [user.role, user.organization_id]
+    elif user and user.role == "CLINIC_ADMIN" and user.clinic_id:
+        variant = [user.role, user.clinic_id]
+    validators = await catalog_versions.validators(request, [DOCTORS, LOCATIONS, CLINICS], variant)
+    if validators.not_modified:
+        return validators.not_modified_response()
+    
     query = {"is_active": True}
+    topology = await org_topology.get(user.organization_id) if user and user.organization_id else None
     
     if user and user.role == "SUPER_ADMIN" and user.organization_id:
         # Super admin sees all doctors in their organization
@@ -23,11 +55,7 @@ async def get_doctors(request: Request, clinic_id: Optional[str] = None, locatio
             query["clinic_id"] = clinic_id
         else:
             # Get all locations in organization
-            locations = await db.locations.find(
-                {"organization_id": user.organization_id},
-                {"_id": 0, "location_id": 1}
-            ).to_list(100)
-            location_ids = [loc["location_id"] for loc in locations]
+            location_ids = topology.location_ids()
             if location_ids:
                 query["location_id"] = {"$in": location_ids}
     elif user and user.role == "CLINIC_ADMIN" and user.clinic_id:
@@ -37,20 +65,39 @@ async def get_doctors(request: Request, clinic_id: Optional[str] = None, locatio
     elif clinic_id:
         query["clinic_id"] = clinic_id
     
-    doctors = await db.doctors.find(query, {"_id": 0}).to_list(100)
+    doctors = await db.doctors.find(query, fieldset.projection()).to_list(100)
+    if not fieldset.wants("location_name", "clinic_name"):
+        return validators.response(fieldset.trim(doctors))
+    
+    # Location names from the organization topology, one query for any others
+    location_names = topology.names() if topology else {}
+    missing = list({doc["location_id"] for doc in doctors if doc.get("location_id")} - set(location_names))
+    if missing:
+        async for location in db.locations.find(
+            {"location_id": {"$in": missing}},
+            {"_id": 0, "location_id": 1, "name": 1}
+        ):
+            location_names[location["location_id"]] = location.get("name")
+    
     for doc in doctors:
         # Try to get location info first, fallback to clinic
         if doc.get("location_id"):
-            location = await db.locations.find_one({"location_id": doc["location_id"]}, {"_id": 0})
-            doc["location_name"] = location.get("name") if location else "Unknown"
+            doc["location_name"] = location_names.get(doc["location_id"]) or "Unknown"
         elif doc.get("clinic_id"):
             clinic = await db.clinics.find_one({"clinic_id": doc["clinic_id"]}, {"_id": 0})
             doc["clinic_name"] = clinic.get("name") if clinic else "Unknown"
-    return doctors
+    return validators.response(fieldset.trim(doctors))
 
 
 @router.get("/{doctor_id}")
-async def get_doctor(doctor_id: str):
+async def get_doctor(doctor_id: str, request: Request):
+    validators = await catalog_versions.validators(request, [DOCTORS, CLINICS])
+    if validators.not_modified:
+        return validators.not_modified_response()
+    return validators.response(await _load_doctor(doctor_id))
+
+
+async def _load_doctor(doctor_id: str) -> dict:
     # Try to get from cache first
     cached_doctor = await doctors_cache.get(doctor_id)
     if cached_doctor:
@@ -155,6 +202,9 @@ async def create_doctor(data: DoctorCreate, request: Request, location_id: Optio
     doc = doctor.model_dump()
     doc['created_at'] = doc['created_at'].isoformat()
     await db.doctors.insert_one(doc)
+    await catalog_versions.bump(DOCTORS)
+    if target_user_id:
+        await doctor_identity.link(target_user_id, doctor.doctor_id)
     return doctor
 
 
@@ -194,7 +244,10 @@ async def update_doctor(doctor_id: str, data: DoctorUpdate, request: Request):
         await db.doctors.update_one({"doctor_id": doctor_id}, {"$set": update_data})
         # Invalidate cache
         await doctors_cache.delete(doctor_id)
-    return await get_doctor(doctor_id)
+        await catalog_versions.bump(DOCTORS)
+        if "email" in update_data or "is_active" in update_data:
+            await doctor_identity.unlink(doctor_id)
+    return await _load_doctor(doctor_id)
 
 
 @router.delete("/{doctor_id}")
@@ -226,6 +279,8 @@ async def delete_doctor(doctor_id: str, request: Request):
     await db.doctors.update_one({"doctor_id": doctor_id}, {"$set": {"is_active": False}})
     # Invalidate cache
     await doctors_cache.delete(doctor_id)
+    await catalog_versions.bump(DOCTORS)
+    await doctor_identity.unlink(doctor_id)
     return {"message": "Doctor deactivated successfully"}
 
 
@@ -309,5 +364,6 @@ async def update_doctor_availability(doctor_id: str, data: dict, request: Reques
     )
     # Invalidate cache
     await doctors_cache.delete(doctor_id)
+    await catalog_versions.bump(DOCTORS)
     updated_doctor = await db.doctors.find_one({"doctor_id": doctor_id}, {"_id": 0})
     return updated_doctor
@@ -3,72 +3,101 @@ from typing import List
 from datetime import datetime, timezone
 
 from ..db import db
+from ..responses import FastJSONResponse
 from ..schemas.favorite import (
     FavoriteDoctor,
     FavoriteDoctorCreate,
     FavoriteDoctorUpdate,
-    FavoriteDoctorStats
+    FavoriteDoctorStats,
+    FavoriteDoctorListItem
 )
 from ..security import require_auth
 
 router = APIRouter(prefix="/favorites", tags=["favorites"])
 
+MAX_FAVORITES = 100
 
-@router.get("/doctors", response_model=List[FavoriteDoctor])
+
+def _appointment_stats_lookup(patient_id: str) -> dict:
+    """
+    `$lookup` stage adding `appointment_stats: [{total, last_completed}]`
+    for the patient's appointments with each favorite's doctor.
+    
+    Served by the (patient_id, doctor_id, status, date_time) index.
+    """
+    return {
+        "$lookup": {
+            "from": "appointments",
+            "localField": "doctor_id",
+            "foreignField": "doctor_id",
+            "pipeline": [
+                {"$match": {"patient_id": patient_id}},
+                {"$group": {
+                    "_id": None,
+                    "total": {"$sum": 1},
+                    "last_completed": {"$max": {
+                        "$cond": [{"$eq": ["$status", "COMPLETED"]}, "$date_time", None]
+                    }}
+                }}
+            ],
+            "as": "appointment_stats"
+        }
+    }
+
+
+@router.get("/doctors", response_model=List[FavoriteDoctorListItem])
 async def get_favorite_doctors(request: Request):
     """Get user's favorite doctors"""
     user = await require_auth(request)
     
-    favorites = await db.favorite_doctors.find(
-        {"user_id": user.user_id},
-        {"_id": 0}
-    ).sort("created_at", -1).to_list(100)
-    
-    # Enrich with latest doctor info
-    for fav in favorites:
-        doctor = await db.doctors.find_one(
-            {"doctor_id": fav["doctor_id"]},
-            {"_id": 0}
-        )
-        
-        if doctor:
-            fav["doctor_name"] = doctor.get("name")
-            fav["doctor_specialty"] = doctor.get("specialty")
-            fav["doctor_clinic_id"] = doctor.get("clinic_id")
-            fav["doctor_picture"] = doctor.get("picture")
-            fav["doctor_consultation_fee"] = doctor.get("consultation_fee")
-            fav["doctor_consultation_duration"] = doctor.get("consultation_duration")
-            
-            # Get clinic name
-            if doctor.get("clinic_id"):
-                clinic = await db.clinics.find_one(
-                    {"clinic_id": doctor["clinic_id"]},
-                    {"_id": 0, "name": 1}
-                )
-                if clinic:
-                    fav["doctor_clinic_name"] = clinic.get("name")
-            
-            # Get last appointment with this doctor
-            last_apt = await db.appointments.find_one(
-                {
-                    "patient_id": user.user_id,
-                    "doctor_id": fav["doctor_id"],
-                    "status": "COMPLETED"
-                },
-                {"_id": 0, "date_time": 1}
-            ).sort("date_time", -1)
-            
-            if last_apt:
-                fav["last_appointment_date"] = last_apt.get("date_time")
-            
-            # Count total appointments with this doctor
-            total_appointments = await db.appointments.count_documents({
-                "patient_id": user.user_id,
-                "doctor_id": fav["doctor_id"]
-            })
-            fav["total_appointments"] = total_appointments
-    
-    return favorites
+    # One aggregation: latest doctor info, clinic name and appointment
+    # history are joined in, instead of four queries per favorite
+    favorites = await db.favorite_doctors.aggregate([
+        {"$match": {"user_id": user.user_id}},
+        {"$sort": {"created_at": -1}},
+        {"$limit": MAX_FAVORITES},
+        {"$lookup": {
+            "from": "doctors",
+            "localField": "doctor_id",
+            "foreignField": "doctor_id",
+            "pipeline": [{"$project": {
+                "_id": 0,
+                "name": 1,
+                "specialty": 1,
+                "clinic_id": 1,
+                "picture": 1,
+                "consultation_fee": 1,
+                "consultation_duration": 1
+            }}],
+            "as": "doctor"
+        }},
+        {"$unwind": {"path": "$doctor", "preserveNullAndEmptyArrays": True}},
+        {"$lookup": {
+            "from": "clinics",
+            "localField": "doctor.clinic_id",
+            "foreignField": "clinic_id",
+            "pipeline": [{"$project": {"_id": 0, "name": 1}}],
+            "as": "clinic"
+        }},
+        _appointment_stats_lookup(user.user_id),
+        {"$set": {
+            "doctor_name": {"$ifNull": ["$doctor.name", "$doctor_name"]},
+            "doctor_specialty": {"$ifNull": ["$doctor.specialty", "$doctor_specialty"]},
+            "doctor_clinic_id": {"$ifNull": ["$doctor.clinic_id", "$doctor_clinic_id"]},
+            "doctor_clinic_name": {"$ifNull": [{"$first": "$clinic.name"}, "$doctor_clinic_name"]},
+            "doctor_picture": "$doctor.picture",
+            "doctor_consultation_fee": "$doctor.consultation_fee",
+            "doctor_consultation_duration": "$doctor.consultation_duration",
+            "last_appointment_date": {"$ifNull": [
+                {"$first": "$appointment_stats.last_completed"},
+                "$last_appointment_date"
+            ]},
+            "total_appointments": {"$ifNull": [{"$first": "$appointment_stats.total"}, 0]}
+        }},
+        {"$unset": ["_id", "doctor", "clinic", "appointment_stats"]}
+    ]).to_list(MAX_FAVORITES)
+    
+    return FastJSONResponse(favorites)
 
 
 @router.post("/doctors", response_model=FavoriteDoctor)
@@ -105,18 +134,18 @@ async def add_favorite_doctor(data: FavoriteDoctorCreate, request: Request):
             clinic_name = clinic.get("name")
     
     # Get last appointment date
-    last_apt = await db.appointments.find_one(
+    last_apt = await db.appointments.find(
         {
             "patient_id": user.user_id,
             "doctor_id": data.doctor_id,
             "status": "COMPLETED"
         },
         {"_id": 0, "date_time": 1}
-    ).sort("date_time", -1)
+    ).sort("date_time", -1).limit(1).to_list(1)
     
     last_appointment_date = None
     if last_apt:
-        last_appointment_date = last_apt.get("date_time")
+        last_appointment_date = last_apt[0].get("date_time")
     
     # Create favorite
     favorite = FavoriteDoctor(
@@ -229,41 +258,22 @@ async def get_favorite_stats(request: Request):
     """Get statistics about favorite doctors"""
     user = await require_auth(request)
     
-    # Count total favorites
-    total_favorites = await db.favorite_doctors.count_documents({
-        "user_id": user.user_id
-    })
-    
-    # Get all favorite doctor IDs
-    favorites = await db.favorite_doctors.find(
-        {"user_id": user.user_id},
-        {"_id": 0, "doctor_id": 1}
-    ).to_list(100)
-    
-    favorite_doctor_ids = [f["doctor_id"] for f in favorites]
-    
-    # Count appointments with favorite doctors
-    total_appointments = 0
-    last_visit = None
-    
-    if favorite_doctor_ids:
-        total_appointments = await db.appointments.count_documents({
-            "patient_id": user.user_id,
-            "doctor_id": {"$in": favorite_doctor_ids}
-        })
-        
-        # Get last visit
-        last_apt = await db.appointments.find_one(
-            {
-                "patient_id": user.user_id,
-                "doctor_id": {"$in": favorite_doctor_ids},
-                "status": "COMPLETED"
-            },
-            {"_id": 0, "date_time": 1}
-        ).sort("date_time", -1)
-        
-        if last_apt:
-            last_visit = last_apt.get("date_time")
+    # Totals over the favorites and their appointment history in one aggregation
+    result = await db.favorite_doctors.aggregate([
+        {"$match": {"user_id": user.user_id}},
+        _appointment_stats_lookup(user.user_id),
+        {"$group": {
+            "_id": None,
+            "total_favorites": {"$sum": 1},
+            "total_appointments": {"$sum": {"$ifNull": [{"$first": "$appointment_stats.total"}, 0]}},
+            "last_visit": {"$max": {"$first": "$appointment_stats.last_completed"}}
+        }}
+    ]).to_list(1)
+    
+    totals = result[0] if result else {}
+    total_favorites = totals.get("total_favorites", 0)
+    total_appointments = totals.get("total_appointments", 0)
+    last_visit = totals.get("last_visit")
     
     return FavoriteDoctorStats(
         total_favorites=total_favorites,
@@ -67,6 +67,7 @@ async def readiness_check():
             checks["redis"] = True
     except Exception as e:
         logger.error(f"Redis health check failed: {e}")
+    checks["redis_circuit"] = redis_client.breaker.snapshot()
     
     # Overall status
     checks["overall"] = checks["database"] and checks["redis"]
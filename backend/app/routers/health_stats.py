@@ -1,17 +1,27 @@
-from fastapi import APIRouter, HTTPException, Request
-from typing import List, Optional
-from datetime import datetime, timezone
+from fastapi import APIRouter, HTTPException, Query, Request
+from typing import Any, List, Optional
+from datetime import datetime, timezone, timedelta
+import json
 
+from ..config import VITALS_BULK_MAX_ITEMS
 from ..db import db
 from ..schemas.health_stats import (
     VitalSign,
     VitalSignCreate,
+    VitalSignBulkResponse,
     LabResult,
     LabResultCreate,
     LabResultUpdate,
     HealthStats
 )
 from ..security import require_auth
+from ..services.health_summary import health_summary, latest_vital
+from ..services.vital_signs import (
+    vital_signs,
+    CHART_DEFAULT_POINTS,
+    CHART_MIN_POINTS,
+    CHART_MAX_POINTS
+)
 
 router = APIRouter(prefix="/health", tags=["health-stats"])
 
@@ -27,16 +37,7 @@ async def get_vital_signs(
     """Get user's vital signs"""
     user = await require_auth(request)
     
-    query = {"user_id": user.user_id}
-    if type:
-        query["type"] = type
-    
-    vitals = await db.vital_signs.find(
-        query,
-        {"_id": 0}
-    ).sort("measured_at", -1).limit(limit).to_list(limit)
-    
-    return vitals
+    return await vital_signs.find_recent(user.user_id, type, limit)
 
 
 @router.post("/vitals", response_model=VitalSign)
@@ -56,27 +57,95 @@ async def add_vital_sign(data: VitalSignCreate, request: Request):
     )
     
     doc = vital.model_dump()
-    doc['measured_at'] = doc['measured_at'].isoformat()
     doc['created_at'] = doc['created_at'].isoformat()
     
-    await db.vital_signs.insert_one(doc)
+    stored = await vital_signs.insert(doc)
+    await health_summary.record_vital(stored)
     
     return vital
 
 
+async def _read_bulk_items(request: Request) -> List[Any]:
+    """
+    Read a bulk upload body: a JSON array (or {"measurements": [...]}), or
+    NDJSON with one measurement per line. NDJSON is consumed as a stream.
+    Lines that are not valid JSON are passed on as-is and reported invalid.
+    """
+    content_type = request.headers.get("content-type", "")
+    items: List[Any] = []
+    
+    def too_many():
+        return HTTPException(
+            status_code=413,
+            detail=f"Too many measurements. Maximum is {VITALS_BULK_MAX_ITEMS} per request."
+        )
+    
+    def add_line(line: bytes):
+        line = line.strip()
+        if not line:
+            return
+        if len(items) >= VITALS_BULK_MAX_ITEMS:
+            raise too_many()
+        try:
+            items.append(json.loads(line))
+        except ValueError:
+            items.append(line.decode("utf-8", errors="replace"))
+    
+    if "ndjson" in content_type or "jsonlines" in content_type:
+        buffer = b""
+        async for chunk in request.stream():
+            buffer += chunk
+            *lines, buffer = buffer.split(b"\n")
+            for line in lines:
+                add_line(line)
+        add_line(buffer)
+        return items
+    
+    try:
+        body = json.loads(await request.body())
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Body must be a JSON array or NDJSON")
+    
+    if isinstance(body, dict):
+        body = body.get("measurements")
+    if not isinstance(body, list):
+        raise HTTPException(status_code=400, detail="Body must be a JSON array of measurements")
+    if len(body) > VITALS_BULK_MAX_ITEMS:
+        raise too_many()
+    return body
+
+
+@router.post("/vitals/bulk", response_model=VitalSignBulkResponse)
+async def add_vital_signs_bulk(request: Request):
+    """
+    Add many vital sign measurements at once (device sync)
+    
+    Accepts a JSON array or NDJSON (`application/x-ndjson`). Measurements
+    already stored for the same type and time are skipped as duplicates;
+    every item gets its own result.
+    """
+    user = await require_auth(request)
+    
+    items = await _read_bulk_items(request)
+    result = await vital_signs.ingest(user.user_id, items)
+    
+    await health_summary.record_vitals(result.pop("inserted"))
+    
+    return result
+
+
 @router.delete("/vitals/{measurement_id}")
 async def delete_vital_sign(measurement_id: str, request: Request):
     """Delete a vital sign measurement"""
     user = await require_auth(request)
     
-    result = await db.vital_signs.delete_one({
-        "measurement_id": measurement_id,
-        "user_id": user.user_id
-    })
+    deleted = await vital_signs.delete(user.user_id, measurement_id)
     
-    if result.deleted_count == 0:
+    if not deleted:
         raise HTTPException(status_code=404, detail="Measurement not found")
     
+    await health_summary.invalidate(user.user_id)
+    
     return {"message": "Measurement deleted"}
 
 
@@ -146,6 +215,7 @@ async def add_lab_result(data: LabResultCreate, request: Request):
     doc['updated_at'] = doc['updated_at'].isoformat()
     
     await db.lab_results.insert_one(doc)
+    await health_summary.record_lab_result(doc)
     
     return result
 
@@ -195,6 +265,7 @@ async def add_lab_result_for_patient(
     doc['updated_at'] = doc['updated_at'].isoformat()
     
     await db.lab_results.insert_one(doc)
+    await health_summary.record_lab_result(doc)
     
     return result
 
@@ -227,6 +298,7 @@ async def update_lab_result(
         {"result_id": result_id},
         {"$set": update_data}
     )
+    await health_summary.invalidate(result['user_id'])
     
     updated = await db.lab_results.find_one({"result_id": result_id}, {"_id": 0})
     return updated
@@ -247,6 +319,7 @@ async def delete_lab_result(result_id: str, request: Request):
         raise HTTPException(status_code=403, detail="Not authorized")
     
     await db.lab_results.delete_one({"result_id": result_id})
+    await health_summary.invalidate(result['user_id'])
     
     return {"message": "Lab result deleted"}
 
@@ -258,31 +331,10 @@ async def get_health_stats(request: Request):
     """Get user's health statistics summary"""
     user = await require_auth(request)
     
-    # Get latest vitals
-    latest_bp = await db.vital_signs.find_one(
-        {"user_id": user.user_id, "type": "blood_pressure"},
-        {"_id": 0}
-    ).sort("measured_at", -1)
+    summary = await health_summary.get_summary(user.user_id)
     
-    latest_hr = await db.vital_signs.find_one(
-        {"user_id": user.user_id, "type": "heart_rate"},
-        {"_id": 0}
-    ).sort("measured_at", -1)
-    
-    latest_temp = await db.vital_signs.find_one(
-        {"user_id": user.user_id, "type": "temperature"},
-        {"_id": 0}
-    ).sort("measured_at", -1)
-    
-    latest_weight = await db.vital_signs.find_one(
-        {"user_id": user.user_id, "type": "weight"},
-        {"_id": 0}
-    ).sort("measured_at", -1)
-    
-    latest_height = await db.vital_signs.find_one(
-        {"user_id": user.user_id, "type": "height"},
-        {"_id": 0}
-    ).sort("measured_at", -1)
+    latest_weight = latest_vital(summary, "weight")
+    latest_height = latest_vital(summary, "height")
     
     # Calculate BMI if we have both weight and height
     bmi = None
@@ -292,43 +344,22 @@ async def get_health_stats(request: Request):
         if height_m > 0:
             bmi = round(weight_kg / (height_m ** 2), 1)
     
-    # Count measurements
-    total_vitals = await db.vital_signs.count_documents({"user_id": user.user_id})
-    total_labs = await db.lab_results.count_documents({"user_id": user.user_id})
-    pending_labs = await db.lab_results.count_documents({
-        "user_id": user.user_id,
-        "status": "PENDING"
-    })
-    abnormal_labs = await db.lab_results.count_documents({
-        "user_id": user.user_id,
-        "status": "ABNORMAL"
-    })
-    
-    # Get last measurement dates
-    last_vital = await db.vital_signs.find_one(
-        {"user_id": user.user_id},
-        {"_id": 0, "measured_at": 1}
-    ).sort("measured_at", -1)
-    
-    last_lab = await db.lab_results.find_one(
-        {"user_id": user.user_id},
-        {"_id": 0, "test_date": 1}
-    ).sort("test_date", -1)
+    labs_by_status = summary.get("labs_by_status") or {}
     
     return HealthStats(
         user_id=user.user_id,
-        latest_blood_pressure=latest_bp,
-        latest_heart_rate=latest_hr,
-        latest_temperature=latest_temp,
+        latest_blood_pressure=latest_vital(summary, "blood_pressure"),
+        latest_heart_rate=latest_vital(summary, "heart_rate"),
+        latest_temperature=latest_vital(summary, "temperature"),
         latest_weight=latest_weight,
         latest_height=latest_height,
         latest_bmi=bmi,
-        total_vital_measurements=total_vitals,
-        total_lab_results=total_labs,
-        pending_lab_results=pending_labs,
-        abnormal_lab_results=abnormal_labs,
-        last_measurement_date=last_vital.get('measured_at') if last_vital else None,
-        last_lab_test_date=last_lab.get('test_date') if last_lab else None
+        total_vital_measurements=summary.get("total_vitals", 0),
+        total_lab_results=summary.get("total_labs", 0),
+        pending_lab_results=labs_by_status.get("PENDING", 0),
+        abnormal_lab_results=labs_by_status.get("ABNORMAL", 0),
+        last_measurement_date=summary.get("last_measurement_date"),
+        last_lab_test_date=summary.get("last_lab_test_date")
     )
 
 
@@ -336,25 +367,28 @@ async def get_health_stats(request: Request):
 async def get_vitals_chart_data(
     type: str,
     request: Request,
-    days: int = 30
+    days: int = 30,
+    points: int = Query(
+        CHART_DEFAULT_POINTS,
+        ge=CHART_MIN_POINTS,
+        le=CHART_MAX_POINTS,
+        description="Maximum number of points to return"
+    )
 ):
-    """Get vital signs data for charting"""
+    """
+    Get vital signs data for charting
+    
+    Measurements are downsampled on the server into at most `points`
+    time buckets (average as `value`, plus min/max/count per bucket).
+    """
     user = await require_auth(request)
     
-    from datetime import timedelta
-    start_date = datetime.now(timezone.utc) - timedelta(days=days)
+    end_date = datetime.now(timezone.utc)
+    start_date = end_date - timedelta(days=days)
     
-    vitals = await db.vital_signs.find(
-        {
-            "user_id": user.user_id,
-            "type": type,
-            "measured_at": {"$gte": start_date.isoformat()}
-        },
-        {"_id": 0, "measured_at": 1, "value": 1, "value_secondary": 1, "unit": 1}
-    ).sort("measured_at", 1).to_list(1000)
+    chart = await vital_signs.chart(user.user_id, type, start_date, end_date, points)
     
     return {
         "type": type,
-        "data": vitals,
-        "count": len(vitals)
+        **chart
     }
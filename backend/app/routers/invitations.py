@@ -27,6 +27,7 @@ from ..schemas.user import User, UserRole
 from ..schemas.audit_log import AuditActions
 from ..security import require_auth, hash_password, create_session
 from ..services.permissions import PermissionService
+from ..services.doctor_identity import doctor_identity
 from ..services.email import send_staff_invitation_email
 from ..config import FRONTEND_URL
 from ..middleware.permissions import require_role
@@ -93,7 +94,7 @@ async def create_invitation(
     
     # Verify user has access to assigned locations
     if data.location_ids:
-        accessible_locations = await PermissionService.get_accessible_locations(user)
+        accessible_locations = await PermissionService.get_accessible_locations(user, request)
         for loc_id in data.location_ids:
             if loc_id not in accessible_locations:
                 raise HTTPException(
@@ -210,7 +211,7 @@ async def list_invitations(
     
     # Filter by accessible locations for LOCATION_ADMIN
     if user.role == UserRole.LOCATION_ADMIN:
-        accessible_locations = await PermissionService.get_accessible_locations(user)
+        accessible_locations = await PermissionService.get_accessible_locations(user, request)
         invitations = [
             inv for inv in invitations
             if any(loc_id in accessible_locations for loc_id in inv.get("location_ids", []))
@@ -240,7 +241,7 @@ async def get_invitation(invitation_id: str, request: Request):
     
     # For LOCATION_ADMIN, check location access
     if user.role == UserRole.LOCATION_ADMIN:
-        accessible_locations = await PermissionService.get_accessible_locations(user)
+        accessible_locations = await PermissionService.get_accessible_locations(user, request)
         if not any(loc_id in accessible_locations for loc_id in invitation.get("location_ids", [])):
             raise HTTPException(status_code=403, detail="Access denied")
     
@@ -382,6 +383,14 @@ async def accept_invitation(data: InvitationAccept, response: Response):
         is_email_verified=True
     )
     
+    # Link a doctor profile created before the invitation was accepted
+    if user_role == UserRole.DOCTOR:
+        new_user.doctor_id = await doctor_identity.lookup(
+            new_user.email,
+            invitation.get("clinic_id"),
+            invitation["organization_id"]
+        )
+    
     user_doc = new_user.model_dump()
     user_doc['created_at'] = user_doc['created_at'].isoformat()
     user_doc['permissions_updated_at'] = user_doc['permissions_updated_at'].isoformat()
@@ -5,6 +5,8 @@ import uuid
 from ..db import db
 from ..schemas.location import Location, LocationCreate, LocationUpdate
 from ..security import require_auth
+from ..services.org_topology import org_topology
+from ..services.catalog_versions import catalog_versions, LOCATIONS
 
 router = APIRouter(prefix="/locations", tags=["locations"])
 
@@ -150,6 +152,9 @@ async def create_location(data: LocationCreate, request: Request):
             detail=f"Failed to create location: {str(e)}"
         )
     
+    await org_topology.invalidate(user.organization_id)
+    await catalog_versions.bump(LOCATIONS)
+    
     # Return the created location (without _id)
     created_location = await db.locations.find_one(
         {"location_id": location_id},
@@ -198,6 +203,8 @@ async def update_location(location_id: str, data: LocationUpdate, request: Reque
             {"location_id": location_id},
             {"$set": update_data}
         )
+        await org_topology.invalidate(location['organization_id'])
+        await catalog_versions.bump(LOCATIONS)
     
     # Return updated location
     updated_location = await db.locations.find_one(
@@ -253,5 +260,7 @@ async def delete_location(location_id: str, request: Request):
             "updated_at": datetime.now(timezone.utc).isoformat()
         }}
     )
+    await org_topology.invalidate(location['organization_id'])
+    await catalog_versions.bump(LOCATIONS)
     
     return {"message": "Location deleted successfully"}
@@ -0,0 +1,32 @@
+"""
+Prometheus Metrics Endpoint
+Exposition endpoint scraped by Prometheus
+"""
+
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import Response
+import hmac
+
+from ..config import METRICS_TOKEN
+from ..services.metrics import CONTENT_TYPE_LATEST, METRICS_ACTIVE, render_metrics
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics", include_in_schema=False)
+async def prometheus_metrics(request: Request):
+    """
+    Prometheus exposition format.
+    
+    Aggregates samples from every worker when PROMETHEUS_MULTIPROC_DIR is
+    set. Requires `Authorization: Bearer <METRICS_TOKEN>` if configured.
+    """
+    if METRICS_TOKEN:
+        supplied = request.headers.get("Authorization", "").removeprefix("Bearer ").strip()
+        if not hmac.compare_digest(supplied, METRICS_TOKEN):
+            raise HTTPException(status_code=401, detail="Invalid metrics token")
+    
+    if not METRICS_ACTIVE:
+        raise HTTPException(status_code=404, detail="Metrics are disabled")
+    
+    return Response(content=await render_metrics(), media_type=CONTENT_TYPE_LATEST)
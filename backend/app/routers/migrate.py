@@ -6,6 +6,7 @@ This should be protected and only accessible by admins.
 from fastapi import APIRouter, Request, HTTPException
 from ..db import db
 from ..security import require_clinic_admin
+from ..services.catalog_versions import catalog_versions, SERVICES
 
 router = APIRouter(prefix="/migrate", tags=["migration"])
 
@@ -53,6 +54,9 @@ async def migrate_services_multilingual(request: Request):
             )
             migrated_count += 1
     
+    if migrated_count:
+        await catalog_versions.bump(SERVICES)
+    
     return {
         "message": "Migration completed successfully",
         "services_migrated": migrated_count,
@@ -1,24 +1,29 @@
 from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
 from typing import Optional, List
 from datetime import datetime, timezone
 
 from ..db import db
+from ..responses import FastJSONResponse
 from ..schemas.notification import (
     Notification,
+    NotificationListItem,
     NotificationCreate,
     NotificationUpdate,
     NotificationPreferences,
+    NOTIFICATION_PREFERENCE_DEFAULTS,
     NotificationPreferencesUpdate,
     NotificationStats,
-    NotificationType,
-    NotificationPriority
+    NotificationType
 )
 from ..security import require_auth
+from ..services.notification_counters import NotificationCounterService
+from ..services.notification_stream import notification_stream
 
 router = APIRouter(prefix="/notifications", tags=["notifications"])
 
 
-@router.get("/me", response_model=List[Notification])
+@router.get("/me", response_model=List[NotificationListItem])
 async def get_my_notifications(
     request: Request,
     unread_only: bool = False,
@@ -30,50 +35,65 @@ async def get_my_notifications(
     
     query = {"user_id": user.user_id}
     if unread_only:
-        query["is_read"] = False
+        query["is_read"] = {"$ne": True}
     
     notifications = await db.notifications.find(
         query,
         {"_id": 0}
     ).sort("created_at", -1).skip(skip).limit(limit).to_list(limit)
     
-    return notifications
+    return FastJSONResponse(notifications)
 
 
 @router.get("/me/stats", response_model=NotificationStats)
-async def get_notification_stats(request: Request):
-    """Get notification statistics for current user"""
+async def get_notification_stats(request: Request, breakdown: bool = True):
+    """
+    Get notification statistics for current user.
+    
+    Totals come from the materialized counter document. Pass
+    `breakdown=false` (as the notification bell does) to skip the
+    per-type/per-priority aggregation.
+    """
     user = await require_auth(request)
     
-    # Get all notifications
-    all_notifications = await db.notifications.find(
-        {"user_id": user.user_id},
-        {"_id": 0}
-    ).to_list(1000)
-    
-    # Calculate stats
-    total = len(all_notifications)
-    unread = sum(1 for n in all_notifications if not n.get("is_read", False))
-    read = total - unread
-    
-    # Group by type
-    by_type = {}
-    for n in all_notifications:
-        n_type = n.get("type", "UNKNOWN")
-        by_type[n_type] = by_type.get(n_type, 0) + 1
-    
-    # Group by priority
-    by_priority = {}
-    for n in all_notifications:
-        priority = n.get("priority", NotificationPriority.MEDIUM)
-        by_priority[priority] = by_priority.get(priority, 0) + 1
-    
-    return NotificationStats(
-        total_notifications=total,
-        unread_count=unread,
-        read_count=read,
-        by_type=by_type,
-        by_priority=by_priority
+    counters = await NotificationCounterService.get_counters(user.user_id)
+    
+    stats = NotificationStats(
+        total_notifications=counters["total"],
+        unread_count=counters["unread"],
+        read_count=max(counters["total"] - counters["unread"], 0)
+    )
+    
+    if breakdown:
+        groups = await NotificationCounterService.get_breakdown(user.user_id)
+        stats.by_type = groups["by_type"]
+        stats.by_priority = groups["by_priority"]
+    
+    return stats
+
+
+@router.get("/stream")
+async def stream_notifications(request: Request, last_event_id: Optional[str] = None):
+    """
+    Server-Sent Events stream of the current user's notifications.
+    
+    Emits `notification` events (id = notification_id) for new notifications
+    and `unread_count` events whenever the counters change, plus a comment
+    heartbeat when idle. Reconnecting clients send `Last-Event-ID` (or the
+    `last_event_id` query parameter) to receive what they missed.
+    """
+    user = await require_auth(request)
+    
+    resume_from = request.headers.get("Last-Event-ID") or last_event_id
+    counters = await NotificationCounterService.get_counters(user.user_id)
+    
+    return StreamingResponse(
+        notification_stream.event_source(request, user.user_id, counters, resume_from),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"
+        }
     )
 
 
@@ -105,10 +125,20 @@ async def update_notification(
     if update_data.get("is_read") is False:
         update_data["read_at"] = None
     
-    await db.notifications.update_one(
-        {"notification_id": notification_id},
-        {"$set": update_data}
-    )
+    # Only count a read-state transition if this update actually flipped it
+    read_changing = update_data.get("is_read") is not None
+    read_filter = {"notification_id": notification_id}
+    if read_changing:
+        # A missing is_read counts as unread (see NotificationCounterService)
+        read_filter["is_read"] = {"$ne": True} if update_data["is_read"] else True
+    
+    result = await db.notifications.update_one(read_filter, {"$set": update_data})
+    
+    if read_changing and result.modified_count:
+        await NotificationCounterService.record_read_state(
+            user.user_id,
+            update_data["is_read"]
+        )
     
     updated = await db.notifications.find_one(
         {"notification_id": notification_id},
@@ -124,7 +154,7 @@ async def mark_all_notifications_read(request: Request):
     user = await require_auth(request)
     
     result = await db.notifications.update_many(
-        {"user_id": user.user_id, "is_read": False},
+        {"user_id": user.user_id, "is_read": {"$ne": True}},
         {
             "$set": {
                 "is_read": True,
@@ -133,6 +163,8 @@ async def mark_all_notifications_read(request: Request):
         }
     )
     
+    await NotificationCounterService.record_all_read(user.user_id, result.modified_count)
+    
     return {
         "message": "All notifications marked as read",
         "updated_count": result.modified_count
@@ -153,7 +185,13 @@ async def delete_notification(notification_id: str, request: Request):
     if not notification:
         raise HTTPException(status_code=404, detail="Notification not found")
     
-    await db.notifications.delete_one({"notification_id": notification_id})
+    result = await db.notifications.delete_one({"notification_id": notification_id})
+    
+    if result.deleted_count:
+        await NotificationCounterService.record_deleted(
+            user.user_id,
+            notification.get("is_read", False)
+        )
     
     return {"message": "Notification deleted successfully"}
 
@@ -165,6 +203,8 @@ async def clear_all_notifications(request: Request):
     
     result = await db.notifications.delete_many({"user_id": user.user_id})
     
+    await NotificationCounterService.reset(user.user_id)
+    
     return {
         "message": "All notifications cleared",
         "deleted_count": result.deleted_count
@@ -184,12 +224,11 @@ async def get_notification_preferences(request: Request):
     )
     
     if not preferences:
-        # Create default preferences
-        default_prefs = NotificationPreferences(user_id=user.user_id)
-        await db.notification_preferences.insert_one(default_prefs.model_dump())
-        return default_prefs
+        # Create default preferences (dumped once, stored and returned as-is)
+        preferences = NotificationPreferences(user_id=user.user_id).model_dump()
+        await db.notification_preferences.insert_one({**preferences})
     
-    return preferences
+    return FastJSONResponse({**NOTIFICATION_PREFERENCE_DEFAULTS, **preferences})
 
 
 @router.put("/preferences")
@@ -267,6 +306,8 @@ async def create_notification(data: NotificationCreate, request: Request):
         doc['sent_at'] = doc['sent_at'].isoformat()
     
     await db.notifications.insert_one(doc)
+    await notification_stream.publish_notification(doc)
+    await NotificationCounterService.record_created(notification.user_id, notification.is_read)
     
     # TODO: Send actual notification via email/push/sms based on user preferences
     # This will be handled by the notification service
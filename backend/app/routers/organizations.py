@@ -15,6 +15,7 @@ from ..schemas.user import User
 from ..schemas.access_request import AccessRequest, AccessRequestCreate
 from ..security import hash_password, create_session, get_current_user, require_auth
 from ..services.email import send_password_reset_email
+from ..services.catalog_versions import catalog_versions, LOCATIONS
 
 router = APIRouter(prefix="/organizations", tags=["organizations"])
 
@@ -126,6 +127,7 @@ async def register_organization(data: OrganizationRegistration, response: Respon
     location_doc = location.model_dump()
     location_doc['created_at'] = location_doc['created_at'].isoformat()
     await db.locations.insert_one(location_doc)
+    await catalog_versions.bump(LOCATIONS)
     
     # Create super admin user
     admin_user = User(
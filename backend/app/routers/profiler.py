@@ -0,0 +1,68 @@
+from fastapi import APIRouter, Request
+from typing import Optional
+
+from ..security import require_super_admin
+from ..services.query_profiler import query_profiler
+
+router = APIRouter(prefix="/profiler", tags=["profiler"])
+
+
+@router.get("/requests")
+async def get_profiled_requests(
+    request: Request,
+    limit: int = 50,
+    route: Optional[str] = None,
+    min_queries: int = 0
+):
+    """
+    Recent requests with their query counts and DB time (Super Admin only).
+    
+    Sorted by query count so N+1 offenders come first.
+    """
+    await require_super_admin(request)
+    
+    entries = [
+        entry for entry in list(query_profiler.recent_requests)
+        if entry["query_count"] >= min_queries
+        and (route is None or entry["route"] == route)
+    ]
+    entries.sort(key=lambda e: (e["query_count"], e["db_time_ms"]), reverse=True)
+    
+    return {
+        "total": len(entries),
+        "requests": entries[:max(1, min(limit, 500))]
+    }
+
+
+@router.get("/routes")
+async def get_profiled_routes(request: Request, limit: int = 20):
+    """Per-route query statistics over the recent request window (Super Admin only)."""
+    await require_super_admin(request)
+    return {"routes": query_profiler.top_routes(limit)}
+
+
+@router.get("/slow-queries")
+async def get_slow_queries(request: Request, limit: int = 50):
+    """
+    Commands slower than SLOW_QUERY_MS, newest first (Super Admin only).
+    
+    Filters are reported as shapes (keys and operators only), never values.
+    """
+    await require_super_admin(request)
+    
+    entries = list(query_profiler.slow_queries)
+    entries.reverse()
+    
+    return {
+        "threshold_ms": query_profiler.slow_query_ms,
+        "total": len(entries),
+        "queries": entries[:max(1, min(limit, 200))]
+    }
+
+
+@router.delete("/reset")
+async def reset_profiler(request: Request):
+    """Clear recorded requests and slow queries (Super Admin only)."""
+    await require_super_admin(request)
+    query_profiler.reset()
+    return {"message": "Profiler data cleared"}
@@ -1,61 +1,130 @@
-from fastapi import APIRouter, HTTPException, Request
+from fastapi import APIRouter, HTTPException, Query, Request
 from datetime import datetime, timezone
+from typing import Optional
+import asyncio
 from ..db import db
 from ..schemas.medical_record import MedicalRecord, MedicalRecordCreate
 from ..schemas.prescription import Prescription, PrescriptionCreate
 from ..security import require_auth
+from ..services.cache import doctors_cache
+from ..services.doctor_identity import doctor_identity
+from ..services.pagination import paginate
 
 router = APIRouter(prefix="", tags=["records"])
 
 
+HISTORY_SECTIONS = ("appointments", "prescriptions", "medical_records")
+
+
+async def _history_appointments(query: dict, limit: int, cursor: Optional[str]):
+    appointments, next_cursor = await paginate(
+        db.appointments, query, "date_time", "appointment_id", limit, cursor
+    )
+    
+    # Cached doctor cards in one round trip, one lookup for the rest of the page
+    doctor_ids = list({apt["doctor_id"] for apt in appointments if apt.get("doctor_id")})
+    doctors = await doctors_cache.get_many(doctor_ids)
+    missing = [doctor_id for doctor_id in doctor_ids if doctor_id not in doctors]
+    if missing:
+        async for doctor in db.doctors.find(
+            {"doctor_id": {"$in": missing}},
+            {"_id": 0, "doctor_id": 1, "name": 1, "specialty": 1}
+        ):
+            doctors[doctor["doctor_id"]] = doctor
+    
+    for apt in appointments:
+        doctor = doctors.get(apt.get("doctor_id"))
+        apt["doctor_name"] = doctor.get("name") if doctor else "Unknown"
+        apt["doctor_specialty"] = doctor.get("specialty") if doctor else "Unknown"
+    
+    return appointments, next_cursor
+
+
 @router.get("/patients/{patient_id}/history")
-async def get_patient_history(patient_id: str, request: Request):
+async def get_patient_history(
+    patient_id: str,
+    request: Request,
+    limit: int = Query(100, ge=1, le=100, description="Items per section"),
+    sections: Optional[str] = Query(None, description="Comma-separated sections to load (default: all)"),
+    appointments_cursor: Optional[str] = None,
+    prescriptions_cursor: Optional[str] = None,
+    medical_records_cursor: Optional[str] = None
+):
+    """
+    Get a patient's appointments, prescriptions and medical records.
+    
+    Sections are loaded concurrently, newest first, and paginated
+    independently: pass a section's `next_cursors` value back as
+    `<section>_cursor` (optionally with `sections=<section>`) to load its
+    next page.
+    """
     user = await require_auth(request)
     if user.role == "USER" and user.user_id != patient_id:
         raise HTTPException(status_code=403, detail="Access denied")
+    
+    requested = HISTORY_SECTIONS
+    if sections:
+        requested = tuple(name for name in HISTORY_SECTIONS if name in {s.strip() for s in sections.split(",")})
+    
+    # Resolve the doctor identity once; it scopes both access and the sections
+    doctor_id = None
     if user.role == "DOCTOR":
-        doctor = await db.doctors.find_one({"email": user.email.lower(), "clinic_id": user.clinic_id}, {"_id": 0})
-        if not doctor:
+        doctor_id = await doctor_identity.resolve(user)
+        if not doctor_id:
             raise HTTPException(status_code=403, detail="Doctor record not found")
-        has_appointment = await db.appointments.find_one({
+    
+    access_check = None
+    if user.role == "DOCTOR":
+        access_check = db.appointments.find_one({
             "patient_id": patient_id,
-            "doctor_id": doctor["doctor_id"],
+            "doctor_id": doctor_id,
             "status": "COMPLETED"
-        }, {"_id": 0})
-        if not has_appointment:
+        }, {"_id": 1})
+    elif user.role == "CLINIC_ADMIN":
+        access_check = db.appointments.find_one(
+            {"patient_id": patient_id, "clinic_id": user.clinic_id},
+            {"_id": 1}
+        )
+    
+    # Access check and patient lookup are independent reads
+    patient, has_access = await asyncio.gather(
+        db.users.find_one({"user_id": patient_id}, {"_id": 0, "password_hash": 0}),
+        access_check if access_check is not None else asyncio.sleep(0, result=True)
+    )
+    if not has_access:
+        if user.role == "DOCTOR":
             raise HTTPException(status_code=403, detail="You can only view history for patients you have treated")
-    if user.role == "CLINIC_ADMIN":
-        patient_in_clinic = await db.appointments.find_one({"patient_id": patient_id, "clinic_id": user.clinic_id}, {"_id": 0})
-        if not patient_in_clinic:
-            raise HTTPException(status_code=403, detail="Patient not found in your clinic")
-    patient = await db.users.find_one({"user_id": patient_id}, {"_id": 0, "password_hash": 0})
+        raise HTTPException(status_code=403, detail="Patient not found in your clinic")
     if not patient:
         raise HTTPException(status_code=404, detail="Patient not found")
-    query_filter = {"patient_id": patient_id}
-    if user.role == "DOCTOR":
-        doctor = await db.doctors.find_one({"email": user.email.lower()}, {"_id": 0})
-        query_filter["doctor_id"] = doctor["doctor_id"]
+    
+    appointment_filter = {"patient_id": patient_id}
+    record_filter = {"patient_id": patient_id}
+    if doctor_id:
+        appointment_filter["doctor_id"] = doctor_id
+        record_filter["doctor_id"] = doctor_id
     elif user.role == "CLINIC_ADMIN":
-        query_filter["clinic_id"] = user.clinic_id
-    appointments = await db.appointments.find(query_filter, {"_id": 0}).sort("date_time", -1).to_list(100)
-    for apt in appointments:
-        doctor = await db.doctors.find_one({"doctor_id": apt["doctor_id"]}, {"_id": 0})
-        apt["doctor_name"] = doctor.get("name") if doctor else "Unknown"
-        apt["doctor_specialty"] = doctor.get("specialty") if doctor else "Unknown"
-    prescriptions = await db.prescriptions.find(
-        {"patient_id": patient_id} if user.role != "DOCTOR" else {"patient_id": patient_id, "doctor_id": doctor["doctor_id"]},
-        {"_id": 0}
-    ).sort("created_at", -1).to_list(100)
-    medical_records = await db.medical_records.find(
-        {"patient_id": patient_id} if user.role != "DOCTOR" else {"patient_id": patient_id, "doctor_id": doctor["doctor_id"]},
-        {"_id": 0}
-    ).sort("created_at", -1).to_list(100)
-    return {
-        "patient": patient,
-        "appointments": appointments,
-        "prescriptions": prescriptions,
-        "medical_records": medical_records
+        appointment_filter["clinic_id"] = user.clinic_id
+    
+    loaders = {
+        "appointments": lambda: _history_appointments(appointment_filter, limit, appointments_cursor),
+        "prescriptions": lambda: paginate(
+            db.prescriptions, record_filter, "created_at", "prescription_id", limit, prescriptions_cursor
+        ),
+        "medical_records": lambda: paginate(
+            db.medical_records, record_filter, "created_at", "record_id", limit, medical_records_cursor
+        ),
     }
+    pages = await asyncio.gather(*(loaders[name]() for name in requested))
+    
+    history = {"patient": patient}
+    next_cursors = {}
+    for name, (items, next_cursor) in zip(requested, pages):
+        history[name] = items
+        next_cursors[name] = next_cursor
+    history["next_cursors"] = next_cursors
+    
+    return history
 
 
 @router.post("/prescriptions")
@@ -67,8 +136,7 @@ async def create_prescription(data: PrescriptionCreate, request: Request):
     if not appointment:
         raise HTTPException(status_code=404, detail="Appointment not found")
     if user.role == "DOCTOR":
-        doctor = await db.doctors.find_one({"email": user.email.lower()}, {"_id": 0})
-        if not doctor or doctor["doctor_id"] != appointment["doctor_id"]:
+        if await doctor_identity.resolve(user) != appointment["doctor_id"]:
             raise HTTPException(status_code=403, detail="You can only create prescriptions for your own appointments")
     prescription = Prescription(
         appointment_id=data.appointment_id,
@@ -93,8 +161,7 @@ async def create_medical_record(data: MedicalRecordCreate, request: Request):
     if not appointment:
         raise HTTPException(status_code=404, detail="Appointment not found")
     if user.role == "DOCTOR":
-        doctor = await db.doctors.find_one({"email": user.email.lower()}, {"_id": 0})
-        if not doctor or doctor["doctor_id"] != appointment["doctor_id"]:
+        if await doctor_identity.resolve(user) != appointment["doctor_id"]:
             raise HTTPException(status_code=403, detail="You can only create medical records for your own appointments")
     record = MedicalRecord(
         appointment_id=data.appointment_id,
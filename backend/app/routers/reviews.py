@@ -3,14 +3,19 @@ from datetime import datetime, timezone
 from ..db import db
 from ..schemas.review import Review, ReviewCreate, ReviewResponse
 from ..security import require_auth, require_clinic_admin
+from ..services.clinic_ratings import clinic_ratings
+from ..services.catalog_versions import catalog_versions, reviews_scope
 
 router = APIRouter(prefix="/clinics/{clinic_id}/reviews", tags=["reviews"])
 
 
 @router.get("")
-async def get_clinic_reviews(clinic_id: str):
+async def get_clinic_reviews(clinic_id: str, request: Request):
+    validators = await catalog_versions.validators(request, [reviews_scope(clinic_id)])
+    if validators.not_modified:
+        return validators.not_modified_response()
     reviews = await db.reviews.find({"clinic_id": clinic_id}, {"_id": 0}).sort("created_at", -1).to_list(100)
-    return reviews
+    return validators.response(reviews)
 
 
 @router.post("")
@@ -28,6 +33,8 @@ async def create_review(clinic_id: str, data: ReviewCreate, request: Request):
     doc = review.model_dump()
     doc['created_at'] = doc['created_at'].isoformat()
     await db.reviews.insert_one(doc)
+    await clinic_ratings.record_review(clinic_id, data.rating)
+    await catalog_versions.bump(reviews_scope(clinic_id))
     return review
 
 
@@ -46,5 +53,6 @@ async def respond_to_review(clinic_id: str, review_id: str, data: ReviewResponse
         "admin_response": formatted_response,
         "admin_response_at": datetime.now(timezone.utc).isoformat()
     }})
+    await catalog_versions.bump(reviews_scope(clinic_id))
     updated_review = await db.reviews.find_one({"review_id": review_id}, {"_id": 0})
     return updated_review
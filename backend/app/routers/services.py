@@ -3,6 +3,7 @@ from typing import Optional
 from ..db import db
 from ..schemas.service import Service, ServiceCreate
 from ..security import get_current_user
+from ..services.catalog_versions import catalog_versions, SERVICES
 
 router = APIRouter(prefix="/services", tags=["services"])
 
@@ -11,6 +12,18 @@ router = APIRouter(prefix="/services", tags=["services"])
 async def get_services(request: Request, clinic_id: Optional[str] = None, location_id: Optional[str] = None):
     user = await get_current_user(request)
     
+    # The admin branches below ignore the query params and list the admin's own scope
+    variant = None
+    if user and user.role == "SUPER_ADMIN" and user.organization_id:
+        variant = [user.role, user.organization_id]
+    elif user and user.role == "LOCATION_ADMIN" and user.assigned_location_ids:
+        variant = [user.role, user.assigned_location_ids]
+    elif user and user.role == "CLINIC_ADMIN" and user.clinic_id:
+        variant = [user.role, user.clinic_id]
+    validators = await catalog_versions.validators(request, [SERVICES], variant)
+    if validators.not_modified:
+        return validators.not_modified_response()
+    
     # Build query based on user role and parameters
     query = {"is_active": True}
     
@@ -30,7 +43,7 @@ async def get_services(request: Request, clinic_id: Optional[str] = None, locati
             query["clinic_id"] = clinic_id
     
     services = await db.services.find(query, {"_id": 0}).to_list(100)
-    return services
+    return validators.response(services)
 
 
 @router.post("")
@@ -88,6 +101,7 @@ async def create_service(data: ServiceCreate, request: Request):
     doc = service.model_dump()
     doc['created_at'] = doc['created_at'].isoformat()
     await db.services.insert_one(doc)
+    await catalog_versions.bump(SERVICES)
     return service
 
 
@@ -132,6 +146,7 @@ async def update_service(service_id: str, data: ServiceCreate, request: Request)
         {"service_id": service_id},
         {"$set": update_data}
     )
+    await catalog_versions.bump(SERVICES)
     updated_service = await db.services.find_one({"service_id": service_id}, {"_id": 0})
     return updated_service
 
@@ -163,4 +178,5 @@ async def delete_service(service_id: str, request: Request):
         raise HTTPException(status_code=403, detail="Not authorized to delete this service")
     
     await db.services.update_one({"service_id": service_id}, {"$set": {"is_active": False}})
+    await catalog_versions.bump(SERVICES)
     return {"message": "Service removed successfully"}
@@ -1,5 +1,6 @@
 from datetime import datetime, timezone
 from typing import Optional
+from typing_extensions import TypedDict
 from pydantic import BaseModel, Field, ConfigDict
 import uuid
 from .common import RecurrencePattern
@@ -49,3 +50,32 @@ class AppointmentUpdate(BaseModel):
 
 class AppointmentCancel(BaseModel):
     reason: str
+
+
+class AppointmentListItem(TypedDict, total=False):
+    """
+    Appointment as returned by list endpoints.
+    
+    A TypedDict rather than a model: list handlers return Mongo documents
+    as-is through FastJSONResponse, so this documents the shape without a
+    per-item validation pass.
+    """
+    appointment_id: str
+    patient_id: str
+    patient_name: Optional[str]
+    patient_email: Optional[str]
+    patient_phone: Optional[str]
+    doctor_id: str
+    doctor_name: str
+    doctor_specialty: str
+    clinic_id: str
+    location_id: Optional[str]
+    date_time: str
+    duration: int
+    status: str
+    notes: Optional[str]
+    cancellation_reason: Optional[str]
+    recurrence: Optional[dict]
+    parent_appointment_id: Optional[str]
+    is_own_patient: bool
+    created_at: str
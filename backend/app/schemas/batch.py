@@ -0,0 +1,18 @@
+from typing import Dict, List, Literal, Optional
+from pydantic import BaseModel, Field
+
+from ..config import BATCH_MAX_REQUESTS
+
+
+class BatchSubRequest(BaseModel):
+    """One GET request inside a batch, e.g. {"id": "stats", "path": "/api/stats"}."""
+    id: Optional[str] = None
+    method: Literal["GET"] = "GET"
+    path: str = Field(..., description="API path including the query string")
+    # Forwarded as request headers (If-None-Match, If-Modified-Since, X-Location-ID)
+    headers: Dict[str, str] = Field(default_factory=dict)
+
+
+class BatchRequest(BaseModel):
+    requests: List[BatchSubRequest] = Field(..., min_length=1, max_length=BATCH_MAX_REQUESTS)
+
@@ -1,5 +1,6 @@
 from datetime import datetime, timezone
-from typing import Optional
+from typing import List, Optional
+from typing_extensions import TypedDict
 from pydantic import BaseModel, Field
 import uuid
 
@@ -53,3 +54,32 @@ class MedicalCenterResponse(BaseModel):
     phone: Optional[str] = None
     email: Optional[str] = None
     description: Optional[str] = None
+
+
+class CenterListItem(TypedDict, total=False):
+    """Clinic card in center search results (only the fields the cards show)."""
+    clinic_id: str
+    name: Optional[str]
+    description: Optional[str]
+    address: Optional[str]
+    city: Optional[str]
+    county: Optional[str]
+    phone: Optional[str]
+    email: Optional[str]
+    logo_url: Optional[str]
+    is_verified: bool
+    average_rating: float
+    review_count: int
+
+
+class CenterListResponse(TypedDict):
+    """Response schema for center search"""
+    count: int
+    county_filter: str
+    city_filter: str
+    search_term: Optional[str]
+    results: List[CenterListItem]
+
+
+# Mongo projection loading only the center card fields
+CENTER_LIST_PROJECTION = {"_id": 0, **{field: 1 for field in CenterListItem.__annotations__}}
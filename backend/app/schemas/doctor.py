@@ -1,5 +1,6 @@
 from datetime import datetime, timezone
 from typing import Optional
+from typing_extensions import TypedDict
 from pydantic import BaseModel, Field, ConfigDict
 import uuid
 
@@ -58,3 +59,26 @@ class DoctorUpdate(BaseModel):
     currency: Optional[str] = None
     is_active: Optional[bool] = None
     availability_schedule: Optional[dict] = None
+
+
+class DoctorListItem(TypedDict, total=False):
+    """Doctor as returned by list endpoints (documents are served unvalidated)."""
+    doctor_id: str
+    user_id: Optional[str]
+    clinic_id: Optional[str]
+    clinic_name: str
+    location_id: Optional[str]
+    location_name: str
+    organization_id: Optional[str]
+    name: str
+    email: str
+    phone: Optional[str]
+    specialty: str
+    bio: Optional[str]
+    picture: Optional[str]
+    consultation_duration: int
+    consultation_fee: float
+    currency: str
+    is_active: bool
+    availability_schedule: dict
+    created_at: str
@@ -1,5 +1,6 @@
 from datetime import datetime, timezone
 from typing import Optional
+from typing_extensions import TypedDict
 from pydantic import BaseModel, Field, ConfigDict
 
 
@@ -25,6 +26,24 @@ class FavoriteDoctor(BaseModel):
     last_appointment_date: Optional[datetime] = None  # Track last visit
 
 
+class FavoriteDoctorListItem(TypedDict, total=False):
+    """Favorite doctor enriched with current doctor info and visit history (served unvalidated)."""
+    favorite_id: str
+    user_id: str
+    doctor_id: str
+    doctor_name: Optional[str]
+    doctor_specialty: Optional[str]
+    doctor_clinic_id: Optional[str]
+    doctor_clinic_name: Optional[str]
+    doctor_picture: Optional[str]
+    doctor_consultation_fee: Optional[float]
+    doctor_consultation_duration: Optional[int]
+    notes: Optional[str]
+    created_at: str
+    last_appointment_date: Optional[str]
+    total_appointments: int
+
+
 class FavoriteDoctorCreate(BaseModel):
     """Create favorite doctor request"""
     doctor_id: str
@@ -37,6 +37,23 @@ class VitalSignCreate(BaseModel):
     measured_at: Optional[datetime] = None
 
 
+class VitalSignBulkItemResult(BaseModel):
+    """Outcome of one measurement in a bulk upload"""
+    index: int  # Position in the uploaded array / NDJSON line number (0-based)
+    status: str  # created, duplicate, invalid, failed
+    measurement_id: Optional[str] = None
+    error: Optional[str] = None
+
+
+class VitalSignBulkResponse(BaseModel):
+    """Bulk vital sign upload summary"""
+    created: int = 0
+    duplicates: int = 0
+    invalid: int = 0
+    failed: int = 0
+    results: List[VitalSignBulkItemResult] = []
+
+
 class LabResult(BaseModel):
     """Laboratory test result"""
     model_config = ConfigDict(extra="ignore")
@@ -1,5 +1,6 @@
 from datetime import datetime, timezone
 from typing import Optional, Dict
+from typing_extensions import TypedDict
 from pydantic import BaseModel, Field, ConfigDict
 
 
@@ -88,6 +89,25 @@ class Notification(BaseModel):
     sent_at: Optional[datetime] = None
 
 
+class NotificationListItem(TypedDict, total=False):
+    """Notification as returned by list endpoints (documents are served unvalidated)."""
+    notification_id: str
+    user_id: str
+    type: str
+    title: str
+    message: str
+    priority: str
+    appointment_id: Optional[str]
+    prescription_id: Optional[str]
+    record_id: Optional[str]
+    doctor_id: Optional[str]
+    metadata: Optional[Dict]
+    is_read: bool
+    read_at: Optional[str]
+    created_at: str
+    scheduled_for: Optional[str]
+
+
 class NotificationPreferences(BaseModel):
     """User notification preferences"""
     model_config = ConfigDict(extra="ignore")
@@ -127,6 +147,15 @@ class NotificationPreferences(BaseModel):
     updated_at: Optional[datetime] = None
 
 
+# Field defaults, merged over stored documents so preferences saved before a
+# field existed still return it without validating through the model
+NOTIFICATION_PREFERENCE_DEFAULTS = {
+    name: field.default
+    for name, field in NotificationPreferences.model_fields.items()
+    if not field.is_required() and field.default_factory is None
+}
+
+
 class NotificationCreate(BaseModel):
     """Create notification request"""
     user_id: str
@@ -27,6 +27,9 @@ class User(BaseModel):
     # List = specific locations (for LOCATION_ADMIN, RECEPTIONIST, DOCTOR, ASSISTANT)
     assigned_location_ids: Optional[List[str]] = None
     
+    # Linked doctor profile (DOCTOR role), resolved once by DoctorIdentityService
+    doctor_id: Optional[str] = None
+    
     # Permission caching (updated when role changes or permissions are modified)
     # This improves performance by avoiding repeated permission lookups
     cached_permissions: Optional[List[str]] = Field(default_factory=list)
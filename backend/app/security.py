@@ -7,6 +7,7 @@ import os
 
 from .db import db
 from .schemas.user import User, UserSession
+from .services.data_lifecycle import purge_at
 
 ENV = os.environ.get("ENV", "development")
 IS_PRODUCTION = ENV == "production"
@@ -26,6 +27,20 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 
 
 async def get_current_user(request: Request) -> Optional[User]:
+    """
+    Resolve the session's user, once per request.
+    
+    The result is kept on `request.state`, so permission dependencies and
+    the handler (or every sub-request of a /batch call) share one lookup.
+    """
+    if hasattr(request.state, "current_user"):
+        return request.state.current_user
+    user = await _load_current_user(request)
+    request.state.current_user = user
+    return user
+
+
+async def _load_current_user(request: Request) -> Optional[User]:
     session_token = request.cookies.get("session_token")
 
     if not session_token:
@@ -131,6 +146,7 @@ async def create_session(user_id: str, response: Response) -> str:
     session_doc = session.model_dump()
     session_doc["expires_at"] = session_doc["expires_at"].isoformat()
     session_doc["created_at"] = session_doc["created_at"].isoformat()
+    session_doc["purge_at"] = purge_at("user_sessions", expires_at)
 
     await db.user_sessions.insert_one(session_doc)
 
@@ -0,0 +1,204 @@
+"""
+Batch Request Service
+Runs the GET sub-requests of POST /api/batch concurrently inside one request
+"""
+
+import asyncio
+import json
+import logging
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
+
+from fastapi import Request
+from fastapi.middleware.asyncexitstack import AsyncExitStackMiddleware
+from starlette.middleware.exceptions import ExceptionMiddleware
+from starlette.types import ASGIApp, Message
+
+from ..config import BATCH_SUB_REQUEST_TIMEOUT
+from ..middleware.rate_limiter import (
+    RATE_LIMIT_ENABLED,
+    RATE_LIMIT_EXCLUDED_PATHS,
+    get_client_ip,
+    rate_limiter
+)
+from ..responses import ORJSON_AVAILABLE, orjson
+from ..schemas.batch import BatchSubRequest
+from .metrics import record_rate_limit_rejection
+
+logger = logging.getLogger("mediconnect")
+
+# Sub-request headers a client may set per entry
+FORWARDED_HEADERS = {"if-none-match", "if-modified-since", "x-location-id"}
+
+# Batch request headers that describe the batch itself, not its sub-requests
+BATCH_ONLY_HEADERS = {
+    b"content-length",
+    b"content-type",
+    b"transfer-encoding",
+    b"accept-encoding",
+    b"if-none-match",
+    b"if-modified-since",
+}
+
+
+class StreamingNotBatchable(Exception):
+    """A sub-request answered with an event stream, which never completes."""
+
+
+class BatchService:
+    """
+    Executes GET sub-requests against the application router.
+
+    Sub-requests skip the middleware stack (the batch already went through
+    it once) but not per-endpoint rate limiting: each one is counted
+    against its own path before it runs, unless the rate limit middleware
+    excludes that path. A failing entry (a bad header, a rate limiter
+    error) only fails its own result. They share the batch request's
+    `request.state`, so the session user and permission facts resolved
+    once are reused by every sub-request. Errors are rendered by the
+    application's exception handlers, as they would be for a direct call.
+    """
+
+    @staticmethod
+    def _dispatcher(app) -> ASGIApp:
+        handlers = {key: handler for key, handler in app.exception_handlers.items() if key not in (500, Exception)}
+        return ExceptionMiddleware(AsyncExitStackMiddleware(app.router), handlers=handlers)
+
+    @staticmethod
+    def _scope(request: Request, sub: BatchSubRequest, path: str, query: str) -> Dict[str, Any]:
+        headers = [(name, value) for name, value in request.scope["headers"] if name not in BATCH_ONLY_HEADERS]
+        for name, value in sub.headers.items():
+            if name.lower() in FORWARDED_HEADERS:
+                headers.append((name.lower().encode("latin-1"), value.encode("latin-1")))
+
+        return {
+            "type": "http",
+            "asgi": request.scope.get("asgi", {"version": "3.0"}),
+            "http_version": request.scope.get("http_version", "1.1"),
+            "method": sub.method,
+            "scheme": request.scope.get("scheme", "http"),
+            "server": request.scope.get("server"),
+            "client": request.scope.get("client"),
+            "root_path": request.scope.get("root_path", ""),
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": query.encode(),
+            "headers": headers,
+            "app": request.app,
+            # Shared with the batch: current_user, permission_context, ...
+            "state": request.scope["state"],
+        }
+
+    @staticmethod
+    def _result(sub: BatchSubRequest, status: int, body: Any, headers: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        return {"id": sub.id, "status": status, "headers": headers or {}, "body": body}
+
+    @staticmethod
+    async def _rate_limited(request: Request, sub: BatchSubRequest, path: str) -> Optional[Dict[str, Any]]:
+        """Count the sub-request against its endpoint's limit; a 429 result if exceeded."""
+        if not RATE_LIMIT_ENABLED or path in RATE_LIMIT_EXCLUDED_PATHS:
+            return None
+        is_limited, _, limit = await rate_limiter.is_rate_limited(get_client_ip(request), path)
+        if not is_limited:
+            return None
+        record_rate_limit_rejection(rate_limiter._get_limit_name(path))
+        return BatchService._result(
+            sub,
+            429,
+            {"detail": f"Rate limit exceeded. Maximum {limit} requests per minute allowed."},
+            {"x-ratelimit-limit": str(limit), "x-ratelimit-remaining": "0", "x-ratelimit-reset": "60"}
+        )
+
+    @staticmethod
+    def _body(body: bytes, content_type: str) -> Any:
+        if not body:
+            return None
+        if "json" in content_type:
+            # Embedded as-is by FastJSONResponse instead of parsed and re-encoded
+            return orjson.Fragment(body) if ORJSON_AVAILABLE else json.loads(body)
+        return body.decode("utf-8", "replace")
+
+    @staticmethod
+    async def _run(dispatcher: ASGIApp, request: Request, sub: BatchSubRequest) -> Dict[str, Any]:
+        url = urlsplit(sub.path)
+        path = url.path
+        if not path.startswith("/api/") or path.rstrip("/") == "/api/batch":
+            return BatchService._result(sub, 400, {"detail": "Only /api/ paths (other than /api/batch) can be batched"})
+
+        try:
+            scope = BatchService._scope(request, sub, path, url.query)
+        except UnicodeEncodeError:
+            return BatchService._result(sub, 400, {"detail": "Header values must be latin-1 encodable"})
+
+        limited = await BatchService._rate_limited(request, sub, path)
+        if limited:
+            return limited
+
+        start: Dict[str, Any] = {"status": 500, "headers": []}
+        chunks: List[bytes] = []
+        request_sent = False
+
+        async def receive() -> Message:
+            nonlocal request_sent
+            if not request_sent:
+                request_sent = True
+                return {"type": "http.request", "body": b"", "more_body": False}
+            # Nothing more to read; wait like a client that stays connected
+            await asyncio.Future()
+
+        async def send(message: Message):
+            if message["type"] == "http.response.start":
+                start.update(message)
+                for name, value in message.get("headers", []):
+                    if name.lower() == b"content-type" and value.startswith(b"text/event-stream"):
+                        raise StreamingNotBatchable()
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+
+        try:
+            await asyncio.wait_for(dispatcher(scope, receive, send), BATCH_SUB_REQUEST_TIMEOUT)
+        except StreamingNotBatchable:
+            return BatchService._result(sub, 400, {"detail": "Streaming responses cannot be batched"})
+        except asyncio.TimeoutError:
+            return BatchService._result(sub, 504, {"detail": "Sub-request timed out"})
+        except Exception as exc:
+            handler = request.app.exception_handlers.get(Exception)
+            if handler is None:
+                logger.exception(f"Batch sub-request {path} failed")
+                return BatchService._result(sub, 500, {"detail": "Internal server error"})
+            response = await handler(Request(scope), exc)
+            start = {"status": response.status_code, "headers": response.raw_headers}
+            chunks = [response.body]
+
+        headers = {
+            name.decode("latin-1"): value.decode("latin-1")
+            for name, value in start["headers"]
+            if name.lower() != b"content-length"
+        }
+        body = BatchService._body(b"".join(chunks), headers.get("content-type", ""))
+        return BatchService._result(sub, start["status"], body, headers)
+
+    @staticmethod
+    async def _isolated(dispatcher: ASGIApp, request: Request, sub: BatchSubRequest) -> Dict[str, Any]:
+        """Run one sub-request; an unexpected failure becomes its own 500 result."""
+        try:
+            return await BatchService._run(dispatcher, request, sub)
+        except Exception:
+            logger.exception(f"Batch sub-request {sub.path} failed")
+            return BatchService._result(sub, 500, {"detail": "Internal server error"})
+
+    @staticmethod
+    async def execute(request: Request, requests: List[BatchSubRequest]) -> List[Dict[str, Any]]:
+        """
+        Run sub-requests concurrently.
+
+        Returns:
+            One {"id", "status", "headers", "body"} result per sub-request, in order
+        """
+        request.scope.setdefault("state", {})
+        dispatcher = BatchService._dispatcher(request.app)
+        return await asyncio.gather(*(BatchService._isolated(dispatcher, request, sub) for sub in requests))
+
+
+# Convenience instance
+batch_service = BatchService()
@@ -4,12 +4,12 @@ Provides easy-to-use caching decorators and utilities
 """
 
 import functools
-import hashlib
-import json
-from typing import Optional, Callable, Any
+from typing import Optional, Callable, Any, Dict, Iterable
 import logging
 from ..redis_client import redis_client
 from ..config import REDIS_CACHE_TTL
+from .metrics import record_cache_lookup
+from .cache_keys import build_cache_key
 
 logger = logging.getLogger("mediconnect")
 
@@ -18,6 +18,10 @@ def generate_cache_key(prefix: str, *args, **kwargs) -> str:
     """
     Generate a unique cache key based on function arguments.
     
+    Arguments are encoded canonically (primitives, containers, Pydantic
+    models) and hashed with BLAKE2b, so equal arguments always give the
+    same key and object addresses never end up in it.
+    
     Args:
         prefix: Key prefix (usually function name)
         args: Positional arguments
@@ -25,39 +29,19 @@ def generate_cache_key(prefix: str, *args, **kwargs) -> str:
         
     Returns:
         Unique cache key
+        
+    Raises:
+        TypeError: If an argument has no canonical encoding
     """
-    # Create a string representation of arguments
-    key_parts = [prefix]
-    
-    # Add positional arguments
-    for arg in args:
-        if hasattr(arg, '__dict__'):
-            # For objects, use their dict representation
-            key_parts.append(str(sorted(arg.__dict__.items())))
-        else:
-            key_parts.append(str(arg))
-    
-    # Add keyword arguments (sorted for consistency)
-    for k, v in sorted(kwargs.items()):
-        if hasattr(v, '__dict__'):
-            key_parts.append(f"{k}:{sorted(v.__dict__.items())}")
-        else:
-            key_parts.append(f"{k}:{v}")
-    
-    # Create hash for long keys
-    key_str = ":".join(key_parts)
-    if len(key_str) > 200:
-        # Use hash for very long keys
-        key_hash = hashlib.md5(key_str.encode()).hexdigest()
-        return f"{prefix}:{key_hash}"
-    
-    return key_str
+    return build_cache_key(prefix, [args, kwargs])
 
 
 def cache(
     ttl: Optional[int] = None,
     key_prefix: Optional[str] = None,
-    skip_cache_if: Optional[Callable] = None
+    skip_cache_if: Optional[Callable] = None,
+    key: Optional[Callable] = None,
+    version: int = 1
 ):
     """
     Decorator to cache function results in Redis.
@@ -66,17 +50,24 @@ def cache(
         ttl: Time to live in seconds (default: REDIS_CACHE_TTL)
         key_prefix: Custom key prefix (default: function name)
         skip_cache_if: Function to determine if caching should be skipped
+        key: Key builder called with the function's arguments; returns a
+             string (used verbatim) or values to hash (default: all arguments)
+        version: Bump when the cached result's shape changes, so entries
+                 written by older code are never read
         
     Usage:
         @cache(ttl=300)
         async def get_user(user_id: str):
             return await db.users.find_one({"user_id": user_id})
         
-        @cache(ttl=60, key_prefix="doctor_list")
-        async def get_doctors(clinic_id: str):
+        @cache(ttl=60, key_prefix="doctor_list", key=lambda clinic_id, user: clinic_id, version=2)
+        async def get_doctors(clinic_id: str, user: User):
             return await db.doctors.find({"clinic_id": clinic_id}).to_list(100)
     """
     def decorator(func: Callable) -> Callable:
+        prefix = key_prefix or f"{func.__module__}.{func.__name__}"
+        warned = False
+        
         @functools.wraps(func)
         async def wrapper(*args, **kwargs):
             # Check if caching should be skipped
@@ -84,22 +75,27 @@ def cache(
                 return await func(*args, **kwargs)
             
             # Generate cache key
-            prefix = key_prefix or f"{func.__module__}.{func.__name__}"
-            cache_key = generate_cache_key(prefix, *args, **kwargs)
+            try:
+                parts = key(*args, **kwargs) if key else [args, kwargs]
+                cache_key = build_cache_key(prefix, parts, version)
+            except TypeError as e:
+                nonlocal warned
+                if not warned:
+                    warned = True
+                    logger.warning(f"Not caching {prefix}: {e}")
+                return await func(*args, **kwargs)
             
             # Try to get from cache
             cached_value = await redis_client.get_json(cache_key)
+            record_cache_lookup(key_prefix or func.__name__, cached_value is not None)
             if cached_value is not None:
-                logger.debug(f"Cache hit for {cache_key}")
                 return cached_value
             
             # Execute function
             result = await func(*args, **kwargs)
             
             # Cache result
-            cache_ttl = ttl or REDIS_CACHE_TTL
-            await redis_client.set_json(cache_key, result, cache_ttl)
-            logger.debug(f"Cached result for {cache_key} (TTL: {cache_ttl}s)")
+            await redis_client.set_json(cache_key, result, ttl or REDIS_CACHE_TTL)
             
             return result
         
@@ -150,8 +146,12 @@ class CacheManager:
         # Set cache
         await cache_mgr.set(doctor_id, doctor_data, ttl=300)
         
+        # Batch operations (one round trip)
+        doctors = await cache_mgr.get_many(doctor_ids)
+        await cache_mgr.set_many({doctor_id: doctor_data}, ttl=300)
+        
         # Invalidate cache
-        await cache_mgr.invalidate(doctor_id)
+        await cache_mgr.delete(doctor_id)
         await cache_mgr.invalidate_all()
     """
     
@@ -179,7 +179,9 @@ class CacheManager:
             Cached value or None
         """
         cache_key = self._make_key(key)
-        return await redis_client.get_json(cache_key)
+        value = await redis_client.get_json(cache_key)
+        record_cache_lookup(self.namespace, value is not None)
+        return value
     
     async def set(
         self,
@@ -215,6 +217,55 @@ class CacheManager:
         cache_key = self._make_key(key)
         return await redis_client.delete(cache_key)
     
+    async def get_many(self, keys: Iterable[str]) -> Dict[str, dict]:
+        """
+        Get several values from cache in one round trip.
+        
+        Args:
+            keys: Cache keys
+            
+        Returns:
+            Dict of key → cached value for the keys that were found
+        """
+        keys = list(dict.fromkeys(keys))
+        cached = await redis_client.get_many(self._make_key(key) for key in keys)
+        
+        found = {}
+        for key in keys:
+            value = cached.get(self._make_key(key))
+            record_cache_lookup(self.namespace, value is not None)
+            if value is not None:
+                found[key] = value
+        return found
+    
+    async def set_many(self, items: Dict[str, dict], ttl: Optional[int] = None) -> bool:
+        """
+        Set several values in cache in one round trip.
+        
+        Args:
+            items: Dict of cache key → value
+            ttl: Time to live in seconds
+            
+        Returns:
+            True if successful
+        """
+        return await redis_client.set_many(
+            {self._make_key(key): value for key, value in items.items()},
+            ttl or REDIS_CACHE_TTL
+        )
+    
+    async def delete_many(self, keys: Iterable[str]) -> int:
+        """
+        Delete several values from cache.
+        
+        Args:
+            keys: Cache keys
+            
+        Returns:
+            Number of keys deleted
+        """
+        return await redis_client.delete(*(self._make_key(key) for key in keys))
+    
     async def invalidate_all(self) -> int:
         """
         Invalidate all cache entries in this namespace.
@@ -0,0 +1,89 @@
+"""
+Cache Key Derivation
+Canonical argument encoding and BLAKE2 hashing for @cache keys
+"""
+
+import hashlib
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+from typing import Any
+from uuid import UUID
+
+from ..config import CACHE_KEY_VERSION
+from ..responses import ORJSON_AVAILABLE, orjson
+
+DIGEST_SIZE = 16  # bytes, 32 hex characters in the key
+
+
+def _key_default(obj: Any) -> Any:
+    """Encode the non-JSON types allowed in cache keys."""
+    if hasattr(obj, "model_dump"):
+        # Pydantic models: their field values, never object identity
+        return obj.model_dump()
+    if isinstance(obj, (set, frozenset)):
+        return sorted(obj, key=canonical_encode)
+    if isinstance(obj, Decimal):
+        return str(obj)
+    if isinstance(obj, bytes):
+        return {"__bytes__": obj.hex()}
+    raise TypeError(
+        f"Cannot derive a cache key from {type(obj).__name__}; "
+        "pass key= to @cache to choose the arguments that identify the result"
+    )
+
+
+def _json_key_default(obj: Any) -> Any:
+    """Stdlib json fallback mirroring orjson's native types."""
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, UUID):
+        return str(obj)
+    if isinstance(obj, Enum):
+        return obj.value
+    return _key_default(obj)
+
+
+def canonical_encode(value: Any) -> bytes:
+    """
+    Encode primitives, containers and Pydantic models deterministically.
+
+    Dict keys are sorted and types stay distinct ("1" and 1 encode
+    differently). Anything else (requests, connections, arbitrary objects)
+    raises TypeError rather than leaking addresses into the key.
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(
+            value,
+            default=_key_default,
+            option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+        )
+    return json.dumps(
+        value,
+        default=_json_key_default,
+        sort_keys=True,
+        separators=(",", ":")
+    ).encode()
+
+
+def hash_key(data: bytes) -> str:
+    """BLAKE2b digest of encoded key material."""
+    return hashlib.blake2b(data, digest_size=DIGEST_SIZE).hexdigest()
+
+
+def build_cache_key(prefix: str, parts: Any, version: int = 1) -> str:
+    """
+    Build a versioned cache key.
+
+    Args:
+        prefix: Key prefix (usually the function name)
+        parts: A string (used verbatim) or any canonically encodable value (hashed)
+        version: Per-prefix schema version
+
+    Returns:
+        "{prefix}:v{CACHE_KEY_VERSION}.{version}:{parts or digest}"
+    """
+    if not isinstance(parts, str):
+        parts = hash_key(canonical_encode(parts))
+    return f"{prefix}:v{CACHE_KEY_VERSION}.{version}:{parts}"
@@ -0,0 +1,165 @@
+"""
+Catalog Version Service
+Per-scope version counters for ETag / Last-Modified validation of catalog endpoints
+"""
+
+import logging
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Dict, Iterable, Optional
+
+from fastapi import Request
+from pymongo import UpdateOne
+from starlette.responses import Response
+
+from ..config import CATALOG_MAX_AGE, CATALOG_STALE_WHILE_REVALIDATE
+from ..db import db
+from ..responses import FastJSONResponse
+from .cache_keys import canonical_encode, hash_key
+
+logger = logging.getLogger("mediconnect")
+
+# Version scopes: every write to the backing collection bumps its scope
+CLINICS = "clinics"        # clinics (including rating aggregates)
+CENTERS = "centers"        # medical_centers
+DOCTORS = "doctors"
+SERVICES = "services"
+LOCATIONS = "locations"
+
+
+def reviews_scope(clinic_id: str) -> str:
+    return f"reviews:{clinic_id}"
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison against an If-None-Match header (RFC 9110 13.1.2)."""
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+
+class CatalogValidators:
+    """
+    Validators for one catalog response.
+
+    Usage:
+        validators = await catalog_versions.validators(request, [CLINICS])
+        if validators.not_modified:
+            return validators.not_modified_response()
+        clinics = await db.clinics.find(...).to_list(100)
+        return validators.response(clinics)
+    """
+
+    def __init__(self, etag: str, last_modified: Optional[datetime], public: bool, request: Request):
+        self.etag = etag
+        self.last_modified = last_modified
+        self.public = public
+        self.not_modified = self._is_not_modified(request)
+
+    def _is_not_modified(self, request: Request) -> bool:
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match is not None:
+            # If-None-Match takes precedence over If-Modified-Since
+            return _etag_matches(if_none_match, self.etag)
+
+        if_modified_since = request.headers.get("if-modified-since")
+        if if_modified_since and self.last_modified:
+            try:
+                since = parsedate_to_datetime(if_modified_since)
+            except (TypeError, ValueError):
+                return False
+            if since.tzinfo is None:
+                since = since.replace(tzinfo=timezone.utc)
+            return self.last_modified.replace(microsecond=0) <= since
+        return False
+
+    def headers(self) -> Dict[str, str]:
+        headers = {"ETag": self.etag}
+        if self.public:
+            # The same for every caller, so one shared (CDN) entry serves everyone
+            headers["Cache-Control"] = (
+                f"public, max-age={CATALOG_MAX_AGE}, "
+                f"stale-while-revalidate={CATALOG_STALE_WHILE_REVALIDATE}"
+            )
+        else:
+            # Tailored to the signed-in user: browser only, revalidated each time
+            headers["Cache-Control"] = "private, no-cache"
+            headers["Vary"] = "Authorization, Cookie"
+        if self.last_modified:
+            headers["Last-Modified"] = format_datetime(self.last_modified, usegmt=True)
+        return headers
+
+    def not_modified_response(self) -> Response:
+        return Response(status_code=304, headers=self.headers())
+
+    def response(self, content: Any) -> FastJSONResponse:
+        return FastJSONResponse(content, headers=self.headers())
+
+
+class CatalogVersionService:
+    """
+    Version counters in `catalog_versions`, one document per scope:
+    {_id: scope, version: int, updated_at: datetime}.
+
+    Writes call `bump` after changing catalog data; reads derive their
+    ETag from the versions of every scope the response is built from, so
+    a 304 costs one primary-key lookup instead of the catalog query and
+    serialization.
+    """
+
+    @staticmethod
+    async def bump(*scopes: str):
+        """Advance the version of each scope (never fails the calling write)."""
+        now = datetime.now(timezone.utc)
+        operations = [
+            UpdateOne({"_id": scope}, {"$inc": {"version": 1}, "$set": {"updated_at": now}}, upsert=True)
+            for scope in dict.fromkeys(scopes)
+        ]
+        try:
+            await db.catalog_versions.bulk_write(operations, ordered=False)
+        except Exception as e:
+            logger.error(f"Failed to bump catalog versions {list(scopes)}: {e}")
+
+    @staticmethod
+    async def validators(
+        request: Request,
+        scopes: Iterable[str],
+        variant: Any = None
+    ) -> CatalogValidators:
+        """
+        Build the validators for a response built from `scopes`.
+
+        Args:
+            request: Incoming request (conditional headers)
+            scopes: Version scopes the response depends on
+            variant: Request facts that change the response besides the URL
+                     (e.g. the signed-in user's role and assignments); a
+                     response with a variant is private to that user
+        """
+        scopes = sorted(set(scopes))
+        versions = {scope: (0, None) for scope in scopes}
+        async for doc in db.catalog_versions.find({"_id": {"$in": scopes}}):
+            updated_at = doc.get("updated_at")
+            if isinstance(updated_at, datetime) and updated_at.tzinfo is None:
+                updated_at = updated_at.replace(tzinfo=timezone.utc)
+            versions[doc["_id"]] = (doc.get("version", 0), updated_at)
+
+        digest = hash_key(canonical_encode([[versions[scope][0] for scope in scopes], scopes, variant]))
+        modified = [updated_at for _, updated_at in versions.values() if updated_at]
+        return CatalogValidators(
+            etag=f'W/"{digest[:20]}"',
+            last_modified=max(modified) if modified else None,
+            public=variant is None,
+            request=request
+        )
+
+
+# Convenience instance
+catalog_versions = CatalogVersionService()
@@ -0,0 +1,130 @@
+"""
+Clinic Ratings Service
+Rating aggregates denormalized onto clinic documents and kept in sync incrementally
+"""
+
+import logging
+from typing import Any, Dict, List
+
+from pymongo import UpdateOne
+
+from ..config import DATA_LIFECYCLE_BATCH_SIZE
+from ..db import db
+from .catalog_versions import catalog_versions, CLINICS
+
+logger = logging.getLogger("mediconnect")
+
+RATING_VALUES = (1, 2, 3, 4, 5)
+
+
+def rating_fields(histogram: Dict[str, int]) -> Dict[str, Any]:
+    """
+    Clinic rating fields for a histogram of {"1".."5": count}.
+
+    Returns:
+        Dict with `average_rating`, `review_count`, `rating_sum` and
+        `rating_histogram` (every star value present)
+    """
+    histogram = {str(star): int(histogram.get(str(star), 0)) for star in RATING_VALUES}
+    review_count = sum(histogram.values())
+    rating_sum = sum(star * histogram[str(star)] for star in RATING_VALUES)
+    return {
+        "average_rating": round(rating_sum / review_count, 2) if review_count else 0.0,
+        "review_count": review_count,
+        "rating_sum": rating_sum,
+        "rating_histogram": histogram
+    }
+
+
+class ClinicRatingService:
+    """
+    Keeps `average_rating`, `review_count`, `rating_sum` and
+    `rating_histogram` on each clinic document in sync with `reviews`.
+
+    A new review is applied in one atomic update on the clinic document.
+    Clinics that have never been rated through this service (no
+    `review_count` yet) are rebuilt from their reviews instead, and
+    `reconcile_all` periodically corrects any drift.
+    """
+
+    @staticmethod
+    async def record_review(clinic_id: str, rating: int):
+        """Account for a newly inserted review."""
+        star = str(int(rating))
+
+        # Update pipeline: increments and the derived average in one atomic write
+        result = await db.clinics.update_one(
+            {"clinic_id": clinic_id, "review_count": {"$exists": True}},
+            [
+                {"$set": {
+                    "review_count": {"$add": ["$review_count", 1]},
+                    "rating_sum": {"$add": [{"$ifNull": ["$rating_sum", 0]}, int(rating)]},
+                    f"rating_histogram.{star}": {"$add": [
+                        {"$ifNull": [f"$rating_histogram.{star}", 0]},
+                        1
+                    ]}
+                }},
+                {"$set": {
+                    "average_rating": {"$round": [{"$divide": ["$rating_sum", "$review_count"]}, 2]}
+                }}
+            ]
+        )
+
+        if result.matched_count == 0:
+            await ClinicRatingService.rebuild(clinic_id)
+        else:
+            await catalog_versions.bump(CLINICS)
+
+    @staticmethod
+    async def rebuild(clinic_id: str) -> Dict[str, Any]:
+        """Recompute one clinic's rating fields from its reviews."""
+        groups = await db.reviews.aggregate([
+            {"$match": {"clinic_id": clinic_id}},
+            {"$group": {"_id": "$rating", "count": {"$sum": 1}}}
+        ]).to_list(None)
+
+        fields = rating_fields({str(group["_id"]): group["count"] for group in groups})
+        await db.clinics.update_one({"clinic_id": clinic_id}, {"$set": fields})
+        await catalog_versions.bump(CLINICS)
+        return fields
+
+    @staticmethod
+    async def reconcile_all(batch_size: int = DATA_LIFECYCLE_BATCH_SIZE) -> Dict[str, int]:
+        """
+        Recompute rating fields for every clinic with one `$group` over reviews.
+
+        Returns:
+            Dict with `clinics_rated` and `clinics_reset` (clinics without reviews)
+        """
+        histograms: Dict[str, Dict[str, int]] = {}
+        async for group in db.reviews.aggregate([
+            {"$group": {
+                "_id": {"clinic_id": "$clinic_id", "rating": "$rating"},
+                "count": {"$sum": 1}
+            }}
+        ]):
+            clinic_histogram = histograms.setdefault(group["_id"]["clinic_id"], {})
+            clinic_histogram[str(group["_id"]["rating"])] = group["count"]
+
+        operations: List[UpdateOne] = []
+        for clinic_id, histogram in histograms.items():
+            operations.append(UpdateOne({"clinic_id": clinic_id}, {"$set": rating_fields(histogram)}))
+            if len(operations) >= batch_size:
+                await db.clinics.bulk_write(operations, ordered=False)
+                operations = []
+        if operations:
+            await db.clinics.bulk_write(operations, ordered=False)
+
+        reset = await db.clinics.update_many(
+            {"clinic_id": {"$nin": list(histograms)}, "review_count": {"$ne": 0}},
+            {"$set": rating_fields({})}
+        )
+
+        await catalog_versions.bump(CLINICS)
+        summary = {"clinics_rated": len(histograms), "clinics_reset": reset.modified_count}
+        logger.info(f"Clinic ratings reconciled: {summary}")
+        return summary
+
+
+# Convenience instance
+clinic_ratings = ClinicRatingService()
@@ -0,0 +1,259 @@
+"""
+Dashboard Stats Service
+Role-scoped dashboard counters computed concurrently and cached per minute
+"""
+
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from fastapi import HTTPException
+
+from ..db import db
+from ..redis_client import redis_client
+from .cache import stats_cache
+from .doctor_identity import doctor_identity
+
+logger = logging.getLogger("mediconnect")
+
+# Cached dashboards are keyed by the current minute, so they are never
+# older than this even without an explicit invalidation
+DASHBOARD_CACHE_TTL = 60
+
+NOT_CANCELLED = {"$ne": "CANCELLED"}
+
+
+def _minute_bucket(now: datetime) -> str:
+    return now.strftime("%Y%m%d%H%M")
+
+
+def _cache_key(role: str, scope: str, bucket: str) -> str:
+    return f"dashboard:{role}:{scope}:{bucket}"
+
+
+def _count(facet: List[Dict[str, Any]]) -> int:
+    return facet[0]["n"] if facet else 0
+
+
+class DashboardStatsService:
+    """
+    Computes the `/stats` dashboard.
+
+    Appointment counters (today, upcoming, total, unique patients) come from
+    one `$facet` aggregation; the remaining collection counts run
+    concurrently with it, so a dashboard costs one database round trip.
+
+    Results are cached per (role, clinic/organization/doctor/user scope, minute).
+    Appointment writes delete the current-minute entries of every scope the
+    appointment belongs to via `invalidate_for_appointment`.
+    """
+
+    @staticmethod
+    async def _appointment_counters(
+        match: Dict[str, Any],
+        now: datetime,
+        include_today: bool = True,
+        include_patients: bool = False
+    ) -> Dict[str, int]:
+        """Count appointment buckets for `match` in a single aggregation."""
+        facets: Dict[str, List[Dict[str, Any]]] = {
+            "upcoming": [
+                {"$match": {"date_time": {"$gte": now.isoformat()}, "status": NOT_CANCELLED}},
+                {"$count": "n"}
+            ],
+            "total": [{"$count": "n"}],
+        }
+
+        if include_today:
+            today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+            today_end = today_start + timedelta(days=1)
+            facets["today"] = [
+                {"$match": {
+                    "date_time": {"$gte": today_start.isoformat(), "$lt": today_end.isoformat()},
+                    "status": NOT_CANCELLED
+                }},
+                {"$count": "n"}
+            ]
+
+        if include_patients:
+            facets["patients"] = [{"$group": {"_id": "$patient_id"}}, {"$count": "n"}]
+
+        result = await db.appointments.aggregate([
+            {"$match": match},
+            {"$facet": facets}
+        ]).to_list(1)
+
+        row = result[0] if result else {}
+        return {name: _count(row.get(name, [])) for name in facets}
+
+    @staticmethod
+    async def _clinic_scope_stats(clinic_match: Any, now: datetime) -> Dict[str, int]:
+        """Admin dashboard for one clinic (`clinic_id`) or several (`{"$in": [...]}`)."""
+        appointments, total_doctors, total_staff, total_services = await asyncio.gather(
+            DashboardStatsService._appointment_counters(
+                {"clinic_id": clinic_match},
+                now,
+                include_patients=True
+            ),
+            db.doctors.count_documents({"clinic_id": clinic_match}),
+            db.staff.count_documents({"clinic_id": clinic_match}),
+            db.services.count_documents({"clinic_id": clinic_match})
+        )
+
+        return {
+            "today_appointments": appointments["today"],
+            "upcoming_appointments": appointments["upcoming"],
+            "total_doctors": total_doctors,
+            "total_patients": appointments["patients"],
+            "total_staff": total_staff,
+            "total_services": total_services,
+            "total_appointments": appointments["total"]
+        }
+
+    @staticmethod
+    async def _scope(user) -> str:
+        """
+        Cache scope for a user's dashboard; validates required affiliations.
+
+        A doctor's scope is keyed by the linked doctor profile, as stored on
+        the appointments `invalidate_for_appointment` is called with.
+        """
+        if user.role == "CLINIC_ADMIN":
+            if not user.clinic_id:
+                raise HTTPException(status_code=400, detail="Clinic ID not found for admin")
+            return user.clinic_id
+
+        if user.role in ("DOCTOR", "ASSISTANT"):
+            if not user.clinic_id:
+                raise HTTPException(status_code=400, detail="Clinic ID not found for staff")
+            if user.role == "DOCTOR":
+                return f"{user.clinic_id}:{await doctor_identity.resolve(user)}"
+            return user.clinic_id
+
+        if user.role == "SUPER_ADMIN":
+            if not user.organization_id:
+                raise HTTPException(status_code=400, detail="Organization ID not found for super admin")
+            return user.organization_id
+
+        if user.role == "USER":
+            return user.user_id
+
+        raise HTTPException(status_code=403, detail=f"Invalid user role: {user.role}")
+
+    @staticmethod
+    async def compute(user, now: Optional[datetime] = None) -> Dict[str, int]:
+        """
+        Compute dashboard stats for a user without the cache.
+
+        Args:
+            user: Authenticated user
+            now: Reference time (local, matching stored ISO timestamps)
+
+        Returns:
+            Role-specific counters
+        """
+        now = now or datetime.now()
+        await DashboardStatsService._scope(user)
+
+        if user.role == "CLINIC_ADMIN":
+            return await DashboardStatsService._clinic_scope_stats(user.clinic_id, now)
+
+        if user.role in ("DOCTOR", "ASSISTANT"):
+            match = {"clinic_id": user.clinic_id}
+            if user.role == "DOCTOR":
+                doctor_id = await doctor_identity.resolve(user)
+                if not doctor_id:
+                    # No doctor profile, so no appointments
+                    return {"today_appointments": 0, "upcoming_appointments": 0, "total_appointments": 0}
+                match["doctor_id"] = doctor_id
+            appointments = await DashboardStatsService._appointment_counters(match, now)
+            return {
+                "today_appointments": appointments["today"],
+                "upcoming_appointments": appointments["upcoming"],
+                "total_appointments": appointments["total"]
+            }
+
+        if user.role == "SUPER_ADMIN":
+            clinics = await db.clinics.find(
+                {"organization_id": user.organization_id},
+                {"_id": 0, "clinic_id": 1}
+            ).to_list(None)
+            clinic_ids = [clinic["clinic_id"] for clinic in clinics]
+
+            stats = await DashboardStatsService._clinic_scope_stats({"$in": clinic_ids}, now)
+            stats["total_clinics"] = len(clinic_ids)
+            return stats
+
+        # USER
+        appointments = await DashboardStatsService._appointment_counters(
+            {"patient_id": user.user_id},
+            now,
+            include_today=False
+        )
+        return {
+            "upcoming_appointments": appointments["upcoming"],
+            "total_appointments": appointments["total"]
+        }
+
+    @staticmethod
+    async def get_stats(user) -> Dict[str, int]:
+        """
+        Get dashboard stats for a user, served from cache when possible.
+
+        Returns:
+            Role-specific counters
+        """
+        now = datetime.now()
+        key = _cache_key(user.role, await DashboardStatsService._scope(user), _minute_bucket(now))
+
+        cached = await stats_cache.get(key)
+        if cached is not None:
+            return cached
+
+        stats = await DashboardStatsService.compute(user, now)
+        await stats_cache.set(key, stats, ttl=DASHBOARD_CACHE_TTL)
+        return stats
+
+    @staticmethod
+    async def invalidate_for_appointment(appointment: Dict[str, Any]):
+        """
+        Drop cached dashboards that count this appointment.
+
+        Only the current minute's entries can still be served, so the keys
+        are known up front and removed in one DEL without scanning.
+
+        Args:
+            appointment: Appointment document (needs clinic_id, doctor_id, patient_id)
+        """
+        if not redis_client.is_available():
+            return
+
+        bucket = _minute_bucket(datetime.now())
+        clinic_id = appointment.get("clinic_id")
+        keys = []
+
+        if clinic_id:
+            keys.append(_cache_key("CLINIC_ADMIN", clinic_id, bucket))
+            keys.append(_cache_key("ASSISTANT", clinic_id, bucket))
+            if appointment.get("doctor_id"):
+                keys.append(_cache_key("DOCTOR", f"{clinic_id}:{appointment['doctor_id']}", bucket))
+
+            clinic = await db.clinics.find_one(
+                {"clinic_id": clinic_id},
+                {"_id": 0, "organization_id": 1}
+            )
+            if clinic and clinic.get("organization_id"):
+                keys.append(_cache_key("SUPER_ADMIN", clinic["organization_id"], bucket))
+
+        if appointment.get("patient_id"):
+            keys.append(_cache_key("USER", appointment["patient_id"], bucket))
+
+        try:
+            await redis_client.delete(*(stats_cache._make_key(key) for key in keys))
+        except Exception as e:
+            logger.warning(f"Failed to invalidate dashboard stats: {e}")
+
+
+# Convenience instance
+dashboard_stats = DashboardStatsService()
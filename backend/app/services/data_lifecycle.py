@@ -0,0 +1,298 @@
+"""
+Data Lifecycle Service
+Retention, TTL expiry and cold archival for high-volume collections
+"""
+
+import gzip
+import json
+import logging
+import zlib
+from dataclasses import dataclass
+from datetime import datetime, timezone, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from bson import Binary
+
+from ..config import (
+    NOTIFICATION_RETENTION_DAYS,
+    NOTIFICATION_LOG_RETENTION_DAYS,
+    AUDIT_LOG_RETENTION_DAYS,
+    AUDIT_LOG_ARCHIVE_TARGET,
+    AUDIT_LOG_ARCHIVE_DIR,
+    DATA_LIFECYCLE_BATCH_SIZE
+)
+from ..db import db
+from .notification_counters import NotificationCounterService
+
+logger = logging.getLogger("mediconnect")
+
+# BSON date field read by TTL indexes. Most collections store timestamps as
+# ISO strings, which TTL monitors ignore, so expiring documents carry this
+# extra field alongside their own timestamps.
+PURGE_AT_FIELD = "purge_at"
+
+ARCHIVE_COLLECTION = "audit_logs_archive"
+
+
+@dataclass(frozen=True)
+class RetentionPolicy:
+    """
+    How long documents of a collection stay in the hot database.
+
+    Attributes:
+        collection: Collection name
+        mode: "ttl" (MongoDB deletes via a TTL index on purge_at),
+              "purge" (batch job deletes, keeping derived counters in sync)
+              or "archive" (batch job moves documents to cold storage)
+        timestamp_field: Field compared against the retention cutoff
+        retention_days: Retention window; 0 keeps documents forever
+    """
+    collection: str
+    mode: str
+    timestamp_field: str
+    retention_days: int = 0
+
+
+RETENTION_POLICIES: Dict[str, RetentionPolicy] = {
+    "user_sessions": RetentionPolicy("user_sessions", "ttl", "expires_at"),
+    "password_reset_tokens": RetentionPolicy("password_reset_tokens", "ttl", "expires_at"),
+    "notification_logs": RetentionPolicy(
+        "notification_logs", "ttl", "created_at", NOTIFICATION_LOG_RETENTION_DAYS
+    ),
+    "notifications": RetentionPolicy(
+        "notifications", "purge", "created_at", NOTIFICATION_RETENTION_DAYS
+    ),
+    "audit_logs": RetentionPolicy(
+        "audit_logs", "archive", "timestamp", AUDIT_LOG_RETENTION_DAYS
+    ),
+}
+
+
+def purge_at(collection: str, expires_at: Optional[datetime] = None) -> Optional[datetime]:
+    """
+    Compute the TTL purge date to stamp on a new document.
+
+    Args:
+        collection: Collection the document is inserted into
+        expires_at: Explicit expiry (sessions, reset tokens)
+
+    Returns:
+        Aware UTC datetime, or None if the collection keeps documents forever
+    """
+    if expires_at is not None:
+        if expires_at.tzinfo is None:
+            expires_at = expires_at.replace(tzinfo=timezone.utc)
+        return expires_at
+
+    policy = RETENTION_POLICIES.get(collection)
+    if not policy or policy.retention_days <= 0:
+        return None
+
+    return datetime.now(timezone.utc) + timedelta(days=policy.retention_days)
+
+
+def _cutoff_filter(policy: RetentionPolicy, now: datetime) -> Dict[str, Any]:
+    """
+    Match documents older than the policy's retention window.
+
+    Timestamps are stored either as BSON dates or as ISO strings depending
+    on the writer; MongoDB compares within a type only, so both are matched.
+    """
+    if policy.retention_days > 0:
+        cutoff = now - timedelta(days=policy.retention_days)
+    else:
+        cutoff = now
+
+    field = policy.timestamp_field
+    return {
+        "$or": [
+            {field: {"$lt": cutoff}},
+            {field: {"$lt": cutoff.isoformat()}}
+        ]
+    }
+
+
+class DataLifecycleService:
+    """
+    Applies retention policies.
+
+    - TTL collections get a `purge_at` TTL index; the batch job only sweeps
+      legacy documents written before `purge_at` was stamped.
+    - Notifications are deleted in batches so per-user counters stay exact.
+    - Audit logs are moved in batches to compressed cold storage, either an
+      archive collection or gzip'd JSON lines on local disk.
+    """
+
+    @staticmethod
+    async def ensure_ttl_indexes():
+        """Create TTL indexes for every TTL-managed collection (idempotent)."""
+        for policy in RETENTION_POLICIES.values():
+            if policy.mode != "ttl":
+                continue
+            try:
+                await db[policy.collection].create_index(
+                    PURGE_AT_FIELD,
+                    expireAfterSeconds=0
+                )
+            except Exception as e:
+                logger.error(f"Failed to create TTL index on {policy.collection}: {e}")
+
+    @staticmethod
+    async def sweep_legacy_ttl(now: Optional[datetime] = None) -> Dict[str, int]:
+        """
+        Delete expired documents in TTL collections that lack `purge_at`.
+
+        Returns:
+            Deleted count per collection
+        """
+        now = now or datetime.now(timezone.utc)
+        deleted: Dict[str, int] = {}
+
+        for policy in RETENTION_POLICIES.values():
+            if policy.mode != "ttl":
+                continue
+            if policy.timestamp_field != "expires_at" and policy.retention_days <= 0:
+                continue
+
+            result = await db[policy.collection].delete_many({
+                PURGE_AT_FIELD: {"$exists": False},
+                **_cutoff_filter(policy, now)
+            })
+            deleted[policy.collection] = result.deleted_count
+
+        return deleted
+
+    @staticmethod
+    async def purge_notifications(
+        now: Optional[datetime] = None,
+        batch_size: int = DATA_LIFECYCLE_BATCH_SIZE
+    ) -> int:
+        """
+        Delete notifications past retention, adjusting per-user counters.
+
+        Returns:
+            Number of notifications deleted
+        """
+        policy = RETENTION_POLICIES["notifications"]
+        if policy.retention_days <= 0:
+            return 0
+
+        now = now or datetime.now(timezone.utc)
+        query = _cutoff_filter(policy, now)
+        total_deleted = 0
+
+        while True:
+            batch = await db.notifications.find(
+                query,
+                {"_id": 1, "user_id": 1, "is_read": 1}
+            ).limit(batch_size).to_list(batch_size)
+
+            if not batch:
+                break
+
+            result = await db.notifications.delete_many(
+                {"_id": {"$in": [doc["_id"] for doc in batch]}}
+            )
+            total_deleted += result.deleted_count
+
+            deltas: Dict[str, Dict[str, int]] = {}
+            for doc in batch:
+                delta = deltas.setdefault(doc["user_id"], {"total": 0, "unread": 0})
+                delta["total"] += 1
+                if not doc.get("is_read", False):
+                    delta["unread"] += 1
+
+            for user_id, delta in deltas.items():
+                await NotificationCounterService.record_bulk_deleted(
+                    user_id,
+                    delta["total"],
+                    delta["unread"]
+                )
+
+            if len(batch) < batch_size:
+                break
+
+        return total_deleted
+
+    @staticmethod
+    async def _write_archive_batch(batch: List[Dict[str, Any]], now: datetime):
+        """Persist one batch of audit logs to cold storage."""
+        lines = "\n".join(json.dumps(doc, default=str) for doc in batch) + "\n"
+
+        if AUDIT_LOG_ARCHIVE_TARGET == "file":
+            archive_dir = Path(AUDIT_LOG_ARCHIVE_DIR)
+            archive_dir.mkdir(parents=True, exist_ok=True)
+            path = archive_dir / f"audit_logs-{now.strftime('%Y%m%d')}.jsonl.gz"
+            # Appending gzip members yields a valid multi-member gzip file
+            with gzip.open(path, "at", encoding="utf-8") as f:
+                f.write(lines)
+            return
+
+        await db[ARCHIVE_COLLECTION].insert_one({
+            "archived_at": now,
+            "count": len(batch),
+            "first_id": batch[0]["_id"],
+            "last_id": batch[-1]["_id"],
+            "encoding": "jsonl+zlib",
+            "payload": Binary(zlib.compress(lines.encode("utf-8"), 6))
+        })
+
+    @staticmethod
+    async def archive_audit_logs(
+        now: Optional[datetime] = None,
+        batch_size: int = DATA_LIFECYCLE_BATCH_SIZE
+    ) -> int:
+        """
+        Move audit logs past retention to compressed cold storage.
+
+        Each batch is written to the archive before it is deleted from the
+        hot collection, so an interrupted run never loses entries (at worst
+        a batch is archived twice).
+
+        Returns:
+            Number of audit logs archived
+        """
+        policy = RETENTION_POLICIES["audit_logs"]
+        if policy.retention_days <= 0:
+            return 0
+
+        now = now or datetime.now(timezone.utc)
+        query = _cutoff_filter(policy, now)
+        total_archived = 0
+
+        while True:
+            batch = await db.audit_logs.find(query).sort("_id", 1).limit(
+                batch_size
+            ).to_list(batch_size)
+
+            if not batch:
+                break
+
+            await DataLifecycleService._write_archive_batch(batch, now)
+            await db.audit_logs.delete_many({"_id": {"$in": [doc["_id"] for doc in batch]}})
+            total_archived += len(batch)
+
+            if len(batch) < batch_size:
+                break
+
+        return total_archived
+
+    @staticmethod
+    async def run() -> Dict[str, Any]:
+        """
+        Run every retention task once.
+
+        Returns:
+            Summary of work done
+        """
+        await DataLifecycleService.ensure_ttl_indexes()
+
+        summary = {
+            "ttl_swept": await DataLifecycleService.sweep_legacy_ttl(),
+            "notifications_purged": await DataLifecycleService.purge_notifications(),
+            "audit_logs_archived": await DataLifecycleService.archive_audit_logs(),
+        }
+
+        logger.info(f"Data lifecycle run complete: {summary}")
+        return summary
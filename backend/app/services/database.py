@@ -10,6 +10,8 @@ import asyncio
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
 from pymongo.errors import ConnectionFailure, ServerSelectionTimeoutError
 
+from .indexes import IndexManager
+
 logger = logging.getLogger("mediconnect")
 
 
@@ -191,54 +193,26 @@ class DatabaseService:
         result = await self.db[collection].delete_one(filter)
         return result.deleted_count
     
-    async def create_indexes(self):
+    async def create_indexes(self, rebuild_drifted: bool = False) -> Dict[str, Any]:
         """
         Create database indexes for optimal performance.
         
-        Best Practice:
-        - Create indexes on frequently queried fields
-        - Use compound indexes for multi-field queries
-        - Monitor index usage and remove unused indexes
+        Applies the declarative INDEX_REGISTRY (see services/indexes.py).
+        Idempotent: existing indexes are left untouched, so this is safe
+        to run on every startup.
+        
+        Args:
+            rebuild_drifted: Drop and recreate indexes whose keys/options
+                no longer match the registry
+            
+        Returns:
+            Per-collection summary of created, drifted and failed indexes
         """
         try:
-            # Users collection indexes
-            await self.db.users.create_index("email", unique=True)
-            await self.db.users.create_index("user_id", unique=True)
-            await self.db.users.create_index([("organization_id", 1), ("role", 1)])
-            
-            # Doctors collection indexes
-            await self.db.doctors.create_index("doctor_id", unique=True)
-            await self.db.doctors.create_index("email")
-            await self.db.doctors.create_index([("clinic_id", 1), ("is_active", 1)])
-            await self.db.doctors.create_index([("location_id", 1), ("is_active", 1)])
-            await self.db.doctors.create_index("specialty")
-            
-            # Appointments collection indexes
-            await self.db.appointments.create_index("appointment_id", unique=True)
-            await self.db.appointments.create_index([("doctor_id", 1), ("date_time", 1)])
-            await self.db.appointments.create_index([("patient_id", 1), ("date_time", -1)])
-            await self.db.appointments.create_index([("clinic_id", 1), ("status", 1)])
-            await self.db.appointments.create_index("date_time")
-            
-            # Clinics collection indexes
-            await self.db.clinics.create_index("clinic_id", unique=True)
-            await self.db.clinics.create_index("organization_id")
-            await self.db.clinics.create_index([("county", 1), ("city", 1)])
-            
-            # Locations collection indexes
-            await self.db.locations.create_index("location_id", unique=True)
-            await self.db.locations.create_index("organization_id")
-            await self.db.locations.create_index([("county", 1), ("city", 1)])
-            
-            # Medical records indexes
-            await self.db.medical_records.create_index("record_id", unique=True)
-            await self.db.medical_records.create_index([("patient_id", 1), ("created_at", -1)])
-            await self.db.medical_records.create_index("doctor_id")
-            
-            logger.info("✅ Database indexes created successfully")
-            
+            return await IndexManager(self.db).apply(rebuild_drifted=rebuild_drifted)
         except Exception as e:
             logger.error(f"Failed to create database indexes: {e}")
+            return {}
     
     async def get_collection_stats(self, collection: str) -> Dict[str, Any]:
         """
@@ -0,0 +1,91 @@
+"""
+Doctor Identity Service
+Resolves the doctor profile linked to a user once and keeps the link on the user document
+"""
+
+import logging
+from typing import Optional
+
+from ..db import db
+from ..schemas.user import User
+
+logger = logging.getLogger("mediconnect")
+
+
+class DoctorIdentityService:
+    """
+    Maintains the user → doctor identity map.
+
+    The linked `doctor_id` is stored on the user document, so it arrives
+    with the user on every authenticated request. It is resolved at login,
+    at invitation acceptance and when a doctor creates their own profile;
+    until then `resolve` looks it up by email, within the user's clinic or
+    organization, on first use and stores it.
+    Profile changes that can alter the link (email change, deactivation)
+    drop it so the next request resolves it again.
+    """
+
+    @staticmethod
+    async def lookup(
+        email: str,
+        clinic_id: Optional[str] = None,
+        organization_id: Optional[str] = None
+    ) -> Optional[str]:
+        """
+        Find the doctor_id for an email within the user's own tenant.
+
+        Profiles are matched in `clinic_id`, or in `organization_id` for
+        users without a clinic; a profile with the same email in another
+        tenant is never linked.
+
+        Returns:
+            doctor_id, or None if the tenant has no matching profile
+        """
+        if clinic_id:
+            query = {"email": email.lower(), "clinic_id": clinic_id}
+        elif organization_id:
+            query = {"email": email.lower(), "organization_id": organization_id}
+        else:
+            return None
+
+        doctor = await db.doctors.find_one(query, {"_id": 0, "doctor_id": 1})
+        return doctor.get("doctor_id") if doctor else None
+
+    @staticmethod
+    async def link(user_id: str, doctor_id: str):
+        """Store a doctor_id on a user document."""
+        await db.users.update_one({"user_id": user_id}, {"$set": {"doctor_id": doctor_id}})
+
+    @staticmethod
+    async def resolve(user: User) -> Optional[str]:
+        """
+        The doctor_id linked to `user`, looked up and stored if not linked yet.
+
+        Returns:
+            doctor_id, or None if no doctor profile matches the user
+        """
+        if user.doctor_id:
+            return user.doctor_id
+
+        doctor_id = await DoctorIdentityService.lookup(user.email, user.clinic_id, user.organization_id)
+        if doctor_id:
+            await DoctorIdentityService.link(user.user_id, doctor_id)
+            user.doctor_id = doctor_id
+        return doctor_id
+
+    @staticmethod
+    async def unlink(doctor_id: str) -> int:
+        """
+        Drop every user link to `doctor_id` after a profile change.
+
+        Returns:
+            Number of users unlinked
+        """
+        result = await db.users.update_many({"doctor_id": doctor_id}, {"$unset": {"doctor_id": ""}})
+        if result.modified_count:
+            logger.info(f"Unlinked doctor {doctor_id} from {result.modified_count} user(s)")
+        return result.modified_count
+
+
+# Convenience instance
+doctor_identity = DoctorIdentityService()
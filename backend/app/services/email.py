@@ -3,6 +3,7 @@ import logging
 from datetime import datetime
 from typing import Optional, Dict, Any
 from ..config import RESEND_API_KEY, DEFAULT_FROM_EMAIL, FRONTEND_URL
+from .metrics import track_email
 
 logger = logging.getLogger("mediconnect")
 
@@ -23,19 +24,21 @@ def _send_email(to: str, subject: str, html: str, text: str) -> Dict[str, Any]:
         logger.warning(f"Email not sent to {to} - RESEND_API_KEY not configured")
         return {"success": False, "error": "Email service not configured"}
     
-    try:
-        response = resend.Emails.send({
-            "from": DEFAULT_FROM_EMAIL,
-            "to": to,
-            "subject": subject,
-            "html": html,
-            "text": text
-        })
-        logger.info(f"Email sent successfully to {to} - ID: {response.get('id', 'unknown')}")
-        return {"success": True, "email_id": response.get('id')}
-    except Exception as e:
-        logger.error(f"Failed to send email to {to}: {str(e)}")
-        return {"success": False, "error": str(e)}
+    with track_email() as outcome:
+        try:
+            response = resend.Emails.send({
+                "from": DEFAULT_FROM_EMAIL,
+                "to": to,
+                "subject": subject,
+                "html": html,
+                "text": text
+            })
+            logger.info(f"Email sent successfully to {to} - ID: {response.get('id', 'unknown')}")
+            return {"success": True, "email_id": response.get('id')}
+        except Exception as e:
+            outcome["success"] = False
+            logger.error(f"Failed to send email to {to}: {str(e)}")
+            return {"success": False, "error": str(e)}
 
 
 def _get_email_header(center_name: str = "MediConnect") -> str:
@@ -106,13 +109,14 @@ def send_password_reset_email(recipient_email: str, recipient_name: str, reset_l
 </body>
 </html>"""
         text_content = f"Resetare Parolă\n\nBună ziua {recipient_name},\n\nResetați parola: {reset_link}\n\nAcest link expiră în 1 oră."
-        resend.Emails.send({
-            "from": DEFAULT_FROM_EMAIL,
-            "to": recipient_email,
-            "subject": f"Resetare Parolă - {center_name}",
-            "html": html_content,
-            "text": text_content
-        })
+        with track_email():
+            resend.Emails.send({
+                "from": DEFAULT_FROM_EMAIL,
+                "to": recipient_email,
+                "subject": f"Resetare Parolă - {center_name}",
+                "html": html_content,
+                "text": text_content
+            })
         logger.info(f"Password reset email sent to {recipient_email}")
         return {"success": True}
     except Exception as e:
@@ -153,13 +157,14 @@ def send_staff_invitation_email(recipient_email: str, recipient_name: str, role:
 </body>
 </html>"""
         text_content = f"Invitație Personal\n\nBună ziua {recipient_name},\n\n{inviter_name} v-a invitat să vă alăturați {clinic_name} ca {role_display}.\n\nAcceptați invitația: {invitation_link}\n\nAceastă invitație expiră în 7 zile."
-        resend.Emails.send({
-            "from": DEFAULT_FROM_EMAIL,
-            "to": recipient_email,
-            "subject": f"Invitație de a vă alătura {clinic_name} - MediConnect",
-            "html": html_content,
-            "text": text_content
-        })
+        with track_email():
+            resend.Emails.send({
+                "from": DEFAULT_FROM_EMAIL,
+                "to": recipient_email,
+                "subject": f"Invitație de a vă alătura {clinic_name} - MediConnect",
+                "html": html_content,
+                "text": text_content
+            })
         logger.info(f"Staff invitation email sent to {recipient_email}")
         return {"success": True}
     except Exception as e:
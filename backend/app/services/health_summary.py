@@ -0,0 +1,241 @@
+"""
+Health Summary Service
+Per-user health summary built from single aggregations and kept in a summary document
+"""
+
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from pymongo import ReturnDocument
+
+from ..config import HEALTH_SUMMARY_CACHE_ENABLED
+from ..db import db
+from .vital_signs import as_utc, from_storage, vital_filter
+
+logger = logging.getLogger("mediconnect")
+
+
+def _safe_key(value: Any) -> bool:
+    """Whether a user-supplied value can be used as a document field name."""
+    return isinstance(value, str) and bool(value) and "." not in value and not value.startswith("$")
+
+
+class HealthSummaryService:
+    """
+    Builds the `/health/stats` summary.
+
+    Vitals and lab results are each summarized by one aggregation, run
+    concurrently. With HEALTH_SUMMARY_CACHE_ENABLED the result is stored in
+    a `health_summaries` document per user.
+
+    Summary document shape:
+        {
+            "user_id": str,
+            "latest": {<vital type>: <latest vital sign>},
+            "total_vitals": int,
+            "last_measurement_date": str,
+            "labs_by_status": {<status>: int},
+            "total_labs": int,
+            "last_lab_test_date": str,
+            "updated_at": str
+        }
+
+    Inserts are applied to an existing document in place; deletes and lab
+    updates drop it instead, and a missing document is rebuilt on the next
+    read. The rebuild only ever inserts (`$setOnInsert`), so it never
+    overwrites a summary that a concurrent read seeded and writes have
+    since updated.
+    """
+
+    @staticmethod
+    async def _summarize_vitals(user_id: str) -> Dict[str, Any]:
+        # The sort matches the (meta.user_id, meta.type, measured_at desc) index, so
+        # `$first` per type is the latest measurement without an in-memory sort
+        result = await db.vital_signs.aggregate([
+            {"$match": vital_filter(user_id)},
+            {"$sort": {"meta.type": 1, "measured_at": -1}},
+            {"$facet": {
+                "latest": [{"$group": {"_id": "$meta.type", "doc": {"$first": "$$ROOT"}}}],
+                "totals": [{"$group": {
+                    "_id": None,
+                    "count": {"$sum": 1},
+                    "last": {"$max": "$measured_at"}
+                }}]
+            }}
+        ]).to_list(1)
+
+        row = result[0] if result else {}
+        latest = {}
+        for group in row.get("latest", []):
+            if not _safe_key(group["_id"]):
+                continue
+            latest[group["_id"]] = from_storage(group["doc"])
+
+        totals = row.get("totals") or [{}]
+        last = totals[0].get("last")
+        return {
+            "latest": latest,
+            "total_vitals": totals[0].get("count", 0),
+            "last_measurement_date": as_utc(last).isoformat() if last else None
+        }
+
+    @staticmethod
+    async def _summarize_labs(user_id: str) -> Dict[str, Any]:
+        groups = await db.lab_results.aggregate([
+            {"$match": {"user_id": user_id}},
+            {"$group": {
+                "_id": "$status",
+                "count": {"$sum": 1},
+                "last": {"$max": "$test_date"}
+            }}
+        ]).to_list(None)
+
+        last_dates = [group["last"] for group in groups if group.get("last")]
+        return {
+            "labs_by_status": {str(group["_id"]): group["count"] for group in groups},
+            "total_labs": sum(group["count"] for group in groups),
+            "last_lab_test_date": max(last_dates) if last_dates else None
+        }
+
+    @staticmethod
+    async def compute(user_id: str) -> Dict[str, Any]:
+        """Summarize a user's vitals and lab results from the source collections."""
+        vitals, labs = await asyncio.gather(
+            HealthSummaryService._summarize_vitals(user_id),
+            HealthSummaryService._summarize_labs(user_id)
+        )
+        return {"user_id": user_id, **vitals, **labs}
+
+    @staticmethod
+    async def rebuild(user_id: str) -> Dict[str, Any]:
+        """
+        Recompute a user's summary and store it if no summary exists.
+
+        Returns:
+            The stored summary (another request's, if it seeded first)
+        """
+        summary = await HealthSummaryService.compute(user_id)
+        fields = {key: value for key, value in summary.items() if key != "user_id"}
+
+        return await db.health_summaries.find_one_and_update(
+            {"user_id": user_id},
+            {"$setOnInsert": {**fields, "updated_at": datetime.now(timezone.utc).isoformat()}},
+            projection={"_id": 0},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+
+    @staticmethod
+    async def get_summary(user_id: str) -> Dict[str, Any]:
+        """
+        Get a user's health summary, from the summary document when enabled.
+
+        Returns:
+            Summary dict (see class docstring)
+        """
+        if not HEALTH_SUMMARY_CACHE_ENABLED:
+            return await HealthSummaryService.compute(user_id)
+
+        doc = await db.health_summaries.find_one({"user_id": user_id}, {"_id": 0})
+        if not doc:
+            return await HealthSummaryService.rebuild(user_id)
+
+        return doc
+
+    @staticmethod
+    async def invalidate(user_id: str):
+        """Drop a summary that cannot be updated in place."""
+        if HEALTH_SUMMARY_CACHE_ENABLED:
+            await db.health_summaries.delete_one({"user_id": user_id})
+
+    @staticmethod
+    async def record_vital(vital: Dict[str, Any]):
+        """
+        Account for an inserted vital sign.
+
+        Args:
+            vital: Stored vital sign in the API shape (ISO string `measured_at`)
+        """
+        await HealthSummaryService.record_vitals([vital])
+
+    @staticmethod
+    async def record_vitals(vitals: List[Dict[str, Any]]):
+        """
+        Account for a batch of inserted vital signs of one user in a single update.
+
+        Args:
+            vitals: Stored vital signs in the API shape (ISO string `measured_at`)
+        """
+        if not HEALTH_SUMMARY_CACHE_ENABLED or not vitals:
+            return
+
+        user_id = vitals[0]["user_id"]
+        if not all(_safe_key(vital.get("type")) for vital in vitals):
+            await HealthSummaryService.invalidate(user_id)
+            return
+
+        newest: Dict[str, Dict[str, Any]] = {}
+        for vital in vitals:
+            current = newest.get(vital["type"])
+            if current is None or vital["measured_at"] >= current["measured_at"]:
+                newest[vital["type"]] = {k: v for k, v in vital.items() if k != "_id"}
+
+        # Pipeline update so a latest vital is only replaced by a newer one;
+        # $literal keeps user text in the document from being read as field paths
+        updates: Dict[str, Any] = {}
+        for vital_type, vital in newest.items():
+            latest_field = f"latest.{vital_type}"
+            updates[latest_field] = {"$cond": [
+                {"$gte": [vital["measured_at"], {"$ifNull": [f"${latest_field}.measured_at", ""]}]},
+                {"$literal": vital},
+                f"${latest_field}"
+            ]}
+
+        await db.health_summaries.update_one(
+            {"user_id": user_id},
+            [{"$set": {
+                **updates,
+                "total_vitals": {"$add": [{"$ifNull": ["$total_vitals", 0]}, len(vitals)]},
+                "last_measurement_date": {"$max": [
+                    "$last_measurement_date",
+                    max(vital["measured_at"] for vital in vitals)
+                ]},
+                "updated_at": datetime.now(timezone.utc).isoformat()
+            }}]
+        )
+
+    @staticmethod
+    async def record_lab_result(result: Dict[str, Any]):
+        """
+        Account for an inserted lab result.
+
+        Args:
+            result: Stored lab result document (ISO string `test_date`)
+        """
+        if not HEALTH_SUMMARY_CACHE_ENABLED:
+            return
+
+        status = result.get("status")
+        if not _safe_key(status):
+            await HealthSummaryService.invalidate(result["user_id"])
+            return
+
+        await db.health_summaries.update_one(
+            {"user_id": result["user_id"]},
+            {
+                "$inc": {"total_labs": 1, f"labs_by_status.{status}": 1},
+                "$max": {"last_lab_test_date": result["test_date"]},
+                "$set": {"updated_at": datetime.now(timezone.utc).isoformat()}
+            }
+        )
+
+
+def latest_vital(summary: Dict[str, Any], vital_type: str) -> Optional[Dict[str, Any]]:
+    """Latest measurement of one vital type from a summary, if any."""
+    return (summary.get("latest") or {}).get(vital_type)
+
+
+# Convenience instance
+health_summary = HealthSummaryService()
@@ -0,0 +1,428 @@
+"""
+Index Registry
+Declarative MongoDB index definitions applied idempotently at startup or via CLI
+"""
+
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ASCENDING, DESCENDING, IndexModel
+
+from .data_lifecycle import PURGE_AT_FIELD
+
+logger = logging.getLogger("mediconnect")
+
+KeySpec = Union[str, Tuple[str, int]]
+
+
+@dataclass(frozen=True)
+class IndexSpec:
+    """
+    A single declared index.
+
+    Attributes:
+        keys: Ordered (field, direction) pairs
+        unique: Enforce uniqueness
+        sparse: Skip documents missing the indexed fields
+        expire_after_seconds: TTL in seconds (single-field date indexes only)
+        partial_filter: partialFilterExpression
+    """
+    keys: Tuple[Tuple[str, int], ...]
+    unique: bool = False
+    sparse: bool = False
+    expire_after_seconds: Optional[int] = None
+    partial_filter: Optional[Dict[str, Any]] = field(default=None, hash=False, compare=False)
+
+    @property
+    def name(self) -> str:
+        """Index name, matching MongoDB's default naming for the key pattern."""
+        return "_".join(f"{key}_{direction}" for key, direction in self.keys)
+
+    def options(self) -> Dict[str, Any]:
+        """Index options as reported by index_information()."""
+        opts: Dict[str, Any] = {}
+        if self.unique:
+            opts["unique"] = True
+        if self.sparse:
+            opts["sparse"] = True
+        if self.expire_after_seconds is not None:
+            opts["expireAfterSeconds"] = self.expire_after_seconds
+        if self.partial_filter is not None:
+            opts["partialFilterExpression"] = self.partial_filter
+        return opts
+
+    def to_model(self) -> IndexModel:
+        return IndexModel(list(self.keys), name=self.name, **self.options())
+
+
+def index(*keys: KeySpec, **options) -> IndexSpec:
+    """
+    Declare an index.
+
+    Usage:
+        index("email", unique=True)
+        index("user_id", ("created_at", DESCENDING))
+    """
+    normalized = tuple(
+        (key, ASCENDING) if isinstance(key, str) else (key[0], key[1])
+        for key in keys
+    )
+    return IndexSpec(keys=normalized, **options)
+
+
+# Every query issued by the routers and services should be served by one of
+# these. Keep entries grouped by collection and add the index in the same
+# change that introduces a new query shape.
+INDEX_REGISTRY: Dict[str, List[IndexSpec]] = {
+    "users": [
+        index("email", unique=True),
+        index("user_id", unique=True),
+        index("organization_id", "role"),
+        index("assigned_location_ids"),
+        index("clinic_id"),
+        index("doctor_id", sparse=True),
+    ],
+    "user_sessions": [
+        index("session_token", unique=True),
+        index("user_id"),
+        index(PURGE_AT_FIELD, expire_after_seconds=0),
+    ],
+    "password_reset_tokens": [
+        index("token", unique=True),
+        index("user_id"),
+        index(PURGE_AT_FIELD, expire_after_seconds=0),
+    ],
+    "organizations": [
+        index("organization_id", unique=True),
+        index("cui"),
+    ],
+    "locations": [
+        index("location_id", unique=True),
+        index("organization_id", "is_active"),
+        index("county", "city"),
+    ],
+    "clinics": [
+        index("clinic_id", unique=True),
+        index("organization_id"),
+        index("county", "city"),
+        index("cui"),
+        index(("average_rating", DESCENDING), ("review_count", DESCENDING)),
+    ],
+    "medical_centers": [
+        index("center_id", unique=True),
+    ],
+    "doctors": [
+        index("doctor_id", unique=True),
+        index("email"),
+        index("clinic_id", "is_active"),
+        index("location_id", "is_active"),
+        index("specialty"),
+    ],
+    "staff": [
+        index("staff_id", unique=True),
+        index("invitation_token", sparse=True),
+        index("email", "is_active"),
+        index("clinic_id", "is_active"),
+        index("organization_id", "is_active"),
+    ],
+    "services": [
+        index("service_id", unique=True),
+        index("clinic_id", "is_active"),
+        index("location_id", "is_active"),
+    ],
+    "appointments": [
+        index("appointment_id", unique=True),
+        index("doctor_id", "date_time"),
+        # Patient history pages: keyset on (date_time, appointment_id)
+        index("patient_id", ("date_time", DESCENDING), ("appointment_id", DESCENDING)),
+        index("patient_id", "doctor_id", "status", ("date_time", DESCENDING)),
+        index("clinic_id", "status"),
+        index("clinic_id", "date_time"),
+        index("location_id", "date_time"),
+        index("date_time"),
+    ],
+    "medical_records": [
+        index("record_id", unique=True),
+        index("patient_id", ("created_at", DESCENDING), ("record_id", DESCENDING)),
+        index("doctor_id"),
+    ],
+    "prescriptions": [
+        index("prescription_id", unique=True),
+        index("patient_id", ("created_at", DESCENDING), ("prescription_id", DESCENDING)),
+    ],
+    "reviews": [
+        index("review_id", unique=True),
+        index("clinic_id", ("created_at", DESCENDING)),
+        index("clinic_id", "user_id"),
+    ],
+    "favorite_doctors": [
+        index("favorite_id", unique=True),
+        index("user_id", "doctor_id", unique=True),
+        index("user_id", ("created_at", DESCENDING)),
+    ],
+    "vital_signs": [
+        # Time-series collection (see COLLECTION_OPTIONS): unique indexes are
+        # not supported, and `meta` + time is created by MongoDB itself
+        index("meta", "measured_at"),
+        index("meta.user_id", "meta.type", ("measured_at", DESCENDING)),
+        index("meta.user_id", ("measured_at", DESCENDING)),
+        index("measurement_id"),
+    ],
+    "lab_results": [
+        index("result_id", unique=True),
+        index("user_id", ("test_date", DESCENDING)),
+        index("user_id", "status"),
+    ],
+    "health_summaries": [
+        index("user_id", unique=True),
+    ],
+    "notifications": [
+        index("notification_id", unique=True),
+        index("user_id", ("created_at", DESCENDING)),
+        index("user_id", "is_read"),
+        index("user_id", "appointment_id", "type"),
+        index("created_at"),
+    ],
+    "notification_counters": [
+        index("user_id", unique=True),
+    ],
+    "notification_preferences": [
+        index("user_id", unique=True),
+    ],
+    "notification_logs": [
+        index("user_id"),
+        index(PURGE_AT_FIELD, expire_after_seconds=0),
+    ],
+    "invitations": [
+        index("invitation_id", unique=True),
+        index("invitation_token", unique=True),
+        index("email", "status"),
+        index("organization_id", "status"),
+    ],
+    "access_requests": [
+        index("request_id", unique=True),
+        index("organization_id", "status"),
+    ],
+    "audit_logs": [
+        index("organization_id", ("timestamp", DESCENDING)),
+        index("user_id", ("timestamp", DESCENDING)),
+        index("action", ("timestamp", DESCENDING)),
+        index("timestamp"),
+    ],
+    "permissions": [
+        index("name", unique=True),
+        index("resource"),
+    ],
+    "role_permissions": [
+        index("role", "permission_name"),
+        index("role"),
+    ],
+    "user_permission_overrides": [
+        index("user_id", "permission_name"),
+        index("user_id"),
+    ],
+}
+
+
+# Collections that need creation options. They are created before their
+# indexes, since creating an index (or inserting) on a missing collection
+# would implicitly create a plain one.
+COLLECTION_OPTIONS: Dict[str, Dict[str, Any]] = {
+    "vital_signs": {
+        "timeseries": {
+            "timeField": "measured_at",
+            "metaField": "meta",
+            "granularity": "minutes",
+        },
+    },
+}
+
+
+def _key_pattern(info: Dict[str, Any]) -> List[Tuple[str, Any]]:
+    """Normalize an index_information() key pattern for comparison."""
+    return [
+        (key, int(direction) if isinstance(direction, float) else direction)
+        for key, direction in info["key"]
+    ]
+
+
+def _is_drifted(spec: IndexSpec, info: Dict[str, Any]) -> bool:
+    return _key_pattern(info) != list(spec.keys) or _declared_options(info) != spec.options()
+
+
+def _declared_options(info: Dict[str, Any]) -> Dict[str, Any]:
+    """Extract the options we manage from an index_information() entry."""
+    return {
+        k: info[k]
+        for k in ("unique", "sparse", "expireAfterSeconds", "partialFilterExpression")
+        if k in info and info[k] is not False
+    }
+
+
+class IndexManager:
+    """
+    Applies INDEX_REGISTRY to a database and reports on index health.
+
+    Usage:
+        manager = IndexManager(db)
+        await manager.apply()            # create missing indexes
+        report = await manager.check()   # drift + unused/undeclared indexes
+    """
+
+    def __init__(self, db: AsyncIOMotorDatabase, registry: Optional[Dict[str, List[IndexSpec]]] = None):
+        self.db = db
+        self.registry = registry if registry is not None else INDEX_REGISTRY
+
+    async def _existing(self, collection: str) -> Dict[str, Dict[str, Any]]:
+        try:
+            return await self.db[collection].index_information()
+        except Exception:
+            # Collection does not exist yet
+            return {}
+
+    async def ensure_collections(self) -> List[str]:
+        """
+        Create missing collections declared in COLLECTION_OPTIONS.
+
+        Existing collections are never converted; a plain collection that
+        should be a time-series one is only reported (see
+        migrate_vital_signs.py).
+
+        Returns:
+            Names of the collections created
+        """
+        created: List[str] = []
+        for name, options in COLLECTION_OPTIONS.items():
+            cursor = await self.db.list_collections(filter={"name": name})
+            infos = await cursor.to_list(1)
+
+            if not infos:
+                try:
+                    await self.db.create_collection(name, **options)
+                    created.append(name)
+                except Exception as e:
+                    logger.error(f"Failed to create collection {name}: {e}")
+                continue
+
+            if "timeseries" in options and infos[0].get("type") != "timeseries":
+                logger.warning(f"⚠️ {name} is not a time-series collection; run migrate_vital_signs.py")
+
+        return created
+
+    async def apply(self, rebuild_drifted: bool = False) -> Dict[str, Dict[str, List[str]]]:
+        """
+        Create every declared index that is missing.
+
+        Safe to run on every startup: indexes that already exist with the
+        declared keys and options are left untouched. An index whose name
+        matches but whose keys or options differ is reported as drifted and
+        only rebuilt when `rebuild_drifted` is set, because rebuilding large
+        indexes is expensive.
+
+        Returns:
+            Per collection: created, drifted and failed index names
+        """
+        summary: Dict[str, Dict[str, List[str]]] = {}
+
+        await self.ensure_collections()
+
+        for collection, specs in self.registry.items():
+            existing = await self._existing(collection)
+            result = {"created": [], "drifted": [], "failed": []}
+            to_create: List[IndexSpec] = []
+
+            for spec in specs:
+                info = existing.get(spec.name)
+                if info is None:
+                    to_create.append(spec)
+                    continue
+
+                if _is_drifted(spec, info):
+                    result["drifted"].append(spec.name)
+                    if rebuild_drifted:
+                        await self.db[collection].drop_index(spec.name)
+                        to_create.append(spec)
+
+            for spec in to_create:
+                try:
+                    await self.db[collection].create_indexes([spec.to_model()])
+                    result["created"].append(spec.name)
+                except Exception as e:
+                    logger.error(f"Failed to create index {collection}.{spec.name}: {e}")
+                    result["failed"].append(spec.name)
+
+            if any(result.values()):
+                summary[collection] = result
+
+        created = sum(len(r["created"]) for r in summary.values())
+        drifted = sum(len(r["drifted"]) for r in summary.values())
+        failed = sum(len(r["failed"]) for r in summary.values())
+        logger.info(f"✅ Index bootstrap complete: {created} created, {drifted} drifted, {failed} failed")
+        for collection, result in summary.items():
+            if result["drifted"] and not rebuild_drifted:
+                logger.warning(f"⚠️ Drifted indexes on {collection}: {result['drifted']}")
+
+        return summary
+
+    async def check(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Compare live indexes against the registry using `$indexStats`.
+
+        Returns:
+            Per collection:
+                missing: declared but not present
+                drifted: present with different keys or options
+                undeclared: present but not in the registry
+                unused: present with zero recorded accesses since server start
+                usage: access count per index
+        """
+        report: Dict[str, Dict[str, Any]] = {}
+        collections = set(self.registry) | set(await self.db.list_collection_names())
+
+        for collection in sorted(collections):
+            if collection.startswith("system."):
+                continue
+
+            specs = {spec.name: spec for spec in self.registry.get(collection, [])}
+            existing = await self._existing(collection)
+
+            usage: Dict[str, int] = {}
+            try:
+                async for stat in self.db[collection].aggregate([{"$indexStats": {}}]):
+                    usage[stat["name"]] = stat.get("accesses", {}).get("ops", 0)
+            except Exception as e:
+                logger.debug(f"$indexStats unavailable for {collection}: {e}")
+
+            drifted = [
+                name for name, spec in specs.items()
+                if name in existing and _is_drifted(spec, existing[name])
+            ]
+
+            entry = {
+                "missing": [name for name in specs if name not in existing],
+                "drifted": drifted,
+                "undeclared": [name for name in existing if name != "_id_" and name not in specs],
+                "unused": [name for name, ops in usage.items() if name != "_id_" and ops == 0],
+                "usage": usage,
+            }
+
+            if entry["missing"] or entry["drifted"] or entry["undeclared"] or entry["unused"]:
+                report[collection] = entry
+
+        return report
+
+    async def drop_undeclared(self) -> Dict[str, List[str]]:
+        """
+        Drop live indexes that are not in the registry.
+
+        Returns:
+            Dropped index names per collection
+        """
+        dropped: Dict[str, List[str]] = {}
+        for collection, entry in (await self.check()).items():
+            for name in entry["undeclared"]:
+                await self.db[collection].drop_index(name)
+                dropped.setdefault(collection, []).append(name)
+        return dropped
@@ -4,16 +4,63 @@ Structured logging with correlation IDs and log levels
 """
 
 import logging
+import logging.handlers
+import queue
 import sys
 import json
-from datetime import datetime
-from typing import Any, Dict
+import copy
+import random
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Mapping, Optional
 import uuid
 from contextvars import ContextVar
 
+from ..responses import ORJSON_AVAILABLE, orjson
+
 # Context variable for request ID tracking
 request_id_var: ContextVar[str] = ContextVar('request_id', default='')
 
+# Headers never written to logs verbatim
+REDACTED_HEADERS = frozenset({
+    'authorization',
+    'cookie',
+    'set-cookie',
+    'proxy-authorization',
+    'x-api-key',
+    'x-csrf-token',
+})
+
+# LogRecord attributes that are not user-supplied `extra` fields
+_RECORD_ATTRS = frozenset(
+    vars(logging.LogRecord('', 0, '', 0, '', (), None)).keys()
+) | {'message', 'asctime', 'request_id', 'color_levelname'}
+
+# Listener draining the log queue (one per process)
+_queue_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def dumps(data: Any) -> str:
+    """Serialize to a JSON string, using orjson when installed."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, default=str).decode('utf-8')
+    return json.dumps(data, default=str)
+
+
+def redact_headers(headers: Mapping[str, str]) -> Dict[str, str]:
+    """
+    Copy request headers with credentials masked.
+    
+    Args:
+        headers: Request headers
+        
+    Returns:
+        Dict safe to log
+    """
+    return {
+        key: '[REDACTED]' if key.lower() in REDACTED_HEADERS else value
+        for key, value in headers.items()
+    }
+
 
 class StructuredFormatter(logging.Formatter):
     """
@@ -23,7 +70,7 @@ class StructuredFormatter(logging.Formatter):
     
     def format(self, record: logging.LogRecord) -> str:
         log_data: Dict[str, Any] = {
-            'timestamp': datetime.utcnow().isoformat(),
+            'timestamp': datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
             'level': record.levelname,
             'logger': record.name,
             'message': record.getMessage(),
@@ -32,20 +79,23 @@ class StructuredFormatter(logging.Formatter):
             'line': record.lineno,
         }
         
-        # Add request ID if available
-        request_id = request_id_var.get()
+        # Add request ID if available (captured on the emitting thread)
+        request_id = getattr(record, 'request_id', None) or request_id_var.get()
         if request_id:
             log_data['request_id'] = request_id
         
         # Add exception info if present
         if record.exc_info:
             log_data['exception'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            log_data['exception'] = record.exc_text
         
         # Add extra fields
-        if hasattr(record, 'extra_data'):
-            log_data['extra'] = record.extra_data
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS:
+                log_data[key] = value
         
-        return json.dumps(log_data)
+        return dumps(log_data)
 
 
 class ColoredFormatter(logging.Formatter):
@@ -64,15 +114,71 @@ class ColoredFormatter(logging.Formatter):
     RESET = '\033[0m'
     
     def format(self, record: logging.LogRecord) -> str:
+        # Color a copy: the same record may also reach a file handler
         color = self.COLORS.get(record.levelname, self.RESET)
+        record = copy.copy(record)
         record.levelname = f"{color}{record.levelname}{self.RESET}"
         return super().format(record)
 
 
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queue handler that never blocks the event loop.
+    
+    Only cheap work happens on the emitting thread: message interpolation
+    and capturing the request ID. Formatting, JSON encoding and I/O run on
+    the QueueListener thread. The last `reserved` slots of the queue are
+    kept for WARNING and above, so a flood of INFO records cannot crowd
+    them out; records that find no room are dropped (and counted) instead
+    of stalling requests.
+    """
+    
+    def __init__(self, log_queue: queue.Queue, reserved: int = 0):
+        super().__init__(log_queue)
+        # Queue length from which records below WARNING are dropped
+        self.capacity = max(log_queue.maxsize - reserved, 0) if log_queue.maxsize > 0 else 0
+        self.dropped = 0
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        record.request_id = request_id_var.get()
+        return record
+    
+    def enqueue(self, record: logging.LogRecord):
+        if self.capacity and record.levelno < logging.WARNING and self.queue.qsize() >= self.capacity:
+            self.dropped += 1
+            return
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            # Even the reserve is exhausted: drop rather than block
+            self.dropped += 1
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keep a fraction of high-volume records.
+    
+    A record is sampled when it carries a `sample_rate` attribute
+    (`logger.info(..., extra={"sample_rate": 0.1})`). WARNING and above are
+    always kept.
+    """
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        rate = getattr(record, 'sample_rate', None)
+        if rate is None or record.levelno >= logging.WARNING:
+            return True
+        return random.random() < rate
+
+
 def setup_logging(
     level: str = "INFO",
     json_logs: bool = False,
-    log_file: str = None
+    log_file: str = None,
+    async_logging: bool = True,
+    queue_size: int = 10000
 ):
     """
     Setup application logging.
@@ -81,7 +187,12 @@ def setup_logging(
         level: Log level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
         json_logs: Use JSON format for logs
         log_file: Optional file path for logs
+        async_logging: Write through a QueueHandler/QueueListener pair so
+            formatting and I/O happen off the event loop thread
+        queue_size: Maximum records buffered before INFO/DEBUG are dropped
     """
+    global _queue_listener
+    
     log_level = getattr(logging, level.upper(), logging.INFO)
     
     # Root logger
@@ -89,8 +200,11 @@ def setup_logging(
     root_logger.setLevel(log_level)
     
     # Remove existing handlers
+    stop_logging()
     root_logger.handlers.clear()
     
+    handlers: List[logging.Handler] = []
+    
     # Console handler
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(log_level)
@@ -102,22 +216,69 @@ def setup_logging(
             '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
         ))
     
-    root_logger.addHandler(console_handler)
+    handlers.append(console_handler)
     
     # File handler (optional)
     if log_file:
         file_handler = logging.FileHandler(log_file)
         file_handler.setLevel(log_level)
         file_handler.setFormatter(StructuredFormatter())
-        root_logger.addHandler(file_handler)
+        handlers.append(file_handler)
+    
+    if async_logging:
+        # Extra room on top of queue_size that only warnings and errors can use
+        reserved = max(queue_size // 10, 1)
+        queue_handler = NonBlockingQueueHandler(queue.Queue(maxsize=queue_size + reserved), reserved)
+        queue_handler.addFilter(SamplingFilter())
+        root_logger.addHandler(queue_handler)
+        
+        _queue_listener = logging.handlers.QueueListener(
+            queue_handler.queue,
+            *handlers,
+            respect_handler_level=True
+        )
+        _queue_listener.start()
+    else:
+        for handler in handlers:
+            handler.addFilter(SamplingFilter())
+            root_logger.addHandler(handler)
     
     # Suppress noisy loggers
     logging.getLogger('urllib3').setLevel(logging.WARNING)
     logging.getLogger('asyncio').setLevel(logging.WARNING)
+    # Access logs are written once per request by AccessLogMiddleware
+    logging.getLogger('uvicorn.access').setLevel(logging.WARNING)
     
     return root_logger
 
 
+def stop_logging():
+    """
+    Flush queued records and stop the listener thread.
+    Should be called during application shutdown.
+    """
+    global _queue_listener
+    
+    # Nothing drains the queue once the listener stops
+    root_logger = logging.getLogger()
+    for handler in list(root_logger.handlers):
+        if isinstance(handler, NonBlockingQueueHandler):
+            root_logger.removeHandler(handler)
+    
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        _queue_listener = None
+
+
+def dropped_log_records() -> int:
+    """Number of records dropped because the log queue was full."""
+    return sum(
+        handler.dropped
+        for handler in logging.getLogger().handlers
+        if isinstance(handler, NonBlockingQueueHandler)
+    )
+
+
 def get_logger(name: str) -> logging.Logger:
     """
     Get a logger with the specified name.
@@ -0,0 +1,326 @@
+"""
+Prometheus Metrics
+Low-overhead application metrics with multiprocess (multi-worker) support
+"""
+
+import asyncio
+import logging
+import os
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone, timedelta
+from typing import Optional, Tuple
+
+# Try to import prometheus_client, but don't fail if not available (for testing)
+try:
+    from prometheus_client import (
+        CollectorRegistry,
+        Counter,
+        Gauge,
+        Histogram,
+        REGISTRY,
+        CONTENT_TYPE_LATEST,
+        generate_latest,
+        multiprocess
+    )
+    from pymongo import monitoring
+    PROMETHEUS_AVAILABLE = True
+except ImportError:
+    PROMETHEUS_AVAILABLE = False
+    CONTENT_TYPE_LATEST = "text/plain; version=0.0.4; charset=utf-8"
+    monitoring = None
+
+from ..config import METRICS_ENABLED
+from .logging_config import dropped_log_records
+
+logger = logging.getLogger("mediconnect")
+
+# Set by the process manager before workers start; every worker writes its
+# samples there and /metrics merges them, so any worker can answer a scrape.
+# The directory must be emptied when the server (not a worker) starts.
+MULTIPROC_DIR = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+
+METRICS_ACTIVE = METRICS_ENABLED and PROMETHEUS_AVAILABLE
+
+# Latency buckets tuned for API calls (seconds)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# How often each worker refreshes its own pool gauges (seconds)
+POOL_SAMPLE_INTERVAL = 5.0
+
+# Upper bound for scrape-time database sampling, so an unreachable
+# database cannot stall the scrape past Prometheus' own timeout (seconds)
+SCRAPE_SAMPLE_TIMEOUT = 2.0
+
+# Label used for requests that did not match a route, so that scanners
+# probing random paths cannot blow up label cardinality
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+if METRICS_ACTIVE:
+    HTTP_REQUEST_DURATION = Histogram(
+        "mediconnect_http_request_duration_seconds",
+        "HTTP request latency by route template",
+        ["method", "route", "status"],
+        buckets=LATENCY_BUCKETS
+    )
+    HTTP_REQUESTS_IN_PROGRESS = Gauge(
+        "mediconnect_http_requests_in_progress",
+        "HTTP requests currently being handled",
+        ["method"],
+        multiprocess_mode="livesum"
+    )
+    MONGO_CONNECTIONS_OPEN = Gauge(
+        "mediconnect_mongo_pool_connections",
+        "Open MongoDB pool connections",
+        multiprocess_mode="livesum"
+    )
+    MONGO_CONNECTIONS_IN_USE = Gauge(
+        "mediconnect_mongo_pool_connections_in_use",
+        "MongoDB pool connections checked out",
+        multiprocess_mode="livesum"
+    )
+    MONGO_CHECKOUT_FAILURES = Counter(
+        "mediconnect_mongo_pool_checkout_failures_total",
+        "Failed MongoDB connection checkouts",
+        ["reason"]
+    )
+    REDIS_CONNECTIONS_OPEN = Gauge(
+        "mediconnect_redis_pool_connections",
+        "Open Redis pool connections",
+        multiprocess_mode="livesum"
+    )
+    REDIS_CONNECTIONS_IN_USE = Gauge(
+        "mediconnect_redis_pool_connections_in_use",
+        "Redis pool connections in use",
+        multiprocess_mode="livesum"
+    )
+    CACHE_REQUESTS = Counter(
+        "mediconnect_cache_requests_total",
+        "Cache lookups by namespace and result (hit/miss)",
+        ["namespace", "result"]
+    )
+    RATE_LIMIT_REJECTIONS = Counter(
+        "mediconnect_rate_limit_rejections_total",
+        "Requests rejected by the rate limiter",
+        ["limit"]
+    )
+    EMAILS_SENT = Counter(
+        "mediconnect_emails_total",
+        "Emails handed to the email provider",
+        ["status"]
+    )
+    EMAILS_IN_FLIGHT = Gauge(
+        "mediconnect_emails_in_flight",
+        "Emails currently being sent",
+        multiprocess_mode="livesum"
+    )
+    CIRCUIT_STATE = Gauge(
+        "mediconnect_circuit_state",
+        "Circuit breaker state per dependency (0 closed, 1 half-open, 2 open)",
+        ["dependency"],
+        multiprocess_mode="livemax"
+    )
+    CIRCUIT_CALLS = Counter(
+        "mediconnect_circuit_calls_total",
+        "Calls through a circuit breaker by outcome (success/slow/failure/timeout/rejected)",
+        ["dependency", "outcome"]
+    )
+    REMINDERS_PENDING = Gauge(
+        "mediconnect_reminders_pending",
+        "Reminders due to be sent within the next hour",
+        ["window"],
+        multiprocess_mode="mostrecent"
+    )
+    LOG_RECORDS_DROPPED = Gauge(
+        "mediconnect_log_records_dropped",
+        "Log records dropped because the log queue was full, since worker start",
+        multiprocess_mode="livesum"
+    )
+
+
+_next_pool_sample = 0.0
+
+
+def route_label(scope: dict) -> str:
+    """Route template for a request scope (e.g. /api/appointments/{appointment_id})."""
+    route = scope.get("route")
+    return getattr(route, "path", None) or UNMATCHED_ROUTE
+
+
+def observe_request(method: str, route: str, status_code: int, duration: float):
+    """Record one finished HTTP request."""
+    if not METRICS_ACTIVE:
+        return
+    HTTP_REQUEST_DURATION.labels(method, route, str(status_code)).observe(duration)
+    _maybe_sample_pools()
+
+
+@contextmanager
+def track_in_progress(method: str):
+    """Count a request as in flight for the duration of the block."""
+    if not METRICS_ACTIVE:
+        yield
+        return
+    gauge = HTTP_REQUESTS_IN_PROGRESS.labels(method)
+    gauge.inc()
+    try:
+        yield
+    finally:
+        gauge.dec()
+
+
+def record_cache_lookup(namespace: str, hit: bool):
+    if METRICS_ACTIVE:
+        CACHE_REQUESTS.labels(namespace, "hit" if hit else "miss").inc()
+
+
+def record_rate_limit_rejection(limit: str):
+    if METRICS_ACTIVE:
+        RATE_LIMIT_REJECTIONS.labels(limit).inc()
+
+
+def set_circuit_state(dependency: str, value: int):
+    if METRICS_ACTIVE:
+        CIRCUIT_STATE.labels(dependency).set(value)
+
+
+def record_circuit_call(dependency: str, outcome: str):
+    if METRICS_ACTIVE:
+        CIRCUIT_CALLS.labels(dependency, outcome).inc()
+
+
+@contextmanager
+def track_email():
+    """
+    Count an email send. An exception escaping the block, or setting
+    `outcome["success"] = False`, marks the email as failed.
+    """
+    if not METRICS_ACTIVE:
+        yield {}
+        return
+    outcome = {"success": True}
+    EMAILS_IN_FLIGHT.inc()
+    try:
+        yield outcome
+    except Exception:
+        outcome["success"] = False
+        raise
+    finally:
+        EMAILS_IN_FLIGHT.dec()
+        EMAILS_SENT.labels("sent" if outcome["success"] else "failed").inc()
+
+
+def _redis_pool_usage() -> Optional[Tuple[int, int]]:
+    """(open, in use) connections of this worker's Redis pool."""
+    from ..redis_client import redis_client
+
+    pool = getattr(redis_client, "_pool", None)
+    if pool is None:
+        return None
+    in_use = len(getattr(pool, "_in_use_connections", ()))
+    available = len(getattr(pool, "_available_connections", ()))
+    return in_use + available, in_use
+
+
+def _maybe_sample_pools():
+    """Refresh this worker's pool gauges at most every POOL_SAMPLE_INTERVAL."""
+    global _next_pool_sample
+    now = time.monotonic()
+    if now < _next_pool_sample:
+        return
+    _next_pool_sample = now + POOL_SAMPLE_INTERVAL
+
+    usage = _redis_pool_usage()
+    if usage is not None:
+        REDIS_CONNECTIONS_OPEN.set(usage[0])
+        REDIS_CONNECTIONS_IN_USE.set(usage[1])
+
+
+async def _sample_reminder_backlog():
+    """Count active appointments whose 24h or 1h reminder falls due within the next hour."""
+    from ..db import db
+
+    now = datetime.now(timezone.utc)
+    active = {"$in": ["SCHEDULED", "CONFIRMED"]}
+    for window, hours in (("24h", 24), ("1h", 1)):
+        count = await db.appointments.count_documents({
+            "date_time": {
+                "$gt": (now + timedelta(hours=hours)).isoformat(),
+                "$lte": (now + timedelta(hours=hours + 1)).isoformat()
+            },
+            "status": active
+        })
+        REMINDERS_PENDING.labels(window).set(count)
+
+
+async def render_metrics() -> bytes:
+    """
+    Produce the Prometheus exposition text.
+
+    Gauges that need I/O are sampled here, at scrape time, so request
+    handling never pays for them.
+    """
+    if not METRICS_ACTIVE:
+        return b""
+
+    _maybe_sample_pools()
+    LOG_RECORDS_DROPPED.set(dropped_log_records())
+    try:
+        await asyncio.wait_for(_sample_reminder_backlog(), SCRAPE_SAMPLE_TIMEOUT)
+    except Exception as e:
+        logger.debug(f"Reminder backlog sampling failed: {e}")
+
+    if MULTIPROC_DIR:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest(REGISTRY)
+
+
+def mark_process_dead():
+    """Drop this worker's live gauges from the shared multiprocess directory."""
+    if METRICS_ACTIVE and MULTIPROC_DIR:
+        multiprocess.mark_process_dead(os.getpid())
+
+
+if METRICS_ACTIVE:
+    class MongoPoolMetrics(monitoring.ConnectionPoolListener):
+        """pymongo pool listener keeping connection gauges up to date."""
+
+        def pool_created(self, event):
+            pass
+
+        def pool_ready(self, event):
+            pass
+
+        def pool_cleared(self, event):
+            pass
+
+        def pool_closed(self, event):
+            pass
+
+        def connection_created(self, event):
+            MONGO_CONNECTIONS_OPEN.inc()
+
+        def connection_ready(self, event):
+            pass
+
+        def connection_closed(self, event):
+            MONGO_CONNECTIONS_OPEN.dec()
+
+        def connection_check_out_started(self, event):
+            pass
+
+        def connection_check_out_failed(self, event):
+            MONGO_CHECKOUT_FAILURES.labels(str(event.reason)).inc()
+
+        def connection_checked_out(self, event):
+            MONGO_CONNECTIONS_IN_USE.inc()
+
+        def connection_checked_in(self, event):
+            MONGO_CONNECTIONS_IN_USE.dec()
+
+    mongo_pool_metrics = MongoPoolMetrics()
+else:
+    mongo_pool_metrics = None
@@ -0,0 +1,205 @@
+"""
+Notification Counters Service
+Materialized per-user notification counters for O(1) unread badge polling
+"""
+
+from datetime import datetime, timezone
+from typing import Dict
+import logging
+
+from pymongo import ReturnDocument
+
+from ..db import db
+from ..schemas.notification import NotificationPriority
+from .notification_stream import notification_stream
+
+logger = logging.getLogger("mediconnect")
+
+
+class NotificationCounterService:
+    """
+    Keeps a small `notification_counters` document per user in sync with
+    the `notifications` collection.
+
+    Counter document shape:
+        {"user_id": str, "total": int, "unread": int, "updated_at": str}
+
+    Writers `$inc` an existing document. A missing document is seeded
+    from the notifications collection (on the first write or read), so
+    users with notifications created before this service existed still
+    get correct numbers. Seeding only ever inserts (`$setOnInsert`): it
+    never overwrites a document that a concurrent writer already seeded
+    or incremented.
+
+    A notification is unread unless `is_read` is True, matching the
+    router's `{"is_read": {"$ne": True}}` filters for documents stored
+    without the field.
+    """
+
+    @staticmethod
+    async def _apply(user_id: str, total: int = 0, unread: int = 0):
+        """Atomically apply deltas, seeding the counter document if it is missing."""
+        if not total and not unread:
+            return
+
+        doc = await db.notification_counters.find_one_and_update(
+            {"user_id": user_id},
+            {
+                "$inc": {"total": total, "unread": unread},
+                "$set": {"updated_at": datetime.now(timezone.utc).isoformat()}
+            },
+            projection={"_id": 0, "total": 1, "unread": 1},
+            return_document=ReturnDocument.AFTER
+        )
+
+        if doc is None:
+            # The write is already in the collection, so the seed counts it
+            doc = await NotificationCounterService.rebuild(user_id)
+
+        await notification_stream.publish_counters(user_id, doc["total"], doc["unread"])
+
+    @staticmethod
+    async def rebuild(user_id: str) -> Dict[str, int]:
+        """
+        Seed counters for a user from the notifications collection.
+
+        If another request seeded the document first, its counters (and
+        any deltas applied since) are kept and returned.
+
+        Returns:
+            Dict with `total` and `unread`
+        """
+        result = await db.notifications.aggregate([
+            {"$match": {"user_id": user_id}},
+            {
+                "$group": {
+                    "_id": None,
+                    "total": {"$sum": 1},
+                    "unread": {"$sum": {"$cond": [{"$ne": ["$is_read", True]}, 1, 0]}}
+                }
+            }
+        ]).to_list(1)
+
+        counters = {
+            "total": result[0]["total"] if result else 0,
+            "unread": result[0]["unread"] if result else 0
+        }
+
+        doc = await db.notification_counters.find_one_and_update(
+            {"user_id": user_id},
+            {
+                "$setOnInsert": {
+                    **counters,
+                    "updated_at": datetime.now(timezone.utc).isoformat()
+                }
+            },
+            projection={"_id": 0, "total": 1, "unread": 1},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+
+        return {
+            "total": max(doc.get("total", 0), 0),
+            "unread": max(doc.get("unread", 0), 0)
+        }
+
+    @staticmethod
+    async def get_counters(user_id: str) -> Dict[str, int]:
+        """
+        Get total and unread counts for a user with a single indexed lookup.
+
+        Returns:
+            Dict with `total` and `unread`
+        """
+        doc = await db.notification_counters.find_one(
+            {"user_id": user_id},
+            {"_id": 0, "total": 1, "unread": 1}
+        )
+
+        if not doc:
+            return await NotificationCounterService.rebuild(user_id)
+
+        return {
+            "total": max(doc.get("total", 0), 0),
+            "unread": max(doc.get("unread", 0), 0)
+        }
+
+    @staticmethod
+    async def get_breakdown(user_id: str) -> Dict[str, Dict[str, int]]:
+        """
+        Group a user's notifications by type and priority in one `$group`.
+
+        Returns:
+            Dict with `by_type` and `by_priority` counts
+        """
+        groups = await db.notifications.aggregate([
+            {"$match": {"user_id": user_id}},
+            {
+                "$group": {
+                    "_id": {"type": "$type", "priority": "$priority"},
+                    "count": {"$sum": 1}
+                }
+            }
+        ]).to_list(None)
+
+        by_type: Dict[str, int] = {}
+        by_priority: Dict[str, int] = {}
+        for group in groups:
+            n_type = group["_id"].get("type") or "UNKNOWN"
+            priority = group["_id"].get("priority") or NotificationPriority.MEDIUM
+            by_type[n_type] = by_type.get(n_type, 0) + group["count"]
+            by_priority[priority] = by_priority.get(priority, 0) + group["count"]
+
+        return {"by_type": by_type, "by_priority": by_priority}
+
+    @staticmethod
+    async def record_created(user_id: str, is_read: bool = False):
+        """Account for a newly inserted notification."""
+        await NotificationCounterService._apply(
+            user_id,
+            total=1,
+            unread=0 if is_read else 1
+        )
+
+    @staticmethod
+    async def record_read_state(user_id: str, is_read: bool):
+        """Account for a single notification switching read state."""
+        await NotificationCounterService._apply(user_id, unread=-1 if is_read else 1)
+
+    @staticmethod
+    async def record_all_read(user_id: str, count: int):
+        """Account for `count` notifications marked as read in bulk."""
+        await NotificationCounterService._apply(user_id, unread=-count)
+
+    @staticmethod
+    async def record_deleted(user_id: str, was_read: bool):
+        """Account for a single deleted notification."""
+        await NotificationCounterService._apply(
+            user_id,
+            total=-1,
+            unread=0 if was_read else -1
+        )
+
+    @staticmethod
+    async def record_bulk_deleted(user_id: str, total: int, unread: int):
+        """Account for `total` deleted notifications, `unread` of them unread."""
+        await NotificationCounterService._apply(user_id, total=-total, unread=-unread)
+
+    @staticmethod
+    async def reset(user_id: str):
+        """Zero the counters after all of a user's notifications are removed."""
+        await db.notification_counters.update_one(
+            {"user_id": user_id},
+            {
+                "$set": {
+                    "total": 0,
+                    "unread": 0,
+                    "updated_at": datetime.now(timezone.utc).isoformat()
+                }
+            }
+        )
+        await notification_stream.publish_counters(user_id, 0, 0)
+
+
+# Convenience instance
+notification_counters = NotificationCounterService()
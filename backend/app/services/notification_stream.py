@@ -0,0 +1,331 @@
+"""
+Notification Stream Service
+Pushes new notifications and unread-count changes to connected clients
+"""
+
+import asyncio
+import json
+import logging
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional, Set
+
+from fastapi import Request
+
+from ..config import (
+    NOTIFICATION_STREAM_BACKEND,
+    NOTIFICATION_STREAM_HEARTBEAT,
+    NOTIFICATION_STREAM_REPLAY_LIMIT
+)
+from ..db import db
+from ..redis_client import REDIS_ENABLED, redis_client
+
+logger = logging.getLogger("mediconnect")
+
+CHANNEL_PREFIX = "notifications:stream:"
+
+# Per-connection buffer; a client that falls this far behind drops events
+# and catches up through Last-Event-ID on its next reconnect.
+SUBSCRIBER_QUEUE_SIZE = 100
+
+# Reconnect delay advertised to EventSource clients (milliseconds)
+CLIENT_RETRY_MS = 5000
+
+# How often the listener retries while Redis is unavailable (seconds)
+REDIS_RETRY_SECONDS = 5
+
+
+def format_sse(event: str, data: Any, event_id: Optional[str] = None) -> str:
+    """Encode a single Server-Sent Event frame."""
+    lines = []
+    if event_id:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(data, default=str)}")
+    return "\n".join(lines) + "\n\n"
+
+
+class NotificationStreamService:
+    """
+    Fan-out hub for per-user notification events.
+
+    Each worker process runs one background listener (a pattern-subscribed
+    Redis pub/sub connection, or a MongoDB change stream) and hands events
+    to the in-process queues of the users connected to that worker. Open
+    SSE connections therefore never hold a Redis or Mongo connection each.
+
+    While this worker's Redis subscription is down (Redis unavailable at
+    startup, circuit open, reconnecting) events are delivered in-process
+    instead, which is only complete for a single worker; the listener keeps
+    retrying and Redis delivery resumes once it has subscribed again.
+    """
+
+    def __init__(self):
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        self._listener: Optional[asyncio.Task] = None
+        # Whether the Redis listener currently holds its subscription
+        self._redis_subscribed = False
+
+    @property
+    def backend(self) -> str:
+        return NOTIFICATION_STREAM_BACKEND
+
+    async def start(self):
+        """
+        Start the background listener.
+        Should be called during application startup.
+        """
+        if self._listener:
+            return
+
+        if self.backend == "change_stream":
+            self._listener = asyncio.create_task(self._listen_change_stream())
+            logger.info("✅ Notification stream listening on MongoDB change streams")
+        elif REDIS_ENABLED:
+            # Keeps retrying if Redis is not reachable yet
+            self._listener = asyncio.create_task(self._listen_redis())
+            logger.info("✅ Notification stream listening on Redis pub/sub")
+        else:
+            logger.warning("⚠️ Notification stream running in-process (single worker only)")
+
+    async def stop(self):
+        """
+        Stop the background listener.
+        Should be called during application shutdown.
+        """
+        if self._listener:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+
+    # ============= PUBLISHING =============
+
+    async def publish(
+        self,
+        user_id: str,
+        event: str,
+        data: Dict[str, Any],
+        event_id: Optional[str] = None
+    ):
+        """
+        Publish an event to every connection of a user.
+
+        With the change stream backend this is a no-op: the listener
+        observes the underlying writes directly.
+        """
+        if self.backend == "change_stream":
+            return
+
+        message = {"event": event, "data": data, "id": event_id}
+
+        # While subscribed, this worker's own listener receives the message,
+        # so 0 receivers means the publish failed
+        if self._redis_subscribed and await redis_client.publish(
+            f"{CHANNEL_PREFIX}{user_id}",
+            json.dumps(message, default=str)
+        ):
+            return
+
+        self._dispatch(user_id, message)
+
+    async def publish_notification(self, doc: Dict[str, Any]):
+        """Publish a newly inserted notification document."""
+        data = {k: v for k, v in doc.items() if k != "_id"}
+        await self.publish(
+            data["user_id"],
+            "notification",
+            data,
+            event_id=data.get("notification_id")
+        )
+
+    async def publish_counters(self, user_id: str, total: int, unread: int):
+        """Publish the user's current notification counters."""
+        await self.publish(
+            user_id,
+            "unread_count",
+            {"total": max(total, 0), "unread": max(unread, 0)}
+        )
+
+    # ============= SUBSCRIBING =============
+
+    @asynccontextmanager
+    async def subscribe(self, user_id: str) -> AsyncIterator[asyncio.Queue]:
+        """Register an in-process queue receiving the user's events."""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self._subscribers.setdefault(user_id, set()).add(queue)
+        try:
+            yield queue
+        finally:
+            queues = self._subscribers.get(user_id)
+            if queues is not None:
+                queues.discard(queue)
+                if not queues:
+                    del self._subscribers[user_id]
+
+    def connection_count(self) -> int:
+        """Number of open stream connections on this worker."""
+        return sum(len(queues) for queues in self._subscribers.values())
+
+    async def replay(self, user_id: str, last_event_id: str) -> List[Dict[str, Any]]:
+        """
+        Get notifications created after the one a client last received.
+
+        Args:
+            user_id: Owner of the notifications
+            last_event_id: notification_id from the client's Last-Event-ID
+
+        Returns:
+            Missed notifications, oldest first
+        """
+        anchor = await db.notifications.find_one(
+            {"notification_id": last_event_id, "user_id": user_id},
+            {"_id": 0, "created_at": 1}
+        )
+        if not anchor:
+            return []
+
+        return await db.notifications.find(
+            {"user_id": user_id, "created_at": {"$gt": anchor["created_at"]}},
+            {"_id": 0}
+        ).sort("created_at", 1).limit(NOTIFICATION_STREAM_REPLAY_LIMIT).to_list(
+            NOTIFICATION_STREAM_REPLAY_LIMIT
+        )
+
+    async def event_source(
+        self,
+        request: Request,
+        user_id: str,
+        counters: Dict[str, int],
+        last_event_id: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """
+        Generate the SSE body for one client connection.
+
+        Sends the current counters, replays anything missed since
+        `last_event_id`, then streams live events with periodic heartbeats.
+        """
+        async with self.subscribe(user_id) as queue:
+            yield f"retry: {CLIENT_RETRY_MS}\n\n"
+            yield format_sse("unread_count", counters)
+
+            replayed: Set[str] = set()
+            if last_event_id:
+                for doc in await self.replay(user_id, last_event_id):
+                    replayed.add(doc["notification_id"])
+                    yield format_sse("notification", doc, doc["notification_id"])
+
+            while not await request.is_disconnected():
+                try:
+                    message = await asyncio.wait_for(
+                        queue.get(),
+                        timeout=NOTIFICATION_STREAM_HEARTBEAT
+                    )
+                except asyncio.TimeoutError:
+                    yield ": heartbeat\n\n"
+                    continue
+
+                if message.get("id") in replayed:
+                    continue
+
+                yield format_sse(message["event"], message["data"], message.get("id"))
+
+    # ============= LISTENERS =============
+
+    def _dispatch(self, user_id: str, message: Dict[str, Any]):
+        """Hand a message to every local queue of a user."""
+        for queue in self._subscribers.get(user_id, ()):
+            try:
+                queue.put_nowait(message)
+            except asyncio.QueueFull:
+                logger.warning(f"Notification stream queue full for user {user_id}, dropping event")
+
+    async def _listen_redis(self):
+        """Relay pattern-subscribed Redis messages to local subscribers."""
+        while True:
+            pubsub = None
+            try:
+                client = await redis_client.get_client()
+                if not client:
+                    await asyncio.sleep(REDIS_RETRY_SECONDS)
+                    continue
+
+                pubsub = client.pubsub()
+                await pubsub.psubscribe(f"{CHANNEL_PREFIX}*")
+                self._redis_subscribed = True
+
+                async for msg in pubsub.listen():
+                    if msg.get("type") != "pmessage":
+                        continue
+                    user_id = msg["channel"][len(CHANNEL_PREFIX):]
+                    if user_id in self._subscribers:
+                        self._dispatch(user_id, json.loads(msg["data"]))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Notification stream Redis listener error: {e}")
+                await asyncio.sleep(1)
+            finally:
+                self._redis_subscribed = False
+                if pubsub is not None:
+                    try:
+                        await pubsub.close()
+                    except Exception:
+                        pass
+
+    async def _listen_change_stream(self):
+        """Relay notification inserts and counter updates from MongoDB."""
+        pipeline = [
+            {
+                "$match": {
+                    "$or": [
+                        {"ns.coll": "notifications", "operationType": "insert"},
+                        {
+                            "ns.coll": "notification_counters",
+                            "operationType": {"$in": ["insert", "update", "replace"]}
+                        }
+                    ]
+                }
+            }
+        ]
+        resume_token = None
+
+        while True:
+            try:
+                async with db.watch(
+                    pipeline,
+                    full_document="updateLookup",
+                    resume_after=resume_token
+                ) as stream:
+                    async for change in stream:
+                        resume_token = stream.resume_token
+                        doc = change.get("fullDocument")
+                        if not doc or doc.get("user_id") not in self._subscribers:
+                            continue
+
+                        doc.pop("_id", None)
+                        if change["ns"]["coll"] == "notifications":
+                            self._dispatch(doc["user_id"], {
+                                "event": "notification",
+                                "data": doc,
+                                "id": doc.get("notification_id")
+                            })
+                        else:
+                            self._dispatch(doc["user_id"], {
+                                "event": "unread_count",
+                                "data": {
+                                    "total": max(doc.get("total", 0), 0),
+                                    "unread": max(doc.get("unread", 0), 0)
+                                },
+                                "id": None
+                            })
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Notification change stream error: {e}")
+                await asyncio.sleep(1)
+
+
+# Global notification stream instance
+notification_stream = NotificationStreamService()
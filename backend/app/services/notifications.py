@@ -3,6 +3,7 @@ from pydantic import BaseModel, Field, ConfigDict
 import uuid
 import logging
 from ..db import db
+from .data_lifecycle import purge_at
 
 logger = logging.getLogger("mediconnect")
 
@@ -28,6 +29,7 @@ async def send_notification_email(user_id: str, appointment_id: str, notificatio
     )
     doc = notification.model_dump()
     doc['created_at'] = doc['created_at'].isoformat()
+    doc['purge_at'] = purge_at("notification_logs")
     await db.notification_logs.insert_one(doc)
     logger.info(f"[MOCK EMAIL] {notification_type} sent to user {user_id}: {message}")
     return notification
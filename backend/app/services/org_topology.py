@@ -0,0 +1,115 @@
+"""
+Organization Topology Service
+Cached organization → locations map (IDs, names, active flags) for scope checks and labels
+"""
+
+import logging
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..config import ORG_TOPOLOGY_CACHE_TTL, ORG_TOPOLOGY_LOCAL_TTL
+from ..db import db
+from .cache import locations_cache
+
+logger = logging.getLogger("mediconnect")
+
+TOPOLOGY_FIELDS = {"_id": 0, "location_id": 1, "name": 1, "is_active": 1, "is_primary": 1, "clinic_id": 1}
+
+
+class OrganizationTopology:
+    """One organization's locations, in primary-first order."""
+
+    def __init__(self, organization_id: str, locations: List[Dict[str, Any]]):
+        self.organization_id = organization_id
+        self.locations = locations
+        self._by_id = {location["location_id"]: location for location in locations}
+
+    def __contains__(self, location_id: str) -> bool:
+        return location_id in self._by_id
+
+    def location_ids(self) -> List[str]:
+        """Every location ID, active or not."""
+        return list(self._by_id)
+
+    def active_location_ids(self) -> List[str]:
+        return [location["location_id"] for location in self.locations if location.get("is_active")]
+
+    def active_locations(self) -> List[Dict[str, Any]]:
+        return [location for location in self.locations if location.get("is_active")]
+
+    def is_active(self, location_id: str) -> bool:
+        location = self._by_id.get(location_id)
+        return bool(location and location.get("is_active"))
+
+    def name(self, location_id: str) -> Optional[str]:
+        location = self._by_id.get(location_id)
+        return location.get("name") if location else None
+
+    def names(self) -> Dict[str, str]:
+        """location_id → name."""
+        return {location_id: location.get("name") for location_id, location in self._by_id.items()}
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"organization_id": self.organization_id, "locations": self.locations}
+
+
+class OrganizationTopologyService:
+    """
+    Serves organization topologies from an in-process cache in front of
+    the `locations` Redis namespace, loading from MongoDB on a miss.
+
+    Location writes (create, update, delete, access request approval) call
+    `invalidate`, which clears this process and Redis immediately; other
+    workers' in-process entries expire within ORG_TOPOLOGY_LOCAL_TTL.
+    """
+
+    _local: Dict[str, Tuple[float, OrganizationTopology]] = {}
+
+    @staticmethod
+    def _cache_key(organization_id: str) -> str:
+        return f"org:{organization_id}"
+
+    @staticmethod
+    async def load(organization_id: str) -> OrganizationTopology:
+        """Read an organization's locations from MongoDB."""
+        locations = await db.locations.find(
+            {"organization_id": organization_id},
+            TOPOLOGY_FIELDS
+        ).sort([("is_primary", -1), ("location_id", 1)]).to_list(None)
+        return OrganizationTopology(organization_id, locations)
+
+    @staticmethod
+    async def get(organization_id: str) -> OrganizationTopology:
+        """
+        Get an organization's topology, from cache when possible.
+
+        Returns:
+            OrganizationTopology (empty for an unknown organization)
+        """
+        now = time.monotonic()
+        entry = OrganizationTopologyService._local.get(organization_id)
+        if entry and entry[0] > now:
+            return entry[1]
+
+        key = OrganizationTopologyService._cache_key(organization_id)
+        cached = await locations_cache.get(key)
+        if cached is not None:
+            topology = OrganizationTopology(organization_id, cached.get("locations", []))
+        else:
+            topology = await OrganizationTopologyService.load(organization_id)
+            await locations_cache.set(key, topology.to_dict(), ttl=ORG_TOPOLOGY_CACHE_TTL)
+
+        OrganizationTopologyService._local[organization_id] = (now + ORG_TOPOLOGY_LOCAL_TTL, topology)
+        return topology
+
+    @staticmethod
+    async def invalidate(organization_id: Optional[str]):
+        """Drop an organization's cached topology after a location write."""
+        if not organization_id:
+            return
+        OrganizationTopologyService._local.pop(organization_id, None)
+        await locations_cache.delete(OrganizationTopologyService._cache_key(organization_id))
+
+
+# Convenience instance
+org_topology = OrganizationTopologyService()
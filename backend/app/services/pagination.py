@@ -0,0 +1,78 @@
+"""
+Cursor Pagination
+Keyset (cursor) pagination over MongoDB collections sorted newest first
+"""
+
+import base64
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi import HTTPException
+from motor.motor_asyncio import AsyncIOMotorCollection
+
+
+def encode_cursor(sort_value: Any, tie_breaker: Any) -> str:
+    """Opaque cursor pointing just past (sort_value, tie_breaker)."""
+    raw = json.dumps([sort_value, tie_breaker], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Any, Any]:
+    """
+    Decode a cursor from `encode_cursor`.
+
+    Raises:
+        HTTPException: 400 if the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_value, tie_breaker = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return sort_value, tie_breaker
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+
+
+def keyset_filter(sort_field: str, id_field: str, cursor: Optional[str]) -> Dict[str, Any]:
+    """Filter selecting documents after `cursor` in (sort_field desc, id_field desc) order."""
+    if not cursor:
+        return {}
+    sort_value, tie_breaker = decode_cursor(cursor)
+    return {"$or": [
+        {sort_field: {"$lt": sort_value}},
+        {sort_field: sort_value, id_field: {"$lt": tie_breaker}}
+    ]}
+
+
+async def paginate(
+    collection: AsyncIOMotorCollection,
+    query: Dict[str, Any],
+    sort_field: str,
+    id_field: str,
+    limit: int,
+    cursor: Optional[str] = None,
+    projection: Optional[Dict[str, Any]] = None
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    Fetch one page, newest first.
+
+    Sorting on (sort_field, id_field) keeps the order stable when several
+    documents share a timestamp; an index on (<query fields>, sort_field
+    desc, id_field desc) serves every page without skipping.
+
+    Returns:
+        (documents, next cursor or None on the last page)
+    """
+    after = keyset_filter(sort_field, id_field, cursor)
+    full_query = {"$and": [query, after]} if after else query
+
+    docs = await collection.find(
+        full_query,
+        projection if projection is not None else {"_id": 0}
+    ).sort([(sort_field, -1), (id_field, -1)]).limit(limit + 1).to_list(limit + 1)
+
+    if len(docs) <= limit:
+        return docs, None
+
+    docs = docs[:limit]
+    last = docs[-1]
+    return docs, encode_cursor(last.get(sort_field), last.get(id_field))
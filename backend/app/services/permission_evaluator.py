@@ -0,0 +1,153 @@
+"""
+Permission Evaluator
+ROLE_PERMISSIONS_MATRIX compiled to per-role bitmasks, plus per-request permission facts
+"""
+
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from fastapi import Request
+
+from ..db import db
+from ..schemas.permission import PermissionConstants, ROLE_PERMISSIONS_MATRIX
+from ..schemas.user import User, UserRole
+from .doctor_identity import doctor_identity
+from .org_topology import org_topology
+
+# Roles that only ever view appointments
+ADMIN_ROLES = frozenset({UserRole.SUPER_ADMIN, UserRole.LOCATION_ADMIN})
+
+# Appointment fields the ownership and location checks read
+APPOINTMENT_FACT_FIELDS = {"_id": 0, "appointment_id": 1, "patient_id": 1, "doctor_id": 1, "location_id": 1, "clinic_id": 1}
+
+
+class CompiledRole(NamedTuple):
+    """One role's permissions as bitmasks over PERMISSION_BITS."""
+    granted: int
+    location_scope: int
+    organization_scope: int
+    own_appointments: int
+    own_location: int
+    scopes: Dict[str, str]
+    configs: Dict[str, Dict[str, Any]]
+
+
+def compile_permission_matrix(
+    matrix: Dict[str, Dict[str, Dict[str, Any]]]
+) -> Tuple[Dict[str, int], Dict[str, CompiledRole]]:
+    """
+    Compile a role → permission → config matrix into bitmasks.
+
+    Every permission named anywhere in the matrix gets one bit; each role
+    gets a mask of its granted permissions and one mask per constraint, so
+    a check is a dict lookup and a few `&` operations.
+
+    Returns:
+        (permission → bit, role → CompiledRole)
+    """
+    permissions = sorted({permission for grants in matrix.values() for permission in grants})
+    bits = {permission: 1 << index for index, permission in enumerate(permissions)}
+
+    roles = {}
+    for role, grants in matrix.items():
+        masks = {"granted": 0, "location": 0, "organization": 0, "own_appointments": 0, "own_location": 0}
+        scopes = {}
+        for permission, config in grants.items():
+            bit = bits[permission]
+            scope = config.get("scope", "location")
+            scopes[permission] = scope
+            masks["granted"] |= bit
+            if scope in ("location", "organization"):
+                masks[scope] |= bit
+            if config.get("own_appointments_only"):
+                masks["own_appointments"] |= bit
+            if config.get("own_location_only"):
+                masks["own_location"] |= bit
+
+        roles[role] = CompiledRole(
+            granted=masks["granted"],
+            location_scope=masks["location"],
+            organization_scope=masks["organization"],
+            own_appointments=masks["own_appointments"],
+            own_location=masks["own_location"],
+            scopes=scopes,
+            configs={permission: dict(config) for permission, config in grants.items()}
+        )
+
+    return bits, roles
+
+
+# Compiled once at import (application startup)
+PERMISSION_BITS, COMPILED_ROLES = compile_permission_matrix(ROLE_PERMISSIONS_MATRIX)
+
+# Operational appointment permissions admins are never allowed
+ADMIN_RESTRICTED_MASK = 0
+for _permission, _bit in PERMISSION_BITS.items():
+    if _permission.startswith("appointments:") and _permission != PermissionConstants.APPOINTMENTS_VIEW:
+        ADMIN_RESTRICTED_MASK |= _bit
+
+
+class PermissionContext:
+    """
+    Permission facts for one user within one request.
+
+    Database-backed facts (organization locations, the user's doctor_id,
+    appointment ownership) are loaded on first use and reused by every
+    later check, and each decision is cached by its inputs. Obtain it with
+    `get_permission_context` so it is shared through `request.state`.
+    """
+
+    def __init__(self, user: User):
+        self.user = user
+        self.decisions: Dict[Tuple, Any] = {}
+        self._org_locations: Optional[Dict[str, bool]] = None
+        self._doctor_loaded = False
+        self._doctor_id: Optional[str] = None
+        self._appointments: Dict[str, Optional[Dict[str, Any]]] = {}
+
+    async def org_locations(self) -> Dict[str, bool]:
+        """location_id → is_active for every location in the user's organization."""
+        if self._org_locations is None:
+            self._org_locations = {}
+            if self.user.organization_id:
+                topology = await org_topology.get(self.user.organization_id)
+                for location in topology.locations:
+                    self._org_locations[location["location_id"]] = bool(location.get("is_active"))
+        return self._org_locations
+
+    async def accessible_locations(self) -> List[str]:
+        """Location IDs the user may act on."""
+        if self.user.role == UserRole.SUPER_ADMIN and self.user.organization_id:
+            locations = await self.org_locations()
+            return [location_id for location_id, active in locations.items() if active]
+        return self.user.assigned_location_ids or []
+
+    async def doctor_id(self) -> Optional[str]:
+        """The doctor_id linked to the user, if any."""
+        if not self._doctor_loaded:
+            self._doctor_id = await doctor_identity.resolve(self.user)
+            self._doctor_loaded = True
+        return self._doctor_id
+
+    async def appointment(self, appointment_id: str) -> Optional[Dict[str, Any]]:
+        """Ownership and location fields of an appointment, or None if missing."""
+        if appointment_id not in self._appointments:
+            self._appointments[appointment_id] = await db.appointments.find_one(
+                {"appointment_id": appointment_id},
+                APPOINTMENT_FACT_FIELDS
+            )
+        return self._appointments[appointment_id]
+
+
+def get_permission_context(user: User, request: Optional[Request] = None) -> PermissionContext:
+    """
+    The permission context for `user`, memoized on `request.state` when a
+    request is given (a fresh, unshared context otherwise).
+    """
+    if request is None:
+        return PermissionContext(user)
+
+    context = getattr(request.state, "permission_context", None)
+    if context is None or context.user.user_id != user.user_id:
+        context = PermissionContext(user)
+        request.state.permission_context = context
+    return context
@@ -11,14 +11,23 @@ This service implements the core RBAC logic with the following critical rules:
 from typing import Optional, Dict, List, Any
 from datetime import datetime, timezone
 
+from fastapi import Request
+
 from ..db import db
 from ..schemas.user import User, UserRole
 from ..schemas.permission import (
     PermissionConstants,
-    ROLE_PERMISSIONS_MATRIX,
     PermissionCheckResult
 )
 from ..schemas.audit_log import AuditLog, AuditActions
+from .permission_evaluator import (
+    ADMIN_RESTRICTED_MASK,
+    ADMIN_ROLES,
+    COMPILED_ROLES,
+    PERMISSION_BITS,
+    PermissionContext,
+    get_permission_context
+)
 
 
 class PermissionService:
@@ -31,59 +40,79 @@ class PermissionService:
         user: User,
         permission: str,
         resource_id: Optional[str] = None,
-        context: Optional[Dict[str, Any]] = None
+        context: Optional[Dict[str, Any]] = None,
+        request: Optional[Request] = None
     ) -> PermissionCheckResult:
         """
         Check if a user has a specific permission.
         
+        The role matrix is evaluated through its compiled bitmasks, and
+        location/ownership facts come from the request's PermissionContext,
+        so repeated checks within one request do not touch the database.
+        
         Args:
             user: The user to check permissions for
             permission: The permission to check (e.g., "appointments:accept")
             resource_id: Optional resource ID (e.g., appointment_id, location_id)
             context: Additional context for the permission check
+            request: Current request; facts and decisions are memoized on it
             
         Returns:
             PermissionCheckResult with allowed status and details
         """
         context = context or {}
+        facts = get_permission_context(user, request)
         
-        # Get role permissions
-        role_permissions = ROLE_PERMISSIONS_MATRIX.get(user.role, {})
+        key = (permission, resource_id, context.get("location_id"), context.get("organization_id"))
+        decision = facts.decisions.get(key)
+        if decision is None:
+            decision = await PermissionService._evaluate(facts, permission, resource_id, context)
+            facts.decisions[key] = decision
+        
+        return decision
+    
+    @staticmethod
+    async def _evaluate(
+        facts: PermissionContext,
+        permission: str,
+        resource_id: Optional[str],
+        context: Dict[str, Any]
+    ) -> PermissionCheckResult:
+        user = facts.user
+        compiled = COMPILED_ROLES.get(user.role)
+        bit = PERMISSION_BITS.get(permission, 0)
         
         # Check if role has this permission
-        if permission not in role_permissions:
+        if compiled is None or not compiled.granted & bit:
             return PermissionCheckResult(
                 allowed=False,
                 reason=f"Role {user.role} does not have permission {permission}",
                 scope=None
             )
         
-        permission_config = role_permissions[permission]
-        
-        # Check scope constraints
-        scope = permission_config.get("scope", "location")
+        permission_config = compiled.configs[permission]
+        scope = compiled.scopes[permission]
         
         # CRITICAL: Check view-only constraint for admins on appointments
         # But allow doctors to manage their own appointments
-        if permission.startswith("appointments:") and permission != PermissionConstants.APPOINTMENTS_VIEW:
-            if user.role in [UserRole.SUPER_ADMIN, UserRole.LOCATION_ADMIN]:
-                # Admins cannot perform operational appointment actions
-                await PermissionService._log_permission_denial(
-                    user=user,
-                    permission=permission,
-                    resource_id=resource_id,
-                    reason="Admin roles have view-only access to appointments"
-                )
-                return PermissionCheckResult(
-                    allowed=False,
-                    reason="Admin roles have view-only access to appointments. Only operational staff can perform this action.",
-                    scope=scope,
-                    constraints=permission_config
-                )
+        if bit & ADMIN_RESTRICTED_MASK and user.role in ADMIN_ROLES:
+            # Admins cannot perform operational appointment actions
+            await PermissionService._log_permission_denial(
+                user=user,
+                permission=permission,
+                resource_id=resource_id,
+                reason="Admin roles have view-only access to appointments"
+            )
+            return PermissionCheckResult(
+                allowed=False,
+                reason="Admin roles have view-only access to appointments. Only operational staff can perform this action.",
+                scope=scope,
+                constraints=permission_config
+            )
         
         # Check location-scoped access
-        if scope == "location":
-            if not await PermissionService._check_location_access(user, context.get("location_id")):
+        if bit & compiled.location_scope:
+            if not await PermissionService._check_location_access(user, context.get("location_id"), facts):
                 return PermissionCheckResult(
                     allowed=False,
                     reason="User does not have access to this location",
@@ -91,7 +120,7 @@ class PermissionService:
                 )
         
         # Check organization-scoped access
-        if scope == "organization":
+        if bit & compiled.organization_scope:
             if not await PermissionService._check_organization_access(user, context.get("organization_id")):
                 return PermissionCheckResult(
                     allowed=False,
@@ -100,8 +129,8 @@ class PermissionService:
                 )
         
         # Check "own_appointments_only" constraint (for doctors)
-        if permission_config.get("own_appointments_only"):
-            if not await PermissionService._check_own_appointment(user, resource_id):
+        if bit & compiled.own_appointments:
+            if not await PermissionService._check_own_appointment(user, resource_id, facts):
                 return PermissionCheckResult(
                     allowed=False,
                     reason="You can only access your own appointments",
@@ -110,7 +139,7 @@ class PermissionService:
                 )
         
         # Check "own_location_only" constraint
-        if permission_config.get("own_location_only"):
+        if bit & compiled.own_location:
             if not await PermissionService._check_own_location(user, resource_id):
                 return PermissionCheckResult(
                     allowed=False,
@@ -128,7 +157,11 @@ class PermissionService:
         )
     
     @staticmethod
-    async def _check_location_access(user: User, location_id: Optional[str]) -> bool:
+    async def _check_location_access(
+        user: User,
+        location_id: Optional[str],
+        facts: Optional[PermissionContext] = None
+    ) -> bool:
         """
         Check if user has access to a specific location.
         
@@ -139,11 +172,8 @@ class PermissionService:
         if user.role == UserRole.SUPER_ADMIN:
             # Super admin has access to all locations in their organization
             if location_id and user.organization_id:
-                location = await db.locations.find_one(
-                    {"location_id": location_id, "organization_id": user.organization_id},
-                    {"_id": 0}
-                )
-                return location is not None
+                facts = facts or PermissionContext(user)
+                return location_id in await facts.org_locations()
             return True
         
         # For other roles, check assigned_location_ids
@@ -167,32 +197,25 @@ class PermissionService:
         return user.organization_id == organization_id
     
     @staticmethod
-    async def _check_own_appointment(user: User, appointment_id: Optional[str]) -> bool:
+    async def _check_own_appointment(
+        user: User,
+        appointment_id: Optional[str],
+        facts: Optional[PermissionContext] = None
+    ) -> bool:
         """
         Check if an appointment belongs to the user (for doctors).
         """
-        if not appointment_id:
+        if not appointment_id or user.role != UserRole.DOCTOR:
             return False
         
-        appointment = await db.appointments.find_one(
-            {"appointment_id": appointment_id},
-            {"_id": 0}
-        )
-        
+        facts = facts or PermissionContext(user)
+        appointment = await facts.appointment(appointment_id)
         if not appointment:
             return False
         
         # For doctors, check if they are the assigned doctor
-        if user.role == UserRole.DOCTOR:
-            # Find doctor record for this user
-            doctor = await db.doctors.find_one(
-                {"email": user.email.lower()},
-                {"_id": 0}
-            )
-            if doctor:
-                return appointment.get("doctor_id") == doctor.get("doctor_id")
-        
-        return False
+        doctor_id = await facts.doctor_id()
+        return doctor_id is not None and appointment.get("doctor_id") == doctor_id
     
     @staticmethod
     async def _check_own_location(user: User, location_id: Optional[str]) -> bool:
@@ -236,7 +259,7 @@ class PermissionService:
         await db.audit_logs.insert_one(log_doc)
     
     @staticmethod
-    async def can_accept_appointments(user: User) -> bool:
+    async def can_accept_appointments(user: User, request: Optional[Request] = None) -> bool:
         """
         Check if user can accept/reject appointments.
         
@@ -245,12 +268,17 @@ class PermissionService:
         """
         result = await PermissionService.check_permission(
             user=user,
-            permission=PermissionConstants.APPOINTMENTS_ACCEPT
+            permission=PermissionConstants.APPOINTMENTS_ACCEPT,
+            request=request
         )
         return result.allowed
     
     @staticmethod
-    async def can_modify_appointments(user: User, appointment_id: Optional[str] = None) -> bool:
+    async def can_modify_appointments(
+        user: User,
+        appointment_id: Optional[str] = None,
+        request: Optional[Request] = None
+    ) -> bool:
         """
         Check if user can modify appointments.
         
@@ -262,12 +290,17 @@ class PermissionService:
         result = await PermissionService.check_permission(
             user=user,
             permission=PermissionConstants.APPOINTMENTS_UPDATE,
-            resource_id=appointment_id
+            resource_id=appointment_id,
+            request=request
         )
         return result.allowed
     
     @staticmethod
-    async def can_view_appointments(user: User, location_id: Optional[str] = None) -> bool:
+    async def can_view_appointments(
+        user: User,
+        location_id: Optional[str] = None,
+        request: Optional[Request] = None
+    ) -> bool:
         """
         Check if user can view appointments.
         
@@ -281,7 +314,8 @@ class PermissionService:
         result = await PermissionService.check_permission(
             user=user,
             permission=PermissionConstants.APPOINTMENTS_VIEW,
-            context={"location_id": location_id}
+            context={"location_id": location_id},
+            request=request
         )
         return result.allowed
     
@@ -310,7 +344,7 @@ class PermissionService:
         return False
     
     @staticmethod
-    async def can_manage_locations(user: User) -> bool:
+    async def can_manage_locations(user: User, request: Optional[Request] = None) -> bool:
         """
         Check if user can manage locations (add/edit/delete).
         
@@ -318,28 +352,23 @@ class PermissionService:
         """
         result = await PermissionService.check_permission(
             user=user,
-            permission=PermissionConstants.LOCATIONS_MANAGE
+            permission=PermissionConstants.LOCATIONS_MANAGE,
+            request=request
         )
         return result.allowed
     
     @staticmethod
-    async def get_accessible_locations(user: User) -> List[str]:
+    async def get_accessible_locations(user: User, request: Optional[Request] = None) -> List[str]:
         """
         Get list of location IDs the user has access to.
         
+        Super admins get every active location in their organization (loaded
+        once per request); other roles get their assigned locations.
+        
         Returns:
             List of location_ids
         """
-        if user.role == UserRole.SUPER_ADMIN and user.organization_id:
-            # Super admin has access to all locations in their organization
-            locations = await db.locations.find(
-                {"organization_id": user.organization_id, "is_active": True},
-                {"_id": 0, "location_id": 1}
-            ).to_list(100)
-            return [loc["location_id"] for loc in locations]
-        
-        # For other roles, return assigned locations
-        return user.assigned_location_ids or []
+        return await get_permission_context(user, request).accessible_locations()
     
     @staticmethod
     async def log_action(
@@ -0,0 +1,249 @@
+"""
+Query Profiler
+MongoDB command monitoring with per-request query accounting and a slow-query log
+"""
+
+import logging
+import threading
+from collections import deque
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Any, Deque, Dict, List, Optional
+
+from pymongo import monitoring
+
+from ..config import SLOW_QUERY_MS, QUERY_PROFILER_HISTORY
+from .logging_config import request_id_var
+
+logger = logging.getLogger("mediconnect")
+
+# Commands that are driver housekeeping rather than application queries.
+# getMore is counted: every batch past the first is a round trip of its own.
+IGNORED_COMMANDS = frozenset({
+    "hello", "ismaster", "isMaster", "ping", "buildinfo", "buildInfo",
+    "saslStart", "saslContinue", "getnonce", "authenticate", "endSessions",
+    "killCursors",
+})
+
+# Commands whose own value is not the collection name (getMore carries the cursor id)
+COLLECTION_FIELDS = {
+    "getMore": "collection",
+}
+
+# Where each command keeps its filter
+FILTER_FIELDS = {
+    "find": "filter",
+    "count": "query",
+    "distinct": "query",
+    "findAndModify": "query",
+}
+
+
+def filter_shape(value: Any, depth: int = 0) -> Any:
+    """
+    Reduce a query filter to its shape: keys and operators are kept,
+    literal values are replaced by their type name.
+
+    Example:
+        {"user_id": "u1", "date_time": {"$gte": "2025-01-01"}}
+        -> {"user_id": "str", "date_time": {"$gte": "str"}}
+    """
+    if depth > 6:
+        return "..."
+    if isinstance(value, dict):
+        return {k: filter_shape(v, depth + 1) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        if value and all(isinstance(v, dict) for v in value):
+            return [filter_shape(v, depth + 1) for v in value]
+        return f"[{type(value[0]).__name__ if value else ''}]"
+    return type(value).__name__
+
+
+def _extract_filter(command_name: str, command: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    if command_name in FILTER_FIELDS:
+        return command.get(FILTER_FIELDS[command_name])
+    if command_name == "aggregate":
+        pipeline = command.get("pipeline") or []
+        if pipeline and "$match" in pipeline[0]:
+            return pipeline[0]["$match"]
+        return {"$pipeline": [next(iter(stage), "?") for stage in pipeline]}
+    if command_name == "update":
+        updates = command.get("updates") or []
+        return updates[0].get("q") if updates else None
+    if command_name == "delete":
+        deletes = command.get("deletes") or []
+        return deletes[0].get("q") if deletes else None
+    return None
+
+
+class RequestQueryStats:
+    """
+    Mutable per-request accumulator.
+
+    Listener callbacks run on Motor's executor threads (with the request's
+    context copied in), so updates are guarded by a lock.
+    """
+
+    __slots__ = ("query_count", "db_time_ms", "commands", "slow", "_lock")
+
+    def __init__(self):
+        self.query_count = 0
+        self.db_time_ms = 0.0
+        self.commands: Dict[str, int] = {}
+        self.slow: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def record(self, key: str, duration_ms: float, slow_entry: Optional[Dict[str, Any]] = None):
+        with self._lock:
+            self.query_count += 1
+            self.db_time_ms += duration_ms
+            self.commands[key] = self.commands.get(key, 0) + 1
+            if slow_entry is not None:
+                self.slow.append(slow_entry)
+
+
+# Stats object for the request currently being handled
+request_query_stats: ContextVar[Optional[RequestQueryStats]] = ContextVar(
+    "request_query_stats",
+    default=None
+)
+
+
+class QueryProfiler(monitoring.CommandListener):
+    """
+    pymongo command listener recording query counts and durations.
+
+    Usage:
+        client = AsyncIOMotorClient(MONGO_URL, event_listeners=[query_profiler])
+    """
+
+    def __init__(
+        self,
+        slow_query_ms: float = 100.0,
+        history_size: int = 500,
+        slow_log_size: int = 200
+    ):
+        self.slow_query_ms = slow_query_ms
+        self._pending: Dict[int, Dict[str, Any]] = {}
+        self._pending_lock = threading.Lock()
+        self.recent_requests: Deque[Dict[str, Any]] = deque(maxlen=history_size)
+        self.slow_queries: Deque[Dict[str, Any]] = deque(maxlen=slow_log_size)
+
+    # ============= LISTENER CALLBACKS =============
+
+    def started(self, event: monitoring.CommandStartedEvent):
+        if event.command_name in IGNORED_COMMANDS:
+            return
+
+        command = event.command
+        collection = command.get(COLLECTION_FIELDS.get(event.command_name, event.command_name))
+        info = {
+            "command": event.command_name,
+            "collection": collection if isinstance(collection, str) else None,
+            "shape": filter_shape(_extract_filter(event.command_name, command)),
+        }
+        with self._pending_lock:
+            self._pending[event.request_id] = info
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent):
+        self._finish(event.request_id, event.duration_micros / 1000.0, failed=False)
+
+    def failed(self, event: monitoring.CommandFailedEvent):
+        self._finish(event.request_id, event.duration_micros / 1000.0, failed=True)
+
+    def _finish(self, op_id: int, duration_ms: float, failed: bool):
+        with self._pending_lock:
+            info = self._pending.pop(op_id, None)
+        if info is None:
+            return
+
+        key = f"{info['collection']}.{info['command']}"
+        slow_entry = None
+
+        if duration_ms >= self.slow_query_ms:
+            slow_entry = {
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "request_id": request_id_var.get() or None,
+                "collection": info["collection"],
+                "command": info["command"],
+                "shape": info["shape"],
+                "duration_ms": round(duration_ms, 2),
+                "failed": failed,
+            }
+            self.slow_queries.append(slow_entry)
+            logger.warning(
+                f"Slow query: {key} took {duration_ms:.1f}ms",
+                extra={"slow_query": slow_entry}
+            )
+
+        stats = request_query_stats.get()
+        if stats is not None:
+            stats.record(key, duration_ms, slow_entry)
+
+    # ============= REQUEST LIFECYCLE =============
+
+    def begin_request(self) -> RequestQueryStats:
+        """Attach a fresh stats accumulator to the current context."""
+        stats = RequestQueryStats()
+        request_query_stats.set(stats)
+        return stats
+
+    def end_request(
+        self,
+        stats: RequestQueryStats,
+        request_id: str,
+        method: str,
+        route: str,
+        status_code: int
+    ) -> Dict[str, Any]:
+        """Store and return the summary of a finished request."""
+        summary = {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "request_id": request_id,
+            "method": method,
+            "route": route,
+            "status_code": status_code,
+            "query_count": stats.query_count,
+            "db_time_ms": round(stats.db_time_ms, 2),
+            "commands": dict(stats.commands),
+            "slow_queries": len(stats.slow),
+        }
+        self.recent_requests.append(summary)
+        return summary
+
+    # ============= REPORTING =============
+
+    def top_routes(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """Aggregate recent requests per route, ordered by average query count."""
+        routes: Dict[str, Dict[str, Any]] = {}
+        for entry in list(self.recent_requests):
+            key = f"{entry['method']} {entry['route']}"
+            route = routes.setdefault(key, {
+                "route": key,
+                "requests": 0,
+                "total_queries": 0,
+                "max_queries": 0,
+                "total_db_time_ms": 0.0,
+            })
+            route["requests"] += 1
+            route["total_queries"] += entry["query_count"]
+            route["max_queries"] = max(route["max_queries"], entry["query_count"])
+            route["total_db_time_ms"] += entry["db_time_ms"]
+
+        for route in routes.values():
+            route["avg_queries"] = round(route["total_queries"] / route["requests"], 2)
+            route["avg_db_time_ms"] = round(route["total_db_time_ms"] / route["requests"], 2)
+            route["total_db_time_ms"] = round(route["total_db_time_ms"], 2)
+
+        return sorted(routes.values(), key=lambda r: r["avg_queries"], reverse=True)[:limit]
+
+    def reset(self):
+        self.recent_requests.clear()
+        self.slow_queries.clear()
+
+
+# Global profiler instance (registered on the Motor client in db.py)
+query_profiler = QueryProfiler(
+    slow_query_ms=SLOW_QUERY_MS,
+    history_size=QUERY_PROFILER_HISTORY
+)
@@ -21,6 +21,8 @@ from ..schemas.notification import (
     NotificationPriority
 )
 from .email import send_appointment_reminder_email
+from .notification_counters import NotificationCounterService
+from .notification_stream import notification_stream
 
 logger = logging.getLogger(__name__)
 
@@ -104,6 +106,8 @@ class ReminderService:
             doc['sent_at'] = doc['sent_at'].isoformat()
         
         await db.notifications.insert_one(doc)
+        await notification_stream.publish_notification(doc)
+        await NotificationCounterService.record_created(user_id, notification.is_read)
         
         return notification
     
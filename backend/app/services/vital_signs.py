@@ -0,0 +1,392 @@
+"""
+Vital Signs Storage
+Time-series storage for vital signs with server-side chart downsampling
+"""
+
+import logging
+import math
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pydantic import ValidationError
+from pymongo.errors import BulkWriteError
+
+from ..config import DATA_LIFECYCLE_BATCH_SIZE, VITALS_BULK_CHUNK_SIZE
+from ..db import db
+from ..schemas.health_stats import VitalSignCreate
+from .indexes import COLLECTION_OPTIONS
+
+logger = logging.getLogger("mediconnect")
+
+VITAL_SIGNS_COLLECTION = "vital_signs"
+LEGACY_COLLECTION = "vital_signs_legacy"
+
+# Bounds for the number of points a chart request may ask for
+CHART_MIN_POINTS = 10
+CHART_MAX_POINTS = 1000
+CHART_DEFAULT_POINTS = 200
+
+
+def as_utc(value: Any) -> datetime:
+    """Parse an ISO string or datetime into an aware UTC datetime."""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if value.tzinfo is None:
+        # BSON dates come back naive, in UTC
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def storage_time(value: Any) -> datetime:
+    """UTC datetime truncated to milliseconds, the precision BSON dates keep."""
+    value = as_utc(value)
+    return value.replace(microsecond=value.microsecond // 1000 * 1000)
+
+
+def to_storage(vital: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Convert a vital sign to its time-series document.
+
+    `user_id` and `type` move into the `meta` field and `measured_at`
+    becomes a BSON date.
+    """
+    doc = {k: v for k, v in vital.items() if k not in ("_id", "user_id", "type")}
+    doc["meta"] = {"user_id": vital["user_id"], "type": vital["type"]}
+    doc["measured_at"] = storage_time(vital["measured_at"])
+    return doc
+
+
+def from_storage(doc: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a time-series document back to the API shape."""
+    vital = {k: v for k, v in doc.items() if k not in ("_id", "meta")}
+    meta = doc.get("meta") or {}
+    vital["user_id"] = meta.get("user_id")
+    vital["type"] = meta.get("type")
+    if isinstance(vital.get("measured_at"), datetime):
+        vital["measured_at"] = as_utc(vital["measured_at"]).isoformat()
+    return vital
+
+
+def vital_filter(user_id: str, vital_type: Optional[str] = None) -> Dict[str, Any]:
+    """Query filter on the metaField for a user's (and optionally one type's) vitals."""
+    query: Dict[str, Any] = {"meta.user_id": user_id}
+    if vital_type:
+        query["meta.type"] = vital_type
+    return query
+
+
+def _validation_message(error: ValidationError) -> str:
+    first = error.errors()[0]
+    location = ".".join(str(part) for part in first.get("loc", ())) or "item"
+    return f"{location}: {first.get('msg')}"
+
+
+def chart_bucket_minutes(start: datetime, end: datetime, points: int) -> int:
+    """Bucket width (whole minutes) that splits [start, end) into at most `points` buckets."""
+    span_minutes = max((end - start).total_seconds() / 60, 1)
+    return max(1, math.ceil(span_minutes / max(points, 1)))
+
+
+class VitalSignsService:
+    """
+    Reads and writes the `vital_signs` time-series collection.
+
+    Documents are stored as:
+        {"meta": {"user_id", "type"}, "measured_at": <date>, "measurement_id",
+         "value", "value_secondary", "unit", "notes", "measured_by", "created_at"}
+
+    and returned to callers in the flat API shape (see `from_storage`).
+    Deleting single measurements from a time-series collection requires
+    MongoDB 7.0 or newer.
+    """
+
+    @staticmethod
+    async def insert(vital: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Store a vital sign.
+
+        Args:
+            vital: Vital sign in the API shape
+
+        Returns:
+            The stored vital sign in the API shape
+        """
+        doc = to_storage(vital)
+        await db.vital_signs.insert_one(doc)
+        return from_storage(doc)
+
+    @staticmethod
+    async def ingest(
+        user_id: str,
+        items: List[Any],
+        chunk_size: int = VITALS_BULK_CHUNK_SIZE
+    ) -> Dict[str, Any]:
+        """
+        Validate and store a batch of measurements for one user.
+
+        Items are validated in one pass and deduplicated on (type,
+        measured_at), both within the batch and against stored vitals (a
+        time-series collection cannot enforce a unique index). New vitals are
+        written with unordered insert_many in chunks, so one bad document
+        does not stop the rest.
+
+        Args:
+            user_id: Owner of the measurements
+            items: Raw measurements (anything that is not a valid
+                VitalSignCreate is reported as invalid)
+            chunk_size: Documents per insert_many call
+
+        Returns:
+            Dict with per-item `results`, `created`/`duplicates`/`invalid`/
+            `failed` counts and `inserted` (stored vitals in the API shape)
+        """
+        now = datetime.now(timezone.utc)
+        results: List[Optional[Dict[str, Any]]] = [None] * len(items)
+        pending: List[Tuple[int, Dict[str, Any]]] = []
+        seen = set()
+
+        for i, item in enumerate(items):
+            try:
+                data = VitalSignCreate.model_validate(item)
+            except ValidationError as e:
+                results[i] = {"index": i, "status": "invalid", "error": _validation_message(e)}
+                continue
+
+            measured_at = storage_time(data.measured_at or now)
+            key = (data.type, measured_at)
+            if key in seen:
+                results[i] = {"index": i, "status": "duplicate"}
+                continue
+            seen.add(key)
+
+            pending.append((i, {
+                "measurement_id": f"vital_{uuid.uuid4().hex[:12]}",
+                "meta": {"user_id": user_id, "type": data.type},
+                "value": data.value,
+                "value_secondary": data.value_secondary,
+                "unit": data.unit,
+                "notes": data.notes,
+                "measured_by": "self",
+                "measured_at": measured_at,
+                "created_at": now.isoformat()
+            }))
+
+        if pending:
+            # Device re-syncs resend measurements that are already stored
+            stored = await db.vital_signs.find(
+                {
+                    **vital_filter(user_id),
+                    "meta.type": {"$in": list({doc["meta"]["type"] for _, doc in pending})},
+                    "measured_at": {"$in": [doc["measured_at"] for _, doc in pending]}
+                },
+                {"_id": 0, "meta.type": 1, "measured_at": 1}
+            ).to_list(None)
+            existing = {(doc["meta"]["type"], as_utc(doc["measured_at"])) for doc in stored}
+
+            fresh = []
+            for i, doc in pending:
+                if (doc["meta"]["type"], doc["measured_at"]) in existing:
+                    results[i] = {"index": i, "status": "duplicate"}
+                else:
+                    fresh.append((i, doc))
+            pending = fresh
+
+        inserted: List[Dict[str, Any]] = []
+        for start in range(0, len(pending), chunk_size):
+            chunk = pending[start:start + chunk_size]
+            errors: Dict[int, str] = {}
+            try:
+                await db.vital_signs.insert_many([doc for _, doc in chunk], ordered=False)
+            except BulkWriteError as e:
+                errors = {
+                    error["index"]: error.get("errmsg", "write failed")
+                    for error in e.details.get("writeErrors", [])
+                }
+
+            for offset, (i, doc) in enumerate(chunk):
+                if offset in errors:
+                    results[i] = {"index": i, "status": "failed", "error": errors[offset]}
+                else:
+                    results[i] = {"index": i, "status": "created", "measurement_id": doc["measurement_id"]}
+                    inserted.append(from_storage(doc))
+
+        counts = {"created": 0, "duplicate": 0, "invalid": 0, "failed": 0}
+        for result in results:
+            counts[result["status"]] += 1
+
+        return {
+            "created": counts["created"],
+            "duplicates": counts["duplicate"],
+            "invalid": counts["invalid"],
+            "failed": counts["failed"],
+            "results": results,
+            "inserted": inserted
+        }
+
+    @staticmethod
+    async def find_recent(user_id: str, vital_type: Optional[str] = None, limit: int = 50) -> List[Dict[str, Any]]:
+        """Most recent vitals for a user, newest first."""
+        docs = await db.vital_signs.find(
+            vital_filter(user_id, vital_type),
+            {"_id": 0}
+        ).sort("measured_at", -1).limit(limit).to_list(limit)
+        return [from_storage(doc) for doc in docs]
+
+    @staticmethod
+    async def delete(user_id: str, measurement_id: str) -> bool:
+        """Delete one of a user's measurements. Returns False if not found."""
+        result = await db.vital_signs.delete_one({
+            **vital_filter(user_id),
+            "measurement_id": measurement_id
+        })
+        return result.deleted_count > 0
+
+    @staticmethod
+    async def chart(
+        user_id: str,
+        vital_type: str,
+        start: datetime,
+        end: datetime,
+        points: int = CHART_DEFAULT_POINTS
+    ) -> Dict[str, Any]:
+        """
+        Downsample a user's vitals of one type to about `points` buckets.
+
+        Buckets are aligned by $dateTrunc, so a range can straddle one extra
+        bucket. Each bucket carries the average (as `value`), min, max and
+        sample count, so the payload size depends on `points` only, not on
+        how many measurements fall in the range.
+
+        Returns:
+            Dict with `data` (one entry per non-empty bucket), `count`,
+            `samples` and `bucket_minutes`
+        """
+        bucket_minutes = chart_bucket_minutes(start, end, points)
+
+        buckets = await db.vital_signs.aggregate([
+            {"$match": {
+                **vital_filter(user_id, vital_type),
+                "measured_at": {"$gte": start, "$lt": end}
+            }},
+            {"$group": {
+                "_id": {"$dateTrunc": {
+                    "date": "$measured_at",
+                    "unit": "minute",
+                    "binSize": bucket_minutes
+                }},
+                "value": {"$avg": "$value"},
+                "min": {"$min": "$value"},
+                "max": {"$max": "$value"},
+                "value_secondary": {"$avg": "$value_secondary"},
+                "count": {"$sum": 1},
+                "unit": {"$first": "$unit"}
+            }},
+            {"$sort": {"_id": 1}}
+        ]).to_list(None)
+
+        data = [
+            {
+                "measured_at": as_utc(bucket["_id"]).isoformat(),
+                "value": round(bucket["value"], 2),
+                "value_secondary": (
+                    round(bucket["value_secondary"], 2)
+                    if bucket.get("value_secondary") is not None else None
+                ),
+                "min": bucket["min"],
+                "max": bucket["max"],
+                "count": bucket["count"],
+                "unit": bucket["unit"]
+            }
+            for bucket in buckets
+        ]
+
+        return {
+            "data": data,
+            "count": len(data),
+            "samples": sum(point["count"] for point in data),
+            "bucket_minutes": bucket_minutes
+        }
+
+    @staticmethod
+    async def migrate(
+        database: AsyncIOMotorDatabase = db,
+        batch_size: int = DATA_LIFECYCLE_BATCH_SIZE
+    ) -> Dict[str, Any]:
+        """
+        Convert a plain `vital_signs` collection into a time-series one.
+
+        The plain collection is renamed to `vital_signs_legacy` (kept for
+        rollback), the time-series collection is created and documents are
+        copied over in batches. Documents already in the `meta` shape
+        (written by the current code before the migration ran) are copied
+        as they are.
+
+        The copy is resumable: while `vital_signs_legacy` exists, a rerun
+        copies only the measurement_ids the time-series collection does not
+        have yet.
+
+        Returns:
+            Dict with `status`, `copied`, `existing` (already copied) and `skipped`
+        """
+        cursor = await database.list_collections(filter={"name": VITAL_SIGNS_COLLECTION})
+        infos = await cursor.to_list(1)
+        has_legacy = LEGACY_COLLECTION in await database.list_collection_names()
+
+        if infos and infos[0].get("type") == "timeseries":
+            if not has_legacy:
+                return {"status": "already_timeseries", "copied": 0, "existing": 0, "skipped": 0}
+            logger.info(f"Resuming copy from {LEGACY_COLLECTION}")
+        else:
+            if infos:
+                if has_legacy:
+                    raise RuntimeError(f"{LEGACY_COLLECTION} already exists; drop or rename it first")
+                await database[VITAL_SIGNS_COLLECTION].rename(LEGACY_COLLECTION)
+                logger.info(f"Renamed {VITAL_SIGNS_COLLECTION} to {LEGACY_COLLECTION}")
+
+            await database.create_collection(
+                VITAL_SIGNS_COLLECTION,
+                **COLLECTION_OPTIONS[VITAL_SIGNS_COLLECTION]
+            )
+
+        target = database[VITAL_SIGNS_COLLECTION]
+        copied = 0
+        existing = 0
+        skipped = 0
+        batch: List[Dict[str, Any]] = []
+
+        async def flush():
+            nonlocal copied, existing
+            if not batch:
+                return
+            ids = [doc["measurement_id"] for doc in batch if doc.get("measurement_id")]
+            present = {
+                doc["measurement_id"]
+                async for doc in target.find({"measurement_id": {"$in": ids}}, {"_id": 0, "measurement_id": 1})
+            } if ids else set()
+            missing = [doc for doc in batch if doc.get("measurement_id") not in present]
+            if missing:
+                await target.insert_many(missing, ordered=False)
+            copied += len(missing)
+            existing += len(batch) - len(missing)
+            batch.clear()
+
+        async for legacy in database[LEGACY_COLLECTION].find({}, {"_id": 0}):
+            try:
+                batch.append(legacy if "meta" in legacy else to_storage(legacy))
+            except (KeyError, TypeError, ValueError) as e:
+                skipped += 1
+                logger.warning(f"Skipping vital {legacy.get('measurement_id')}: {e}")
+                continue
+            if len(batch) >= batch_size:
+                await flush()
+
+        await flush()
+
+        logger.info(f"✅ Vital signs migrated: {copied} copied, {existing} already present, {skipped} skipped")
+        return {"status": "migrated", "copied": copied, "existing": existing, "skipped": skipped}
+
+
+# Convenience instance
+vital_signs = VitalSignsService()
@@ -0,0 +1,112 @@
+"""
+Cache Key Benchmark
+Compares @cache key derivation for typical handler arguments (keys per second)
+
+Usage:
+    python -m benchmarks.bench_cache_keys [--keys 20000] [--rounds 5]
+
+before:  str() of every argument (sorted __dict__ for objects), MD5 above 200 chars
+after:   canonical encoding of all arguments hashed with BLAKE2b
+builder: an explicit key= builder returning the identifying arguments
+"""
+
+import argparse
+import hashlib
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.schemas.user import User  # noqa: E402
+from app.services.cache_keys import ORJSON_AVAILABLE, build_cache_key  # noqa: E402
+
+PREFIX = "app.routers.doctors.get_doctors"
+
+
+def legacy_generate_cache_key(prefix: str, *args, **kwargs) -> str:
+    """generate_cache_key as it was before canonical encoding."""
+    key_parts = [prefix]
+    for arg in args:
+        if hasattr(arg, '__dict__'):
+            key_parts.append(str(sorted(arg.__dict__.items())))
+        else:
+            key_parts.append(str(arg))
+    for k, v in sorted(kwargs.items()):
+        if hasattr(v, '__dict__'):
+            key_parts.append(f"{k}:{sorted(v.__dict__.items())}")
+        else:
+            key_parts.append(f"{k}:{v}")
+    key_str = ":".join(key_parts)
+    if len(key_str) > 200:
+        key_hash = hashlib.md5(key_str.encode()).hexdigest()
+        return f"{prefix}:{key_hash}"
+    return key_str
+
+
+def build_calls(count: int) -> list:
+    """(args, kwargs) shaped like a cached list endpoint: IDs, filters and the current user."""
+    calls = []
+    for i in range(count):
+        user = User(
+            user_id=f"user_{i % 50:04d}",
+            email=f"user{i % 50}@example.com",
+            name=f"User {i % 50}",
+            role="LOCATION_ADMIN",
+            organization_id="org_1",
+            assigned_location_ids=["loc_1", "loc_2"]
+        )
+        calls.append((
+            (f"clinic_{i % 7:04d}",),
+            {"specialty": "Cardiologie", "location_id": f"loc_{i % 3}", "page": i % 5, "current_user": user}
+        ))
+    return calls
+
+
+def key_before(args, kwargs):
+    return legacy_generate_cache_key(PREFIX, *args, **kwargs)
+
+
+def key_after(args, kwargs):
+    return build_cache_key(PREFIX, [args, kwargs])
+
+
+def key_builder(args, kwargs):
+    return build_cache_key(PREFIX, [args[0], kwargs["specialty"], kwargs["location_id"], kwargs["page"]])
+
+
+def bench(fn, calls, rounds: int):
+    for args, kwargs in calls[:100]:
+        fn(args, kwargs)  # warm up
+    rates = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for args, kwargs in calls:
+            fn(args, kwargs)
+        rates.append(len(calls) / (time.perf_counter() - start))
+    return rates
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--keys", type=int, default=20000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    calls = build_calls(args.keys)
+    print(f"{args.keys} keys, {args.rounds} rounds, orjson={'yes' if ORJSON_AVAILABLE else 'no'}")
+    print(f"{'variant':<8} {'keys/s':>12} {'key length':>11}")
+
+    results = {}
+    for name, fn in (("before", key_before), ("after", key_after), ("builder", key_builder)):
+        rate = statistics.median(bench(fn, calls, args.rounds))
+        results[name] = rate
+        print(f"{name:<8} {rate:>12,.0f} {len(fn(*calls[0])):>11}")
+
+    print(f"speedup after vs before: {results['after'] / results['before']:.1f}x")
+    print(f"speedup builder vs before: {results['builder'] / results['before']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+Compression Benchmark
+Compares response bytes and delivery time for typical list payloads on clinic Wi-Fi
+
+Usage:
+    python -m benchmarks.bench_compression [--rounds 20]
+
+Payloads: /centers (1000 clinics), /appointments (500) and an analytics
+overview, rendered with FastJSONResponse. For every encoding and level the
+benchmark reports compressed size, compression time and the estimated time
+to deliver the response over each link profile:
+
+    compression + round trip + bytes / bandwidth + decompression
+
+(TCP slow start is ignored, which favours large uncompressed bodies.)
+"""
+
+import argparse
+import gzip
+import statistics
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.middleware.compression import BROTLI_AVAILABLE, ENCODERS, brotli  # noqa: E402
+from app.responses import FastJSONResponse  # noqa: E402
+from benchmarks.bench_serialization import build_payload as build_appointments  # noqa: E402
+
+# (name, bandwidth in Mbit/s, round trip in ms)
+LINKS = [
+    ("clinic wifi", 10, 40),
+    ("busy wifi", 2, 90),
+]
+
+COUNTIES = ["Cluj", "Bihor", "Iasi", "Timis", "Brasov", "Constanta", "Bucuresti"]
+
+
+def build_centers(count: int) -> dict:
+    """A /centers response shaped by CENTER_LIST_PROJECTION."""
+    results = []
+    for i in range(count):
+        county = COUNTIES[i % len(COUNTIES)]
+        results.append({
+            "clinic_id": f"clinic_{i:05d}",
+            "name": f"Clinica Medicală {county} {i}",
+            "description": "Consultații de specialitate, analize de laborator și imagistică." if i % 2 else None,
+            "address": f"Strada Republicii nr. {i % 120 + 1}",
+            "city": county,
+            "county": county,
+            "phone": f"+4072{i:07d}",
+            "email": f"contact{i}@clinica.ro",
+            "logo_url": None,
+            "is_verified": i % 3 != 0,
+            "average_rating": round(3 + (i % 20) / 10, 1),
+            "review_count": i % 137,
+        })
+    return {"count": count, "county_filter": "all", "city_filter": "all", "search_term": None, "results": results}
+
+
+def build_analytics(days: int) -> dict:
+    """An analytics overview with daily series per location."""
+    start = date(2025, 1, 1)
+    return {
+        "organization_id": "org_1",
+        "totals": {"appointments": 18234, "completed": 15110, "cancelled": 1204, "revenue": 2734100.0},
+        "locations": [
+            {
+                "location_id": f"loc_{loc}",
+                "name": f"Location {loc}",
+                "daily": [
+                    {
+                        "date": (start + timedelta(days=day)).isoformat(),
+                        "appointments": (day * 7 + loc) % 60,
+                        "completed": (day * 5 + loc) % 50,
+                        "cancelled": (day + loc) % 6,
+                        "revenue": float((day * 31 + loc * 17) % 9000),
+                    }
+                    for day in range(days)
+                ],
+            }
+            for loc in range(6)
+        ],
+    }
+
+
+def decompress(encoding: str, data: bytes) -> bytes:
+    return gzip.decompress(data) if encoding == "gzip" else brotli.decompress(data)
+
+
+def variants():
+    yield "identity", None, 0
+    for level in (1, 6, 9):
+        yield f"gzip-{level}", "gzip", level
+    if BROTLI_AVAILABLE:
+        for quality in (4, 6, 11):
+            yield f"br-{quality}", "br", quality
+
+
+def timed(fn, rounds: int):
+    fn()  # warm up
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        result = fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    payloads = [
+        ("/centers", build_centers(1000)),
+        ("/appointments", build_appointments(500)),
+        ("/analytics", build_analytics(90)),
+    ]
+    print(f"brotli={'yes' if BROTLI_AVAILABLE else 'no'}, {args.rounds} rounds")
+
+    for path, payload in payloads:
+        body = FastJSONResponse(payload).body
+        print(f"\n{path}: {len(body):,} bytes uncompressed")
+        print(f"{'variant':<9} {'bytes':>9} {'ratio':>6} {'comp ms':>8} {'decomp ms':>9}"
+              + "".join(f" {name + ' ms':>14}" for name, _, _ in LINKS))
+
+        for name, encoding, level in variants():
+            if encoding:
+                compress_ms, data = timed(lambda: ENCODERS[encoding](level).compress(body, final=True), args.rounds)
+                decompress_ms, _ = timed(lambda: decompress(encoding, data), args.rounds)
+            else:
+                compress_ms, decompress_ms, data = 0.0, 0.0, body
+
+            delivery = [
+                compress_ms + rtt + len(data) * 8 / (mbits * 1000) + decompress_ms
+                for _, mbits, rtt in LINKS
+            ]
+            print(f"{name:<9} {len(data):>9,} {len(body) / len(data):>5.1f}x {compress_ms:>8.2f} {decompress_ms:>9.2f}"
+                  + "".join(f" {ms:>14.1f}" for ms in delivery))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Permission Check Benchmark
+Measures PermissionService.check_permission throughput (checks per second)
+
+Usage:
+    python -m benchmarks.bench_permissions [--checks 20000] [--rounds 5]
+
+cold:   a fresh PermissionContext per check (compiled masks, no memoization)
+cached: every check shares one request's context, as route handlers do
+
+Database-backed facts are preloaded, so neither variant touches MongoDB.
+"""
+
+import argparse
+import asyncio
+import itertools
+import statistics
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.schemas.permission import PermissionConstants  # noqa: E402
+from app.schemas.user import User  # noqa: E402
+from app.services.permission_evaluator import PermissionContext, get_permission_context  # noqa: E402
+from app.services.permissions import PermissionService  # noqa: E402
+
+PERMISSIONS = [
+    PermissionConstants.APPOINTMENTS_VIEW,
+    PermissionConstants.APPOINTMENTS_ACCEPT,
+    PermissionConstants.APPOINTMENTS_UPDATE,
+    PermissionConstants.DOCTORS_VIEW,
+    PermissionConstants.SERVICES_VIEW,
+    PermissionConstants.LOCATIONS_MANAGE,
+]
+
+
+def build_users() -> list:
+    users = []
+    for role in ("SUPER_ADMIN", "LOCATION_ADMIN", "RECEPTIONIST", "DOCTOR", "ASSISTANT", "USER"):
+        users.append(User(
+            user_id=f"user_{role.lower()}",
+            email=f"{role.lower()}@example.com",
+            name=role,
+            role=role,
+            organization_id="org_1",
+            assigned_location_ids=None if role == "SUPER_ADMIN" else ["loc_1", "loc_2"]
+        ))
+    return users
+
+
+def preload(context: PermissionContext) -> PermissionContext:
+    """Fill the facts a check may read so the benchmark stays in memory."""
+    context._org_locations = {"loc_1": True, "loc_2": True, "loc_3": False}
+    context._doctor_loaded = True
+    context._doctor_id = "doctor_1"
+    context._appointments["apt_1"] = {"appointment_id": "apt_1", "doctor_id": "doctor_1", "location_id": "loc_1"}
+    return context
+
+
+async def run_cold(users, checks: int) -> float:
+    cases = itertools.cycle(itertools.product(users, PERMISSIONS))
+    start = time.perf_counter()
+    for _ in range(checks):
+        user, permission = next(cases)
+        facts = preload(PermissionContext(user))
+        await PermissionService._evaluate(facts, permission, "apt_1", {"location_id": "loc_1"})
+    return time.perf_counter() - start
+
+
+async def run_cached(users, checks: int) -> float:
+    requests = []
+    for user in users:
+        request = SimpleNamespace(state=SimpleNamespace())
+        preload(get_permission_context(user, request))
+        requests.append((user, request))
+
+    cases = itertools.cycle(itertools.product(requests, PERMISSIONS))
+    start = time.perf_counter()
+    for _ in range(checks):
+        (user, request), permission = next(cases)
+        await PermissionService.check_permission(
+            user, permission, resource_id="apt_1", context={"location_id": "loc_1"}, request=request
+        )
+    return time.perf_counter() - start
+
+
+async def bench(args):
+    users = build_users()
+    # Admin denials write an audit row; keep the benchmark off the database
+    PermissionService._log_permission_denial = staticmethod(_no_audit)
+
+    print(f"{args.checks} checks x {args.rounds} rounds, {len(users)} roles x {len(PERMISSIONS)} permissions")
+    print(f"{'variant':<8} {'checks/s':>12}")
+
+    results = {}
+    for name, fn in (("cold", run_cold), ("cached", run_cached)):
+        await fn(users, 1000)  # warm up
+        rates = [args.checks / await fn(users, args.checks) for _ in range(args.rounds)]
+        results[name] = statistics.median(rates)
+        print(f"{name:<8} {results[name]:>12,.0f}")
+
+    print(f"speedup cached vs cold: {results['cached'] / results['cold']:.1f}x")
+
+
+async def _no_audit(**kwargs):
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--checks", type=int, default=20000)
+    parser.add_argument("--rounds", type=int, default=5)
+    asyncio.run(bench(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Serialization Benchmark
+Compares response rendering for a 500-appointment list payload
+
+Usage:
+    python -m benchmarks.bench_serialization [--items 500] [--rounds 200]
+
+before: FastAPI default path (jsonable_encoder + stdlib json via JSONResponse)
+model:  the same, after validating every item through the Appointment model
+after:  FastJSONResponse returned directly (single orjson call)
+"""
+
+import argparse
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime, timezone, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from starlette.responses import JSONResponse  # noqa: E402
+
+from app.responses import FastJSONResponse, ORJSON_AVAILABLE  # noqa: E402
+from app.schemas.appointment import Appointment  # noqa: E402
+
+
+def build_payload(count: int) -> list:
+    """Appointments shaped like get_appointments output (stored doc + enrichment)."""
+    start = datetime(2025, 1, 6, 8, 0, tzinfo=timezone.utc)
+    items = []
+    for i in range(count):
+        items.append({
+            "appointment_id": f"apt_{uuid.uuid4().hex[:12]}",
+            "patient_id": f"user_{i % 97:04d}",
+            "patient_name": f"Patient {i % 97}",
+            "patient_email": f"patient{i % 97}@example.com",
+            "patient_phone": "+40712345678",
+            "doctor_id": f"doctor_{i % 12:04d}",
+            "doctor_name": f"Dr. Doctor {i % 12}",
+            "doctor_specialty": "Cardiologie",
+            "clinic_id": "clinic_0001",
+            "location_id": f"loc_{i % 3}",
+            "date_time": (start + timedelta(minutes=30 * i)).isoformat(),
+            "duration": 30,
+            "status": "SCHEDULED" if i % 5 else "COMPLETED",
+            "notes": "Control periodic, pacientul prezintă tensiune arterială ușor crescută." if i % 3 == 0 else None,
+            "cancellation_reason": None,
+            "recurrence": {"frequency": "weekly", "interval": 1, "end_date": None} if i % 10 == 0 else None,
+            "parent_appointment_id": None,
+            "is_own_patient": True,
+            "created_at": datetime.now(timezone.utc),
+        })
+    return items
+
+
+def render_before(payload):
+    return JSONResponse(jsonable_encoder(payload)).body
+
+
+def render_model(payload):
+    validated = [Appointment(**item) for item in payload]
+    return JSONResponse(jsonable_encoder(validated)).body
+
+
+def render_after(payload):
+    return FastJSONResponse(payload).body
+
+
+def bench(fn, payload, rounds: int):
+    fn(payload)  # warm up
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn(payload)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=500)
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    payload = build_payload(args.items)
+    print(f"{args.items} appointments, {args.rounds} rounds, orjson={'yes' if ORJSON_AVAILABLE else 'no'}")
+    print(f"{'variant':<8} {'median ms':>10} {'p95 ms':>8} {'bytes':>9}")
+
+    results = {}
+    for name, fn in (("before", render_before), ("model", render_model), ("after", render_after)):
+        timings = sorted(bench(fn, payload, args.rounds))
+        median = statistics.median(timings)
+        p95 = timings[int(len(timings) * 0.95) - 1]
+        results[name] = median
+        print(f"{name:<8} {median:>10.2f} {p95:>8.2f} {len(fn(payload)):>9}")
+
+    print(f"speedup after vs before: {results['before'] / results['after']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -25,7 +25,9 @@ async def clear_database():
         'medical_records',
         'sessions',
         'audit_logs',
+        'audit_logs_archive',
         'notifications',
+        'notification_counters',
         'organizations',
         'locations', 
         'clinics',
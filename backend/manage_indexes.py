@@ -0,0 +1,57 @@
+"""
+Index Management CLI
+
+Applies and audits the declarative index registry (app/services/indexes.py).
+
+Usage:
+    python manage_indexes.py apply                     # create missing indexes
+    python manage_indexes.py apply --rebuild-drifted   # also rebuild drifted ones
+    python manage_indexes.py check                     # drift, undeclared and unused indexes
+    python manage_indexes.py drop-undeclared           # drop indexes not in the registry
+
+Usage counts come from $indexStats and reset when mongod restarts, so
+only trust "unused" on a server that has been serving traffic for a while.
+"""
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.db import db
+from app.services.indexes import IndexManager
+
+
+async def main(argv) -> int:
+    if not argv or argv[0] not in ("apply", "check", "drop-undeclared"):
+        print(__doc__)
+        return 2
+    
+    manager = IndexManager(db)
+    command = argv[0]
+    
+    if command == "apply":
+        summary = await manager.apply(rebuild_drifted="--rebuild-drifted" in argv)
+        print(json.dumps(summary, indent=2))
+        return 1 if any(r["failed"] for r in summary.values()) else 0
+    
+    if command == "check":
+        report = await manager.check()
+        print(json.dumps(report, indent=2))
+        problems = any(entry["missing"] or entry["drifted"] for entry in report.values())
+        return 1 if problems else 0
+    
+    confirm = input("Type 'YES' to drop every index not declared in the registry: ")
+    if confirm != "YES":
+        print("❌ Cancelled. No indexes were dropped.")
+        return 1
+    dropped = await manager.drop_undeclared()
+    print(json.dumps(dropped, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(sys.argv[1:])))
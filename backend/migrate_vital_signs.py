@@ -0,0 +1,41 @@
+"""
+Vital Signs Time-Series Migration
+
+Converts the plain `vital_signs` collection into a MongoDB time-series
+collection (timeField `measured_at`, metaField `meta` = {user_id, type}).
+
+Usage:
+    python migrate_vital_signs.py
+
+The existing collection is renamed to `vital_signs_legacy` and kept for
+rollback; drop it once the migrated data has been checked. Run with the
+API stopped, since writes made during the copy would land in the legacy
+collection. If a run fails part-way, run it again: it resumes the copy
+from `vital_signs_legacy`. Requires MongoDB 5.0+ ($dateTrunc, time-series
+collections); deleting single measurements needs 7.0+.
+"""
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.db import db
+from app.services.indexes import IndexManager
+from app.services.vital_signs import VitalSignsService
+
+
+async def main() -> int:
+    summary = await VitalSignsService.migrate(db)
+    print(json.dumps(summary, indent=2))
+    
+    # Secondary indexes for the new collection
+    await IndexManager(db).apply()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
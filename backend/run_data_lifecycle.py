@@ -0,0 +1,75 @@
+"""
+Data Lifecycle Scheduler
+
+Applies retention policies to high-volume collections.
+It should be run as a background service or scheduled task.
+
+Usage:
+    python run_data_lifecycle.py          # run every hour
+    python run_data_lifecycle.py --once   # single run (for cron jobs)
+
+Each run will:
+- Ensure TTL indexes on sessions, password reset tokens and notification logs
+- Delete expired legacy documents that predate TTL stamping
+- Purge notifications past retention, keeping unread counters exact
+- Archive old audit logs to compressed cold storage in batches
+
+Retention is configured through NOTIFICATION_RETENTION_DAYS,
+NOTIFICATION_LOG_RETENTION_DAYS, AUDIT_LOG_RETENTION_DAYS,
+AUDIT_LOG_ARCHIVE_TARGET, AUDIT_LOG_ARCHIVE_DIR and DATA_LIFECYCLE_BATCH_SIZE.
+"""
+
+import asyncio
+import logging
+import sys
+from pathlib import Path
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.services.data_lifecycle import DataLifecycleService
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+logger = logging.getLogger(__name__)
+
+RUN_INTERVAL_SECONDS = 3600
+
+
+async def run_lifecycle_loop():
+    """Main loop that applies retention policies every hour"""
+    logger.info("🗄️ Data Lifecycle Service Started")
+    
+    while True:
+        try:
+            summary = await DataLifecycleService.run()
+            logger.info(f"✅ Lifecycle run completed: {summary}. Next run in 1 hour.")
+            await asyncio.sleep(RUN_INTERVAL_SECONDS)
+        except Exception as e:
+            logger.error(f"❌ Error in lifecycle loop: {str(e)}", exc_info=True)
+            logger.info("⏳ Waiting 1 minute before retry...")
+            await asyncio.sleep(60)
+
+
+async def run_once():
+    """Run retention policies once"""
+    try:
+        summary = await DataLifecycleService.run()
+        logger.info(f"✅ Lifecycle run completed: {summary}")
+    except Exception as e:
+        logger.error(f"❌ Error in lifecycle run: {str(e)}", exc_info=True)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--once":
+        asyncio.run(run_once())
+    else:
+        try:
+            asyncio.run(run_lifecycle_loop())
+        except KeyboardInterrupt:
+            logger.info("\n👋 Goodbye!")
@@ -0,0 +1,68 @@
+"""
+Clinic Rating Reconciliation
+
+Recomputes the rating aggregates stored on clinic documents
+(average_rating, review_count, rating_sum, rating_histogram) from the
+reviews collection. Reviews update these fields incrementally; this job
+corrects drift from manual edits, deleted reviews or interrupted writes,
+and backfills clinics rated before the fields existed.
+
+Usage:
+    python run_rating_reconciliation.py          # run every 6 hours
+    python run_rating_reconciliation.py --once   # single run (for cron jobs)
+"""
+
+import asyncio
+import logging
+import sys
+from pathlib import Path
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.services.clinic_ratings import ClinicRatingService
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+logger = logging.getLogger(__name__)
+
+RUN_INTERVAL_SECONDS = 6 * 3600
+
+
+async def run_reconciliation_loop():
+    """Main loop that reconciles clinic ratings every 6 hours"""
+    logger.info("⭐ Clinic Rating Reconciliation Started")
+    
+    while True:
+        try:
+            summary = await ClinicRatingService.reconcile_all()
+            logger.info(f"✅ Reconciliation completed: {summary}. Next run in 6 hours.")
+            await asyncio.sleep(RUN_INTERVAL_SECONDS)
+        except Exception as e:
+            logger.error(f"❌ Error in reconciliation loop: {str(e)}", exc_info=True)
+            logger.info("⏳ Waiting 1 minute before retry...")
+            await asyncio.sleep(60)
+
+
+async def run_once():
+    """Reconcile clinic ratings once"""
+    try:
+        summary = await ClinicRatingService.reconcile_all()
+        logger.info(f"✅ Reconciliation completed: {summary}")
+    except Exception as e:
+        logger.error(f"❌ Error in reconciliation run: {str(e)}", exc_info=True)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--once":
+        asyncio.run(run_once())
+    else:
+        try:
+            asyncio.run(run_reconciliation_loop())
+        except KeyboardInterrupt:
+            logger.info("\n👋 Goodbye!")
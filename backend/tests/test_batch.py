@@ -0,0 +1,110 @@
+"""
+Batch Request Tests
+Tests for running GET sub-requests inside one /batch request
+"""
+
+import pytest
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from starlette.testclient import TestClient
+
+from app.schemas.batch import BatchRequest, BatchSubRequest
+from app.responses import FastJSONResponse
+from app.services import batch as module
+from app.services.batch import batch_service
+
+
+def _app() -> FastAPI:
+    app = FastAPI(default_response_class=FastJSONResponse)
+
+    @app.get("/api/whoami")
+    async def whoami(request: Request, fields: str = ""):
+        return {"user": request.state.current_user, "fields": fields}
+
+    @app.get("/api/clinics/{clinic_id}")
+    async def clinic(clinic_id: str):
+        raise HTTPException(status_code=404, detail="Clinic not found")
+
+    @app.get("/api/stream")
+    async def stream():
+        async def events():
+            yield b"data: 1\n\n"
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    @app.post("/api/batch")
+    async def batch(data: BatchRequest, request: Request):
+        request.state.current_user = "user_1"  # resolved once by the batch
+        return FastJSONResponse({"responses": await batch_service.execute(request, data.requests)})
+
+    return app
+
+
+@pytest.mark.unit
+class TestBatchService:
+    """Test batched sub-request execution"""
+
+    def test_sub_requests_share_state_and_keep_order(self):
+        """Test that sub-requests see the batch's request state and results come back in order"""
+        response = TestClient(_app()).post("/api/batch", json={"requests": [
+            {"id": "me", "path": "/api/whoami?fields=name"},
+            {"id": "clinic", "path": "/api/clinics/clinic_missing"},
+        ]})
+
+        assert response.status_code == 200
+        me, clinic = response.json()["responses"]
+        assert me["id"] == "me" and me["status"] == 200
+        assert me["body"] == {"user": "user_1", "fields": "name"}
+        assert clinic["status"] == 404
+        assert clinic["body"]["detail"] == "Clinic not found"
+
+    def test_rejected_sub_requests(self):
+        """Test that non-API paths, nested batches and event streams are refused per entry"""
+        response = TestClient(_app()).post("/api/batch", json={"requests": [
+            {"path": "/docs"},
+            {"path": "/api/batch"},
+            {"path": "/api/stream"},
+        ]})
+
+        assert [result["status"] for result in response.json()["responses"]] == [400, 400, 400]
+
+    def test_failing_entries_do_not_fail_the_batch(self, monkeypatch):
+        """Test that a bad header value and a rate limiter error only fail their own entry"""
+        async def is_rate_limited(client_ip, endpoint):
+            if endpoint == "/api/clinics/clinic_1":
+                raise RuntimeError("limiter failed")
+            return False, 1, 60
+
+        monkeypatch.setattr(module, "RATE_LIMIT_ENABLED", True)
+        monkeypatch.setattr(module.rate_limiter, "is_rate_limited", is_rate_limited)
+
+        response = TestClient(_app()).post("/api/batch", json={"requests": [
+            {"path": "/api/whoami", "headers": {"If-None-Match": "\u201cetag\u201d"}},
+            {"path": "/api/clinics/clinic_1"},
+            {"path": "/api/whoami"},
+        ]})
+
+        assert response.status_code == 200
+        assert [result["status"] for result in response.json()["responses"]] == [400, 500, 200]
+
+    async def test_excluded_paths_are_not_counted(self, monkeypatch):
+        """Test that paths the rate limit middleware skips are not counted for batched calls either"""
+        counted = []
+
+        async def is_rate_limited(client_ip, endpoint):
+            counted.append(endpoint)
+            return False, 1, 60
+
+        monkeypatch.setattr(module, "RATE_LIMIT_ENABLED", True)
+        monkeypatch.setattr(module.rate_limiter, "is_rate_limited", is_rate_limited)
+        request = Request({"type": "http", "method": "POST", "path": "/api/batch", "headers": []})
+
+        for path in ("/health", "/api/whoami"):
+            assert await batch_service._rate_limited(request, BatchSubRequest(path=path), path) is None
+        assert counted == ["/api/whoami"]
+
+    def test_batch_size_is_limited(self):
+        """Test that empty and oversized batches fail validation"""
+        client = TestClient(_app())
+
+        assert client.post("/api/batch", json={"requests": []}).status_code == 422
+        assert client.post("/api/batch", json={"requests": [{"path": "/api/whoami"}] * 100}).status_code == 422
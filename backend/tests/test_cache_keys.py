@@ -0,0 +1,50 @@
+"""
+Cache Key Tests
+Tests for canonical cache key derivation and versioning
+"""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from app.schemas.user import User
+from app.services.cache import generate_cache_key
+from app.services.cache_keys import build_cache_key, canonical_encode
+
+
+def _user() -> User:
+    return User(
+        user_id="user_1",
+        email="admin@example.com",
+        name="Admin",
+        role="LOCATION_ADMIN",
+        created_at=datetime(2025, 1, 6, tzinfo=timezone.utc)
+    )
+
+
+@pytest.mark.unit
+class TestCacheKeys:
+    """Test cache key builders"""
+
+    def test_equal_arguments_give_equal_keys(self):
+        """Test that keys depend on values only: dict order and model identity do not matter"""
+        first = generate_cache_key("doctors", "clinic_1", filters={"a": 1, "b": 2}, user=_user())
+        second = generate_cache_key("doctors", "clinic_1", user=_user(), filters={"b": 2, "a": 1})
+
+        assert first == second
+        assert first.startswith("doctors:v")
+
+    def test_types_and_versions_are_distinct(self):
+        """Test that "1" and 1 differ and a version bump changes the key"""
+        assert canonical_encode(["1"]) != canonical_encode([1])
+        assert canonical_encode({"b", "a"}) == canonical_encode({"a", "b"})
+        assert build_cache_key("doctors", ["clinic_1"], version=1) != build_cache_key("doctors", ["clinic_1"], version=2)
+
+    def test_explicit_string_parts_are_kept(self):
+        """Test that a string from a key builder is used verbatim"""
+        assert build_cache_key("doctors", "clinic_1").endswith(":clinic_1")
+
+    def test_unsupported_objects_are_rejected(self):
+        """Test that arbitrary objects raise instead of leaking their address into the key"""
+        with pytest.raises(TypeError):
+            canonical_encode([object()])
@@ -0,0 +1,67 @@
+"""
+Catalog Version Tests
+Tests for ETag / Last-Modified validation of catalog responses
+"""
+
+from datetime import datetime, timezone
+
+import pytest
+from starlette.requests import Request
+
+from app.services.catalog_versions import CatalogValidators
+
+
+LAST_MODIFIED = datetime(2025, 3, 1, 12, 30, 15, 500000, tzinfo=timezone.utc)
+
+
+def _request(**headers) -> Request:
+    return Request({
+        "type": "http",
+        "method": "GET",
+        "path": "/api/clinics",
+        "headers": [(name.replace("_", "-").encode(), value.encode()) for name, value in headers.items()],
+    })
+
+
+@pytest.mark.unit
+class TestCatalogValidators:
+    """Test conditional GET handling for catalog endpoints"""
+
+    def test_matching_etag_is_not_modified(self):
+        """Test that a weak or strong match in If-None-Match answers 304 with the validators"""
+        for header in ('W/"abc"', '"abc"', '"other", W/"abc"', "*"):
+            validators = CatalogValidators('W/"abc"', LAST_MODIFIED, True, _request(if_none_match=header))
+            assert validators.not_modified
+
+        response = validators.not_modified_response()
+        assert response.status_code == 304
+        assert response.body == b""
+        assert response.headers["etag"] == 'W/"abc"'
+        assert response.headers["last-modified"] == "Sat, 01 Mar 2025 12:30:15 GMT"
+
+    def test_if_none_match_takes_precedence(self):
+        """Test that a stale ETag is modified even when If-Modified-Since is recent"""
+        validators = CatalogValidators('W/"new"', LAST_MODIFIED, True, _request(
+            if_none_match='W/"old"',
+            if_modified_since="Sun, 02 Mar 2025 00:00:00 GMT"
+        ))
+        assert not validators.not_modified
+
+    def test_if_modified_since(self):
+        """Test Last-Modified comparison at one-second precision"""
+        same = CatalogValidators('W/"abc"', LAST_MODIFIED, True, _request(if_modified_since="Sat, 01 Mar 2025 12:30:15 GMT"))
+        older = CatalogValidators('W/"abc"', LAST_MODIFIED, True, _request(if_modified_since="Sat, 01 Mar 2025 12:30:14 GMT"))
+
+        assert same.not_modified
+        assert not older.not_modified
+
+    def test_cache_control_public_or_private(self):
+        """Test that anonymous catalog data is public and only per-user responses vary by credentials"""
+        public = CatalogValidators('W/"abc"', None, True, _request()).response([{"clinic_id": "clinic_1"}])
+        private = CatalogValidators('W/"abc"', None, False, _request()).response([])
+
+        assert public.headers["cache-control"].startswith("public, max-age=")
+        assert "last-modified" not in public.headers
+        assert private.headers["cache-control"] == "private, no-cache"
+        assert "vary" not in public.headers
+        assert private.headers["vary"] == "Authorization, Cookie"
@@ -0,0 +1,139 @@
+"""
+Circuit Breaker Tests
+Tests for per-dependency timeouts, failure thresholds and half-open probing
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError
+from app.middleware.rate_limiter import RateLimiter
+from app.redis_client import RedisClient
+
+
+async def _ok():
+    return "ok"
+
+
+async def _fail():
+    raise ConnectionError("connection refused")
+
+
+async def _hang():
+    await asyncio.sleep(1)
+
+
+class _Pipeline:
+    """Pipeline replying with a fixed ZCARD count, or never when `hang` is set."""
+
+    def __init__(self, count, hang):
+        self.count = count
+        self.hang = hang
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self.commands.append(name)
+
+    async def execute(self):
+        if self.hang:
+            await asyncio.sleep(1)
+        return [0 if name != "zcard" else self.count for name in self.commands]
+
+
+class _Redis:
+    """Redis client whose rate-limit pipelines go through RedisClient.pipeline."""
+
+    pipeline = RedisClient.pipeline
+
+    def __init__(self, breaker, count=0, hang=False):
+        self.breaker = breaker
+        self._client = SimpleNamespace(pipeline=lambda transaction: _Pipeline(count, hang))
+
+    def is_available(self):
+        return True
+
+
+@pytest.mark.unit
+class TestCircuitBreaker:
+    """Test circuit breaker state transitions"""
+
+    async def test_opens_after_failure_rate_and_rejects(self):
+        """Test that the circuit opens once enough calls fail and then rejects without calling"""
+        breaker = CircuitBreaker("test", timeout=0.5, min_calls=4, failure_rate=0.5)
+
+        for operation in (_ok, _ok, _fail, _fail):
+            try:
+                await breaker.call(operation)
+            except ConnectionError:
+                pass
+        assert breaker.state == OPEN
+        assert breaker.is_open
+
+        called = []
+
+        async def _tracked():
+            called.append(True)
+
+        with pytest.raises(CircuitOpenError):
+            await breaker.call(_tracked)
+        assert not called
+
+    async def test_timeouts_count_as_failures(self):
+        """Test that calls over the timeout raise and are counted as failed"""
+        breaker = CircuitBreaker("test", timeout=0.01, min_calls=2)
+
+        for _ in range(2):
+            with pytest.raises(asyncio.TimeoutError):
+                await breaker.call(_hang)
+
+        assert breaker.state == OPEN
+
+    async def test_half_open_probes_close_or_reopen(self):
+        """Test that successful probes close the circuit and a failed probe reopens it"""
+        breaker = CircuitBreaker("test", timeout=0.5, min_calls=1, open_seconds=0, half_open_calls=2)
+
+        with pytest.raises(ConnectionError):
+            await breaker.call(_fail)
+        assert breaker.state == OPEN
+
+        assert await breaker.call(_ok) == "ok"
+        assert breaker.state == HALF_OPEN
+        with pytest.raises(ConnectionError):
+            await breaker.call(_fail)
+        assert breaker.state == OPEN
+
+        assert await breaker.call(_ok) == "ok"
+        assert await breaker.call(_ok) == "ok"
+        assert breaker.state == CLOSED
+
+    async def test_failure_result_is_counted(self):
+        """Test that results matching failure_result are returned but counted as failures"""
+        breaker = CircuitBreaker("test", timeout=0.5, min_calls=1, failure_result=lambda result: result == "ok")
+
+        assert await breaker.call(_ok) == "ok"
+        assert breaker.state == OPEN
+
+    async def test_rate_limiter_falls_back_to_memory_on_slow_redis(self):
+        """Test that the rate-limit pipeline runs under the breaker and falls back to in-memory counting"""
+        breaker = CircuitBreaker("redis", timeout=0.01, min_calls=1)
+        limiter = RateLimiter(_Redis(breaker, hang=True))
+
+        assert await limiter.is_rate_limited("10.0.0.1", "/api/clinics") == (False, 1, 60)
+        assert breaker.state == OPEN
+        assert await limiter.is_rate_limited("10.0.0.1", "/api/clinics") == (False, 2, 60)
+
+    async def test_rate_limiter_reads_the_window_count_from_the_pipeline(self):
+        """Test that the ZCARD reply is read back from the pipeline after the block"""
+        breaker = CircuitBreaker("redis", timeout=0.5, min_calls=1)
+
+        assert await RateLimiter(_Redis(breaker, count=4)).is_rate_limited("10.0.0.1", "/api/clinics") == (False, 5, 60)
+        assert await RateLimiter(_Redis(breaker, count=60)).is_rate_limited("10.0.0.1", "/api/clinics") == (True, 60, 60)
+        assert breaker.state == CLOSED
@@ -0,0 +1,27 @@
+"""
+Clinic Ratings Tests
+Tests for the denormalized clinic rating fields
+"""
+
+import pytest
+
+from app.services.clinic_ratings import rating_fields
+
+
+@pytest.mark.unit
+class TestClinicRatings:
+    """Test clinic rating aggregates"""
+    
+    def test_rating_fields_from_histogram(self):
+        """Test that average, count and sum are derived from the histogram"""
+        fields = rating_fields({"5": 3, "4": 1, "1": 1})
+        assert fields["review_count"] == 5
+        assert fields["rating_sum"] == 20
+        assert fields["average_rating"] == 4.0
+        assert fields["rating_histogram"] == {"1": 1, "2": 0, "3": 0, "4": 1, "5": 3}
+    
+    def test_rating_fields_without_reviews(self):
+        """Test that clinics without reviews get zeroed fields"""
+        fields = rating_fields({})
+        assert fields["review_count"] == 0
+        assert fields["average_rating"] == 0.0
@@ -0,0 +1,128 @@
+"""
+Compression Middleware Tests
+Tests for gzip response compression, thresholds and streaming pass-through
+"""
+
+import gzip
+
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from app.middleware.compression import CompressionMiddleware, negotiate_encoding
+
+
+CLINICS = [{"clinic_id": f"clinic_{i}", "name": f"Clinica {i}", "city": "Cluj-Napoca"} for i in range(200)]
+
+
+async def _clinics(request):
+    return JSONResponse(CLINICS, headers={"ETag": '"v1"'})
+
+
+async def _small(request):
+    return JSONResponse({"status": "ok"})
+
+
+async def _export(request):
+    async def rows():
+        for i in range(50):
+            yield f"appointment_{i},2025-03-01,SCHEDULED\n".encode()
+    return StreamingResponse(rows(), media_type="text/csv")
+
+
+async def _small_stream(request):
+    async def chunks():
+        yield b'{"status":'
+        yield b'"ok"}'
+    return StreamingResponse(chunks(), media_type="application/json")
+
+
+async def _events(request):
+    async def events():
+        yield b"event: unread_count\ndata: 3\n\n" * 100
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
+async def _png(request):
+    return Response(b"\x89PNG" + b"\x00" * 4096, media_type="image/png")
+
+
+def _client(**options) -> TestClient:
+    app = Starlette(routes=[
+        Route("/clinics", _clinics),
+        Route("/small", _small),
+        Route("/export", _export),
+        Route("/small-stream", _small_stream),
+        Route("/events", _events),
+        Route("/png", _png),
+    ])
+    return TestClient(CompressionMiddleware(app, **options))
+
+
+@pytest.mark.unit
+class TestCompressionMiddleware:
+    """Test response compression"""
+
+    def test_large_json_is_gzipped(self):
+        """Test that JSON over the threshold is compressed with an exact length and weak ETag"""
+        response = _client(minimum_size=1024).get("/clinics", headers={"Accept-Encoding": "gzip"})
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert response.headers["etag"] == 'W/"v1"'
+        assert int(response.headers["content-length"]) < len(response.content)
+        assert response.json() == CLINICS
+
+    def test_small_and_binary_responses_are_not_compressed(self):
+        """Test the size threshold and that non-text types pass through"""
+        client = _client(minimum_size=1024)
+
+        for path in ("/small", "/png"):
+            response = client.get(path, headers={"Accept-Encoding": "gzip"})
+            assert "content-encoding" not in response.headers
+
+    def test_streams_are_compressed_per_chunk(self):
+        """Test that streamed exports are compressed without a Content-Length"""
+        with _client().stream("GET", "/export", headers={"Accept-Encoding": "gzip"}) as response:
+            raw = b"".join(response.iter_raw())
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert "content-length" not in response.headers
+        assert gzip.decompress(raw).count(b"\n") == 50
+
+    def test_small_streamed_bodies_are_not_compressed(self):
+        """Test that the threshold also applies when a small body arrives in chunks"""
+        response = _client(minimum_size=1024).get("/small-stream", headers={"Accept-Encoding": "gzip"})
+
+        assert "content-encoding" not in response.headers
+        assert response.json() == {"status": "ok"}
+
+    def test_threshold_through_the_application_stack(self):
+        """Test that the app's BaseHTTPMiddleware layers do not defeat the size threshold"""
+        from app.main import app
+
+        client = TestClient(app)
+        health = client.get("/health", headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in health.headers
+        assert health.headers["content-length"] == str(len(health.content))
+        assert health.json() == {"status": "healthy"}
+
+        openapi = client.get("/openapi.json", headers={"Accept-Encoding": "gzip"})
+        assert openapi.headers["content-encoding"] == "gzip"
+        assert openapi.json()["info"]["title"] == "MediConnect API"
+
+    def test_event_streams_and_disabled_types_pass_through(self):
+        """Test that SSE is never compressed and a level of 0 disables a content type"""
+        client = _client(minimum_size=0, levels={"application/json": (0, 0)})
+
+        assert "content-encoding" not in client.get("/events", headers={"Accept-Encoding": "gzip"}).headers
+        assert "content-encoding" not in client.get("/clinics", headers={"Accept-Encoding": "gzip"}).headers
+
+    def test_negotiation(self):
+        """Test Accept-Encoding parsing with weights"""
+        assert negotiate_encoding("gzip, deflate") == "gzip"
+        assert negotiate_encoding("gzip;q=0, identity") is None
+        assert negotiate_encoding("*") in ("br", "gzip")
+        assert negotiate_encoding("") is None
@@ -0,0 +1,84 @@
+"""
+Dashboard Stats Tests
+Tests for dashboard cache scoping and invalidation
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from app.services import dashboard_stats as module
+from app.services.dashboard_stats import dashboard_stats
+
+
+APPOINTMENT = {
+    "appointment_id": "appt_1",
+    "clinic_id": "clinic_1",
+    "doctor_id": "doctor_abc",
+    "patient_id": "user_patient",
+}
+
+
+class _Cursor:
+    def __init__(self, rows):
+        self.rows = rows
+
+    async def to_list(self, length):
+        return self.rows
+
+
+class _FakeDB:
+    def __init__(self):
+        self.matches = []
+        self.appointments = SimpleNamespace(aggregate=self._aggregate)
+        self.clinics = SimpleNamespace(find_one=self._find_clinic)
+
+    def _aggregate(self, pipeline):
+        self.matches.append(pipeline[0]["$match"])
+        return _Cursor([])
+
+    async def _find_clinic(self, query, projection=None):
+        return {"organization_id": "org_1"}
+
+
+@pytest.mark.unit
+class TestDashboardStats:
+    """Test that a doctor's cached dashboard is the one appointment writes invalidate"""
+
+    async def test_doctor_key_matches_invalidation(self, monkeypatch):
+        """Test that the doctor dashboard is keyed and matched by doctor_id, not user_id"""
+        fake_db = _FakeDB()
+        cached_keys, deleted_keys = [], []
+
+        async def cache_get(key):
+            return None
+
+        async def cache_set(key, value, ttl=None):
+            cached_keys.append(module.stats_cache._make_key(key))
+            return True
+
+        async def delete(*keys):
+            deleted_keys.extend(keys)
+            return len(keys)
+
+        monkeypatch.setattr(module, "db", fake_db)
+        # Both calls fall in the same minute bucket
+        monkeypatch.setattr(module, "_minute_bucket", lambda now: "202501011200")
+        monkeypatch.setattr(module.stats_cache, "get", cache_get)
+        monkeypatch.setattr(module.stats_cache, "set", cache_set)
+        monkeypatch.setattr(module.redis_client, "is_available", lambda: True)
+        monkeypatch.setattr(module.redis_client, "delete", delete)
+
+        doctor = SimpleNamespace(
+            role="DOCTOR",
+            user_id="user_doctor",
+            doctor_id="doctor_abc",
+            clinic_id="clinic_1",
+            email="doctor@example.com"
+        )
+        await dashboard_stats.get_stats(doctor)
+        await dashboard_stats.invalidate_for_appointment(APPOINTMENT)
+
+        assert fake_db.matches == [{"clinic_id": "clinic_1", "doctor_id": "doctor_abc"}]
+        assert len(cached_keys) == 1
+        assert cached_keys[0] in deleted_keys
@@ -0,0 +1,196 @@
+"""
+Data Lifecycle Tests
+Tests for retention cutoffs, notification purging and audit log archival
+"""
+
+import gzip
+import json
+import zlib
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from app.services import data_lifecycle as module
+from app.services.data_lifecycle import (
+    ARCHIVE_COLLECTION,
+    DataLifecycleService,
+    RetentionPolicy,
+    _cutoff_filter,
+    purge_at
+)
+from app.services.notification_counters import NotificationCounterService
+
+
+NOW = datetime(2025, 6, 1, tzinfo=timezone.utc)
+
+
+def _matches(doc, query):
+    """Evaluate the `$or` of `$lt` clauses built by _cutoff_filter (same-type comparison, as MongoDB does)."""
+    for clause in query["$or"]:
+        for field, condition in clause.items():
+            value, cutoff = doc.get(field), condition["$lt"]
+            if type(value) is type(cutoff) and value < cutoff:
+                return True
+    return False
+
+
+class _Cursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    def sort(self, field, direction):
+        self.docs = sorted(self.docs, key=lambda doc: doc[field], reverse=direction < 0)
+        return self
+
+    def limit(self, n):
+        self.docs = self.docs[:n]
+        return self
+
+    async def to_list(self, length):
+        return [dict(doc) for doc in self.docs]
+
+
+class _Collection:
+    def __init__(self, docs=None):
+        self.docs = list(docs or [])
+        self.delete_batches = []
+
+    def find(self, query, projection=None):
+        return _Cursor([doc for doc in self.docs if _matches(doc, query)])
+
+    async def delete_many(self, query):
+        ids = set(query["_id"]["$in"])
+        self.delete_batches.append(len(ids))
+        before = len(self.docs)
+        self.docs = [doc for doc in self.docs if doc["_id"] not in ids]
+        return SimpleNamespace(deleted_count=before - len(self.docs))
+
+    async def insert_one(self, doc):
+        self.docs.append(doc)
+
+
+class _FakeDB:
+    def __init__(self, **collections):
+        self.collections = {name: _Collection(docs) for name, docs in collections.items()}
+        self.collections.setdefault(ARCHIVE_COLLECTION, _Collection())
+
+    def __getattr__(self, name):
+        return self.collections[name]
+
+    def __getitem__(self, name):
+        return self.collections[name]
+
+
+def _notification(i, days_old, user_id="user_1", is_read=None):
+    doc = {"_id": i, "user_id": user_id, "created_at": (NOW - timedelta(days=days_old)).isoformat()}
+    if is_read is not None:
+        doc["is_read"] = is_read
+    return doc
+
+
+def _audit_log(i, days_old):
+    # Older writers stored BSON dates, newer ones ISO strings
+    timestamp = NOW - timedelta(days=days_old)
+    return {"_id": i, "action": "LOGIN", "timestamp": timestamp if i % 2 else timestamp.isoformat()}
+
+
+@pytest.fixture
+def policies(monkeypatch):
+    monkeypatch.setitem(
+        module.RETENTION_POLICIES, "notifications",
+        RetentionPolicy("notifications", "purge", "created_at", 90)
+    )
+    monkeypatch.setitem(
+        module.RETENTION_POLICIES, "audit_logs",
+        RetentionPolicy("audit_logs", "archive", "timestamp", 365)
+    )
+
+
+@pytest.mark.unit
+class TestRetentionCutoffs:
+    """Test purge dates and cutoff filters"""
+
+    def test_purge_at_uses_explicit_expiry_or_retention(self, policies):
+        """Test that explicit expiries become aware UTC and retention-less collections never expire"""
+        assert purge_at("user_sessions", datetime(2025, 6, 2)) == datetime(2025, 6, 2, tzinfo=timezone.utc)
+        assert purge_at("users") is None
+
+        expires = purge_at("notifications")
+        expected = datetime.now(timezone.utc) + timedelta(days=90)
+        assert abs(expires - expected) < timedelta(seconds=5)
+
+    def test_cutoff_filter_matches_dates_and_iso_strings(self):
+        """Test that both timestamp encodings are compared against the same cutoff"""
+        query = _cutoff_filter(RetentionPolicy("audit_logs", "archive", "timestamp", 30), NOW)
+        cutoff = NOW - timedelta(days=30)
+
+        assert query == {"$or": [
+            {"timestamp": {"$lt": cutoff}},
+            {"timestamp": {"$lt": cutoff.isoformat()}}
+        ]}
+        assert _cutoff_filter(RetentionPolicy("user_sessions", "ttl", "expires_at"), NOW)["$or"][0] == {
+            "expires_at": {"$lt": NOW}
+        }
+
+
+@pytest.mark.unit
+class TestDataLifecycle:
+    """Test batched purging and archival"""
+
+    async def test_purge_notifications_applies_counter_deltas(self, monkeypatch, policies):
+        """Test that expired notifications are deleted in batches with per-user total/unread deltas"""
+        fake_db = _FakeDB(notifications=[
+            _notification(1, 100, is_read=True),
+            _notification(2, 100),                       # no is_read: unread
+            _notification(3, 120, is_read=False),
+            _notification(4, 95, user_id="user_2", is_read=True),
+            _notification(5, 10),                        # within retention
+        ])
+        deltas = []
+
+        async def record_bulk_deleted(user_id, total, unread):
+            deltas.append((user_id, total, unread))
+
+        monkeypatch.setattr(module, "db", fake_db)
+        monkeypatch.setattr(NotificationCounterService, "record_bulk_deleted", staticmethod(record_bulk_deleted))
+
+        assert await DataLifecycleService.purge_notifications(now=NOW, batch_size=3) == 4
+
+        assert [doc["_id"] for doc in fake_db.notifications.docs] == [5]
+        assert fake_db.notifications.delete_batches == [3, 1]
+        totals = {}
+        for user_id, total, unread in deltas:
+            previous = totals.get(user_id, (0, 0))
+            totals[user_id] = (previous[0] + total, previous[1] + unread)
+        assert totals == {"user_1": (3, 2), "user_2": (1, 0)}
+
+    async def test_archive_audit_logs_to_collection(self, monkeypatch, policies):
+        """Test that expired audit logs are archived as compressed batches, then deleted"""
+        fake_db = _FakeDB(audit_logs=[_audit_log(i, 400) for i in range(1, 6)] + [_audit_log(6, 10)])
+        monkeypatch.setattr(module, "db", fake_db)
+        monkeypatch.setattr(module, "AUDIT_LOG_ARCHIVE_TARGET", "collection")
+
+        assert await DataLifecycleService.archive_audit_logs(now=NOW, batch_size=2) == 5
+
+        archives = fake_db[ARCHIVE_COLLECTION].docs
+        assert [archive["count"] for archive in archives] == [2, 2, 1]
+        assert [(archive["first_id"], archive["last_id"]) for archive in archives] == [(1, 2), (3, 4), (5, 5)]
+        lines = zlib.decompress(archives[0]["payload"]).decode().splitlines()
+        assert [json.loads(line)["_id"] for line in lines] == [1, 2]
+        assert [doc["_id"] for doc in fake_db.audit_logs.docs] == [6]
+
+    async def test_archive_audit_logs_to_file(self, monkeypatch, policies, tmp_path):
+        """Test that the file sink appends every batch to one gzip'd JSON lines file per day"""
+        fake_db = _FakeDB(audit_logs=[_audit_log(i, 400) for i in range(1, 6)])
+        monkeypatch.setattr(module, "db", fake_db)
+        monkeypatch.setattr(module, "AUDIT_LOG_ARCHIVE_TARGET", "file")
+        monkeypatch.setattr(module, "AUDIT_LOG_ARCHIVE_DIR", str(tmp_path))
+
+        assert await DataLifecycleService.archive_audit_logs(now=NOW, batch_size=2) == 5
+
+        with gzip.open(tmp_path / "audit_logs-20250601.jsonl.gz", "rt", encoding="utf-8") as f:
+            archived = [json.loads(line)["_id"] for line in f]
+        assert archived == [1, 2, 3, 4, 5]
+        assert fake_db.audit_logs.docs == []
+        assert fake_db.audit_logs.delete_batches == [2, 2, 1]
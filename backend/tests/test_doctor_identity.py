@@ -0,0 +1,79 @@
+"""
+Doctor Identity Tests
+Tests for linking users to doctor profiles within their own tenant
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from app.services import doctor_identity as module
+from app.services.doctor_identity import doctor_identity
+
+
+DOCTORS = [
+    {"doctor_id": "doctor_other", "email": "ana@example.com", "clinic_id": "clinic_other", "organization_id": "org_other"},
+    {"doctor_id": "doctor_own", "email": "ana@example.com", "clinic_id": "clinic_own", "organization_id": "org_own"},
+]
+
+
+class _Doctors:
+    def __init__(self, docs):
+        self.docs = docs
+
+    async def find_one(self, query, projection=None):
+        for doc in self.docs:
+            if all(doc.get(field) == value for field, value in query.items()):
+                return {"doctor_id": doc["doctor_id"]}
+        return None
+
+
+@pytest.fixture
+def fake_db(monkeypatch):
+    links = []
+
+    async def update_one(query, update):
+        links.append((query["user_id"], update["$set"]["doctor_id"]))
+
+    db = SimpleNamespace(doctors=_Doctors(DOCTORS[:1]), users=SimpleNamespace(update_one=update_one), links=links)
+    monkeypatch.setattr(module, "db", db)
+    return db
+
+
+def _doctor_user(**fields):
+    return SimpleNamespace(**{
+        "user_id": "user_ana",
+        "email": "Ana@example.com",
+        "doctor_id": None,
+        "clinic_id": None,
+        "organization_id": None,
+        **fields
+    })
+
+
+@pytest.mark.unit
+class TestDoctorIdentity:
+    """Test that doctor profiles are only linked within the user's clinic or organization"""
+
+    async def test_profile_in_another_clinic_is_not_linked(self, fake_db):
+        """Test that a same-email profile in another tenant is never linked"""
+        user = _doctor_user(clinic_id="clinic_own", organization_id="org_own")
+
+        assert await doctor_identity.resolve(user) is None
+        assert user.doctor_id is None
+        assert fake_db.links == []
+
+    async def test_profile_in_own_clinic_is_linked(self, fake_db):
+        """Test that the user's own clinic profile is linked and stored"""
+        fake_db.doctors.docs = DOCTORS
+        user = _doctor_user(clinic_id="clinic_own")
+
+        assert await doctor_identity.resolve(user) == "doctor_own"
+        assert fake_db.links == [("user_ana", "doctor_own")]
+
+    async def test_lookup_without_tenant_matches_nothing(self, fake_db):
+        """Test that invitation acceptance without a clinic matches by organization only"""
+        fake_db.doctors.docs = DOCTORS
+
+        assert await doctor_identity.lookup("ana@example.com") is None
+        assert await doctor_identity.lookup("ana@example.com", None, "org_own") == "doctor_own"
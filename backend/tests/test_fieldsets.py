@@ -0,0 +1,48 @@
+"""
+Sparse Fieldset Tests
+Tests for ?fields= validation, projections and trimming
+"""
+
+import pytest
+from fastapi import HTTPException
+
+from app.routers.appointments import APPOINTMENT_FIELDS
+from app.routers.doctors import DOCTOR_FIELDS
+
+
+@pytest.mark.unit
+class TestFieldSets:
+    """Test sparse fieldsets for list endpoints"""
+
+    def test_no_fields_means_everything(self):
+        """Test that an absent or empty fields parameter keeps the full documents"""
+        for fields in (None, "", " , "):
+            fieldset = APPOINTMENT_FIELDS.parse(fields)
+            assert not fieldset.sparse
+            assert fieldset.projection() == {"_id": 0}
+            assert fieldset.wants("doctor_name")
+
+    def test_projection_includes_key_and_dependencies(self):
+        """Test that computed fields load the stored fields they are derived from"""
+        fieldset = APPOINTMENT_FIELDS.parse("date_time, doctor_name")
+
+        assert fieldset.projection() == {
+            "_id": 0, "appointment_id": 1, "date_time": 1, "doctor_id": 1, "doctor_name": 1
+        }
+        assert fieldset.wants("doctor_name", "doctor_specialty")
+        assert not fieldset.wants("patient_name", "patient_email", "is_own_patient")
+
+    def test_trim_drops_dependency_fields(self):
+        """Test that fields loaded only for enrichment are not returned"""
+        fieldset = DOCTOR_FIELDS.parse("name,location_name")
+        doctors = [{"doctor_id": "doctor_1", "name": "Dr. Ionescu", "location_id": "loc_1", "location_name": "Main"}]
+
+        assert fieldset.trim(doctors) == [{"doctor_id": "doctor_1", "name": "Dr. Ionescu", "location_name": "Main"}]
+
+    def test_unknown_fields_are_rejected(self):
+        """Test that fields outside the allow-list are a 400"""
+        with pytest.raises(HTTPException) as exc_info:
+            DOCTOR_FIELDS.parse("name,password_hash")
+
+        assert exc_info.value.status_code == 400
+        assert "password_hash" in exc_info.value.detail
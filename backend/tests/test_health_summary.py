@@ -0,0 +1,88 @@
+"""
+Health Summary Tests
+Tests for seeding and in-place updates of the per-user health summary
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from app.services import health_summary as module
+from app.services.health_summary import HealthSummaryService
+
+
+SUMMARY = {
+    "user_id": "user_1",
+    "latest": {},
+    "total_vitals": 3,
+    "last_measurement_date": "2025-03-01T08:00:00+00:00",
+    "labs_by_status": {},
+    "total_labs": 0,
+    "last_lab_test_date": None,
+}
+
+
+class _SummaryCollection:
+    """In-memory `health_summaries` recording the updates the service sends."""
+
+    def __init__(self):
+        self.docs = {}
+        self.updates = []
+
+    async def find_one_and_update(self, query, update, projection=None, upsert=False, return_document=None):
+        doc = self.docs.get(query["user_id"])
+        if doc is None and upsert:
+            doc = self.docs[query["user_id"]] = {"user_id": query["user_id"], **update["$setOnInsert"]}
+        return dict(doc) if doc else None
+
+    async def update_one(self, query, update):
+        self.updates.append(update)
+
+
+@pytest.fixture
+def summaries(monkeypatch):
+    collection = _SummaryCollection()
+
+    async def compute(user_id):
+        return dict(SUMMARY)
+
+    monkeypatch.setattr(module, "HEALTH_SUMMARY_CACHE_ENABLED", True)
+    monkeypatch.setattr(module, "db", SimpleNamespace(health_summaries=collection))
+    monkeypatch.setattr(HealthSummaryService, "compute", staticmethod(compute))
+    return collection
+
+
+@pytest.mark.unit
+class TestHealthSummary:
+    """Test health summary seeding and deltas"""
+
+    async def test_rebuild_seeds_only_a_missing_summary(self, summaries):
+        """Test that a rebuild inserts the computed summary but never overwrites an existing one"""
+        seeded = await HealthSummaryService.rebuild("user_1")
+        assert seeded["total_vitals"] == 3
+
+        summaries.docs["user_1"]["total_vitals"] = 4  # a write applied since
+        assert (await HealthSummaryService.rebuild("user_1"))["total_vitals"] == 4
+
+    async def test_vital_delta_keeps_newest_per_type(self, summaries):
+        """Test that a batch adds its count and offers only the newest vital per type"""
+        vitals = [
+            {"user_id": "user_1", "type": "heart_rate", "value": 70, "measured_at": "2025-03-01T08:00:00+00:00"},
+            {"user_id": "user_1", "type": "heart_rate", "value": 75, "measured_at": "2025-03-02T08:00:00+00:00"},
+        ]
+        await HealthSummaryService.record_vitals(vitals)
+
+        update = summaries.updates[0][0]["$set"]
+        assert update["total_vitals"] == {"$add": [{"$ifNull": ["$total_vitals", 0]}, 2]}
+        assert update["last_measurement_date"]["$max"][1] == "2025-03-02T08:00:00+00:00"
+        assert update["latest.heart_rate"]["$cond"][1] == {"$literal": vitals[1]}
+
+    async def test_lab_delta_counts_by_status(self, summaries):
+        """Test that a lab result increments its status bucket and the total"""
+        await HealthSummaryService.record_lab_result(
+            {"user_id": "user_1", "status": "NORMAL", "test_date": "2025-03-01"}
+        )
+
+        update = summaries.updates[0]
+        assert update["$inc"] == {"total_labs": 1, "labs_by_status.NORMAL": 1}
+        assert update["$max"] == {"last_lab_test_date": "2025-03-01"}
@@ -0,0 +1,52 @@
+"""
+Index Registry Tests
+Tests for the declarative index registry
+"""
+
+import pytest
+from pymongo import DESCENDING
+
+from app.services.indexes import INDEX_REGISTRY, index
+
+
+def _declared(collection):
+    return {spec.keys: spec for spec in INDEX_REGISTRY.get(collection, [])}
+
+
+@pytest.mark.unit
+class TestIndexRegistry:
+    """Test index registry declarations"""
+    
+    def test_index_names_match_mongo_defaults(self):
+        """Test that generated names match MongoDB's default index names"""
+        assert index("email", unique=True).name == "email_1"
+        assert index("user_id", ("created_at", DESCENDING)).name == "user_id_1_created_at_-1"
+    
+    def test_no_duplicate_indexes_per_collection(self):
+        """Test that no collection declares the same index twice"""
+        for collection, specs in INDEX_REGISTRY.items():
+            names = [spec.name for spec in specs]
+            assert len(names) == len(set(names)), collection
+    
+    @pytest.mark.parametrize("collection,keys", [
+        ("user_sessions", (("session_token", 1),)),
+        ("notifications", (("user_id", 1), ("created_at", -1))),
+        ("vital_signs", (("meta.user_id", 1), ("meta.type", 1), ("measured_at", -1))),
+        ("lab_results", (("user_id", 1), ("test_date", -1))),
+        ("favorite_doctors", (("user_id", 1), ("doctor_id", 1))),
+        ("appointments", (("patient_id", 1), ("doctor_id", 1), ("status", 1), ("date_time", -1))),
+        ("reviews", (("clinic_id", 1), ("created_at", -1))),
+        ("invitations", (("invitation_token", 1),)),
+        ("staff", (("invitation_token", 1),)),
+        ("audit_logs", (("organization_id", 1), ("timestamp", -1))),
+    ])
+    def test_hot_path_indexes_declared(self, collection, keys):
+        """Test that indexes needed by hot query paths are declared"""
+        assert keys in _declared(collection)
+    
+    def test_ttl_indexes_are_single_field(self):
+        """Test that TTL indexes are single-field, as MongoDB requires"""
+        for specs in INDEX_REGISTRY.values():
+            for spec in specs:
+                if spec.expire_after_seconds is not None:
+                    assert len(spec.keys) == 1
@@ -0,0 +1,88 @@
+"""
+Logging Pipeline Tests
+Tests for the queue-based structured logging pipeline
+"""
+
+import logging
+import queue
+
+import pytest
+
+from app.services.logging_config import (
+    NonBlockingQueueHandler,
+    SamplingFilter,
+    StructuredFormatter,
+    redact_headers,
+    request_id_var,
+    setup_logging,
+    stop_logging
+)
+
+
+def _record(level=logging.INFO, msg="message %s", args=("arg",), **extra):
+    record = logging.LogRecord("mediconnect", level, __file__, 1, msg, args, None)
+    record.__dict__.update(extra)
+    return record
+
+
+@pytest.mark.unit
+class TestLoggingPipeline:
+    """Test structured, non-blocking logging"""
+    
+    def test_credentials_are_redacted(self):
+        """Test that auth headers never reach the logs"""
+        headers = redact_headers({"Authorization": "Bearer abc", "Cookie": "session=1", "Accept": "*/*"})
+        assert headers == {"Authorization": "[REDACTED]", "Cookie": "[REDACTED]", "Accept": "*/*"}
+    
+    def test_queue_handler_captures_request_id_and_drops_info_when_full(self):
+        """Test that the request ID is captured on emit and a full queue never blocks"""
+        handler = NonBlockingQueueHandler(queue.Queue(maxsize=1))
+        token = request_id_var.set("req-1")
+        try:
+            handler.emit(_record())
+            handler.emit(_record())
+        finally:
+            request_id_var.reset(token)
+        
+        queued = handler.queue.get_nowait()
+        assert queued.request_id == "req-1"
+        assert queued.getMessage() == "message arg"
+        assert handler.dropped == 1
+    
+    def test_warnings_use_reserved_capacity_and_never_block(self):
+        """Test that INFO cannot fill the reserve and a full queue drops warnings too"""
+        handler = NonBlockingQueueHandler(queue.Queue(maxsize=3), reserved=1)
+        for _ in range(3):
+            handler.emit(_record())
+        assert handler.queue.qsize() == 2
+        
+        handler.emit(_record(level=logging.WARNING))
+        handler.emit(_record(level=logging.ERROR))
+        assert handler.queue.qsize() == 3
+        assert handler.dropped == 2
+    
+    def test_stop_logging_detaches_queue_handler(self):
+        """Test that records logged after shutdown do not pile up in an undrained queue"""
+        root_logger = logging.getLogger()
+        previous, previous_level = list(root_logger.handlers), root_logger.level
+        try:
+            setup_logging(async_logging=True, queue_size=10)
+            assert any(isinstance(handler, NonBlockingQueueHandler) for handler in root_logger.handlers)
+            stop_logging()
+            assert not any(isinstance(handler, NonBlockingQueueHandler) for handler in root_logger.handlers)
+        finally:
+            stop_logging()
+            root_logger.handlers[:] = previous
+            root_logger.setLevel(previous_level)
+    
+    def test_structured_formatter_includes_extra_fields(self):
+        """Test that `extra=` fields are serialized"""
+        line = StructuredFormatter().format(_record(http={"status_code": 200}, request_id="req-2"))
+        assert '"request_id":' in line and '"status_code":' in line
+    
+    def test_sampling_never_drops_warnings(self):
+        """Test that sampling only applies below WARNING"""
+        sampling = SamplingFilter()
+        assert sampling.filter(_record(level=logging.WARNING, sample_rate=0.0))
+        assert not sampling.filter(_record(sample_rate=0.0))
+        assert sampling.filter(_record())
@@ -0,0 +1,101 @@
+"""
+Metrics Tests
+Tests for request metric labels and scrape-time sampling
+"""
+
+import asyncio
+import logging
+import queue
+import time
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from starlette.testclient import TestClient
+
+import app.db
+from app.middleware.metrics import MetricsMiddleware
+from app.services import metrics
+from app.services.logging_config import NonBlockingQueueHandler
+from app.services.metrics import REGISTRY, UNMATCHED_ROUTE, render_metrics
+
+
+def _app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+
+    @app.get("/api/appointments/{appointment_id}")
+    async def appointment(appointment_id: str):
+        return {"appointment_id": appointment_id}
+
+    return app
+
+
+def _route_labels() -> set:
+    return {
+        sample.labels["route"]
+        for metric in REGISTRY.collect()
+        if metric.name == "mediconnect_http_request_duration_seconds"
+        for sample in metric.samples
+    }
+
+
+def _count(route: str, status: str) -> float:
+    return REGISTRY.get_sample_value(
+        "mediconnect_http_request_duration_seconds_count",
+        {"method": "GET", "route": route, "status": status}
+    ) or 0.0
+
+
+@pytest.mark.unit
+class TestMetrics:
+    """Test Prometheus request labels and bounded scrape sampling"""
+
+    def test_requests_are_labelled_by_route_template(self):
+        """Test that the route template, never the raw ID, ends up in label values"""
+        route = "/api/appointments/{appointment_id}"
+        before = _count(route, "200")
+
+        response = TestClient(_app()).get("/api/appointments/appt_8f3a91")
+
+        assert response.status_code == 200
+        assert _count(route, "200") == before + 1
+        assert not any("appt_8f3a91" in label for label in _route_labels())
+
+    def test_unmatched_paths_share_one_label(self):
+        """Test that 404s for unknown paths are labelled <unmatched>, not by path"""
+        before = _count(UNMATCHED_ROUTE, "404")
+
+        client = TestClient(_app())
+        for path in ("/wp-admin/setup.php", "/api/unknown/123"):
+            assert client.get(path).status_code == 404
+
+        assert _count(UNMATCHED_ROUTE, "404") == before + 2
+        assert not any("wp-admin" in label or "unknown" in label for label in _route_labels())
+
+    async def test_reminder_sampling_is_bounded_when_mongo_is_slow(self, monkeypatch):
+        """Test that a scrape still answers when the reminder backlog query hangs"""
+        async def count_documents(query):
+            await asyncio.sleep(10)
+
+        monkeypatch.setattr(app.db, "db", SimpleNamespace(appointments=SimpleNamespace(count_documents=count_documents)))
+        monkeypatch.setattr(metrics, "SCRAPE_SAMPLE_TIMEOUT", 0.05)
+
+        start = time.monotonic()
+        body = await render_metrics()
+
+        assert time.monotonic() - start < 1
+        assert b"mediconnect_http_request_duration_seconds" in body
+
+    async def test_dropped_log_records_are_exported(self):
+        """Test that records dropped by a full log queue show up at scrape time"""
+        handler = NonBlockingQueueHandler(queue.Queue(maxsize=1))
+        handler.dropped = 3
+        root_logger = logging.getLogger()
+        root_logger.addHandler(handler)
+        try:
+            await render_metrics()
+        finally:
+            root_logger.removeHandler(handler)
+
+        assert REGISTRY.get_sample_value("mediconnect_log_records_dropped") == 3
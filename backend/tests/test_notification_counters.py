@@ -0,0 +1,118 @@
+"""
+Notification Counter Tests
+Tests for the materialized per-user notification counters
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from app.services import notification_counters as module
+from app.services.notification_counters import NotificationCounterService
+
+
+class _Cursor:
+    def __init__(self, rows):
+        self.rows = rows
+
+    async def to_list(self, length):
+        return self.rows
+
+
+class _CounterCollection:
+    """In-memory `notification_counters` supporting the update operators the service uses."""
+
+    def __init__(self):
+        self.docs = {}
+
+    async def find_one_and_update(self, query, update, projection=None, upsert=False, return_document=None):
+        doc = self.docs.get(query["user_id"])
+        if doc is None:
+            if not upsert:
+                return None
+            doc = self.docs[query["user_id"]] = {"user_id": query["user_id"]}
+            doc.update(update.get("$setOnInsert", {}))
+        for field, delta in update.get("$inc", {}).items():
+            doc[field] = doc.get(field, 0) + delta
+        doc.update(update.get("$set", {}))
+        return dict(doc)
+
+    async def find_one(self, query, projection=None):
+        doc = self.docs.get(query["user_id"])
+        return dict(doc) if doc else None
+
+
+class _FakeDB:
+    def __init__(self, stored_counts=None):
+        self.notification_counters = _CounterCollection()
+        rows = [{"_id": None, **stored_counts}] if stored_counts else []
+        self.notifications = SimpleNamespace(aggregate=lambda pipeline: _Cursor(rows))
+
+
+@pytest.fixture
+def fake_db(monkeypatch):
+    db = _FakeDB({"total": 1, "unread": 1})
+    published = []
+
+    async def publish_counters(user_id, total, unread):
+        published.append((total, unread))
+
+    monkeypatch.setattr(module, "db", db)
+    monkeypatch.setattr(module.notification_stream, "publish_counters", publish_counters)
+    db.published = published
+    return db
+
+
+def _counters(db, user_id="user_1"):
+    doc = db.notification_counters.docs[user_id]
+    return doc["total"], doc["unread"]
+
+
+@pytest.mark.unit
+class TestNotificationCounters:
+    """Test counter deltas for each notification write"""
+
+    async def test_first_write_seeds_from_collection(self, fake_db):
+        """Test that a write without a counter document seeds it instead of being dropped"""
+        await NotificationCounterService.record_created("user_1")
+
+        # The seed counts the notification just inserted; no extra $inc
+        assert _counters(fake_db) == (1, 1)
+        assert fake_db.published == [(1, 1)]
+
+    async def test_seed_never_overwrites_existing_counters(self, fake_db):
+        """Test that seeding keeps a document another request created first"""
+        fake_db.notification_counters.docs["user_1"] = {"user_id": "user_1", "total": 5, "unread": 2}
+
+        assert await NotificationCounterService.rebuild("user_1") == {"total": 5, "unread": 2}
+        assert _counters(fake_db) == (5, 2)
+
+    async def test_create_read_toggles_and_delete(self, fake_db):
+        """Test deltas for create, read/unread toggles and deletes"""
+        fake_db.notification_counters.docs["user_1"] = {"user_id": "user_1", "total": 0, "unread": 0}
+
+        await NotificationCounterService.record_created("user_1")
+        await NotificationCounterService.record_created("user_1", is_read=True)
+        assert _counters(fake_db) == (2, 1)
+
+        await NotificationCounterService.record_read_state("user_1", is_read=True)
+        assert _counters(fake_db) == (2, 0)
+        await NotificationCounterService.record_read_state("user_1", is_read=False)
+        assert _counters(fake_db) == (2, 1)
+
+        await NotificationCounterService.record_deleted("user_1", was_read=False)
+        await NotificationCounterService.record_deleted("user_1", was_read=True)
+        assert _counters(fake_db) == (0, 0)
+
+    async def test_mark_all_read_and_bulk_delete(self, fake_db):
+        """Test bulk deltas for mark-all-read and retention deletes"""
+        fake_db.notification_counters.docs["user_1"] = {"user_id": "user_1", "total": 10, "unread": 6}
+
+        await NotificationCounterService.record_all_read("user_1", 4)
+        assert _counters(fake_db) == (10, 2)
+
+        await NotificationCounterService.record_all_read("user_1", 0)
+        assert len(fake_db.published) == 1
+
+        await NotificationCounterService.record_bulk_deleted("user_1", total=3, unread=2)
+        assert _counters(fake_db) == (7, 0)
@@ -0,0 +1,102 @@
+"""
+Notification Stream Tests
+Tests for Redis pub/sub delivery and its in-process fallback
+"""
+
+import asyncio
+
+import pytest
+
+from app.services import notification_stream as module
+from app.services.notification_stream import NotificationStreamService
+
+
+class _FakePubSub:
+    def __init__(self, redis):
+        self.redis = redis
+
+    async def psubscribe(self, pattern):
+        self.redis.subscriptions += 1
+
+    async def listen(self):
+        while True:
+            yield await self.redis.messages.get()
+
+    async def close(self):
+        self.redis.subscriptions -= 1
+
+
+class _FakeRedis:
+    """Redis client that is unreachable until `up` is set."""
+
+    def __init__(self):
+        self.up = False
+        self.subscriptions = 0
+        self.messages: asyncio.Queue = asyncio.Queue()
+
+    async def get_client(self):
+        return self if self.up else None
+
+    def pubsub(self):
+        return _FakePubSub(self)
+
+    async def publish(self, channel, message):
+        if not self.up:
+            return 0
+        await self.messages.put({"type": "pmessage", "channel": channel, "data": message})
+        return self.subscriptions
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    redis = _FakeRedis()
+    monkeypatch.setattr(module, "redis_client", redis)
+    monkeypatch.setattr(module, "REDIS_ENABLED", True)
+    monkeypatch.setattr(module, "NOTIFICATION_STREAM_BACKEND", "redis")
+    monkeypatch.setattr(module, "REDIS_RETRY_SECONDS", 0.01)
+    return redis
+
+
+async def _wait_for(condition):
+    for _ in range(100):
+        if condition():
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("condition not reached")
+
+
+@pytest.mark.unit
+class TestNotificationStream:
+    """Test that events keep flowing while Redis is down and after it returns"""
+
+    async def test_listener_starts_when_redis_comes_back(self, fake_redis):
+        """Test in-process delivery while Redis is down, then delivery through the resumed subscription"""
+        stream = NotificationStreamService()
+        await stream.start()
+        try:
+            async with stream.subscribe("user_1") as queue:
+                await stream.publish("user_1", "unread_count", {"total": 1, "unread": 1})
+                assert (await asyncio.wait_for(queue.get(), 1))["data"] == {"total": 1, "unread": 1}
+
+                fake_redis.up = True
+                await _wait_for(lambda: stream._redis_subscribed)
+
+                await stream.publish("user_1", "unread_count", {"total": 2, "unread": 2})
+                assert (await asyncio.wait_for(queue.get(), 1))["data"] == {"total": 2, "unread": 2}
+                assert queue.empty()
+        finally:
+            await stream.stop()
+
+        assert fake_redis.subscriptions == 0
+
+    async def test_failed_publish_falls_back_to_local_delivery(self, fake_redis):
+        """Test that a publish no one received is delivered to this worker's connections"""
+        stream = NotificationStreamService()
+        stream._redis_subscribed = True  # subscription not yet noticed as lost
+
+        async with stream.subscribe("user_1") as queue:
+            await stream.publish("user_1", "notification", {"notification_id": "notif_1"}, "notif_1")
+
+            message = queue.get_nowait()
+            assert message["id"] == "notif_1"
+            assert fake_redis.messages.empty()
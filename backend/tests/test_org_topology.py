@@ -0,0 +1,42 @@
+"""
+Organization Topology Tests
+Tests for the cached organization → locations map
+"""
+
+import time
+
+import pytest
+
+from app.services.org_topology import OrganizationTopology, OrganizationTopologyService
+
+
+LOCATIONS = [
+    {"location_id": "loc_main", "name": "Main", "is_active": True, "is_primary": True},
+    {"location_id": "loc_old", "name": "Old", "is_active": False, "is_primary": False},
+    {"location_id": "loc_north", "name": "North", "is_active": True, "is_primary": False},
+]
+
+
+@pytest.mark.unit
+class TestOrganizationTopology:
+    """Test organization topology lookups"""
+
+    def test_active_and_all_locations(self):
+        """Test that inactive locations are kept for scope checks but not listed as active"""
+        topology = OrganizationTopology("org_1", LOCATIONS)
+
+        assert topology.location_ids() == ["loc_main", "loc_old", "loc_north"]
+        assert topology.active_location_ids() == ["loc_main", "loc_north"]
+        assert "loc_old" in topology and not topology.is_active("loc_old")
+        assert topology.name("loc_north") == "North"
+        assert topology.name("loc_missing") is None
+
+    async def test_local_entry_is_served_until_invalidated(self):
+        """Test that a fresh in-process entry is returned and invalidate drops it"""
+        topology = OrganizationTopology("org_local", LOCATIONS)
+        OrganizationTopologyService._local["org_local"] = (time.monotonic() + 60, topology)
+
+        assert await OrganizationTopologyService.get("org_local") is topology
+
+        await OrganizationTopologyService.invalidate("org_local")
+        assert "org_local" not in OrganizationTopologyService._local
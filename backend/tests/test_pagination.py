@@ -0,0 +1,34 @@
+"""
+Cursor Pagination Tests
+Tests for keyset cursor encoding and filters
+"""
+
+import pytest
+from fastapi import HTTPException
+
+from app.services.pagination import decode_cursor, encode_cursor, keyset_filter
+
+
+@pytest.mark.unit
+class TestCursorPagination:
+    """Test keyset pagination helpers"""
+    
+    def test_cursor_round_trip(self):
+        """Test that a cursor decodes to the values it was built from"""
+        cursor = encode_cursor("2025-03-01T10:00:00+00:00", "apt_123")
+        assert decode_cursor(cursor) == ("2025-03-01T10:00:00+00:00", "apt_123")
+    
+    def test_keyset_filter_breaks_ties_on_id(self):
+        """Test that documents sharing the sort value are split by the tie breaker"""
+        cursor = encode_cursor("2025-03-01", "apt_5")
+        assert keyset_filter("date_time", "appointment_id", cursor) == {"$or": [
+            {"date_time": {"$lt": "2025-03-01"}},
+            {"date_time": "2025-03-01", "appointment_id": {"$lt": "apt_5"}}
+        ]}
+        assert keyset_filter("date_time", "appointment_id", None) == {}
+    
+    def test_invalid_cursor_is_rejected(self):
+        """Test that a malformed cursor is a client error"""
+        with pytest.raises(HTTPException) as exc:
+            decode_cursor("not-a-cursor")
+        assert exc.value.status_code == 400
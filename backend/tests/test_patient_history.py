@@ -0,0 +1,65 @@
+"""
+Patient History Tests
+Tests for doctor enrichment of the appointment history section
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from app.routers import records as module
+
+
+class _Doctors:
+    def __init__(self, docs):
+        self.docs = docs
+        self.queries = []
+
+    def find(self, query, projection=None):
+        self.queries.append(query["doctor_id"]["$in"])
+        return _AsyncIter([doc for doc in self.docs if doc["doctor_id"] in query["doctor_id"]["$in"]])
+
+
+class _AsyncIter:
+    def __init__(self, docs):
+        self.docs = iter(docs)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self.docs)
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+@pytest.mark.unit
+class TestPatientHistory:
+    """Test doctor names and specialties on history appointments"""
+
+    async def test_cached_doctor_cards_skip_the_database(self, monkeypatch):
+        """Test that cached doctor cards are read in one batch and only misses are queried"""
+        appointments = [
+            {"appointment_id": "apt_1", "doctor_id": "doctor_cached"},
+            {"appointment_id": "apt_2", "doctor_id": "doctor_db"},
+            {"appointment_id": "apt_3", "doctor_id": "doctor_gone"},
+        ]
+        doctors = _Doctors([{"doctor_id": "doctor_db", "name": "Dr. Pop", "specialty": "Neurology"}])
+
+        async def paginate(*args):
+            return [dict(apt) for apt in appointments], None
+
+        async def get_many(keys):
+            return {"doctor_cached": {"doctor_id": "doctor_cached", "name": "Dr. Ionescu", "specialty": "Cardiology"}}
+
+        monkeypatch.setattr(module, "paginate", paginate)
+        monkeypatch.setattr(module, "db", SimpleNamespace(appointments=None, doctors=doctors))
+        monkeypatch.setattr(module.doctors_cache, "get_many", get_many)
+
+        page, _ = await module._history_appointments({"patient_id": "user_1"}, 100, None)
+
+        assert [(apt["doctor_name"], apt["doctor_specialty"]) for apt in page] == [
+            ("Dr. Ionescu", "Cardiology"), ("Dr. Pop", "Neurology"), ("Unknown", "Unknown")
+        ]
+        assert [sorted(ids) for ids in doctors.queries] == [["doctor_db", "doctor_gone"]]
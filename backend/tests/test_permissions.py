@@ -0,0 +1,81 @@
+"""
+Permission Evaluator Tests
+Tests for the compiled role matrix and per-request permission facts
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from app.schemas.permission import PermissionConstants, ROLE_PERMISSIONS_MATRIX
+from app.schemas.user import User
+from app.services.permission_evaluator import (
+    COMPILED_ROLES,
+    PERMISSION_BITS,
+    get_permission_context
+)
+from app.services.permissions import PermissionService
+
+
+def make_user(role: str, **fields) -> User:
+    return User(user_id=f"user_{role.lower()}", email=f"{role.lower()}@example.com", name=role, role=role, **fields)
+
+
+@pytest.mark.unit
+class TestPermissionEvaluator:
+    """Test the compiled RBAC evaluator"""
+
+    def test_compiled_masks_match_matrix(self):
+        """Test that every role's mask grants exactly its matrix permissions"""
+        for role, grants in ROLE_PERMISSIONS_MATRIX.items():
+            granted = {permission for permission, bit in PERMISSION_BITS.items() if COMPILED_ROLES[role].granted & bit}
+            assert granted == set(grants)
+
+        doctor = COMPILED_ROLES["DOCTOR"]
+        assert doctor.own_appointments & PERMISSION_BITS[PermissionConstants.APPOINTMENTS_UPDATE]
+        assert not doctor.own_appointments & PERMISSION_BITS[PermissionConstants.RECORDS_VIEW]
+
+    async def test_decisions_are_memoized_per_request(self):
+        """Test that repeated checks in one request reuse the same decision"""
+        user = make_user("RECEPTIONIST", assigned_location_ids=["loc_1"])
+        request = SimpleNamespace(state=SimpleNamespace())
+
+        first = await PermissionService.check_permission(
+            user, PermissionConstants.APPOINTMENTS_ACCEPT, context={"location_id": "loc_1"}, request=request
+        )
+        again = await PermissionService.check_permission(
+            user, PermissionConstants.APPOINTMENTS_ACCEPT, context={"location_id": "loc_1"}, request=request
+        )
+        other = await PermissionService.check_permission(
+            user, PermissionConstants.APPOINTMENTS_ACCEPT, context={"location_id": "loc_2"}, request=request
+        )
+
+        assert first.allowed and again is first
+        assert not other.allowed
+        assert get_permission_context(user, request) is request.state.permission_context
+
+    async def test_role_without_permission_is_denied(self):
+        """Test that a permission missing from the role's mask is denied"""
+        result = await PermissionService.check_permission(
+            make_user("USER"), PermissionConstants.LOCATIONS_MANAGE
+        )
+        assert not result.allowed
+        assert result.scope is None
+
+    async def test_linked_doctor_identity_skips_lookup(self):
+        """Test that a doctor's stored doctor_id decides ownership without a doctors query"""
+        user = make_user("DOCTOR", assigned_location_ids=["loc_1"], doctor_id="doctor_1")
+        request = SimpleNamespace(state=SimpleNamespace())
+        facts = get_permission_context(user, request)
+        facts._appointments["apt_1"] = {"appointment_id": "apt_1", "doctor_id": "doctor_1"}
+        facts._appointments["apt_2"] = {"appointment_id": "apt_2", "doctor_id": "doctor_2"}
+
+        own = await PermissionService.check_permission(
+            user, PermissionConstants.APPOINTMENTS_UPDATE, resource_id="apt_1", request=request
+        )
+        other = await PermissionService.check_permission(
+            user, PermissionConstants.APPOINTMENTS_UPDATE, resource_id="apt_2", request=request
+        )
+
+        assert own.allowed
+        assert not other.allowed
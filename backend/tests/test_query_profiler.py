@@ -0,0 +1,81 @@
+"""
+Query Profiler Tests
+Tests for command monitoring and per-request query accounting
+"""
+
+import pytest
+from types import SimpleNamespace
+
+from app.services.query_profiler import QueryProfiler, filter_shape, request_query_stats
+
+
+def _started(request_id, command_name, command):
+    return SimpleNamespace(request_id=request_id, command_name=command_name, command=command)
+
+
+def _finished(request_id, duration_ms):
+    return SimpleNamespace(request_id=request_id, duration_micros=int(duration_ms * 1000))
+
+
+@pytest.mark.unit
+class TestQueryProfiler:
+    """Test query profiler accounting"""
+    
+    def test_filter_shape_hides_values(self):
+        """Test that filter shapes keep keys and operators but drop values"""
+        shape = filter_shape({"user_id": "u1", "date_time": {"$gte": "2025-01-01"}, "status": {"$in": ["a", "b"]}})
+        assert shape == {"user_id": "str", "date_time": {"$gte": "str"}, "status": {"$in": "[str]"}}
+    
+    def test_commands_are_attributed_to_request(self):
+        """Test that commands count against the active request"""
+        profiler = QueryProfiler(slow_query_ms=50)
+        stats = profiler.begin_request()
+        try:
+            for i in range(3):
+                profiler.started(_started(i, "find", {"find": "doctors", "filter": {"doctor_id": "d"}}))
+                profiler.succeeded(_finished(i, 2))
+            profiler.started(_started(9, "hello", {"hello": 1}))
+            profiler.succeeded(_finished(9, 1))
+        finally:
+            request_query_stats.set(None)
+        
+        summary = profiler.end_request(stats, "req-1", "GET", "/api/favorites", 200)
+        assert summary["query_count"] == 3
+        assert summary["commands"] == {"doctors.find": 3}
+        assert summary["db_time_ms"] == 6
+        assert profiler.top_routes()[0]["route"] == "GET /api/favorites"
+    
+    def test_get_more_batches_count_against_their_collection(self):
+        """Test that cursor batches past the first are counted, killCursors is not"""
+        profiler = QueryProfiler(slow_query_ms=50)
+        stats = profiler.begin_request()
+        try:
+            profiler.started(_started(1, "find", {"find": "vital_signs", "filter": {"user_id": "u1"}}))
+            profiler.succeeded(_finished(1, 2))
+            for i in (2, 3):
+                profiler.started(_started(i, "getMore", {"getMore": 8123456789, "collection": "vital_signs"}))
+                profiler.succeeded(_finished(i, 3))
+            profiler.started(_started(4, "killCursors", {"killCursors": "vital_signs", "cursors": [8123456789]}))
+            profiler.succeeded(_finished(4, 1))
+        finally:
+            request_query_stats.set(None)
+        
+        summary = profiler.end_request(stats, "req-2", "GET", "/api/vitals", 200)
+        assert summary["query_count"] == 3
+        assert summary["commands"] == {"vital_signs.find": 1, "vital_signs.getMore": 2}
+        assert summary["db_time_ms"] == 8
+    
+    def test_slow_commands_are_logged_with_shape(self):
+        """Test that slow commands land in the slow-query log"""
+        profiler = QueryProfiler(slow_query_ms=50)
+        profiler.started(_started(1, "aggregate", {
+            "aggregate": "appointments",
+            "pipeline": [{"$match": {"patient_id": "p1"}}, {"$sort": {"date_time": -1}}]
+        }))
+        profiler.failed(_finished(1, 120))
+        
+        slow = list(profiler.slow_queries)
+        assert len(slow) == 1
+        assert slow[0]["collection"] == "appointments"
+        assert slow[0]["shape"] == {"patient_id": "str"}
+        assert slow[0]["failed"] is True
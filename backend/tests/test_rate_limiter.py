@@ -0,0 +1,37 @@
+"""
+Rate Limiter Tests
+Tests for rejected requests as seen through the application stack
+"""
+
+import importlib
+import logging
+
+import pytest
+from starlette.testclient import TestClient
+
+module = importlib.import_module("app.middleware.rate_limiter")
+
+
+@pytest.mark.unit
+class TestRateLimitMiddleware:
+    """Test 429 responses from the rate limit middleware"""
+
+    def test_rejections_are_429s_with_an_access_line(self, monkeypatch, caplog):
+        """Test that a limited request answers 429 with limit headers and still gets its access log line"""
+        from app.main import app
+
+        async def is_rate_limited(client_ip, endpoint):
+            return True, 60, 60
+
+        monkeypatch.setattr(module, "RATE_LIMIT_ENABLED", True)
+        monkeypatch.setattr(module.rate_limiter, "is_rate_limited", is_rate_limited)
+
+        with caplog.at_level(logging.INFO, logger="mediconnect"):
+            response = TestClient(app).get("/api/clinics", headers={"X-Request-ID": "req-429"})
+
+        assert response.status_code == 429
+        assert response.json()["error"]["status_code"] == 429
+        assert response.headers["X-RateLimit-Remaining"] == "0"
+        assert response.headers["X-Request-ID"] == "req-429"
+        access = [record for record in caplog.records if getattr(record, "http", None)]
+        assert [record.http["status_code"] for record in access] == [429]
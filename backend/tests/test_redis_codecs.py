@@ -0,0 +1,51 @@
+"""
+Redis Codec Tests
+Tests for cached value serialization and compression
+"""
+
+import json
+
+import pytest
+
+from app.redis_codecs import FRAME_MARKER, ValueCodec
+
+
+DOCTOR = {"doctor_id": "doctor_1", "name": "Dr. Popescu", "specialty": "Cardiologie", "fee": 250.0}
+
+
+@pytest.mark.unit
+class TestValueCodec:
+    """Test value codecs used by the Redis client"""
+
+    def test_small_json_values_stay_plain(self):
+        """Test that uncompressed JSON is stored as plain JSON and legacy JSON still decodes"""
+        codec = ValueCodec("json", compression="zlib", compress_min_bytes=1024)
+
+        data = codec.encode(DOCTOR)
+        assert json.loads(data) == DOCTOR
+        assert codec.decode(json.dumps(DOCTOR)) == DOCTOR
+
+    def test_large_values_are_compressed(self):
+        """Test that values above the threshold are framed, compressed and round-trip"""
+        codec = ValueCodec("json", compression="zlib", compress_min_bytes=256)
+        value = [dict(DOCTOR, doctor_id=f"doctor_{i}") for i in range(50)]
+
+        data = codec.encode(value)
+        assert data[0] == FRAME_MARKER
+        assert len(data) < len(json.dumps(value))
+        assert codec.decode(data) == value
+
+    def test_other_codec_configurations_decode(self):
+        """Test that a value written with one configuration decodes with another"""
+        writer = ValueCodec("orjson", compression="zlib", compress_min_bytes=0)
+        reader = ValueCodec("json", compression=None)
+
+        assert reader.decode(writer.encode(DOCTOR)) == DOCTOR
+
+    def test_unavailable_codec_falls_back(self):
+        """Test that an unknown serializer or compression falls back instead of failing"""
+        codec = ValueCodec("does-not-exist", compression="does-not-exist")
+
+        assert codec.serializer_name in ("orjson", "json")
+        assert codec.compression_name == "zlib"
+        assert codec.decode(codec.encode(DOCTOR)) == DOCTOR
@@ -0,0 +1,117 @@
+"""
+Vital Signs Storage Tests
+Tests for the time-series document mapping and chart bucketing
+"""
+
+import pytest
+from datetime import datetime, timedelta, timezone
+
+from app.services.vital_signs import (
+    LEGACY_COLLECTION,
+    VitalSignsService,
+    chart_bucket_minutes,
+    from_storage,
+    to_storage
+)
+
+
+PLAIN_VITAL = {
+    "measurement_id": "vital_plain",
+    "user_id": "user_1",
+    "type": "heart_rate",
+    "value": 72.0,
+    "measured_at": "2025-03-01T08:00:00+00:00"
+}
+
+
+class _Cursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for doc in self.docs:
+            yield dict(doc)
+
+    async def to_list(self, length):
+        return list(self.docs)
+
+
+class _Collection:
+    def __init__(self, docs=None):
+        self.docs = list(docs or [])
+
+    def find(self, query, projection=None):
+        ids = (query.get("measurement_id") or {}).get("$in")
+        return _Cursor([doc for doc in self.docs if ids is None or doc.get("measurement_id") in ids])
+
+    async def insert_many(self, docs, ordered=True):
+        self.docs.extend(docs)
+
+
+class _Database:
+    """Database holding a time-series `vital_signs` and a `vital_signs_legacy` left by a failed run."""
+
+    def __init__(self, legacy, copied):
+        self.collections = {"vital_signs": _Collection(copied), LEGACY_COLLECTION: _Collection(legacy)}
+
+    async def list_collections(self, filter=None):
+        return _Cursor([{"name": "vital_signs", "type": "timeseries"}])
+
+    async def list_collection_names(self):
+        return list(self.collections)
+
+    def __getitem__(self, name):
+        return self.collections[name]
+
+
+@pytest.mark.unit
+class TestVitalSignsStorage:
+    """Test vital sign storage helpers"""
+    
+    def test_storage_round_trip(self):
+        """Test that user_id/type move into meta and measured_at becomes a UTC date"""
+        vital = {
+            "measurement_id": "vital_1",
+            "user_id": "user_1",
+            "type": "heart_rate",
+            "value": 72.0,
+            "unit": "bpm",
+            "measured_at": "2025-03-01T10:00:00+02:00"
+        }
+        
+        doc = to_storage(vital)
+        assert doc["meta"] == {"user_id": "user_1", "type": "heart_rate"}
+        assert "user_id" not in doc and "type" not in doc
+        assert doc["measured_at"] == datetime(2025, 3, 1, 8, 0, tzinfo=timezone.utc)
+        
+        # BSON dates are read back naive (UTC)
+        doc["measured_at"] = doc["measured_at"].replace(tzinfo=None)
+        restored = from_storage({**doc, "_id": "ignored"})
+        assert restored == {**vital, "measured_at": "2025-03-01T08:00:00+00:00"}
+    
+    def test_chart_buckets_cap_point_count(self):
+        """Test that bucket width keeps the number of buckets within the target"""
+        end = datetime(2025, 3, 31, tzinfo=timezone.utc)
+        start = end - timedelta(days=30)
+        
+        minutes = chart_bucket_minutes(start, end, 200)
+        assert (end - start) / timedelta(minutes=minutes) <= 200
+        assert chart_bucket_minutes(start, start + timedelta(minutes=5), 200) == 1
+    
+    async def test_migration_resumes_and_keeps_meta_shaped_documents(self):
+        """Test that a rerun copies only missing measurements, including ones already in the meta shape"""
+        meta_vital = to_storage({**PLAIN_VITAL, "measurement_id": "vital_meta"})
+        database = _Database(
+            legacy=[PLAIN_VITAL, meta_vital, {**PLAIN_VITAL, "measurement_id": "vital_done"}],
+            copied=[to_storage({**PLAIN_VITAL, "measurement_id": "vital_done"})]
+        )
+        
+        summary = await VitalSignsService.migrate(database, batch_size=2)
+        
+        assert summary == {"status": "migrated", "copied": 2, "existing": 1, "skipped": 0}
+        copied = database["vital_signs"].docs
+        assert sorted(doc["measurement_id"] for doc in copied) == ["vital_done", "vital_meta", "vital_plain"]
+        assert all(doc["meta"] == {"user_id": "user_1", "type": "heart_rate"} for doc in copied)
@@ -1,7 +1,7 @@
 import { useState, useEffect, useRef } from 'react';
 import { useTranslation } from 'react-i18next';
 import { Bell, X, Check, CheckCheck, Trash2, Settings, Loader2 } from 'lucide-react';
-import { api } from '../App';
+import { api, API } from '../App';
 import { useNavigate } from 'react-router-dom';
 
 const NotificationBell = () => {
@@ -17,12 +17,48 @@ const NotificationBell = () => {
     fetchNotifications();
     fetchStats();
 
-    // Poll for new notifications every 30 seconds
-    const interval = setInterval(() => {
-      fetchStats();
-    }, 30000);
+    // Prefer the server push channel; poll every 30 seconds only if the
+    // event stream is unavailable
+    let interval = null;
+    let source = null;
 
-    return () => clearInterval(interval);
+    const startPolling = () => {
+      if (!interval) {
+        interval = setInterval(() => {
+          fetchStats();
+        }, 30000);
+      }
+    };
+
+    if (typeof EventSource !== 'undefined') {
+      source = new EventSource(`${API}/notifications/stream`, { withCredentials: true });
+
+      source.addEventListener('unread_count', (event) => {
+        const data = JSON.parse(event.data);
+        setStats((prev) => ({ ...prev, unread_count: data.unread, total_notifications: data.total }));
+      });
+
+      source.addEventListener('notification', (event) => {
+        const notification = JSON.parse(event.data);
+        setNotifications((prev) => [
+          notification,
+          ...prev.filter((n) => n.notification_id !== notification.notification_id)
+        ].slice(0, 10));
+      });
+
+      source.onerror = () => {
+        if (source.readyState === EventSource.CLOSED) {
+          startPolling();
+        }
+      };
+    } else {
+      startPolling();
+    }
+
+    return () => {
+      if (interval) clearInterval(interval);
+      if (source) source.close();
+    };
   }, []);
 
   useEffect(() => {
@@ -52,7 +88,7 @@ const NotificationBell = () => {
 
   const fetchStats = async () => {
     try {
-      const response = await api.get('/notifications/me/stats');
+      const response = await api.get('/notifications/me/stats?breakdown=false');
       setStats(response.data);
     } catch (error) {
       console.error('Error fetching notification stats:', error);